@@ -0,0 +1,75 @@
+"""土台パッケージのベンチマーク: 既定テンプレート（Presentation()）と最小パッケージ（base_package）。
+
+実行: uv run python benchmarks/bench_base_package.py [--repeat 30]
+
+input/ の YAML を --repeat 回ずつ batch の 1 ファイル変換（convert_to_bytes）で PPTX にしたときの
+1 ファイルあたりの時間と出力サイズ、土台を作るだけの時間を表示する。既定テンプレートは
+変換のたびにディスクから読み、使わない 10 枚のレイアウト・プリンタ設定・サムネイルも出力に入る。
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from pptx import Presentation
+from pptx.util import Emu
+
+from process_to_pptx import base_package, batch, xml2pptx, yaml2pptx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _default_presentation(slide_width=None, slide_height=None):
+    """変更前の土台（既定テンプレートをそのまま読む）。"""
+    prs = Presentation()
+    if slide_width is not None:
+        prs.slide_width = Emu(slide_width)
+    if slide_height is not None:
+        prs.slide_height = Emu(slide_height)
+    return prs
+
+
+def _use(factory) -> None:
+    yaml2pptx.new_presentation = factory
+    xml2pptx.new_presentation = factory
+
+
+def _convert(inputs: list[Path], repeat: int) -> tuple[float, int]:
+    """(1 ファイルあたりの時間, 1 ファイルあたりの出力バイト数)。"""
+    size = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in inputs:
+            data, _ = batch.convert_to_bytes(path, renderer="fast")
+            size += len(data)
+    n = repeat * len(inputs)
+    return (time.perf_counter() - start) / n, size // n
+
+
+def _create(factory, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        factory()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30, help="各入力の変換回数")
+    args = parser.parse_args()
+    inputs = sorted((ROOT / "input").glob("*.yaml"))
+    base_package.base_blob()  # 組み立ては初回だけ（プロセスごと）なので計測から外す
+
+    print(f"inputs: {len(inputs)} x {args.repeat}")
+    print(f"{'base':>9} {'create [ms]':>12} {'convert [ms]':>13} {'size [KB]':>10}")
+    for name, factory in (("default", _default_presentation), ("stripped", base_package.new_presentation)):
+        _use(factory)
+        seconds, size = _convert(inputs, args.repeat)
+        print(f"{name:>9} {_create(factory, args.repeat) * 1e3:>12.2f} {seconds * 1e3:>13.2f} {size / 1024:>10.1f}")
+    _use(base_package.new_presentation)
+
+
+if __name__ == "__main__":
+    main()
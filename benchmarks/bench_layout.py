@@ -0,0 +1,63 @@
+"""レイアウト計算のベンチマーク: 読み込んだモデルとレイアウト結果のメモリ、compute_layout の時間（ループ・NumPy）。
+
+実行: uv run python benchmarks/bench_layout.py [--nodes 10000,50000]
+
+bench_yaml_loading と同じ合成 YAML を読み込み、モデル（ノード）とレイアウト結果が保持する
+Python オブジェクトのメモリ（tracemalloc。時間とは別の回で測る）と、配置をループで計算したときと
+NumPy で計算したとき（NumPy が入っている場合）の compute_layout の時間を表示する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench_yaml_loading import _write_process_yaml
+
+from process_to_pptx.placement import load_numpy
+from process_to_pptx.yaml_loader import ProcessModel
+
+
+def _time_layout(model: ProcessModel, vectorized: bool) -> float:
+    start = time.perf_counter()
+    model.compute_layout(vectorized=vectorized)
+    return time.perf_counter() - start
+
+
+def _measure(path: Path) -> tuple[float, float, float, float | None]:
+    """(モデルのメモリ, レイアウト結果のメモリ, ループの時間, NumPy の時間)。"""
+    gc.collect()
+    tracemalloc.start()
+    model = ProcessModel.load(path)
+    model_bytes = tracemalloc.get_traced_memory()[0]
+    layout = model.compute_layout(vectorized=False)
+    layout_bytes = tracemalloc.get_traced_memory()[0] - model_bytes
+    tracemalloc.stop()
+    del layout
+    scalar = _time_layout(model, vectorized=False)
+    vector = _time_layout(model, vectorized=True) if load_numpy() is not None else None
+    return model_bytes / 2**20, layout_bytes / 2**20, scalar, vector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", default="10000,50000", help="ノード数（カンマ区切り）")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.nodes.split(",") if s.strip()]
+
+    print(f"{'nodes':>8} {'model [MB]':>11} {'layout [MB]':>12} {'loop [s]':>9} {'numpy [s]':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = Path(tmp) / f"process_{n}.yaml"
+            _write_process_yaml(path, n)
+            model_mb, layout_mb, scalar, vector = _measure(path)
+            vector_text = f"{vector:.2f}" if vector is not None else "-"
+            print(f"{n:>8} {model_mb:>11.1f} {layout_mb:>12.1f} {scalar:>9.2f} {vector_text:>10}")
+
+
+if __name__ == "__main__":
+    main()
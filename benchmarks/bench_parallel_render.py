@@ -0,0 +1,52 @@
+"""スライド描画の並列化のベンチマーク: ワーカー数ごとの yaml_to_pptx の時間。
+
+実行: uv run python benchmarks/bench_parallel_render.py [--nodes 4000] [--stack 8] [--workers 1,2,4,8]
+
+横長のプロセス（同じセルに --stack 個ずつ積む密なスライド）を、既定レンダラ（逐次）と
+workers=1（fast・逐次）, 2, 4 … で PPTX にしたときの時間とスライド数を表示する。
+図形 XML の組み立てがワーカーに分散されるため、スライドが多いほどコア数に応じて短くなる
+（スライドの追加と保存は親プロセスで逐次に行う）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+
+from process_to_pptx import yaml2pptx
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _model(n: int, stack: int) -> ProcessModel:
+    nodes = [
+        ProcessNode(id=i, type="task", actor_index=i % 4, label=f"作業 {i}", next_ids=[i + stack] if i + stack < n else [])
+        for i in range(n)
+    ]
+    return ProcessModel(actors=["営業", "上司", "事務", "経理"], nodes=nodes)
+
+
+def _time(model: ProcessModel, renderer: str, workers: int) -> float:
+    start = time.perf_counter()
+    yaml2pptx.yaml_to_pptx(model, io.BytesIO(), renderer=renderer, workers=workers)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=4000, help="ノード数")
+    parser.add_argument("--stack", type=int, default=8, help="同じ列に並べるノード数（スライドの密度）")
+    parser.add_argument("--workers", default="1,2,4,8", help="ワーカー数（カンマ区切り）")
+    args = parser.parse_args()
+    model = _model(args.nodes, args.stack)
+    slides = model.compute_layout().num_slides
+
+    print(f"nodes: {args.nodes}, slides: {slides}")
+    print(f"{'renderer':>9} {'workers':>8} {'time [s]':>9}")
+    print(f"{'default':>9} {1:>8} {_time(model, 'default', 1):>9.2f}")
+    for workers in (int(s) for s in args.workers.split(",") if s.strip()):
+        print(f"{'fast':>9} {workers:>8} {_time(model, 'fast', workers):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
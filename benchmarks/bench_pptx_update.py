@@ -0,0 +1,58 @@
+"""差分更新のベンチマーク: ラベルを 1 つ直したときの作り直し（yaml_to_pptx）と update_pptx の時間。
+
+実行: uv run python benchmarks/bench_pptx_update.py [--nodes 2000] [--stack 4]
+
+横長のプロセスを 1 回生成したあと、1 つのタスクのラベルだけを変えたモデルで、PPTX を作り直した時間
+（既定・fast レンダラ）と、生成済みの PPTX を差分で更新した時間、更新したスライド・図形の数を表示する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from process_to_pptx import yaml2pptx
+from process_to_pptx.pptx_update import update_pptx
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _model(n: int, stack: int, edited: bool) -> ProcessModel:
+    nodes = [
+        ProcessNode(
+            id=i,
+            type="task",
+            actor_index=i % 4,
+            label="変更したラベル" if edited and i == n // 2 else f"作業 {i}",
+            next_ids=[i + stack] if i + stack < n else [],
+        )
+        for i in range(n)
+    ]
+    return ProcessModel(actors=["営業", "上司", "事務", "経理"], nodes=nodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=2000, help="ノード数")
+    parser.add_argument("--stack", type=int, default=4, help="同じ列に並べるノード数（スライドの密度）")
+    args = parser.parse_args()
+    original = _model(args.nodes, args.stack, edited=False)
+    edited = _model(args.nodes, args.stack, edited=True)
+    print(f"nodes: {args.nodes}, slides: {original.compute_layout().num_slides}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "deck.pptx"
+        print(f"{'method':>16} {'time [s]':>9}")
+        for renderer in ("default", "fast"):
+            start = time.perf_counter()
+            yaml2pptx.yaml_to_pptx(edited, path, renderer=renderer)
+            print(f"{'rebuild ' + renderer:>16} {time.perf_counter() - start:>9.3f}")
+        yaml2pptx.yaml_to_pptx(original, path, renderer="fast")
+        start = time.perf_counter()
+        result = update_pptx(edited, path)
+        print(f"{'update':>16} {time.perf_counter() - start:>9.3f}  {result.format()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""図形追加コストのベンチマーク: python-pptx の add_shape（毎回 ID を全走査）と SlideBuilder（カウンタ払い出し）。
+
+実行: uv run python benchmarks/bench_shape_ids.py [--sizes 250,500,1000,2000]
+
+1 スライドに n 個の図形を追加する時間と 1 図形あたりの時間を表示する。
+python-pptx 側は n が倍になると 1 図形あたりの時間もほぼ倍になり（O(n^2)）、
+SlideBuilder 側は n によらずほぼ一定になる（O(n)）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+
+from process_to_pptx.slide_builder import SlideBuilder
+
+
+def _blank_slide():
+    prs = Presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+
+def _bench_python_pptx(n: int) -> float:
+    slide = _blank_slide()
+    start = time.perf_counter()
+    for i in range(n):
+        slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, i, i, 100, 100)
+    return time.perf_counter() - start
+
+
+def _bench_builder(n: int) -> float:
+    builder = SlideBuilder(_blank_slide())
+    start = time.perf_counter()
+    for i in range(n):
+        builder.add_shape(MSO_SHAPE.RECTANGLE, i, i, 100, 100)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="250,500,1000,2000", help="図形数（カンマ区切り）")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    print(f"{'shapes':>8} {'python-pptx [s]':>16} {'us/shape':>10} {'builder [s]':>12} {'us/shape':>10} {'speedup':>8}")
+    for n in sizes:
+        before = _bench_python_pptx(n)
+        after = _bench_builder(n)
+        print(
+            f"{n:>8} {before:>16.3f} {before / n * 1e6:>10.1f} "
+            f"{after:>12.3f} {after / n * 1e6:>10.1f} {before / after:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""スライドキャッシュのベンチマーク: ラベルを 1 つ直したときの yaml_to_pptx の時間（キャッシュなし / あり）。
+
+実行: uv run python benchmarks/bench_slide_cache.py [--nodes 2000] [--stack 4]
+
+横長のプロセスを 1 回描いてキャッシュを温めたあと、1 つのタスクのラベルだけを変えたモデルを
+キャッシュなし・メモリのキャッシュ・ディスクのキャッシュ（新しいプロセス相当）で描いた時間と、
+キャッシュのヒット数を表示する。変わったスライドだけを組み立て直し、残りは XML をそのまま書く。
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import tempfile
+import time
+
+from process_to_pptx import yaml2pptx
+from process_to_pptx.slide_cache import SlideCache
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _model(n: int, stack: int, edited: bool) -> ProcessModel:
+    nodes = [
+        ProcessNode(
+            id=i,
+            type="task",
+            actor_index=i % 4,
+            label="変更したラベル" if edited and i == n // 2 else f"作業 {i}",
+            next_ids=[i + stack] if i + stack < n else [],
+        )
+        for i in range(n)
+    ]
+    return ProcessModel(actors=["営業", "上司", "事務", "経理"], nodes=nodes)
+
+
+def _time(model: ProcessModel, cache) -> float:
+    start = time.perf_counter()
+    yaml2pptx.yaml_to_pptx(model, io.BytesIO(), renderer="fast", slide_cache=cache)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=2000, help="ノード数")
+    parser.add_argument("--stack", type=int, default=4, help="同じ列に並べるノード数（スライドの密度）")
+    args = parser.parse_args()
+    original = _model(args.nodes, args.stack, edited=False)
+    edited = _model(args.nodes, args.stack, edited=True)
+    print(f"nodes: {args.nodes}, slides: {original.compute_layout().num_slides}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory = SlideCache(directory)
+        _time(original, memory)
+        print(f"{'cache':>8} {'time [s]':>9}  stats")
+        print(f"{'none':>8} {_time(edited, None):>9.3f}")
+        before = memory.stats()
+        seconds = _time(edited, memory)
+        after = memory.stats()
+        print(f"{'memory':>8} {seconds:>9.3f}  {after.hits - before.hits} hit(s), {after.misses - before.misses} miss(es)")
+        disk = SlideCache(directory)
+        seconds = _time(edited, disk)
+        print(f"{'disk':>8} {seconds:>9.3f}  {disk.hits} hit(s), {disk.misses} miss(es)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""監視のベンチマーク: YAML を保存してから PPTX が書かれるまでの時間（CLI を毎回起動 / watch の Watcher）。
+
+実行: uv run python benchmarks/bench_watch.py [--input input/process.yaml] [--edits 5] [--renderer fast]
+
+CLI を起動する場合はインタプリタ起動と import を含む from-yaml 1 回分、watch は変更の検知（debounce を含む）から
+出力を書き終えるまでの時間（--poll では検知までに最大で走査間隔が加わる）。どちらも保存のたびに YAML を書き換える。
+"""
+
+from __future__ import annotations
+
+import argparse
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from process_to_pptx import watch
+
+
+def _edit(path: Path, original: str, i: int) -> None:
+    path.write_text(original + f"\n# edit {i}\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", default="input/process.yaml", help="編集する YAML")
+    parser.add_argument("--edits", type=int, default=5, help="保存の回数")
+    parser.add_argument("--renderer", choices=["default", "fast"], default="fast")
+    parser.add_argument("--poll", action="store_true", help="inotify を使わずに走査する")
+    args = parser.parse_args()
+    original = Path(args.input).read_text(encoding="utf-8")
+
+    with tempfile.TemporaryDirectory() as directory:
+        src = Path(directory) / "in"
+        out = Path(directory) / "out"
+        src.mkdir()
+        path = src / Path(args.input).name
+        shutil.copy(args.input, path)
+
+        cli = []
+        for i in range(args.edits):
+            _edit(path, original, i)
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable, "-m", "process_to_pptx.cli", "from-yaml", str(path),
+                    "-o", str(Path(directory) / "cli.pptx"), "--renderer", args.renderer, "--force",
+                ],
+                check=True,
+                capture_output=True,
+            )
+            cli.append(time.perf_counter() - start)
+
+        results: queue.Queue = queue.Queue()
+        with watch.Watcher([src], out, renderer=args.renderer, polling=args.poll, on_result=results.put) as w:
+            w.build_all(force=True)
+            results.get()
+            stop = threading.Event()
+            thread = threading.Thread(target=w.run, args=(stop,))
+            thread.start()
+            watched = []
+            for i in range(args.edits):
+                _edit(path, original, args.edits + i)
+                watched.append(results.get(timeout=30).seconds)
+            stop.set()
+            thread.join()
+
+        print(f"{'method':>22} {'mean [ms]':>10} {'max [ms]':>9}")
+        for name, times in (("from-yaml (new process)", cli), (f"watch ({w.source.name})", watched)):
+            print(f"{name:>22} {sum(times) / len(times) * 1e3:>10.0f} {max(times) * 1e3:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""YAML 読み込みのベンチマーク: 従来の読み込み（純 Python の safe_load）・C ローダー・ストリーミング読み込み。
+
+実行: uv run python benchmarks/bench_yaml_loading.py [--nodes 2000,10000]
+
+機械生成を想定した n ノードのプロセス YAML を一時ファイルに書き、各方式の読み込み時間と
+Python オブジェクトのピークメモリ（tracemalloc。時間とは別の回で測り、libyaml 内部の確保は含まない）を表示する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import yaml
+
+from process_to_pptx import yaml_loader
+
+
+def _write_process_yaml(path: Path, n: int) -> None:
+    actors = ["営業", "上司", "経理", "[システム]CRM"]
+    with path.open("w", encoding="utf-8") as f:
+        f.write("actors:\n" + "".join(f"  - \"{a}\"\n" for a in actors))
+        f.write("nodes:\n")
+        for i in range(n):
+            f.write(
+                f"  - id: {i}\n    type: task\n    actor: {actors[i % 3]}\n    label: \"タスク {i}\"\n"
+                f"    next: [{{ id: {i + 1}, label: \"次へ\" }}]\n"
+                f"    request_to: [{{ id: crm, label: 登録 }}]\n"
+            )
+        f.write("  - { id: crm, type: service, actor: 3, label: CRM }\n")
+        f.write("layout:\n  max_cols_per_slide: 10\n")
+
+
+def _baseline(path: Path):
+    """変更前の読み込み: 全文を文字列にして純 Python の safe_load。"""
+    return yaml_loader._parse_process_data(yaml.safe_load(path.read_text(encoding="utf-8")))
+
+
+def _c_loader(path: Path):
+    return yaml_loader.load_process_yaml(path, streaming=False)
+
+
+def _streaming(path: Path):
+    return yaml_loader.load_process_yaml(path, streaming=True)
+
+
+def _measure(fn, path: Path) -> tuple[float, float, int]:
+    """(時間, ピークメモリ, ノード数)。tracemalloc は遅くなるので時間とメモリは別々に測る。"""
+    start = time.perf_counter()
+    _, nodes, _ = fn(path)
+    elapsed = time.perf_counter() - start
+    del nodes
+    tracemalloc.start()
+    _, nodes, _ = fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, len(nodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", default="2000,10000", help="ノード数（カンマ区切り）")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.nodes.split(",") if s.strip()]
+
+    print(f"libyaml: {'yes' if yaml_loader.HAS_LIBYAML else 'no'}")
+    print(f"{'nodes':>8} {'file [MB]':>10} {'method':>10} {'time [s]':>9} {'peak [MB]':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = Path(tmp) / f"process_{n}.yaml"
+            _write_process_yaml(path, n)
+            size_mb = path.stat().st_size / 2**20
+            for name, fn in (("baseline", _baseline), ("c-loader", _c_loader), ("streaming", _streaming)):
+                elapsed, peak, count = _measure(fn, path)
+                assert count == n + 1
+                print(f"{n:>8} {size_mb:>10.1f} {name:>10} {elapsed:>9.2f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""出力の土台にする、python-pptx 既定テンプレートから不要なパーツを削った最小の PPTX パッケージ。
+
+Presentation() は呼ぶたびに既定テンプレートをディスクから読み、11 枚のスライドレイアウト・プリンタ設定・
+サムネイルまで出力に持ち込む。使うのは白紙レイアウトだけなので、白紙以外のレイアウトと、プリンタ設定・
+サムネイルを外したパッケージをプロセスごとに 1 回だけ組み立ててバイト列で持っておき、変換のたびに
+そこから Presentation を作る（読む XML が半分以下になり、出力も小さくなる）。
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+from typing import Optional
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.util import Emu
+
+# 残す白紙レイアウト（既定テンプレートのレイアウト名）
+BLANK_LAYOUT_NAME = "Blank"
+
+_base_blob: Optional[bytes] = None
+_lock = threading.Lock()
+
+
+def _strip(prs) -> None:
+    """白紙以外のスライドレイアウトと、プリンタ設定・サムネイルへの関係を外す（関係の無いパーツは保存されない）。"""
+    master = prs.slide_master
+    layout_ids = master._element.get_or_add_sldLayoutIdLst()
+    for entry in list(layout_ids):
+        layout = master.part.related_slide_layout(entry.rId)
+        if layout.name == BLANK_LAYOUT_NAME:
+            layout.part.partname = PackURI("/ppt/slideLayouts/slideLayout1.xml")
+        else:
+            layout_ids.remove(entry)
+            master.part.drop_rel(entry.rId)
+    for rId, rel in list(prs.part.rels.items()):
+        if rel.reltype == RT.PRINTER_SETTINGS:
+            prs.part.drop_rel(rId)
+    package_rels = prs.part.package._rels
+    for rId, rel in list(package_rels.items()):
+        if rel.reltype == RT.THUMBNAIL:
+            package_rels.pop(rId)
+
+
+def base_blob() -> bytes:
+    """最小パッケージの .pptx のバイト列（初回だけ組み立てる）。"""
+    global _base_blob
+    if _base_blob is None:
+        with _lock:
+            if _base_blob is None:
+                prs = Presentation()
+                _strip(prs)
+                buffer = io.BytesIO()
+                prs.save(buffer)
+                _base_blob = buffer.getvalue()
+    return _base_blob
+
+
+def new_presentation(slide_width: Optional[int] = None, slide_height: Optional[int] = None):
+    """最小パッケージから新しい Presentation を作る。寸法を渡せばスライドの幅・高さ（EMU）を設定する。"""
+    prs = Presentation(io.BytesIO(base_blob()))
+    if slide_width is not None:
+        prs.slide_width = Emu(slide_width)
+    if slide_height is not None:
+        prs.slide_height = Emu(slide_height)
+    return prs
+
+
+def blank_layout(prs):
+    """prs の白紙レイアウト（最小パッケージでも既定テンプレートの Presentation でも使える）。"""
+    layout = prs.slide_layouts.get_by_name(BLANK_LAYOUT_NAME)
+    if layout is None:
+        raise ValueError(f"the presentation has no {BLANK_LAYOUT_NAME!r} slide layout")
+    return layout
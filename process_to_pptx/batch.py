@@ -0,0 +1,244 @@
+"""複数の YAML / .drawio / mxGraph XML を 1 プロセスでまとめて PPTX に変換する。
+
+ファイルごとに CLI を起動し直すとインタプリタ起動と python-pptx の import を毎回払うため、
+ワーカープール（プロセス）で変換し、保存は専用スレッドに任せる。
+投入数と保存待ちの数に上限を設け、変換（読み込み・レイアウト・描画）と保存が重なって進むようにする。
+"""
+
+from __future__ import annotations
+
+import glob
+import io
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .build_manifest import XML_OPTIONS, BuildManifest, input_digest_or_none, yaml_options
+
+YAML_SUFFIXES = (".yaml", ".yml")
+XML_SUFFIXES = (".drawio", ".xml")
+INPUT_SUFFIXES = YAML_SUFFIXES + XML_SUFFIXES
+
+
+@dataclass
+class BatchResult:
+    """1 ファイル分の変換結果。error が None なら成功（skipped なら出力が最新のため変換していない）。"""
+
+    input: Path
+    output: Path
+    shapes: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+
+
+def collect_inputs(patterns: Iterable[str]) -> list[Path]:
+    """ディレクトリ（直下）・glob・ファイルパスから YAML / .drawio / XML の入力ファイルを集める。重複は除く。"""
+    found: list[Path] = []
+    seen: set[Path] = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(path.iterdir())
+        elif glob.has_magic(pattern):
+            candidates = [Path(p) for p in sorted(glob.glob(pattern, recursive=True))]
+        else:
+            candidates = [path]
+        for p in candidates:
+            if p.suffix.lower() in INPUT_SUFFIXES and p.is_file() and p not in seen:
+                seen.add(p)
+                found.append(p)
+    return found
+
+
+def convert_to_bytes(
+    input_path: str | Path,
+    renderer: Optional[str] = None,
+    bake_chrome: bool = True,
+    cache_dir: Optional[str] = None,
+) -> tuple[bytes, int]:
+    """1 ファイルを PPTX に変換し、(PPTX のバイト列, 図形数) を返す。拡張子で YAML か XML かを判定する。"""
+    from . import xml2pptx, yaml2pptx
+    from .layout_cache import LayoutCache
+    from .parse_cache import ParseCache
+    from .slide_cache import SlideCache
+
+    path = Path(input_path)
+    buf = io.BytesIO()
+    if path.suffix.lower() in YAML_SUFFIXES:
+        cache = ParseCache(cache_dir) if cache_dir else None
+        layouts = LayoutCache(cache_dir) if cache_dir else None
+        # python-pptx の図形 API（default）を明示したときはスライドのキャッシュ（fast のテンプレート）を使わない
+        slides = SlideCache(cache_dir) if cache_dir and renderer != "default" else None
+        n = yaml2pptx.yaml_to_pptx(
+            path,
+            buf,
+            renderer=renderer,
+            bake_chrome=bake_chrome,
+            parse_cache=cache,
+            layout_cache=layouts,
+            slide_cache=slides,
+        )
+    else:
+        n = xml2pptx.xml_to_pptx(path.read_text(encoding="utf-8"), buf)
+    return buf.getvalue(), n
+
+
+def _convert_task(
+    input_path: str, renderer: Optional[str], bake_chrome: bool, cache_dir: Optional[str]
+) -> tuple[Optional[bytes], int, float, Optional[str]]:
+    """ワーカーで実行する変換。例外はプールを壊さないよう文字列にして返す。"""
+    start = time.perf_counter()
+    try:
+        data, n = convert_to_bytes(input_path, renderer=renderer, bake_chrome=bake_chrome, cache_dir=cache_dir)
+    except Exception as e:  # noqa: BLE001  1 ファイルの失敗で全体を止めない
+        return None, 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return data, n, time.perf_counter() - start, None
+
+
+class _InlineExecutor:
+    """workers=1 用。プロセスを起こさずその場で実行する（結果は Future で返す）。"""
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        pass
+
+
+def run_batch(
+    inputs: list[Path],
+    output_dir: str | Path,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    renderer: Optional[str] = None,
+    bake_chrome: bool = True,
+    cache_dir: Optional[str | Path] = None,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+    incremental: bool = False,
+) -> list[BatchResult]:
+    """
+    inputs を output_dir/<stem>.pptx に変換する。戻り値は inputs と同じ順の結果。
+    workers: 変換プロセス数（省略時は CPU 数、1 ならプロセスを起こさない）。
+    queue_size: 変換中＋保存待ちのファイル数の上限（省略時は workers の 2 倍）。
+    cache_dir: YAML の解析・レイアウトのキャッシュのディレクトリ（parse_cache・layout_cache 参照）。
+    on_result: 保存が終わったファイルから順に呼ばれる（進捗表示用）。
+    incremental: output_dir のビルドマニフェスト（build_manifest）を見て、入力の内容と設定が前回と同じで
+        出力が残っているファイルは変換しない（skipped）。変換したファイルはマニフェストに記録する。
+    """
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, workers or os.cpu_count() or 1)
+    queue_size = max(1, queue_size or 2 * workers)
+
+    results: list[BatchResult] = []
+    owners: dict[Path, Path] = {}
+    for path in inputs:
+        output = out_dir / (path.stem + ".pptx")
+        result = BatchResult(input=path, output=output)
+        if output in owners:
+            result.error = f"output {output} is already produced from {owners[output]}"
+        else:
+            owners[output] = path
+        results.append(result)
+
+    manifest = BuildManifest(out_dir) if incremental else None
+    digests: dict[Path, str] = {}
+
+    def _options(path: Path) -> dict[str, Any]:
+        return yaml_options("pptx", bake_chrome) if path.suffix.lower() in YAML_SUFFIXES else XML_OPTIONS
+
+    # 保存スレッド: 変換済みのバイト列を受け取り順に書き出す
+    save_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    slots = threading.Semaphore(queue_size)
+
+    def _report(result: BatchResult) -> None:
+        if on_result is not None:
+            on_result(result)
+
+    def _finish(result: BatchResult) -> None:
+        slots.release()
+        _report(result)
+
+    def _saver() -> None:
+        while True:
+            item = save_queue.get()
+            if item is None:
+                return
+            result, data = item
+            try:
+                result.output.write_bytes(data)
+                if manifest is not None and result.output in digests:
+                    manifest.record(result.output, digests[result.output], _options(result.input))
+            except OSError as e:
+                result.error = f"{type(e).__name__}: {e}"
+            _finish(result)
+
+    saver = threading.Thread(target=_saver, name="batch-saver", daemon=True)
+    saver.start()
+
+    executor = _InlineExecutor() if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    pending: dict[Future, BatchResult] = {}
+
+    def _collect(done: Iterable[Future]) -> None:
+        for future in done:
+            result = pending.pop(future)
+            data, result.shapes, result.seconds, result.error = future.result()
+            if data is None:
+                _finish(result)
+            else:
+                save_queue.put((result, data))
+
+    try:
+        for result in results:
+            if result.error is None and manifest is not None:
+                digest = input_digest_or_none(result.input)
+                if digest is not None:
+                    if manifest.is_up_to_date(result.output, digest, _options(result.input)):
+                        result.skipped = True
+                    else:
+                        digests[result.output] = digest
+            # 変換しないファイルは枠を取らない（取ると回収前の変換が枠を埋めているときに止まる）
+            if result.error is not None or result.skipped:
+                _report(result)
+                continue
+            # 変換中＋保存待ちが上限に達したら、変換の完了か保存の完了を待ってから投入する
+            while not slots.acquire(blocking=False):
+                if pending:
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                    _collect(done)
+                else:
+                    slots.acquire()
+                    break
+            future = executor.submit(
+                _convert_task, str(result.input), renderer, bake_chrome, str(cache_dir) if cache_dir else None
+            )
+            pending[future] = result
+            _collect([f for f in pending if f.done()])
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            _collect(done)
+    finally:
+        executor.shutdown(wait=True)
+        save_queue.put(None)
+        saver.join()
+        if manifest is not None:
+            manifest.save()
+    return results
+
+
+def format_result(result: BatchResult) -> str:
+    """1 ファイル分の要約行。"""
+    if result.error is not None:
+        return f"FAIL {result.input}: {result.error}"
+    if result.skipped:
+        return f"SKIP {result.input} -> {result.output} (up to date)"
+    return f"OK   {result.input} -> {result.output} (shapes: {result.shapes}, {result.seconds:.2f}s)"
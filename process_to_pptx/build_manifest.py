@@ -0,0 +1,163 @@
+"""出力ごとに「何から・どの設定で作ったか」を記録し、変わっていない入力の変換を省くビルドマニフェスト。
+
+出力ディレクトリに MANIFEST_NAME（JSON）を置き、出力ファイル名ごとに入力内容の SHA-256・変換の設定・
+ツールのバージョンと、書いた直後の出力のサイズ・更新時刻を持つ。次の実行でこれらがすべて一致すれば
+（出力が消えたり手で書き換えられたりしていなければ）出力はまだ有効とみなし、変換しない。
+入力は内容で比べるため、チェックアウトし直して更新時刻だけが変わった入力も省ける。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+from . import __version__
+
+MANIFEST_NAME = ".process-to-pptx-manifest.json"
+# マニフェストの形式を変えたら上げる（古い形式のマニフェストは読み捨てる）
+MANIFEST_VERSION = 1
+_CHUNK = 1 << 20
+
+# 変換の設定のうち出力の中身を変えるもの（描画方式・ワーカー数・ストリーミングは出力が同じなので含めない）。
+# YAML → PPTX は from-yaml と batch で同じ設定になり、どちらで作った出力も互いに省ける
+XML_OPTIONS = {"from": "xml", "format": "pptx"}
+
+
+def yaml_options(fmt: str, bake_chrome: bool) -> dict[str, Any]:
+    """YAML からの変換の設定（fmt は pptx / svg / html / drawio）。"""
+    return {"from": "yaml", "format": fmt, "chrome": "layout" if bake_chrome else "slide"}
+
+
+def _toggle_umask() -> int:
+    """umask を付け替えて今の値を読む（付け替えの間に他のスレッドが作るファイルは umask 0 になるので、
+    /proc の無い環境で import のときに 1 回だけ使う）。"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _proc_umask() -> Optional[int]:
+    """/proc/self/status の Umask（Linux 4.7 以降）。読めなければ None。"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+_IMPORT_UMASK = _proc_umask()
+if _IMPORT_UMASK is None:
+    _IMPORT_UMASK = _toggle_umask()
+
+
+def new_file_mode() -> int:
+    """新しく作るファイルの既定のパーミッション（open で作った場合と同じく 0o666 から umask を除いたもの）。
+    tempfile.mkstemp の一時ファイルは 0o600 なので、置き換える前にこれを付ける（他のユーザーからも読めるように）。
+    umask は /proc から読み、読めない環境では import のときの値を使う（保存のたびに付け替えない）。"""
+    umask = _proc_umask()
+    return 0o666 & ~(_IMPORT_UMASK if umask is None else umask)
+
+
+def file_digest(path: str | Path) -> str:
+    """ファイル内容の SHA-256（16 進）。"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_digest_or_none(path: str | Path) -> Optional[str]:
+    """入力のハッシュ（読めなければ None。変換側で改めてエラーにする）。"""
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+class BuildManifest:
+    """1 つの出力ディレクトリのマニフェスト。record した内容は save で書き出す（スレッドから呼んでよい）。"""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self._entries = self._read()
+        self._dirty: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_output(cls, output: str | Path) -> BuildManifest:
+        """output と同じディレクトリのマニフェスト。"""
+        return cls(Path(output).resolve().parent)
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        outputs = data.get("outputs")
+        return outputs if isinstance(outputs, dict) else {}
+
+    def _key(self, output: str | Path) -> str:
+        return Path(output).name
+
+    def is_up_to_date(self, output: str | Path, input_digest: str, options: Mapping[str, Any]) -> bool:
+        """output が、内容 input_digest の入力から options で作った最新のものとして残っているか。"""
+        with self._lock:
+            entry = self._entries.get(self._key(output))
+        if entry is None:
+            return False
+        if entry.get("input") != input_digest or entry.get("options") != dict(options):
+            return False
+        if entry.get("tool") != __version__:
+            return False
+        try:
+            st = os.stat(output)
+        except OSError:
+            return False
+        return entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns
+
+    def record(self, output: str | Path, input_digest: str, options: Mapping[str, Any]) -> None:
+        """書き終えた output を記録する。入力は変換前に計ったハッシュを渡す（変換中に入力が変わっても次回作り直される）。"""
+        st = os.stat(output)
+        entry = {
+            "input": input_digest,
+            "options": dict(options),
+            "tool": __version__,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        with self._lock:
+            key = self._key(output)
+            self._entries[key] = entry
+            self._dirty[key] = entry
+
+    def save(self) -> None:
+        """記録した出力をマニフェストに書く。同じディレクトリへ別のプロセスが書いた分は読み直して残す。"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = self._read()
+            entries.update(self._dirty)
+            self._entries = entries
+            self._dirty = {}
+        blob = json.dumps({"version": MANIFEST_VERSION, "outputs": entries}, ensure_ascii=False, indent=1, sort_keys=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(blob)
+            os.chmod(tmp, new_file_mode())
+            os.replace(tmp, self.path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
@@ -1,15 +1,24 @@
 """YAML / mxGraph XML → PPTX 一連フローを実行する CLI。"""
 
 import argparse
+import os
 import sys
 from pathlib import Path
+from typing import Any, Optional
 
 from . import __version__
-from . import xml2pptx
+from . import batch
+from . import build_manifest
+from . import layout_cache
+from . import parse_cache
 from . import xml2drawio
-from . import yaml2pptx
 from . import yaml_loader
 
+# yaml2pptx.RENDERERS のキー。python-pptx の import は PPTX を書くサブコマンドだけで行う（layout を速く起動するため）
+RENDERER_NAMES = ("default", "fast")
+# svg_render.PREVIEW_FORMATS と同じ
+PREVIEW_FORMATS = ("svg", "html")
+
 
 def _report_pptx_shapes(n: int, output_path: str) -> None:
     """PPTX に書き込んだ図形数を表示し、0 件のときは警告する。"""
@@ -19,6 +28,61 @@ def _report_pptx_shapes(n: int, output_path: str) -> None:
         print(f"Shapes: {n}", file=sys.stderr)
 
 
+def _report_saved(output_path: str) -> None:
+    """保存先を表示する（標準出力に書いた場合は出力を汚さないよう表示しない）。"""
+    if output_path != "-":
+        print(f"Saved: {output_path}")
+
+
+def _add_force_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="出力が最新でも変換し直す（既定では入力の内容と設定が前回と同じで出力が残っていれば変換しない）",
+    )
+
+
+# (出力先のマニフェスト, 入力のハッシュ)。変換後に出力を記録する
+Incremental = Optional[tuple[build_manifest.BuildManifest, str]]
+
+
+def _manifest_for(args: argparse.Namespace, options: dict[str, Any]) -> Incremental:
+    """
+    from-yaml / to-pptx の出力先のマニフェストと入力のハッシュ。--force・標準入出力・読めない入力では None。
+    出力が最新なら表示して終了する。
+    """
+    if args.force or args.input == "-" or args.output == "-":
+        return None
+    digest = build_manifest.input_digest_or_none(args.input)
+    if digest is None:
+        return None
+    manifest = build_manifest.BuildManifest.for_output(args.output)
+    if manifest.is_up_to_date(args.output, digest, options):
+        print(f"Up to date: {args.output}")
+        sys.exit(0)
+    return manifest, digest
+
+
+def _record_output(incremental: Incremental, output_path: str, options: dict[str, Any]) -> None:
+    if incremental is not None:
+        manifest, digest = incremental
+        manifest.record(output_path, digest, options)
+        manifest.save()
+
+
+def _add_cache_dir_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get(parse_cache.CACHE_DIR_ENV),
+        metavar="DIR",
+        help=(
+            "YAML 解析結果・レイアウト・スライドの XML のキャッシュ先（内容が同じ YAML は再解析せず、ラベルだけの修正なら"
+            "レイアウトも再計算せず、描画入力が変わったスライドだけを組み立て直す。"
+            f"既定: 環境変数 {parse_cache.CACHE_DIR_ENV}）"
+        ),
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="業務プロセスを YAML または mxGraph XML から編集可能な PPTX に変換する。XML は .drawio にも変換可能。",
@@ -28,8 +92,73 @@ def main() -> None:
 
     # yaml → pptx
     p_yaml = sub.add_parser("from-yaml", help="YAML から PPTX を生成（業務プロセス図）")
-    p_yaml.add_argument("input", help="入力 YAML ファイル")
-    p_yaml.add_argument("-o", "--output", required=True, help="出力 .pptx ファイル")
+    p_yaml.add_argument("input", help="入力 YAML ファイル（または - で標準入力）")
+    p_yaml.add_argument(
+        "-o", "--output", required=True, help="出力ファイル（.pptx / --format に応じて .svg / .html / .drawio。- で標準出力）"
+    )
+    p_yaml.add_argument(
+        "--format",
+        choices=("pptx",) + PREVIEW_FORMATS + ("drawio",),
+        default="pptx",
+        help=(
+            "出力形式（pptx、プレビュー用の svg: 全スライドを縦に並べた 1 枚 / html: 1 ページ 1 スライド、"
+            "drawio: スライドごとに 1 ページの編集可能な .drawio）"
+        ),
+    )
+    p_yaml.add_argument(
+        "--renderer",
+        choices=RENDERER_NAMES,
+        default=None,
+        help=(
+            "描画方式（default: python-pptx の図形 API、fast: XML テンプレートから直接構築。出力は同じ。"
+            "省略時は default、-j 2 以上・--stream・スライドのキャッシュでは fast。"
+            "default を明示すると --stream・スライドのキャッシュは使わず、-j 2 以上とは組み合わせられない）"
+        ),
+    )
+    p_yaml.add_argument(
+        "--chrome",
+        choices=["layout", "slide"],
+        default="layout",
+        help="レーン（アクター名・区切り線）の描き先（layout: 専用スライドレイアウトに 1 回だけ、slide: スライドごと）",
+    )
+    p_yaml.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="PPTX のスライドの描画を並列に行うプロセス数（0 で CPU 数。既定 1 は逐次。スライドが多いときに速い）",
+    )
+    p_yaml.add_argument(
+        "--stream",
+        action="store_true",
+        help="PPTX のスライドを描いたそばから書き出す（スライド数によらずメモリが一定。-o - のときは常に有効）",
+    )
+    _add_force_argument(p_yaml)
+    _add_cache_dir_argument(p_yaml)
+    p_yaml.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="キャッシュ（解析・レイアウト・スライド）のヒット数などを標準エラーに表示する（--cache-dir と併用）",
+    )
+
+    # yaml → 既存の pptx を差分で更新
+    p_update = sub.add_parser(
+        "update",
+        help="from-yaml で作った PPTX を YAML の変更分だけ更新（ユーザーが足したタイトル・ノートは残す）",
+    )
+    p_update.add_argument("input", help="入力 YAML ファイル（または - で標準入力）")
+    p_update.add_argument("pptx", help="更新する .pptx ファイル（from-yaml で生成したもの）")
+    p_update.add_argument(
+        "-o", "--output", default=None, help="更新結果の保存先（省略時は pptx を置き換える）"
+    )
+    _add_cache_dir_argument(p_update)
+
+    # yaml → レイアウト JSON
+    p_layout = sub.add_parser("layout", help="YAML のレイアウト（位置・スライド・レーン・接続）を JSON で出力（PPTX は作らない）")
+    p_layout.add_argument("input", help="入力 YAML ファイル（または - で標準入力）")
+    p_layout.add_argument("-o", "--output", default="-", help="出力 .json ファイル（省略時または - で標準出力）")
+    p_layout.add_argument("--indent", type=int, default=None, help="JSON のインデント幅（省略時は 1 行）")
+    _add_cache_dir_argument(p_layout)
 
     # xml → .drawio
     p_drawio = sub.add_parser("to-drawio", help="mxGraph XML を .drawio ファイルに変換")
@@ -40,6 +169,7 @@ def main() -> None:
     p_pptx = sub.add_parser("to-pptx", help=".drawio / mxGraph XML から PPTX を生成")
     p_pptx.add_argument("input", help="入力 .drawio または mxGraph XML ファイル")
     p_pptx.add_argument("-o", "--output", required=True, help="出力 .pptx ファイル")
+    _add_force_argument(p_pptx)
 
     # 一連フロー: xml → .drawio → pptx
     p_pipeline = sub.add_parser(
@@ -55,21 +185,175 @@ def main() -> None:
         help="中間 .drawio を保存するパス（省略時は保存しない）",
     )
 
+    # まとめて変換: ディレクトリ / glob → 出力ディレクトリ
+    p_batch = sub.add_parser(
+        "batch",
+        help="ディレクトリ / glob の YAML・.drawio・XML を 1 プロセスでまとめて PPTX に変換",
+    )
+    p_batch.add_argument(
+        "inputs",
+        nargs="+",
+        help="入力ディレクトリ（直下の .yaml/.yml/.drawio/.xml）、glob（引用符で囲む）またはファイル",
+    )
+    p_batch.add_argument("-o", "--output-dir", required=True, help="出力ディレクトリ（<入力名>.pptx を保存）")
+    p_batch.add_argument(
+        "-j", "--workers", type=int, default=None, help="変換ワーカー数（省略時は CPU 数、1 で単一プロセス）"
+    )
+    p_batch.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="変換中＋保存待ちのファイル数の上限（省略時はワーカー数の 2 倍）",
+    )
+    p_batch.add_argument(
+        "--renderer",
+        choices=RENDERER_NAMES,
+        default=None,
+        help="YAML の描画方式（from-yaml と同じ。default を明示するとスライドのキャッシュは使わない）",
+    )
+    p_batch.add_argument(
+        "--chrome",
+        choices=["layout", "slide"],
+        default="layout",
+        help="YAML のレーンの描き先（from-yaml と同じ）",
+    )
+    _add_force_argument(p_batch)
+    _add_cache_dir_argument(p_batch)
+
+    # 監視: 入力ディレクトリの変更を待ち、変わったファイルだけを同じプロセスで変換し直す
+    p_watch = sub.add_parser(
+        "watch",
+        help="入力ディレクトリを監視し、変わった YAML・.drawio・XML だけを温めたプロセスで PPTX に変換し直す",
+    )
+    p_watch.add_argument(
+        "inputs",
+        nargs="+",
+        help="監視する入力ディレクトリ（直下の .yaml/.yml/.drawio/.xml）またはファイル",
+    )
+    p_watch.add_argument("-o", "--output-dir", required=True, help="出力ディレクトリ（<入力名>.pptx を保存）")
+    p_watch.add_argument(
+        "--renderer",
+        choices=RENDERER_NAMES,
+        default=None,
+        help="YAML の描画方式（from-yaml と同じ。default を明示するとスライドのキャッシュは使わない）",
+    )
+    p_watch.add_argument(
+        "--chrome",
+        choices=["layout", "slide"],
+        default="layout",
+        help="YAML のレーンの描き先（from-yaml と同じ）",
+    )
+    p_watch.add_argument(
+        "--debounce",
+        type=float,
+        default=0.1,
+        metavar="SECONDS",
+        help="最後の変更から変換するまで待つ秒数（保存途中の書き込みを 1 回にまとめる。既定: 0.1）",
+    )
+    p_watch.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        metavar="SECONDS",
+        help="inotify が使えないときにディレクトリを走査する間隔（既定: 0.2）",
+    )
+    p_watch.add_argument("--poll", action="store_true", help="inotify を使わず、常にディレクトリを走査する")
+    _add_force_argument(p_watch)
+    _add_cache_dir_argument(p_watch)
+
     args = parser.parse_args()
 
     if args.command == "from-yaml":
+        # python-pptx の図形 API（default）は並列・ストリーム書き出しできない。明示されたら fast に置き換えずに断る
+        workers = (os.cpu_count() or 1) if args.workers == 0 else args.workers
+        if args.renderer == "default" and workers > 1:
+            parser.error("--renderer default cannot be combined with -j/--workers > 1 (use --renderer fast)")
+        if args.renderer == "default" and args.stream:
+            parser.error("--renderer default cannot be combined with --stream (use --renderer fast)")
+        options = build_manifest.yaml_options(args.format, args.chrome == "layout")
+        incremental = _manifest_for(args, options)
+        cache = parse_cache.ParseCache(args.cache_dir) if args.cache_dir else None
+        layouts = layout_cache.LayoutCache(args.cache_dir) if args.cache_dir else None
+        source = sys.stdin.buffer if args.input == "-" else args.input
+        # 1 回だけ読み込み、孤立ノードの検査と描画で共有する
+        model = yaml_loader.ProcessModel.load(source, cache=cache, layout_cache=layouts)
         # DoD: 人のタスクの接続 — 孤立したフローノードがあれば警告
-        actors, nodes, _ = yaml_loader.load_process_yaml(args.input)
-        isolated = yaml_loader.find_isolated_flow_nodes(nodes)
+        isolated = model.find_isolated_flow_nodes()
         if isolated:
             print(
                 "Warning: isolated flow node(s) (no incoming/outgoing edges): "
                 + ", ".join(str(i) for i in isolated),
                 file=sys.stderr,
             )
-        n = yaml2pptx.yaml_to_pptx(args.input, args.output)
-        print(f"Saved: {args.output}")
-        _report_pptx_shapes(n, args.output)
+        to_stdout = args.output == "-"
+        slides = None
+        if args.format in PREVIEW_FORMATS:
+            from . import svg_render
+
+            layout = svg_render.yaml_to_preview(model, sys.stdout if to_stdout else args.output, fmt=args.format)
+            _record_output(incremental, args.output, options)
+            _report_saved(args.output)
+            print(f"Slides: {layout.num_slides}", file=sys.stderr)
+        elif args.format == "drawio":
+            from . import yaml2drawio
+
+            layout = yaml2drawio.yaml_to_drawio(model, sys.stdout if to_stdout else args.output)
+            _record_output(incremental, args.output, options)
+            _report_saved(args.output)
+            print(f"Pages: {layout.num_slides}", file=sys.stderr)
+        else:
+            from . import yaml2pptx
+            from .slide_cache import SlideCache
+
+            # default を明示したときはスライドのキャッシュ（fast のテンプレート）を使わない
+            python_pptx = args.renderer == "default"
+            slides = SlideCache(args.cache_dir) if args.cache_dir and not python_pptx else None
+            n = yaml2pptx.yaml_to_pptx(
+                model,
+                sys.stdout.buffer if to_stdout else args.output,
+                renderer=args.renderer,
+                bake_chrome=args.chrome == "layout",
+                workers=args.workers,
+                stream=args.stream or (to_stdout and not python_pptx),
+                slide_cache=slides,
+            )
+            _record_output(incremental, args.output, options)
+            _report_saved(args.output)
+            _report_pptx_shapes(n, args.output)
+        if args.cache_stats and cache is not None and layouts is not None:
+            print(f"Parse cache: {cache.hits} hit(s), {cache.misses} miss(es)", file=sys.stderr)
+            print(f"Layout cache: {layouts.hits} hit(s), {layouts.misses} miss(es)", file=sys.stderr)
+            if slides is not None:
+                print(slides.stats().format(), file=sys.stderr)
+
+    elif args.command == "update":
+        from . import pptx_update
+
+        cache = parse_cache.ParseCache(args.cache_dir) if args.cache_dir else None
+        layouts = layout_cache.LayoutCache(args.cache_dir) if args.cache_dir else None
+        source = sys.stdin.buffer if args.input == "-" else args.input
+        try:
+            result = pptx_update.update_pptx(
+                source, args.pptx, args.output, parse_cache=cache, layout_cache=layouts
+            )
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Updated: {args.output or args.pptx}")
+        print(result.format(), file=sys.stderr)
+
+    elif args.command == "layout":
+        from . import layout_json
+
+        cache = parse_cache.ParseCache(args.cache_dir) if args.cache_dir else None
+        layouts = layout_cache.LayoutCache(args.cache_dir) if args.cache_dir else None
+        source = sys.stdin.buffer if args.input == "-" else args.input
+        output = sys.stdout if args.output == "-" else args.output
+        layout = layout_json.yaml_to_layout_json(
+            source, output, parse_cache=cache, layout_cache=layouts, indent=args.indent
+        )
+        _report_saved(args.output)
+        print(f"Nodes: {len(layout.nodes)}, slides: {layout.num_slides}", file=sys.stderr)
 
     elif args.command == "to-drawio":
         if args.input == "-":
@@ -80,13 +364,19 @@ def main() -> None:
         print(f"Saved: {args.output}")
 
     elif args.command == "to-pptx":
+        from . import xml2pptx
+
+        incremental = _manifest_for(args, build_manifest.XML_OPTIONS)
         path = Path(args.input)
         xml_content = path.read_text(encoding="utf-8")
         n = xml2pptx.xml_to_pptx(xml_content, args.output)
+        _record_output(incremental, args.output, build_manifest.XML_OPTIONS)
         print(f"Saved: {args.output}")
         _report_pptx_shapes(n, args.output)
 
     elif args.command == "pipeline":
+        from . import xml2pptx
+
         xml_content = Path(args.input).read_text(encoding="utf-8")
         if args.drawio:
             xml2drawio.save_drawio(xml_content, args.drawio)
@@ -95,6 +385,57 @@ def main() -> None:
         print(f"Saved pptx: {args.output}")
         _report_pptx_shapes(n, args.output)
 
+    elif args.command == "batch":
+        inputs = batch.collect_inputs(args.inputs)
+        if not inputs:
+            print("No input files found: " + " ".join(args.inputs), file=sys.stderr)
+            sys.exit(1)
+        results = batch.run_batch(
+            inputs,
+            args.output_dir,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            renderer=args.renderer,
+            bake_chrome=args.chrome == "layout",
+            cache_dir=args.cache_dir,
+            on_result=lambda r: print(batch.format_result(r), flush=True),
+            incremental=not args.force,
+        )
+        failed = [r for r in results if r.error is not None]
+        skipped = sum(r.skipped for r in results)
+        print(
+            f"Converted {len(results) - len(failed) - skipped}/{len(results)} file(s) to {args.output_dir}"
+            + (f" ({skipped} up to date)" if skipped else "")
+        )
+        if failed:
+            sys.exit(1)
+
+    elif args.command == "watch":
+        from . import watch
+
+        try:
+            watcher = watch.Watcher(
+                args.inputs,
+                args.output_dir,
+                renderer=args.renderer,
+                bake_chrome=args.chrome == "layout",
+                cache_dir=args.cache_dir,
+                debounce=args.debounce,
+                interval=args.interval,
+                polling=args.poll,
+                on_result=lambda r: print(watch.format_result(r), flush=True),
+            )
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        with watcher:
+            watcher.build_all(force=args.force)
+            print(f"Watching {' '.join(args.inputs)} ({watcher.source.name}). Press Ctrl-C to stop.", flush=True)
+            try:
+                watcher.run()
+            except KeyboardInterrupt:
+                pass
+
 
 if __name__ == "__main__":
     main()
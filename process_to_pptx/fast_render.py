@@ -0,0 +1,398 @@
+"""ProcessLayout を python-pptx の図形プロキシを介さず、spTree の XML として直接描画する高速レンダラ。
+
+図形種別ごとの XML テンプレートを import 時に 1 回だけ組み立て、スライドごとに全図形の XML を連結して
+1 回の parse で spTree に一括挿入する。出力は yaml2pptx の既定レンダラ（python-pptx の API 経由）と
+同じ XML になる（tests/test_fast_render.py で突き合わせている）。
+"""
+
+from __future__ import annotations
+
+import re
+from xml.sax.saxutils import escape
+
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.shapes.autoshape import AutoShapeType
+
+from .render_plan import ACTOR_BOX_GAP_EMU, SlidePlan, node_shape_rect, return_route, site_point
+from .shape_tags import actor_tag, disk_tag, edge_tag, lane_tag, node_tag
+from .yaml_loader import ProcessLayout
+
+# python-pptx が新規オートシェイプ・コネクタに付ける p:style
+_SP_STYLE = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+)
+_CXN_STYLE = (
+    '<p:style><a:lnRef idx="2"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="0"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="1"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="tx1"/></a:fontRef></p:style>'
+)
+_SOLID_BLACK = '<a:solidFill><a:srgbClr val="000000"/></a:solidFill>'
+_SOLID_DARK = '<a:solidFill><a:srgbClr val="373737"/></a:solidFill>'
+_TAIL_ARROW = '<a:tailEnd type="triangle" w="med" len="med"/>'
+_HEAD_OVAL = '<a:headEnd type="oval" w="med" len="med"/>'
+_DOT = '<a:prstDash val="dot"/>'
+
+
+def _autoshape_template(shape_type: MSO_SHAPE, sp_pr_tail: str, body_pr: str, def_rpr_attrs: str) -> str:
+    """オートシェイプ 1 個分の XML テンプレート。{id} {name} {x} {y} {cx} {cy} {sz} {runs} を埋める。"""
+    ast = AutoShapeType(shape_type)
+    return (
+        '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+        '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+        '<a:prstGeom prst="' + ast.prst + '"><a:avLst/></a:prstGeom>' + sp_pr_tail + "</p:spPr>"
+        + _SP_STYLE
+        + "<p:txBody>" + body_pr + '<a:lstStyle/><a:p><a:pPr algn="ctr"><a:defRPr sz="{sz}"' + def_rpr_attrs + ">"
+        + _SOLID_BLACK + "</a:defRPr></a:pPr>{runs}</a:p></p:txBody></p:sp>"
+    )
+
+
+# ノード図形: 薄いグレー塗り・濃いグレー枠・影なし・余白 0・折り返しなし
+_NODE_SP_PR = (
+    '<a:solidFill><a:srgbClr val="E8E8E8"/></a:solidFill><a:ln>' + _SOLID_DARK + "</a:ln><a:effectLst/>"
+)
+_NODE_BODY_PR = '<a:bodyPr rtlCol="0" anchor="ctr" wrap="none" lIns="0" tIns="0" rIns="0" bIns="0"/>'
+_NODE_TEMPLATES: dict[str, str] = {
+    node_type: _autoshape_template(shape_type, _NODE_SP_PR, _NODE_BODY_PR, ' b="0"')
+    for node_type, shape_type in (
+        ("gateway", MSO_SHAPE.DIAMOND),
+        ("start", MSO_SHAPE.OVAL),
+        ("end", MSO_SHAPE.OVAL),
+        ("artifact", MSO_SHAPE.FLOWCHART_DATA),
+        ("service", MSO_SHAPE.FLOWCHART_MAGNETIC_DISK),
+        ("task", MSO_SHAPE.ROUNDED_RECTANGLE),
+    )
+}
+
+# アクター名: 塗りなし・黒枠・影なし・上下中央・太字
+_ACTOR_TEMPLATE = _autoshape_template(
+    MSO_SHAPE.RECTANGLE,
+    "<a:noFill/><a:ln>" + _SOLID_BLACK + "</a:ln><a:effectLst/>",
+    '<a:bodyPr rtlCol="0" anchor="ctr" wrap="square"/>',
+    ' b="1"',
+)
+
+# 矢印ラベルのテキストボックス
+_LABEL_TEMPLATE = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/><a:effectLst/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="none"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+    '<a:p><a:pPr algn="ctr"><a:defRPr sz="{sz}">' + _SOLID_BLACK + "</a:defRPr></a:pPr>{runs}</a:p></p:txBody></p:sp>"
+)
+
+# コネクタ: {cxn} は stCxn / endCxn、{geom} は a:prstGeom か a:custGeom、{ln} は a:ln の中身
+_CONNECTOR_TEMPLATE = (
+    '<p:cxnSp><p:nvCxnSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvCxnSpPr{cxn}<p:nvPr/></p:nvCxnSpPr>'
+    '<p:spPr><a:xfrm{flip}><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '{geom}<a:ln w="{w}">{ln}</a:ln><a:effectLst/></p:spPr>'
+    + _CXN_STYLE
+    + "</p:cxnSp>"
+)
+# 線の中身（python-pptx 経由の既定レンダラと同じ要素順）
+_FLOW_LN = _SOLID_DARK + _TAIL_ARROW
+_SYSTEM_LN = _HEAD_OVAL + _TAIL_ARROW + _SOLID_DARK + _DOT
+_SEPARATOR_LN = '<a:solidFill><a:srgbClr val="808080"/></a:solidFill>' + _DOT
+
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+def _attr(value: str) -> str:
+    """属性値（図形名）のエスケープ。"""
+    return escape(value, {'"': "&quot;"})
+
+
+def _runs_xml(text: str) -> str:
+    """段落テキストを a:r / a:br に変換する（python-pptx の _Paragraph.text と同じ規則）。"""
+    out = []
+    for idx, r_str in enumerate(re.split("\n|\v", text)):
+        if idx > 0:
+            out.append("<a:br/>")
+        if r_str:
+            r_str = _CTRL_CHARS.sub(lambda m: "_x%04X_" % ord(m.group(1)), r_str)
+            out.append("<a:r><a:t>" + escape(r_str) + "</a:t></a:r>")
+    return "".join(out)
+
+
+def _move_begin(pos: int, ext: int, flip: bool, new: int) -> tuple[int, int, bool]:
+    """python-pptx の Connector.begin_x / begin_y の setter と同じ計算（1 軸分）。"""
+    if flip:
+        old = pos + ext
+        d = abs(new - old)
+        if new >= old:
+            return pos, ext + d, flip
+        if d <= ext:
+            return pos, ext - d, flip
+        return new, d - ext, False
+    d = abs(new - pos)
+    if new <= pos:
+        return new, ext + d, flip
+    if d <= ext:
+        return new, ext - d, flip
+    return pos + ext, d - ext, True
+
+
+def _move_end(pos: int, ext: int, flip: bool, new: int) -> tuple[int, int, bool]:
+    """python-pptx の Connector.end_x / end_y の setter と同じ計算（1 軸分）。"""
+    if flip:
+        d = abs(new - pos)
+        if new <= pos:
+            return new, ext + d, flip
+        if d <= ext:
+            return new, ext - d, flip
+        return pos + ext, d - ext, False
+    old = pos + ext
+    d = abs(new - old)
+    if new >= old:
+        return pos, ext + d, flip
+    if d <= ext:
+        return pos, ext - d, flip
+    return new, d - ext, True
+
+
+def _connected_xfrm(begin: tuple[int, int], end: tuple[int, int]) -> tuple[int, int, int, int, bool, bool]:
+    """(0,0) で作ったコネクタの始点・終点を接続点へ移動したときの (x, y, cx, cy, flipH, flipV)。"""
+    x, cx, flip_h = _move_begin(0, 0, False, begin[0])
+    y, cy, flip_v = _move_begin(0, 0, False, begin[1])
+    x, cx, flip_h = _move_end(x, cx, flip_h, end[0])
+    y, cy, flip_v = _move_end(y, cy, flip_v, end[1])
+    return x, y, cx, cy, flip_h, flip_v
+
+
+def _direct_xfrm(begin: tuple[int, int], end: tuple[int, int]) -> tuple[int, int, int, int, bool, bool]:
+    """始点・終点を指定して作ったコネクタの (x, y, cx, cy, flipH, flipV)。"""
+    (bx, by), (ex, ey) = begin, end
+    return min(bx, ex), min(by, ey), abs(ex - bx), abs(ey - by), bx > ex, by > ey
+
+
+def route_xfrm(points: list[tuple[int, int]]) -> tuple[int, int, int, int, bool, bool]:
+    """折れ線 points を囲む (x, y, cx, cy, flipH, flipV)。パスは枠内の座標で書くため反転しない。"""
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys), False, False
+
+
+def route_geom_xml(points: list[tuple[int, int]], xmlns: str = "") -> str:
+    """
+    折れ線 points（始点→終点）を描く a:custGeom。戻り矢印の U 字のように、プリセットのコネクタ（調整値が
+    両端の間隔に比例する）では両端が同じ高さのとき表せない経路に使う。xmlns は単独で parse するときの名前空間宣言。
+    """
+    x, y, cx, cy, _, _ = route_xfrm(points)
+    (x0, y0), *rest = points
+    path = '<a:moveTo><a:pt x="%d" y="%d"/></a:moveTo>' % (x0 - x, y0 - y)
+    path += "".join('<a:lnTo><a:pt x="%d" y="%d"/></a:lnTo>' % (px - x, py - y) for px, py in rest)
+    path_lst = '<a:pathLst><a:path w="%d" h="%d" fill="none">%s</a:path></a:pathLst>' % (cx, cy, path)
+    return (
+        "<a:custGeom" + xmlns + '><a:avLst/><a:gdLst/><a:ahLst/><a:cxnLst/><a:rect l="l" t="t" r="r" b="b"/>'
+        + path_lst
+        + "</a:custGeom>"
+    )
+
+
+def _connector_xml(
+    shape_id: int,
+    name: str,
+    prst: str,
+    width: int,
+    ln: str,
+    xfrm: tuple[int, int, int, int, bool, bool],
+    begin_cxn: tuple[int, int] | None = None,
+    end_cxn: tuple[int, int] | None = None,
+    geom: str | None = None,
+) -> str:
+    """
+    コネクタ 1 本分の XML。name は図形名（shape_tags）、begin_cxn / end_cxn は接続先の (図形 ID, 接続点)。
+    geom を渡すと prst の代わりにその図形定義（route_geom_xml）を使う。
+    """
+    x, y, cx, cy, flip_h, flip_v = xfrm
+    if begin_cxn or end_cxn:
+        cxn = ">"
+        if begin_cxn:
+            cxn += '<a:stCxn id="%d" idx="%d"/>' % begin_cxn
+        if end_cxn:
+            cxn += '<a:endCxn id="%d" idx="%d"/>' % end_cxn
+        cxn += "</p:cNvCxnSpPr>"
+    else:
+        cxn = "/>"
+    flip = (' flipH="1"' if flip_h else "") + (' flipV="1"' if flip_v else "")
+    return _CONNECTOR_TEMPLATE.format(
+        id=shape_id,
+        name=_attr(name),
+        cxn=cxn,
+        flip=flip,
+        x=x,
+        y=y,
+        cx=cx,
+        cy=cy,
+        geom=geom if geom is not None else '<a:prstGeom prst="%s"><a:avLst/></a:prstGeom>' % prst,
+        w=width,
+        ln=ln,
+    )
+
+
+def _node_shape_xml(
+    shape_id: int, name: str, layout: ProcessLayout, node_type: str, text: str, rect: tuple[int, int, int, int]
+) -> str:
+    x, y, cx, cy = rect
+    template = _NODE_TEMPLATES.get(node_type, _NODE_TEMPLATES["task"])
+    return template.format(
+        id=shape_id, name=_attr(name), x=x, y=y, cx=cx, cy=cy, sz=layout.task_font_pt * 100, runs=_runs_xml(text)
+    )
+
+
+def _label_xml(shape_id: int, name: str, layout: ProcessLayout, text: str, rect: tuple[int, int, int, int]) -> str:
+    x, y, cx, cy = rect
+    return _LABEL_TEMPLATE.format(
+        id=shape_id, name=_attr(name), x=x, y=y, cx=cx, cy=cy, sz=layout.label_font_pt * 100, runs=_runs_xml(text)
+    )
+
+
+def chrome_shapes_xml(layout: ProcessLayout, first_id: int) -> tuple[list[str], int]:
+    """アクター名の四角とレーン区切りの点線の XML。戻り値は (図形 XML のリスト, 次の図形 ID)。"""
+    shapes: list[str] = []
+    shape_id = first_id
+    for i, name in enumerate(layout.actors):
+        top = layout.content_top_offset + i * layout.lane_height + ACTOR_BOX_GAP_EMU
+        shapes.append(
+            _ACTOR_TEMPLATE.format(
+                id=shape_id,
+                name=_attr(actor_tag(i)),
+                x=layout.left_margin,
+                y=top,
+                cx=layout.left_label_width,
+                cy=layout.lane_height - 2 * ACTOR_BOX_GAP_EMU,
+                sz=layout.actor_font_pt * 100,
+                runs=_runs_xml(name),
+            )
+        )
+        shape_id += 1
+    x1 = layout.left_margin
+    x2 = int(layout.slide_width - layout.right_margin)
+    for i in range(1, len(layout.actors)):
+        y = layout.content_top_offset + i * layout.lane_height
+        shapes.append(
+            _connector_xml(shape_id, lane_tag(i), "line", 6350, _SEPARATOR_LN, _direct_xfrm((x1, y), (x2, y)))
+        )
+        shape_id += 1
+    return shapes, shape_id
+
+
+def slide_shapes_xml(layout: ProcessLayout, plan: SlidePlan, first_id: int) -> tuple[list[str], int]:
+    """1 スライド分のノード・磁気ディスク・矢印・ラベルの XML。戻り値は (図形 XML のリスト, 次の図形 ID)。"""
+    shapes: list[str] = []
+    shape_id = first_id
+    # ノード ID → (図形 ID, 図形矩形)。同じ ID が複数あれば後に描いたものへ接続する
+    drawn: dict[str | int, tuple[int, tuple[int, int, int, int]]] = {}
+
+    for node in plan.nodes:
+        rect = node_shape_rect(node.type, *layout.node_positions[node.id])
+        if node.type == "gateway":
+            text = "＋" if node.gateway_type == "parallel" else "✕"
+        else:
+            text = node.label
+        shapes.append(_node_shape_xml(shape_id, node_tag(node.id), layout, node.type, text, rect))
+        drawn[node.id] = (shape_id, rect)
+        shape_id += 1
+
+    for disk in plan.service_disks:
+        rect = node_shape_rect("service", disk.left, disk.top, disk.width, disk.height)
+        shapes.append(_node_shape_xml(shape_id, disk_tag(disk.node_id), layout, "service", disk.label, rect))
+        drawn[disk.node_id] = (shape_id, rect)
+        shape_id += 1
+
+    for edge in plan.edges:
+        from_id, from_rect = drawn[edge.from_node.id]
+        to_id, to_rect = drawn[edge.to_node.id]
+        begin, end = site_point(from_rect, edge.site_from), site_point(to_rect, edge.site_to)
+        if edge.route_y is None:
+            xfrm, geom = _connected_xfrm(begin, end), None
+        else:
+            points = return_route(begin, end, edge.route_y)
+            xfrm, geom = route_xfrm(points), route_geom_xml(points)
+        shapes.append(
+            _connector_xml(
+                shape_id,
+                edge_tag("flow", edge.from_node.id, edge.to_node.id),
+                "line" if edge.straight else "bentConnector3",
+                12700,
+                _FLOW_LN,
+                xfrm,
+                begin_cxn=(from_id, edge.site_from),
+                end_cxn=(to_id, edge.site_to),
+                geom=geom,
+            )
+        )
+        shape_id += 1
+        if edge.label:
+            tag = edge_tag("flow", edge.from_node.id, edge.to_node.id, label=True)
+            shapes.append(_label_xml(shape_id, tag, layout, edge.label, edge.label_rect))
+            shape_id += 1
+
+    for edge in plan.system_edges:
+        from_id, from_rect = drawn[edge.from_node.id]
+        to_id, to_rect = drawn[edge.to_node.id]
+        shapes.append(
+            _connector_xml(
+                shape_id,
+                edge_tag(edge.role, edge.from_node.id, edge.to_node.id),
+                "bentConnector3",
+                12700,
+                _SYSTEM_LN,
+                _connected_xfrm(site_point(from_rect, edge.site_from), site_point(to_rect, edge.site_to)),
+                begin_cxn=(from_id, edge.site_from),
+                end_cxn=(to_id, edge.site_to),
+            )
+        )
+        shape_id += 1
+        if edge.label:
+            tag = edge_tag(edge.role, edge.from_node.id, edge.to_node.id, label=True)
+            shapes.append(_label_xml(shape_id, tag, layout, edge.label, edge.label_rect))
+            shape_id += 1
+
+    return shapes, shape_id
+
+
+def slide_fragment(layout: ProcessLayout, plan: SlidePlan, first_id: int, chrome: bool = True) -> tuple[str, int]:
+    """1 スライド分の図形 XML を連結した spTree の断片と図形数。first_id はそのスライドで最初に使う図形 ID。
+    python-pptx のオブジェクトに触れないため、別プロセスでも組み立てられる（parallel_render）。"""
+    lanes: list[str] = []
+    if chrome:
+        lanes, first_id = chrome_shapes_xml(layout, first_id)
+    shapes, _ = slide_shapes_xml(layout, plan, first_id)
+    return "".join(lanes) + "".join(shapes), len(lanes) + len(shapes)
+
+
+def insert_fragment(slide, fragment: str) -> None:
+    """図形 XML を連結した断片を 1 回 parse し、スライドの spTree に一括挿入する。"""
+    insert_fragment_into(slide.shapes._spTree, fragment)
+
+
+def insert_fragment_into(sp_tree, fragment: str) -> None:
+    """insert_fragment の spTree 要素版（Slide オブジェクトを作らずに組み立てる場合。pptx_stream）。"""
+    if not fragment:
+        return
+    parsed = parse_xml("<p:spTree %s>%s</p:spTree>" % (nsdecls("a", "p"), fragment))
+    ext_lst = sp_tree.find(qn("p:extLst"))
+    if ext_lst is None:
+        sp_tree.extend(list(parsed))
+    else:
+        for elm in list(parsed):
+            ext_lst.addprevious(elm)
+
+
+def insert_shapes(slide, shapes: list[str]) -> None:
+    """図形 XML のリストをまとめて 1 回 parse し、スライドの spTree に一括挿入する。"""
+    insert_fragment(slide, "".join(shapes))
+
+
+def render_slide(slide, layout: ProcessLayout, plan: SlidePlan, chrome: bool = True) -> int:
+    """1 スライド分（レーン・ノード・矢印）を描画し、追加した図形数を返す。
+    chrome=False のときレーン（アクター名・区切り線）は描かない（スライドレイアウト側に焼き込む場合）。"""
+    fragment, count = slide_fragment(layout, plan, slide.shapes._spTree.max_shape_id + 1, chrome)
+    insert_fragment(slide, fragment)
+    return count
@@ -0,0 +1,179 @@
+"""compute_layout の結果を、グラフの構造とレイアウト設定をキーに再利用するキャッシュ。
+
+2 段で持つ。
+- 構造: actors・ノードの id / type / actor・接続（next / request_to / response_from）とサービスの label の
+  ハッシュ → レーンの集約と列の割り当て（LayoutStructure）
+- 配置: 構造のハッシュ＋YAML の layout・margins・列数・スライド寸法 → スライド・列・図形の矩形と寸法
+ラベル（サービス以外）・矢印ラベル・分岐の種類は列にも位置にも効かないためキーに含めない。ラベルだけの修正なら
+どちらの段もヒットし、列の割り当て・ページ分け・位置計算を丸ごと省ける。
+
+メモリ上の LRU（プロセス内で使い回す場合）と、directory を指定した場合のディスク（parse_cache.DiskStore。
+CLI の --cache-dir と同じディレクトリを共有）の両方に置く。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .parse_cache import DEFAULT_MAX_BYTES, DiskStore
+from .placement import Placement
+from .yaml_loader import LayoutStructure, ProcessNode
+
+# キーに含まれる。列の割り当て・配置の計算方法や保存形式を変えたら上げる
+LAYOUT_CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 64
+
+# 配置の段の値: (ProcessLayout の寸法 yaml_loader.LAYOUT_GEOMETRY_FIELDS の値, Placement)
+CachedPlacement = tuple[tuple[int, ...], Placement]
+
+
+class LayoutCache:
+    """構造 → 列の割り当て、構造＋設定 → 配置 の 2 段のキャッシュ（メモリ LRU ＋任意でディスク）。"""
+
+    def __init__(
+        self,
+        directory: Optional[str | Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.store = DiskStore(directory, max_bytes) if directory is not None else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def structure_key(self, actors: Sequence[str], nodes: Sequence[ProcessNode]) -> str:
+        """列の割り当てに効く部分だけのハッシュ。"""
+        digest = hashlib.sha256(b"structure:v%d:%d\0" % (LAYOUT_CACHE_VERSION, marshal.version))
+        digest.update(marshal.dumps(tuple(actors)))
+        for node in nodes:
+            row = (
+                node.id,
+                node.type,
+                node.actor_index,
+                tuple(node.next_ids),
+                tuple(node.request_to),
+                tuple(node.response_from),
+                # サービスはユニークな label 順に列を並べるため label も構造に含める
+                node.label if node.type == "service" else None,
+            )
+            digest.update(marshal.dumps(row))
+        return digest.hexdigest()
+
+    def placement_key(
+        self,
+        structure_key: str,
+        layout_config: Optional[dict[str, Any]],
+        margins: Optional[dict[str, Any]],
+        max_cols_per_slide: Optional[int],
+        slide_size: Optional[tuple[int, int]],
+    ) -> str:
+        """構造と、配置に効く設定（YAML の layout・margins・列数・スライド寸法）のハッシュ。"""
+        options = json.dumps(
+            [layout_config or {}, margins or {}, max_cols_per_slide, slide_size], sort_keys=True, default=repr
+        )
+        digest = hashlib.sha256(b"placement:v%d\0" % LAYOUT_CACHE_VERSION)
+        digest.update(structure_key.encode("ascii"))
+        digest.update(options.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_structure(self, key: str) -> Optional[LayoutStructure]:
+        """key の列の割り当て（無ければ None）。"""
+        return self._get(key, _decode_structure)
+
+    def put_structure(self, key: str, structure: LayoutStructure) -> None:
+        self._put(key, structure, _encode_structure)
+
+    def get_placement(self, key: str) -> Optional[CachedPlacement]:
+        """key の配置（無ければ None）。"""
+        return self._get(key, _decode_placement)
+
+    def put_placement(self, key: str, value: CachedPlacement) -> None:
+        self._put(key, value, _encode_placement)
+
+    def clear(self) -> None:
+        """メモリとディスクの全エントリを削除する（ディスクは同じディレクトリの解析キャッシュも消える）。"""
+        with self._lock:
+            self._memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def _get(self, key: str, decode) -> Any:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+        blob = self.store.read(key) if self.store is not None else None
+        if blob is not None:
+            try:
+                value = decode(marshal.loads(zlib.decompress(blob)))
+            except (ValueError, EOFError, TypeError, zlib.error):
+                self.store.discard(key)  # type: ignore[union-attr]
+                value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def _put(self, key: str, value: Any, encode) -> None:
+        with self._lock:
+            self._remember(key, value)
+        if self.store is not None:
+            self.store.write(key, zlib.compress(marshal.dumps(encode(value)), 1))
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+def _encode_structure(structure: LayoutStructure) -> tuple:
+    return (
+        list(structure.actors),
+        structure.lanes.tobytes(),
+        structure.columns.tobytes(),
+        sorted(structure.back_edges),
+        structure.key,
+    )
+
+
+def _decode_structure(row: tuple) -> LayoutStructure:
+    actors, lanes, columns, back_edges, key = row
+    return LayoutStructure(
+        actors=actors,
+        lanes=_int_array("i", lanes),
+        columns=_int_array("i", columns),
+        back_edges=frozenset(tuple(edge) for edge in back_edges),
+        key=key,
+    )
+
+
+def _encode_placement(value: CachedPlacement) -> tuple:
+    geometry, placement = value
+    return geometry, placement.slide_index, placement.col_in_slide, placement.rects.tobytes()
+
+
+def _decode_placement(row: tuple) -> CachedPlacement:
+    geometry, slide_index, col_in_slide, rects = row
+    return tuple(geometry), Placement(slide_index=slide_index, col_in_slide=col_in_slide, rects=_int_array("q", rects))
+
+
+def _int_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    return values
@@ -0,0 +1,96 @@
+"""ProcessLayout（計算済みの配置）を JSON に書き出す。スキーマは docs/layout-json.md。
+
+ジオメトリだけが要るツール（Web ビューア・監査スクリプト等）向け。python-pptx は import しない。
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from .layout_cache import LayoutCache
+from .parse_cache import ParseCache
+from .yaml_loader import ProcessLayout, ProcessModel, ProcessSource
+
+LAYOUT_JSON_SCHEMA = "process-to-pptx/layout"
+# 既存のキーの意味を変えたら上げる（キーの追加では上げない）
+LAYOUT_JSON_VERSION = 1
+
+
+def layout_to_dict(layout: ProcessLayout) -> dict[str, Any]:
+    """layout を JSON にできる dict にする（長さの単位は EMU）。"""
+    positions = layout.node_positions
+    nodes = []
+    for node in layout.nodes:
+        left, top, width, height = positions[node.id]
+        item = {
+            "id": node.id,
+            "type": node.type,
+            "label": node.label,
+            "lane": node.actor_index,
+            "column": node.column,
+            "slide": node.slide_index,
+            "column_in_slide": node.col_in_slide,
+            "x": left,
+            "y": top,
+            "width": width,
+            "height": height,
+        }
+        if node.type == "gateway":
+            item["gateway_type"] = node.gateway_type
+        nodes.append(item)
+    return {
+        "schema": LAYOUT_JSON_SCHEMA,
+        "version": LAYOUT_JSON_VERSION,
+        "unit": "emu",
+        "slide": {"width": layout.slide_width, "height": layout.slide_height, "count": layout.num_slides},
+        "geometry": {
+            "left_margin": layout.left_margin,
+            "right_margin": layout.right_margin,
+            "left_label_width": layout.left_label_width,
+            "content_top": layout.content_top_offset,
+            "bottom_margin": layout.bottom_margin,
+            "lane_height": layout.lane_height,
+            "task_side": layout.task_side,
+            "gap": layout.gap,
+        },
+        "fonts": {"task_pt": layout.task_font_pt, "actor_pt": layout.actor_font_pt, "label_pt": layout.label_font_pt},
+        "lanes": [
+            {"index": i, "name": name, "top": layout.content_top_offset + i * layout.lane_height, "height": layout.lane_height}
+            for i, name in enumerate(layout.actors)
+        ],
+        "nodes": nodes,
+        "edges": [
+            {"from": v, "to": w, "label": layout.edge_labels.get((v, w)), "back": (v, w) in layout.back_edges}
+            for v, w in layout.edges
+        ],
+        "system_edges": [
+            {"from": v, "to": w, "role": role, "label": layout.system_edge_labels.get((v, w, role))}
+            for v, w, role in layout.system_edges
+        ],
+    }
+
+
+def yaml_to_layout_json(
+    source: ProcessModel | ProcessSource,
+    output: str | Path | IO[str],
+    parse_cache: Optional[ParseCache] = None,
+    layout_cache: Optional[LayoutCache] = None,
+    indent: Optional[int] = None,
+) -> ProcessLayout:
+    """
+    YAML を読み、レイアウトを計算して JSON で書き出す。戻り値は計算した ProcessLayout。
+    source: yaml_to_pptx と同じ（パス・ProcessModel・YAML 文字列・bytes・ストリーム）。output: パスまたはテキストストリーム。
+    """
+    model = ProcessModel.load(source, cache=parse_cache, layout_cache=layout_cache)
+    layout = model.compute_layout()
+    data = layout_to_dict(layout)
+    if hasattr(output, "write"):
+        json.dump(data, output, ensure_ascii=False, indent=indent)
+        output.write("\n")
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.write("\n")
+    return layout
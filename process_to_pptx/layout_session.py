@@ -0,0 +1,575 @@
+"""エディタのライブプレビュー向けの増分レイアウト。
+
+LayoutSession は読み込み済みのモデルから 1 回だけ全体のレイアウトを計算し、その後はノードの追加・削除、
+接続の追加・削除、ラベルの変更を受け取って、影響する範囲だけを計算し直す。
+- 列: 戻り辺を除いた DAG 上の最長路を保ち、辺の追加では後続へ列の増加を、削除では減少を伝える。
+  追加した辺が閉路を作るかは、列が終点以下のノードだけをたどって調べる（列は辺の向きに必ず増えるため）。
+- 配置: 列が変わったノードと、ノードが出入りしたセル（スライド・レーン・列）の縦分割だけを計算し直す。
+- 格子（レーン高さ・タスクサイズ・1 スライドの列数）はレーン数と layout 設定だけで決まるため、セッション中は固定。
+各編集は ChangeSet（位置が変わったノード、描き直しが要るスライド）を返す。
+
+ループを閉じる辺（戻り辺）の判定は編集前のものを保つ（後から閉路が切れても戻り辺のまま）。rebuild() で
+読み込み時と同じ判定からやり直せる。ノード ID は一意であること。
+"""
+
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Iterator, Optional
+
+from .placement import Placement, cell_rects
+from .process_graph import ProcessGraph
+from .yaml_loader import (
+    LAYOUT_GEOMETRY_FIELDS,
+    LayoutStructure,
+    ProcessLayout,
+    ProcessModel,
+    ProcessNode,
+    _assemble_layout,
+    _collapse_system_lanes,
+    _layer_columns,
+    _layout_grid,
+    _parse_layout_options,
+)
+
+NodeId = str | int
+Rect = tuple[int, int, int, int]
+# add_edge / remove_edge の role。next=フロー、request=ノード→サービス、response=サービス→ノード
+EDGE_ROLES = ("next", "request", "response")
+# ノード順の番号の間隔（途中への挿入で間が詰まったら振り直す）
+_SEQ_STEP = 1 << 20
+
+
+@dataclass
+class ChangeSet:
+    """1 回の編集の結果。"""
+
+    added: list[NodeId] = field(default_factory=list)
+    removed: list[NodeId] = field(default_factory=list)
+    relabeled: list[NodeId] = field(default_factory=list)
+    # 列・スライド・矩形のいずれかが変わったノード（追加したノードを含む）→ (スライド, (left, top, width, height))
+    moved: dict[NodeId, tuple[int, Rect]] = field(default_factory=dict)
+    # 描き直しが要るスライド（変わったノード・辺の変更前と変更後のスライド）
+    slides: set[int] = field(default_factory=set)
+    num_slides: int = 1
+
+
+class LayoutSession:
+    """ノード・接続・ラベルの編集を受け取り、レイアウトを増分で更新する。"""
+
+    def __init__(
+        self,
+        model: ProcessModel,
+        max_cols_per_slide: Optional[int] = None,
+        slide_size: Optional[tuple[int, int]] = None,
+    ) -> None:
+        self.actors = model.actors
+        self.layout_config = model.layout_config
+        collapsed_actors, self._lane_of = _collapse_system_lanes(model.actors)
+        self._layout_opts = _parse_layout_options(model.layout_config)
+        # 寸法だけを決めた ProcessLayout（layout() の雛形）と格子
+        self._template = ProcessLayout(actors=collapsed_actors)
+        self.grid = _layout_grid(self._template, max_cols_per_slide, model.margins, self._layout_opts, slide_size)
+        self._begin()
+        self._load(model.nodes)
+
+    # --- 参照 ---
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._nodes
+
+    def __iter__(self) -> Iterator[NodeId]:
+        """ノード ID をノード順に返す。"""
+        return (self._by_seq[seq] for seq in self._seqs)
+
+    @property
+    def num_slides(self) -> int:
+        return self._max_slide + 1
+
+    def node(self, node_id: NodeId) -> ProcessNode:
+        return self._nodes[node_id]
+
+    def column(self, node_id: NodeId) -> int:
+        """通し列（layout.nodes の column と同じ）。"""
+        return self._display_column(node_id)
+
+    def position(self, node_id: NodeId) -> tuple[int, Rect]:
+        """(スライド, (left, top, width, height))。"""
+        return self._cell_of[node_id][0], self._rect[node_id]
+
+    def model(self) -> ProcessModel:
+        """現在のノードをノード順に並べたモデル。"""
+        return ProcessModel(actors=self.actors, nodes=self._ordered_nodes(), layout_config=self.layout_config)
+
+    def layout(self) -> ProcessLayout:
+        """現在の配置の ProcessLayout（描画用。ノード数に比例する時間がかかる）。"""
+        nodes = self._ordered_nodes()
+        graph = ProcessGraph(nodes)
+        ids = graph.ids
+        structure = LayoutStructure(
+            actors=self._template.actors,
+            lanes=array("i", (self._cell_of[i][1] for i in ids)),
+            columns=array("i", (self._display_column(i) for i in ids)),
+            back_edges=frozenset((v, w) for v, w in graph.flow_edges() if (ids[v], ids[w]) in self._back),
+        )
+        max_cols = self.grid.max_cols
+        rects = array("q")
+        for i in ids:
+            rects.extend(self._rect[i])
+        placement = Placement(
+            slide_index=[c // max_cols for c in structure.columns],
+            col_in_slide=[c % max_cols for c in structure.columns],
+            rects=rects,
+        )
+        layout = ProcessLayout(actors=self._template.actors, graph=graph)
+        for name in LAYOUT_GEOMETRY_FIELDS:
+            setattr(layout, name, getattr(self._template, name))
+        return _assemble_layout(layout, nodes, graph, structure, placement, self._layout_opts)
+
+    # --- 編集 ---
+
+    def insert_node(self, node: ProcessNode, index: Optional[int] = None) -> ChangeSet:
+        """node をノード順の index 番目（None なら末尾）に追加する。接続先が後から追加されたら、その時点で繋がる。"""
+        if node.id in self._nodes:
+            raise ValueError(f"duplicate node id: {node.id!r}")
+        changes = self._begin()
+        self._add_seq(node.id, index)
+        self._add_node(node)
+        changes.added.append(node.id)
+        self._link_owned(node)
+        # 先に書かれていた、このノードへの接続を繋ぐ
+        for owner in self._pending.pop(node.id, ()):
+            for v, w in _owned_edges(self._nodes[owner]):
+                if node.id in (v, w) and v in self._nodes and w in self._nodes:
+                    self._link(v, w)
+        return self._finish(changes)
+
+    def delete_node(self, node_id: NodeId) -> ChangeSet:
+        """ノードを削除する。他のノードからこのノードへの接続は記述に残り、同じ ID を追加し直すと繋がる。"""
+        node = self._nodes[node_id]
+        changes = self._begin()
+        self._touch(node_id)
+        changes.removed.append(node_id)
+        # 自分が記述した接続
+        for v, w in _owned_edges(node):
+            other = w if v == node_id else v
+            if other in self._nodes:
+                self._unlink(v, w)
+            else:
+                self._drop_pending(other, node_id)
+        # 他のノードが記述した接続（先方の記述には残す）
+        for p, count in list(self._pred[node_id].items()):
+            self._pending[node_id].add(p)
+            for _ in range(count):
+                self._unlink(p, node_id)
+        for w, count in list(self._succ[node_id].items()):
+            self._pending[node_id].add(w)
+            for _ in range(count):
+                self._unlink(node_id, w)
+        self._remove_node(node_id)
+        return self._finish(changes)
+
+    def add_edge(
+        self, from_id: NodeId, to_id: NodeId, label: Optional[str] = None, role: str = "next"
+    ) -> ChangeSet:
+        """接続を追加する（role は EDGE_ROLES。response は from_id がサービス）。記述側のノードが無ければ KeyError。"""
+        owner, other, ids_field, labels_field = _edge_fields(from_id, to_id, role)
+        node = self._nodes[owner]
+        changes = self._begin()
+        labels = getattr(node, labels_field)
+        if label:
+            labels = {**labels, other: label}
+        self._nodes[owner] = replace(node, **{ids_field: [*getattr(node, ids_field), other], labels_field: labels})
+        self._touch_slides(from_id, to_id)
+        if other in self._nodes:
+            self._link(from_id, to_id)
+        else:
+            self._pending[other].add(owner)
+        return self._finish(changes)
+
+    def remove_edge(self, from_id: NodeId, to_id: NodeId, role: str = "next") -> ChangeSet:
+        """接続を 1 本削除する（同じ接続が複数あれば 1 本だけ）。無ければ ValueError。"""
+        owner, other, ids_field, labels_field = _edge_fields(from_id, to_id, role)
+        node = self._nodes[owner]
+        ids = list(getattr(node, ids_field))
+        ids.remove(other)
+        changes = self._begin()
+        labels = getattr(node, labels_field)
+        if other not in ids and other in labels:
+            labels = {k: v for k, v in labels.items() if k != other}
+        self._nodes[owner] = replace(node, **{ids_field: ids, labels_field: labels})
+        self._touch_slides(from_id, to_id)
+        if other in self._nodes:
+            self._unlink(from_id, to_id)
+        elif other not in ids:
+            self._drop_pending(other, owner)
+        return self._finish(changes)
+
+    def set_label(self, node_id: NodeId, label: str) -> ChangeSet:
+        """ノードのラベルを変える。位置が変わるのはサービスのラベル（サービスの列の並び）を変えた場合だけ。"""
+        node = self._nodes[node_id]
+        changes = self._begin()
+        self._nodes[node_id] = replace(node, label=label)
+        changes.relabeled.append(node_id)
+        self._touch_slides(node_id)
+        if node.type == "service" and label != node.label:
+            self._service_labels[node.label] -= 1
+            self._service_labels[label] += 1
+            self._services_changed = True
+        return self._finish(changes)
+
+    def set_edge_label(
+        self, from_id: NodeId, to_id: NodeId, label: Optional[str], role: str = "next"
+    ) -> ChangeSet:
+        """接続の矢印ラベルを変える（None または空文字で削除）。位置は変わらない。"""
+        owner, other, ids_field, labels_field = _edge_fields(from_id, to_id, role)
+        node = self._nodes[owner]
+        if other not in getattr(node, ids_field):
+            raise ValueError(f"no {role} edge: {from_id!r} -> {to_id!r}")
+        changes = self._begin()
+        labels = {k: v for k, v in getattr(node, labels_field).items() if k != other}
+        if label:
+            labels[other] = label
+        self._nodes[owner] = replace(node, **{labels_field: labels})
+        self._touch_slides(from_id, to_id)
+        return self._finish(changes)
+
+    def rebuild(self) -> ChangeSet:
+        """現在のノードで全体を計算し直す（戻り辺も読み込み時と同じ判定にする）。"""
+        changes = self._begin()
+        for node_id in self._nodes:
+            self._touch(node_id)
+        self._load(self._ordered_nodes())
+        return self._finish(changes)
+
+    # --- 全体の計算 ---
+
+    def _load(self, nodes: list[ProcessNode]) -> None:
+        ids = [node.id for node in nodes]
+        if len(set(ids)) != len(ids):
+            raise ValueError("LayoutSession requires unique node ids")
+        self._nodes: dict[NodeId, ProcessNode] = {}
+        self._seq: dict[NodeId, int] = {}
+        self._seqs: list[int] = []
+        self._by_seq: dict[int, NodeId] = {}
+        self._raw: dict[NodeId, int] = {}
+        self._base_counts: Counter[int] = Counter()
+        self._max_col = -1
+        self._service_labels: Counter[str] = Counter()
+        self._services: set[NodeId] = set()
+        self._service_rank: dict[str, int] = {}
+        self._placed_max_col = -1
+        self._services_changed = False
+        self._succ: defaultdict[NodeId, Counter[NodeId]] = defaultdict(Counter)
+        self._pred: defaultdict[NodeId, Counter[NodeId]] = defaultdict(Counter)
+        self._back: set[tuple[NodeId, NodeId]] = set()
+        self._pending: defaultdict[NodeId, set[NodeId]] = defaultdict(set)
+        self._cells: dict[tuple[int, int, int], list[NodeId]] = {}
+        self._cell_of: dict[NodeId, tuple[int, int, int]] = {}
+        self._rect: dict[NodeId, Rect] = {}
+        self._slide_counts: Counter[int] = Counter()
+        self._max_slide = 0
+        self._dirty: set[NodeId] = set()
+
+        graph = ProcessGraph(nodes)
+        raw, back = _layer_columns(nodes, graph)
+        for i, node in enumerate(nodes):
+            self._seq[node.id] = (i + 1) * _SEQ_STEP
+            self._seqs.append((i + 1) * _SEQ_STEP)
+            self._by_seq[(i + 1) * _SEQ_STEP] = node.id
+            self._add_node(node, raw[i])
+            for other in _owned_ids(node):
+                if other not in graph.index:
+                    self._pending[other].add(node.id)
+        for v in range(len(nodes)):
+            for k in range(graph.order_offsets[v], graph.order_offsets[v + 1]):
+                w = graph.order_targets[k]
+                self._succ[ids[v]][ids[w]] += 1
+                self._pred[ids[w]][ids[v]] += 1
+        self._back = {(ids[v], ids[w]) for v, w in back}
+        self._place_dirty()
+
+    # --- 列 ---
+
+    def _display_column(self, node_id: NodeId) -> int:
+        node = self._nodes[node_id]
+        if node.type == "service":
+            return self._max_col + 1 + self._service_rank[node.label]
+        if node.type == "start":
+            return 0
+        return self._raw[node_id]
+
+    def _count_base(self, column: int, delta: int) -> None:
+        """サービスの列の起点（サービス以外も含む全ノードの列の最大）を数える。"""
+        self._base_counts[column] += delta
+        if delta > 0:
+            self._max_col = max(self._max_col, column)
+        elif not self._base_counts[column]:
+            del self._base_counts[column]
+            if column == self._max_col:
+                self._max_col = max(self._base_counts, default=-1)
+
+    def _set_raw(self, node_id: NodeId, column: int) -> None:
+        if self._nodes[node_id].type != "start":
+            self._count_base(self._raw[node_id], -1)
+            self._count_base(column, 1)
+        self._raw[node_id] = column
+        self._dirty.add(node_id)
+
+    def _link(self, v: NodeId, w: NodeId) -> None:
+        """列計算の辺を 1 本追加する。閉路を作るなら戻り辺、そうでなければ後続の列を押し上げる。"""
+        self._succ[v][w] += 1
+        self._pred[w][v] += 1
+        if self._succ[v][w] > 1:
+            return  # 同じ辺が既にある（分類も列も変わらない）
+        if v == w or self._reaches(w, v):
+            self._back.add((v, w))
+            return
+        self._raise(w, self._raw[v] + 1)
+
+    def _unlink(self, v: NodeId, w: NodeId) -> None:
+        self._succ[v][w] -= 1
+        self._pred[w][v] -= 1
+        if self._succ[v][w] > 0:
+            return
+        del self._succ[v][w]
+        del self._pred[w][v]
+        if (v, w) in self._back:
+            self._back.discard((v, w))
+        else:
+            self._lower(w)
+
+    def _reaches(self, source: NodeId, target: NodeId) -> bool:
+        """戻り辺を除いた辺で source から target へ行けるか。列が target 以下のノードだけをたどる。"""
+        limit = self._raw[target]
+        if self._raw[source] > limit:
+            return False
+        stack = [source]
+        seen = {source}
+        while stack:
+            x = stack.pop()
+            if x == target:
+                return True
+            for y in self._succ[x]:
+                if y not in seen and self._raw[y] <= limit and (x, y) not in self._back:
+                    seen.add(y)
+                    stack.append(y)
+        return False
+
+    def _raise(self, node_id: NodeId, column: int) -> None:
+        stack = [(node_id, column)]
+        while stack:
+            x, c = stack.pop()
+            if self._raw[x] >= c:
+                continue
+            self._set_raw(x, c)
+            stack.extend((y, c + 1) for y in self._succ[x] if (x, y) not in self._back)
+
+    def _lower(self, node_id: NodeId) -> None:
+        """node_id の列を前のノードから求め直し、下がったら後続へ伝える。"""
+        queue = deque([node_id])
+        while queue:
+            x = queue.popleft()
+            if x not in self._nodes:
+                continue
+            old = self._raw[x]
+            c = max((self._raw[p] + 1 for p in self._pred[x] if (p, x) not in self._back), default=0)
+            if c >= old:
+                continue
+            self._set_raw(x, c)
+            queue.extend(y for y in self._succ[x] if self._raw[y] == old + 1 and (x, y) not in self._back)
+
+    # --- ノードの出し入れ ---
+
+    def _add_node(self, node: ProcessNode, raw: int = 0) -> None:
+        self._nodes[node.id] = node
+        self._raw[node.id] = raw
+        self._count_base(0 if node.type == "start" else raw, 1)
+        if node.type == "service":
+            self._services.add(node.id)
+            self._service_labels[node.label] += 1
+            self._services_changed = True
+        self._dirty.add(node.id)
+
+    def _remove_node(self, node_id: NodeId) -> None:
+        self._unplace(node_id)
+        node = self._nodes.pop(node_id)
+        raw = self._raw.pop(node_id)
+        self._count_base(0 if node.type == "start" else raw, -1)
+        if node.type == "service":
+            self._services.discard(node_id)
+            self._service_labels[node.label] -= 1
+            self._services_changed = True
+        self._succ.pop(node_id, None)
+        self._pred.pop(node_id, None)
+        self._dirty.discard(node_id)
+        seq = self._seq.pop(node_id)
+        del self._seqs[bisect.bisect_left(self._seqs, seq)]
+        del self._by_seq[seq]
+
+    def _link_owned(self, node: ProcessNode) -> None:
+        for v, w in _owned_edges(node):
+            other = w if v == node.id else v
+            if other in self._nodes:
+                self._link(v, w)
+            else:
+                self._pending[other].add(node.id)
+
+    def _drop_pending(self, missing: NodeId, owner: NodeId) -> None:
+        owners = self._pending.get(missing)
+        if owners is not None:
+            owners.discard(owner)
+            if not owners:
+                del self._pending[missing]
+
+    def _add_seq(self, node_id: NodeId, index: Optional[int]) -> None:
+        n = len(self._seqs)
+        if index is None or index >= n:
+            seq = (self._seqs[-1] if self._seqs else 0) + _SEQ_STEP
+        else:
+            index = max(index, 0)
+            low = self._seqs[index - 1] if index > 0 else 0
+            if self._seqs[index] - low < 2:
+                self._renumber()
+                low = self._seqs[index - 1] if index > 0 else 0
+            seq = (low + self._seqs[index]) // 2
+        bisect.insort(self._seqs, seq)
+        self._seq[node_id] = seq
+        self._by_seq[seq] = node_id
+
+    def _renumber(self) -> None:
+        """ノード順の番号を等間隔に振り直す（順序は変わらない）。"""
+        ordered = [self._by_seq[seq] for seq in self._seqs]
+        self._seqs = [(i + 1) * _SEQ_STEP for i in range(len(ordered))]
+        self._by_seq = dict(zip(self._seqs, ordered))
+        self._seq = {node_id: seq for seq, node_id in self._by_seq.items()}
+
+    def _ordered_nodes(self) -> list[ProcessNode]:
+        return [self._nodes[self._by_seq[seq]] for seq in self._seqs]
+
+    # --- 配置 ---
+
+    def _place_dirty(self) -> None:
+        """列が変わったノード（とサービスの列の起点・並びが変わればサービス全部）をセルに置き直す。"""
+        if self._services_changed:
+            labels = sorted(label for label, count in self._service_labels.items() if count > 0)
+            self._service_rank = {label: rank for rank, label in enumerate(labels)}
+            self._services_changed = False
+            self._dirty |= self._services
+        elif self._max_col != self._placed_max_col:
+            self._dirty |= self._services
+        self._placed_max_col = self._max_col
+        max_cols = self.grid.max_cols
+        for node_id in sorted(self._dirty, key=self._seq.__getitem__):
+            node = self._nodes[node_id]
+            slide, col = divmod(self._display_column(node_id), max_cols)
+            cell = (slide, self._lane_of.get(node.actor_index, node.actor_index), col)
+            if self._cell_of.get(node_id) != cell:
+                self._unplace(node_id)
+                self._place(node_id, cell)
+        self._dirty.clear()
+
+    def _place(self, node_id: NodeId, cell: tuple[int, int, int]) -> None:
+        members = self._cells.setdefault(cell, [])
+        seqs = [self._seq[m] for m in members]
+        members.insert(bisect.bisect(seqs, self._seq[node_id]), node_id)
+        self._cell_of[node_id] = cell
+        if self._nodes[node_id].type != "service":
+            self._slide_counts[cell[0]] += 1
+            self._max_slide = max(self._max_slide, cell[0])
+        self._restack(cell)
+
+    def _unplace(self, node_id: NodeId) -> None:
+        cell = self._cell_of.pop(node_id, None)
+        if cell is None:
+            return
+        self._touch(node_id)
+        self._rect.pop(node_id, None)
+        members = self._cells[cell]
+        members.remove(node_id)
+        if members:
+            self._restack(cell)
+        else:
+            del self._cells[cell]
+        if self._nodes[node_id].type != "service":
+            self._slide_counts[cell[0]] -= 1
+            if not self._slide_counts[cell[0]]:
+                del self._slide_counts[cell[0]]
+                if cell[0] == self._max_slide:
+                    self._max_slide = max(self._slide_counts, default=0)
+
+    def _restack(self, cell: tuple[int, int, int]) -> None:
+        """セル内のノードの矩形（2 つ以上なら縦分割）を計算し直す。"""
+        _slide, lane, col = cell
+        members = self._cells[cell]
+        for node_id, rect in zip(members, cell_rects(self.grid, lane, col, len(members))):
+            if self._rect.get(node_id) != rect:
+                self._touch(node_id)
+                self._rect[node_id] = rect
+
+    # --- 変更の記録 ---
+
+    def _begin(self) -> ChangeSet:
+        self._before = {}
+        self._changes = ChangeSet()
+        return self._changes
+
+    def _touch(self, node_id: NodeId) -> None:
+        """変更前の (スライド, 矩形) を記録する（編集ごとに最初の 1 回だけ）。"""
+        if node_id not in self._before:
+            cell = self._cell_of.get(node_id)
+            rect = self._rect.get(node_id)
+            self._before[node_id] = (cell[0], rect) if cell is not None and rect is not None else None
+
+    def _touch_slides(self, *node_ids: NodeId) -> None:
+        for node_id in node_ids:
+            cell = self._cell_of.get(node_id)
+            if cell is not None:
+                self._changes.slides.add(cell[0])
+
+    def _finish(self, changes: ChangeSet) -> ChangeSet:
+        self._place_dirty()
+        for node_id, before in self._before.items():
+            after = self.position(node_id) if node_id in self._cell_of else None
+            if after != before:
+                if after is not None:
+                    changes.moved[node_id] = after
+                    changes.slides.add(after[0])
+                if before is not None:
+                    changes.slides.add(before[0])
+        changes.num_slides = self.num_slides
+        self._before = {}
+        return changes
+
+
+def _edge_fields(from_id: NodeId, to_id: NodeId, role: str) -> tuple[NodeId, NodeId, str, str]:
+    """(記述するノード, 相手, ID のフィールド, ラベルのフィールド)。"""
+    if role == "next":
+        return from_id, to_id, "next_ids", "next_labels"
+    if role == "request":
+        return from_id, to_id, "request_to", "request_to_labels"
+    if role == "response":
+        return to_id, from_id, "response_from", "response_from_labels"
+    raise ValueError(f"unknown edge role: {role!r} (choose from {', '.join(EDGE_ROLES)})")
+
+
+def _owned_edges(node: ProcessNode) -> Iterable[tuple[NodeId, NodeId]]:
+    """node の記述（next / request_to / response_from）から生じる列計算の辺 (from, to)。"""
+    for to_id in node.next_ids:
+        yield node.id, to_id
+    for to_id in node.request_to:
+        yield node.id, to_id
+    for from_id in node.response_from:
+        yield from_id, node.id
+
+
+def _owned_ids(node: ProcessNode) -> Iterable[NodeId]:
+    yield from node.next_ids
+    yield from node.request_to
+    yield from node.response_from
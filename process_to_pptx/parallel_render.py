@@ -0,0 +1,106 @@
+"""スライドの描画（spTree の図形 XML の組み立て）をプロセスプールで並列に行う。
+
+各スライドの図形は ProcessLayout とそのスライドの描画計画だけで決まる。ワーカーはスライドごとに
+fast_render の XML テンプレートで spTree の断片（図形 XML を連結した文字列）を組み立てて返し、
+親プロセスはスライドを順に追加しながら仕事を投入し、返ってきた断片をスライドの順に挿入する。
+図形 ID は親がスライドを追加した時点で決まるため、出力は逐次描画（どちらのレンダラでも）と同じになる。
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator, Optional
+
+from . import fast_render
+from .render_plan import SlidePlan
+from .yaml_loader import ProcessLayout
+
+# これより少ないスライドはプールを起こす方が高くつくため逐次で描く
+MIN_PARALLEL_SLIDES = 4
+# ワーカー 1 つあたりの仕事の数（スライドをまとめて送り、プロセス間通信の回数を抑える）
+CHUNKS_PER_WORKER = 4
+
+# ワーカー側で保持するレイアウトと描画計画（initializer で 1 回だけ受け取る）
+_worker_layout: Optional[ProcessLayout] = None
+_worker_plans: list[SlidePlan] = []
+
+
+def _init_worker(layout: ProcessLayout, plans: list[SlidePlan]) -> None:
+    global _worker_layout, _worker_plans
+    _worker_layout, _worker_plans = layout, plans
+
+
+def _render_chunk(jobs: list[tuple[int, int]], chrome: bool) -> list[tuple[str, int]]:
+    """(スライド番号, 最初の図形 ID) ごとの (spTree の断片, 図形数)。ワーカーで実行する。"""
+    assert _worker_layout is not None
+    return [fast_render.slide_fragment(_worker_layout, _worker_plans[i], first_id, chrome) for i, first_id in jobs]
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """ワーカー数（None・1 以下は 1＝逐次、0 は CPU 数）。"""
+    if workers == 0:
+        return os.cpu_count() or 1
+    return max(1, workers or 1)
+
+
+def iter_fragments(
+    layout: ProcessLayout, plans: list[SlidePlan], chrome: bool, workers: int, first_id: int
+) -> Iterator[tuple[str, int]]:
+    """
+    全スライドの (spTree の断片, 図形数) をスライドの順に返す。first_id は各スライドで最初に使う図形 ID。
+    ワーカーへ投入中の仕事は workers の 2 倍までに抑え、受け取った断片は呼び出し側が使えば捨てられる
+    （pptx_stream でスライドを書き出しながら使っても、メモリに溜まる断片はスライド数によらない）。
+    """
+    if workers <= 1 or len(plans) < MIN_PARALLEL_SLIDES:
+        for plan in plans:
+            yield fast_render.slide_fragment(layout, plan, first_id, chrome)
+        return
+    chunk_size = max(1, math.ceil(len(plans) / (workers * CHUNKS_PER_WORKER)))
+    chunks = (
+        [(i, first_id) for i in range(start, min(start + chunk_size, len(plans)))]
+        for start in range(0, len(plans), chunk_size)
+    )
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(layout, plans)) as pool:
+        in_flight: deque[Future] = deque()
+        for jobs in chunks:
+            in_flight.append(pool.submit(_render_chunk, jobs, chrome))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def render_slides(prs, slide_layout, layout: ProcessLayout, plans: list[SlidePlan], chrome: bool, workers: int) -> int:
+    """
+    plans の全スライドを prs に追加し、図形をワーカー workers 個で組み立てて挿入する。戻り値は図形数。
+    スライドが MIN_PARALLEL_SLIDES 枚未満か workers が 1 なら、プールを起こさずその場で組み立てる。
+    """
+    if workers <= 1 or len(plans) < MIN_PARALLEL_SLIDES:
+        return sum(
+            fast_render.render_slide(prs.slides.add_slide(slide_layout), layout, plan, chrome=chrome) for plan in plans
+        )
+    chunk_size = max(1, math.ceil(len(plans) / (workers * CHUNKS_PER_WORKER)))
+    slides = []
+    futures: list[Future] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(layout, plans)) as pool:
+        # スライドの追加（親）と図形の組み立て（ワーカー）を重ねて進める
+        jobs: list[tuple[int, int]] = []
+        for i in range(len(plans)):
+            slide = prs.slides.add_slide(slide_layout)
+            slides.append(slide)
+            jobs.append((i, slide.shapes._spTree.max_shape_id + 1))
+            if len(jobs) == chunk_size:
+                futures.append(pool.submit(_render_chunk, jobs, chrome))
+                jobs = []
+        if jobs:
+            futures.append(pool.submit(_render_chunk, jobs, chrome))
+        total = 0
+        remaining = iter(slides)
+        for future in futures:
+            for fragment, count in future.result():
+                fast_render.insert_fragment(next(remaining), fragment)
+                total += count
+    return total
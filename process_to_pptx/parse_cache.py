@@ -0,0 +1,183 @@
+"""load_process_yaml の解析結果をディスクに保存し、内容が同じ YAML の再解析を省くキャッシュ。
+
+キーはファイル内容の SHA-256 とローダーのバージョン（yaml_loader.LOADER_VERSION）。値は正規化済みの
+(actors, nodes, layout_config) を marshal + zlib で詰めたもの。ディレクトリの合計サイズが上限を超えたら、
+最後に使われた時刻（mtime）が古いものから削除する。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import tempfile
+import zlib
+from dataclasses import fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Optional
+
+from .yaml_loader import LOADER_VERSION, NO_IDS, NO_LABELS, ProcessNode
+
+# キャッシュディレクトリを指定する環境変数（CLI の --cache-dir の既定値）
+CACHE_DIR_ENV = "PROCESS_TO_PPTX_CACHE_DIR"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_SUFFIX = ".bin"
+
+# 解析で決まるフィールド（column 等のレイアウト結果は保存しない）
+_PARSED_FIELDS = tuple(
+    f.name for f in fields(ProcessNode) if f.name not in ("column", "slide_index", "col_in_slide")
+)
+
+# 空なら読み込み時と同じ共有の空オブジェクトに戻すフィールド（marshal は MappingProxyType を扱えないため保存時は dict）
+_SHARED_EMPTY = {
+    "next_labels": NO_LABELS,
+    "request_to": NO_IDS,
+    "request_to_labels": NO_LABELS,
+    "response_from": NO_IDS,
+    "response_from_labels": NO_LABELS,
+}
+_SHARED_POSITIONS = tuple((i, _SHARED_EMPTY[name]) for i, name in enumerate(_PARSED_FIELDS) if name in _SHARED_EMPTY)
+
+ParseResult = tuple[list[str], list[ProcessNode], dict[str, Any]]
+
+
+class DiskStore:
+    """ディレクトリに 1 エントリ 1 ファイルで保存する、合計サイズ上限付きの LRU ストア（ParseCache・LayoutCache が共有）。
+
+    同じディレクトリを複数のキャッシュで共有でき、上限はディレクトリ内の全エントリの合計に対して掛かる。
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def entry_path(self, key: str) -> Path:
+        return self.directory / (key + _SUFFIX)
+
+    def read(self, key: str) -> Optional[bytes]:
+        """key のエントリの中身（無ければ None）。読めたら使った時刻を更新する。"""
+        path = self.entry_path(key)
+        try:
+            blob = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # LRU: 使った時刻を更新
+        except OSError:
+            pass
+        return blob
+
+    def write(self, key: str, blob: bytes, evict: bool = True) -> int:
+        """
+        key のエントリを（一時ファイル経由で）書き、上限を超えていれば古いエントリを削除する。戻り値は削除した数。
+        evict=False なら削除は呼び出し側が後でまとめて evict() で行う（続けて多数書く場合。削除はディレクトリを走査するため）。
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self.entry_path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return 0
+        return self.evict() if evict else 0
+
+    def discard(self, key: str) -> None:
+        """壊れたエントリなどを削除する。"""
+        self.entry_path(key).unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """合計サイズが max_bytes 以下になるまで、最後に使われた時刻が古いエントリから削除する。戻り値は削除した数。"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return 0
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """全エントリを削除する。"""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                os.unlink(entry.path)
+
+
+class ParseCache(DiskStore):
+    """内容ハッシュをキーにした解析結果のディスクキャッシュ（サイズ上限付き LRU）。"""
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        super().__init__(directory, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, content: bytes) -> str:
+        digest = hashlib.sha256(b"v%d:%d\0" % (LOADER_VERSION, marshal.version))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry_path(self, content: bytes) -> Path:
+        return self.entry_path(self._key(content))
+
+    def get(self, content: bytes) -> Optional[ParseResult]:
+        """content の解析結果があれば返す（無ければ None）。"""
+        key = self._key(content)
+        blob = self.read(key)
+        if blob is None:
+            self.misses += 1
+            return None
+        try:
+            result = _decode(blob)
+        except (ValueError, EOFError, TypeError, zlib.error):
+            # 壊れたエントリは捨てて解析し直す
+            self.discard(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, content: bytes, result: ParseResult) -> None:
+        """content の解析結果を保存し、上限を超えていれば古いエントリを削除する。"""
+        try:
+            blob = _encode(result)
+        except ValueError:
+            return  # layout に marshal できない値（日付など）がある場合はキャッシュしない
+        self.write(self._key(content), blob)
+
+
+def _encode(result: ParseResult) -> bytes:
+    actors, nodes, layout_config = result
+    rows = [tuple(_plain(getattr(node, name)) for name in _PARSED_FIELDS) for node in nodes]
+    return zlib.compress(marshal.dumps((actors, rows, layout_config)), 1)
+
+
+def _plain(value: Any) -> Any:
+    return dict(value) if isinstance(value, MappingProxyType) else value
+
+
+def _decode(blob: bytes) -> ParseResult:
+    actors, rows, layout_config = marshal.loads(zlib.decompress(blob))
+    nodes = []
+    for row in rows:
+        row = list(row)
+        for i, empty in _SHARED_POSITIONS:
+            if not row[i]:
+                row[i] = empty
+        nodes.append(ProcessNode(*row))  # _PARSED_FIELDS は ProcessNode の先頭からのフィールド
+    return actors, nodes, layout_config
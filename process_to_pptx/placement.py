@@ -0,0 +1,149 @@
+"""ノードの列・レーンから、スライド番号・スライド内の列・図形の矩形 [EMU] を計算する。
+
+Python のループで計算する経路と、NumPy で全ノードをまとめて配列演算する経路があり、結果は同じ。
+NumPy は任意の依存で、入っていなければ（またはノード数が少なければ）ループで計算する。
+同じスライド・レーン・列に複数ノードがある場合は、レーン高さの 90% をノード順に縦分割する。
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+# これ未満のノード数では NumPy を使わない（ループでも数 ms で終わるため、NumPy の import 約 0.1 秒の方が重い）
+VECTORIZE_MIN_NODES = 10000
+
+_numpy: Any = None
+
+
+def load_numpy() -> Any:
+    """NumPy モジュール（入っていなければ None）。CLI の起動を遅くしないよう初回に import する。"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+@dataclass(frozen=True)
+class Grid:
+    """配置の格子（EMU）。"""
+
+    origin_left: int  # 列 0 のタスクの左端
+    unit: int  # 列の間隔（タスク一辺＋間隔）
+    content_top: int  # レーン 0 の上端
+    lane_height: int
+    task_side: int
+    max_cols: int  # 1 スライドの列数
+
+    @property
+    def stack_zone_height(self) -> int:
+        """同じセルに積むノードで分け合う高さ（レーン高さの 90%）。"""
+        return int(self.lane_height * 0.9)
+
+
+@dataclass
+class Placement:
+    """ノード順の配置結果。rects はノードごとに (left, top, width, height) の 4 要素。"""
+
+    slide_index: list[int]
+    col_in_slide: list[int]
+    rects: array
+
+
+def place_nodes(
+    columns: Sequence[int], lanes: Sequence[int], grid: Grid, vectorized: Optional[bool] = None
+) -> Placement:
+    """
+    列・レーンから配置を計算する。
+    vectorized: True なら NumPy（無ければ ImportError）、False ならループ。
+    None なら NumPy があり、ノード数が VECTORIZE_MIN_NODES 以上のとき NumPy。
+    """
+    if vectorized is None:
+        vectorized = len(columns) >= VECTORIZE_MIN_NODES and load_numpy() is not None
+    if vectorized:
+        np = load_numpy()
+        if np is None:
+            raise ImportError("NumPy is required for vectorized placement")
+        return _place_numpy(np, columns, lanes, grid)
+    return _place_scalar(columns, lanes, grid)
+
+
+def cell_rects(grid: Grid, lane: int, col_in_slide: int, count: int) -> list[tuple[int, int, int, int]]:
+    """1 つのセル（レーン・スライド内の列）に count 個のノードを置くときの矩形（ノード順）。"""
+    left = grid.origin_left + col_in_slide * grid.unit
+    if count == 1:
+        top = grid.content_top + lane * grid.lane_height + (grid.lane_height - grid.task_side) // 2
+        return [(left, top, grid.task_side, grid.task_side)]
+    zone_height = grid.stack_zone_height
+    top = grid.content_top + lane * grid.lane_height + (grid.lane_height - zone_height) // 2
+    row_height, remainder = divmod(zone_height, count)
+    rects = []
+    for rank in range(count):
+        h = row_height + (1 if rank < remainder else 0)
+        rects.append((left, top, grid.task_side, h))
+        top += h
+    return rects
+
+
+def _place_scalar(columns: Sequence[int], lanes: Sequence[int], grid: Grid) -> Placement:
+    n = len(columns)
+    slide_index = [c // grid.max_cols for c in columns]
+    col_in_slide = [c % grid.max_cols for c in columns]
+    flat: list[int] = []
+    lane_offset = (grid.lane_height - grid.task_side) // 2
+    cells: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+    for i in range(n):
+        left = grid.origin_left + col_in_slide[i] * grid.unit
+        top = grid.content_top + lanes[i] * grid.lane_height + lane_offset
+        flat += (left, top, grid.task_side, grid.task_side)
+        cells[(slide_index[i], lanes[i], col_in_slide[i])].append(i)
+
+    # 同一アクター・同一列に複数ノードがある場合、レーン高さの90%を縦分割して配置（DoD）
+    for (_slide, lane, col), group in cells.items():
+        if len(group) <= 1:
+            continue
+        for i, rect in zip(group, cell_rects(grid, lane, col, len(group))):
+            flat[4 * i : 4 * i + 4] = rect
+    return Placement(slide_index=slide_index, col_in_slide=col_in_slide, rects=array("q", flat))
+
+
+def _place_numpy(np: Any, columns: Sequence[int], lanes: Sequence[int], grid: Grid) -> Placement:
+    column = np.asarray(columns, dtype=np.int64)
+    lane = np.asarray(lanes, dtype=np.int64)
+    n = len(column)
+    slide, col = np.divmod(column, grid.max_cols)
+    rects = np.empty((n, 4), dtype=np.int64)
+    rects[:, 0] = grid.origin_left + col * grid.unit
+    rects[:, 1] = grid.content_top + lane * grid.lane_height + (grid.lane_height - grid.task_side) // 2
+    rects[:, 2] = grid.task_side
+    rects[:, 3] = grid.task_side
+
+    if n:
+        # (スライド, レーン, 列) で安定ソートし、同じセル内の順位（ノード順）と個数を求める
+        order = np.lexsort((col, lane, slide))
+        key_slide, key_lane, key_col = slide[order], lane[order], col[order]
+        starts = np.ones(n, dtype=bool)
+        starts[1:] = (key_slide[1:] != key_slide[:-1]) | (key_lane[1:] != key_lane[:-1]) | (key_col[1:] != key_col[:-1])
+        start_pos = np.flatnonzero(starts)
+        group = np.cumsum(starts) - 1
+        counts = np.diff(np.append(start_pos, n))[group]
+        rank = np.arange(n) - start_pos[group]
+        stacked = counts > 1
+        if stacked.any():
+            idx = order[stacked]
+            count, rnk = counts[stacked], rank[stacked]
+            zone_height = grid.stack_zone_height
+            zone_top = grid.content_top + key_lane[stacked] * grid.lane_height + (grid.lane_height - zone_height) // 2
+            row_height, remainder = np.divmod(zone_height, count)
+            rects[idx, 1] = zone_top + rnk * row_height + np.minimum(rnk, remainder)
+            rects[idx, 3] = row_height + (rnk < remainder)
+
+    flat = array("q")
+    flat.frombytes(rects.tobytes())
+    return Placement(slide_index=slide.tolist(), col_in_slide=col.tolist(), rects=flat)
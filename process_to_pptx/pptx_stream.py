@@ -0,0 +1,167 @@
+"""PPTX パッケージを、スライドを描いたそばから zip に書き出すストリーミングライター。
+
+python-pptx の Presentation は全スライドの XML をメモリに持ち、prs.save でまとめて書く。
+このライターはスライド以外のパーツ（マスター・レイアウト・テーマ等）を最初に書き、スライドは 1 枚ごとに
+XML を組み立てて zip に書いたら捨てる。スライドの一覧（presentation.xml）とその関係（rels）、
+[Content_Types].xml だけを最後に書くため、スライドが何枚でもメモリの山は 1 枚分で済む。
+出力先はパスのほか、シークできないバイナリストリーム（標準出力など）でもよい。
+各パーツの中身は prs.save と同じ（zip 内の並び順だけが異なる）。
+"""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import CT_Relationships, CT_Types, serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.spec import default_content_types
+from pptx.oxml.slide import CT_Slide
+
+from .fast_render import insert_fragment_into
+
+# 新しいスライドで最初に使う図形 ID（白紙のスライドの spTree はグループの id=1 だけを持つ）
+SLIDE_FIRST_SHAPE_ID = CT_Slide.new().cSld.spTree.max_shape_id + 1
+# python-pptx と同じ、スライド ID の開始値
+MIN_SLIDE_ID = 256
+
+
+def free_rids(used: set[str]) -> Iterator[str]:
+    """使われていない rId を小さい順に返す（python-pptx と同じく欠番から埋める）。"""
+    n = 0
+    while True:
+        n += 1
+        if "rId%d" % n not in used:
+            yield "rId%d" % n
+
+
+def slide_xml(shapes_xml: str = "", name: Optional[str] = None) -> bytes:
+    """spTree の断片から、スライドパーツの XML（prs.save が書くものと同じバイト列）を組み立てる。
+    name はスライドの名前（cSld の name。shape_tags.slide_tag）。"""
+    sld = CT_Slide.new()
+    if name is not None:
+        sld.cSld.set("name", name)
+    insert_fragment_into(sld.cSld.spTree, shapes_xml)
+    return serialize_part_xml(sld)
+
+
+def rid_number(rid: str) -> int:
+    """rId の番号（rels を python-pptx と同じ順に並べるときのキー）。"""
+    return int(rid[3:]) if rid.startswith("rId") and rid[3:].isdigit() else 0
+
+
+class StreamingPresentationWriter:
+    """
+    スライドの無い Presentation を土台に、add_slide で渡したスライドを順に zip へ書き出す。
+    with 文で使うか、最後に close() を呼ぶ（close で presentation.xml と [Content_Types].xml を書く）。
+    """
+
+    def __init__(self, prs, slide_layout, output: str | Path | BinaryIO) -> None:
+        sld_id_lst = prs.part._element.sldIdLst
+        if sld_id_lst is not None and len(sld_id_lst):
+            raise ValueError("the base presentation must not contain slides")
+        self._zip = zipfile.ZipFile(
+            output if hasattr(output, "write") else str(output),
+            "w",
+            compression=zipfile.ZIP_DEFLATED,
+            strict_timestamps=False,
+        )
+        self._prs_part = prs.part
+        self._parts = list(prs.part.package.iter_parts())
+        self._slide_count = 0
+        rels = CT_Relationships.new()
+        rels.add_rel("rId1", RT.SLIDE_LAYOUT, slide_layout.part.partname.relative_ref("/ppt/slides"), False)
+        self._slide_rels = rels.xml_file_bytes
+        self._closed = False
+
+        # スライドに依存しないパーツは先に書いておく
+        self._write(PACKAGE_URI.rels_uri, prs.part.package._rels.xml)
+        for part in self._parts:
+            if part is not self._prs_part:
+                self._write_part(part.partname, part.blob, part.rels.xml if part._rels else None)
+
+    def __enter__(self) -> StreamingPresentationWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+
+    @property
+    def slide_count(self) -> int:
+        return self._slide_count
+
+    def add_slide(self, shapes_xml: str = "", name: Optional[str] = None) -> None:
+        """図形 XML を連結した spTree の断片（図形 ID は SLIDE_FIRST_SHAPE_ID から）を 1 枚のスライドとして書く。"""
+        self.add_slide_xml(slide_xml(shapes_xml, name))
+
+    def add_slide_xml(self, blob: bytes) -> None:
+        """組み立て済みのスライドパーツの XML（slide_xml の戻り値）をそのまま 1 枚のスライドとして書く。"""
+        self._slide_count += 1
+        self._write_part(self._slide_partname(self._slide_count), blob, self._slide_rels)
+
+    def close(self) -> None:
+        """スライドの一覧・関係と [Content_Types].xml を書いて zip を閉じる。"""
+        if self._closed:
+            return
+        self._closed = True
+        prs_elm = self._prs_part._element
+        entries = [(rel.rId, rel.reltype, rel.target_ref, rel.is_external) for rel in self._prs_part.rels.values()]
+        rids = free_rids({entry[0] for entry in entries})
+        created = prs_elm.sldIdLst is None
+        sld_id_lst = prs_elm.get_or_add_sldIdLst()
+        for i in range(self._slide_count):
+            rid = next(rids)
+            entries.append((rid, RT.SLIDE, "slides/slide%d.xml" % (i + 1), False))
+            sld_id_lst._add_sldId(id=MIN_SLIDE_ID + i, rId=rid)
+        rels = CT_Relationships.new()
+        # python-pptx と同じく rId の番号順に並べる
+        for entry in sorted(entries, key=lambda e: (rid_number(e[0]), e[0])):
+            rels.add_rel(*entry)
+        try:
+            self._write_part(self._prs_part.partname, serialize_part_xml(prs_elm), rels.xml_file_bytes)
+        finally:
+            # 土台の Presentation は呼び出し側のものなので、スライドの一覧は元に戻す
+            if created:
+                prs_elm.remove(sld_id_lst)
+            else:
+                for sld_id in list(sld_id_lst):
+                    sld_id_lst.remove(sld_id)
+        self._write(CONTENT_TYPES_URI, serialize_part_xml(self._content_types()))
+        self._zip.close()
+
+    def _content_types(self) -> CT_Types:
+        """[Content_Types].xml（python-pptx の保存と同じ規則: 既定の拡張子は Default、それ以外は Override）。"""
+        defaults = {"rels": CT.OPC_RELATIONSHIPS, "xml": CT.XML}
+        overrides: dict[PackURI, str] = {}
+        for part in self._parts:
+            ext = part.partname.ext
+            if (ext.lower(), part.content_type) in default_content_types:
+                defaults[ext] = part.content_type
+            else:
+                overrides[part.partname] = part.content_type
+        for i in range(self._slide_count):
+            overrides[self._slide_partname(i + 1)] = CT.PML_SLIDE
+        types = CT_Types.new()
+        for ext, content_type in sorted(defaults.items()):
+            types.add_default(ext, content_type)
+        for partname, content_type in sorted(overrides.items()):
+            types.add_override(partname, content_type)
+        return types
+
+    @staticmethod
+    def _slide_partname(number: int) -> PackURI:
+        return PackURI("/ppt/slides/slide%d.xml" % number)
+
+    def _write_part(self, partname: PackURI, blob: bytes, rels_xml: bytes | None) -> None:
+        self._write(partname, blob)
+        if rels_xml is not None:
+            self._write(partname.rels_uri, rels_xml)
+
+    def _write(self, pack_uri: PackURI, blob: bytes) -> None:
+        self._zip.writestr(pack_uri.membername, blob)
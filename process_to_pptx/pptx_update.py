@@ -0,0 +1,365 @@
+"""生成済みの PPTX を、新しいプロセス定義との差分だけ書き換えて更新する（ユーザーが足した図形・ノートは残す）。
+
+生成した図形・スライドは名前で見分ける（shape_tags）。スライドの名前は描画入力のハッシュ（slide_cache.slide_key）
+なので、名前が新しいキーと同じスライドは XML を組み立ても parse もせずにそのまま残す。キーが変わったスライドだけ
+図形 XML を組み立て、生成した図形を名前で突き合わせて、変わった図形だけを差し替え・追加・削除する
+（同じ図形の ID・重なり順は保つ。名前の無い図形＝ユーザーが足したタイトルなどには触れない）。
+スライドが増えれば最後の生成スライドの後ろに足し、減ればユーザーの図形もノートも無いスライドだけを削除する
+（ある場合は生成した図形だけを消し、ユーザーのスライドとして残す）。レーンを焼き込んだレイアウトも同じ要領で更新する。
+
+パッケージは zip のまま読み書きし、変わらないパーツはバイト列をそのまま書き戻す（python-pptx で全パーツを
+parse・保存し直さない）ため、更新の手間は変わったスライドの数にほぼ比例する。
+生成した図形を手で直していた場合、そのスライドの描画入力が変わると生成し直した内容に戻る。
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import stat
+import tempfile
+import zipfile
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import CT_Relationships, serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+
+from .build_manifest import new_file_mode
+from .fast_render import chrome_shapes_xml, slide_fragment
+from .layout_cache import LayoutCache
+from .parse_cache import ParseCache
+from .pptx_stream import MIN_SLIDE_ID, SLIDE_FIRST_SHAPE_ID, free_rids, rid_number, slide_xml
+from .render_plan import build_render_plan
+from .shape_tags import EMPTY_SLIDE_TAG, is_tag, slide_tag
+from .slide_cache import slide_key
+from .yaml_loader import ProcessModel, ProcessSource
+
+# セクション（PowerPoint 2010 以降の p14:sectionLst）の名前空間。スライドを削除したらセクションからも外す
+_P14_NS = "http://schemas.microsoft.com/office/powerpoint/2010/main"
+# スライドの名前（cSld の name）はパーツの先頭付近にあるため、parse せずに読む
+_SLIDE_NAME = re.compile(rb'<p:cSld\b[^>]*?\bname="([^"]*)"')
+_SLIDE_NAME_HEAD_BYTES = 4096
+# spTree の子のうち図形ではないもの
+_NON_SHAPES = {qn("p:nvGrpSpPr"), qn("p:grpSpPr"), qn("p:extLst")}
+
+
+@dataclass
+class UpdateResult:
+    """更新の内容。slides_kept は描画入力が同じで触らなかった生成スライドの数。"""
+
+    slides_kept: int = 0
+    slides_patched: int = 0
+    slides_added: int = 0
+    slides_removed: int = 0
+    shapes_added: int = 0
+    shapes_changed: int = 0
+    shapes_removed: int = 0
+    layout_patched: bool = False
+
+    def format(self) -> str:
+        """1 行の要約（CLI の update）。"""
+        return (
+            f"Slides: {self.slides_kept} unchanged, {self.slides_patched} updated, {self.slides_added} added, "
+            f"{self.slides_removed} removed; shapes: {self.shapes_added} added, {self.shapes_changed} changed, "
+            f"{self.shapes_removed} removed" + ("; swimlane layout updated" if self.layout_patched else "")
+        )
+
+
+def _shape_name(elm) -> Optional[str]:
+    c_nv_pr = elm.find("./*/" + qn("p:cNvPr"))
+    return None if c_nv_pr is None else c_nv_pr.get("name")
+
+
+def _shapes(sp_tree) -> list:
+    return [child for child in sp_tree if child.tag not in _NON_SHAPES]
+
+
+def _canonical(elm) -> bytes:
+    return etree.tostring(elm, method="c14n", exclusive=True)
+
+
+def patch_sp_tree(sp_tree, fragment: str) -> tuple[int, int, int]:
+    """
+    spTree の生成した図形を、新しく組み立てた図形 XML の断片（fast_render.slide_fragment）に合わせる。
+    図形は名前で突き合わせ（同名が複数あれば出てくる順に）、同じものは残し、違うものは同じ ID で差し替え、
+    無くなったものは削除し、新しいものは直前の生成図形の後ろに空いている ID で足す。矢印の接続先の ID も付け替える。
+    戻り値は (追加, 差し替え, 削除) した図形の数。
+    """
+    old_by_name: dict[str, deque] = defaultdict(deque)
+    for elm in _shapes(sp_tree):
+        name = _shape_name(elm)
+        if is_tag(name):
+            old_by_name[name].append(elm)
+    new_shapes = []
+    if fragment:
+        new_shapes = list(parse_xml("<p:spTree %s>%s</p:spTree>" % (nsdecls("a", "p"), fragment)))
+
+    next_id = max([int(v) for v in sp_tree.xpath("//@id") if v.isdigit()] + [0]) + 1
+    pairs = []
+    id_map: dict[str, str] = {}
+    for new in new_shapes:
+        queue = old_by_name.get(_shape_name(new))
+        old = queue.popleft() if queue else None
+        c_nv_pr = new.find("./*/" + qn("p:cNvPr"))
+        if old is not None:
+            final_id = old.find("./*/" + qn("p:cNvPr")).get("id")
+        else:
+            final_id, next_id = str(next_id), next_id + 1
+        id_map[c_nv_pr.get("id")] = final_id
+        c_nv_pr.set("id", final_id)
+        pairs.append((old, new))
+
+    added = changed = 0
+    previous = None
+    for old, new in pairs:
+        for cxn in new.iter(qn("a:stCxn"), qn("a:endCxn")):
+            cxn.set("id", id_map.get(cxn.get("id"), cxn.get("id")))
+        if old is None:
+            if previous is None:
+                sp_tree.insert(2, new)  # nvGrpSpPr・grpSpPr の直後（ユーザーの図形より下）
+            else:
+                previous.addnext(new)
+            added += 1
+            previous = new
+        elif _canonical(old) == _canonical(new):
+            previous = old
+        else:
+            sp_tree.replace(old, new)
+            changed += 1
+            previous = new
+
+    removed = 0
+    for leftovers in old_by_name.values():
+        for old in leftovers:
+            sp_tree.remove(old)
+            removed += 1
+    return added, changed, removed
+
+
+class _Package:
+    """zip のパーツ（メンバー名 → バイト列）と、更新で書き換えるパーツの XML。"""
+
+    def __init__(self, path: str | Path) -> None:
+        with zipfile.ZipFile(path) as z:
+            self.infos = z.infolist()
+            self.blobs = {info.filename: z.read(info) for info in self.infos}
+        self.added: list[str] = []
+        self.content_types = parse_xml(self.blobs[CONTENT_TYPES_URI.membername])
+        package_rels = parse_xml(self.blobs[PACKAGE_URI.rels_uri.membername])
+        target = next(
+            rel.target_ref for rel in package_rels.relationship_lst if rel.reltype == RT.OFFICE_DOCUMENT
+        )
+        self.prs_partname = PackURI.from_rel_ref(PACKAGE_URI.baseURI, target)
+        self.prs = parse_xml(self.blobs[self.prs_partname.membername])
+        self.prs_rels = self.rels(self.prs_partname)
+
+    def rels(self, partname: PackURI):
+        blob = self.blobs.get(partname.rels_uri.membername)
+        return parse_xml(blob) if blob is not None else CT_Relationships.new()
+
+    def target(self, partname: PackURI, rels, reltype: str) -> Optional[PackURI]:
+        for rel in rels.relationship_lst:
+            if rel.reltype == reltype and rel.targetMode != "External":
+                return PackURI.from_rel_ref(partname.baseURI, rel.target_ref)
+        return None
+
+    def slide_parts(self) -> list[tuple[object, PackURI]]:
+        """(sldId 要素, スライドのパーツ名) をスライドの順に。"""
+        targets = {rel.rId: rel.target_ref for rel in self.prs_rels.relationship_lst}
+        sld_id_lst = self.prs.find(qn("p:sldIdLst"))
+        if sld_id_lst is None:
+            return []
+        return [
+            (sld_id, PackURI.from_rel_ref(self.prs_partname.baseURI, targets[sld_id.get(qn("r:id"))]))
+            for sld_id in sld_id_lst
+        ]
+
+    def slide_name(self, partname: PackURI) -> Optional[str]:
+        match = _SLIDE_NAME.search(self.blobs[partname.membername][:_SLIDE_NAME_HEAD_BYTES])
+        return match.group(1).decode("utf-8") if match else None
+
+    def put(self, partname: PackURI, blob: bytes, content_type: Optional[str] = None) -> None:
+        if partname.membername not in self.blobs:
+            self.added.append(partname.membername)
+            if content_type is not None:
+                self.content_types.add_override(partname, content_type)
+        self.blobs[partname.membername] = blob
+
+    def drop(self, partname: PackURI) -> None:
+        for member in (partname.membername, partname.rels_uri.membername):
+            self.blobs.pop(member, None)
+        for override in self.content_types.override_lst:
+            if override.partName == partname:
+                self.content_types.remove(override)
+
+    def next_partname(self, template: str) -> PackURI:
+        n = 1
+        while (template % n)[1:] in self.blobs:
+            n += 1
+        return PackURI(template % n)
+
+    def write(self, output: str | Path | BinaryIO) -> None:
+        self.blobs[CONTENT_TYPES_URI.membername] = serialize_part_xml(self.content_types)
+        self.blobs[self.prs_partname.membername] = serialize_part_xml(self.prs)
+        self.blobs[self.prs_partname.rels_uri.membername] = self.prs_rels.xml_file_bytes
+        if hasattr(output, "write"):
+            self._write_zip(output)
+            return
+        # 同じファイルを上書きするので、一時ファイルに書いてから置き換える。
+        # mkstemp の一時ファイルは 0600 なので、元のファイル（新規なら umask どおり）のパーミッションにそろえる
+        directory = Path(output).resolve().parent
+        try:
+            mode = stat.S_IMODE(os.stat(output).st_mode)
+        except FileNotFoundError:
+            mode = new_file_mode()
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                self._write_zip(f)
+            os.chmod(tmp, mode)
+            os.replace(tmp, output)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _write_zip(self, f: BinaryIO) -> None:
+        with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED, strict_timestamps=False) as z:
+            for info in self.infos:
+                if info.filename in self.blobs:
+                    z.writestr(info, self.blobs[info.filename])
+            for member in self.added:
+                z.writestr(member, self.blobs[member])
+
+
+def _has_user_content(package: _Package, partname: PackURI, sld) -> bool:
+    """スライドにユーザーの図形か、レイアウト以外の関係（ノート・画像など）があるか。"""
+    if any(not is_tag(_shape_name(elm)) for elm in _shapes(sld.cSld.spTree)):
+        return True
+    return any(rel.reltype != RT.SLIDE_LAYOUT for rel in package.rels(partname).relationship_lst)
+
+
+def _remove_slide(package: _Package, sld_id, partname: PackURI) -> None:
+    rid = sld_id.get(qn("r:id"))
+    sld_id.getparent().remove(sld_id)
+    for rel in package.prs_rels.relationship_lst:
+        if rel.rId == rid:
+            package.prs_rels.remove(rel)
+    for entry in package.prs.iter("{%s}sldId" % _P14_NS):
+        if entry.get("id") == sld_id.get("id"):
+            entry.getparent().remove(entry)
+    package.drop(partname)
+
+
+def update_pptx(
+    source: ProcessModel | ProcessSource,
+    pptx_path: str | Path,
+    output_path: Optional[str | Path | BinaryIO] = None,
+    parse_cache: Optional[ParseCache] = None,
+    layout_cache: Optional[LayoutCache] = None,
+) -> UpdateResult:
+    """
+    yaml_to_pptx で生成した pptx_path を、source（YAML のパス・ProcessModel など）の内容に合わせて差分で更新する。
+    output_path を省くと pptx_path を置き換える（一時ファイルに書いてから置き換えるので、失敗しても元のまま）。
+    スライドの寸法とレーンの描き先（レイアウトに焼き込んだか）は既存の PPTX に合わせる。
+    空のモデルなら、yaml_to_pptx の出力と同じく生成したスライドを 1 枚だけ白紙にして残す（次の更新の起点になる）。
+    生成したスライドが 1 枚も無い（名前の無い古い出力など）ときは ValueError。
+    """
+    package = _Package(pptx_path)
+    slides = package.slide_parts()
+    generated = [(sld_id, partname) for sld_id, partname in slides if is_tag(package.slide_name(partname))]
+    if not generated:
+        raise ValueError(f"{pptx_path}: no slides generated by process-to-pptx (regenerate it with from-yaml)")
+
+    model = ProcessModel.load(source, cache=parse_cache, layout_cache=layout_cache)
+    sld_sz = package.prs.find(qn("p:sldSz"))
+    slide_size = (int(sld_sz.get("cx")), int(sld_sz.get("cy")))
+    layout = None if model.is_empty else model.compute_layout(slide_size=slide_size)
+    plans = build_render_plan(layout) if layout is not None else []
+
+    result = UpdateResult()
+    layout_partname = package.target(generated[-1][1], package.rels(generated[-1][1]), RT.SLIDE_LAYOUT)
+    sld_layout = parse_xml(package.blobs[layout_partname.membername])
+    baked = any(is_tag(_shape_name(elm)) for elm in _shapes(sld_layout.cSld.spTree))
+    chrome = not baked
+    if baked and layout is not None:
+        shapes, _ = chrome_shapes_xml(layout, 1)
+        added, changed, removed = patch_sp_tree(sld_layout.cSld.spTree, "".join(shapes))
+        if added or changed or removed:
+            package.put(layout_partname, serialize_part_xml(sld_layout))
+            result.layout_patched = True
+
+    for (sld_id, partname), plan in zip(generated, plans):
+        tag = slide_tag(slide_key(layout, plan, chrome))
+        if package.slide_name(partname) == tag:
+            result.slides_kept += 1
+            continue
+        sld = parse_xml(package.blobs[partname.membername])
+        fragment, _ = slide_fragment(layout, plan, SLIDE_FIRST_SHAPE_ID, chrome)
+        added, changed, removed = patch_sp_tree(sld.cSld.spTree, fragment)
+        sld.cSld.set("name", tag)
+        package.put(partname, serialize_part_xml(sld))
+        result.slides_patched += 1
+        result.shapes_added += added
+        result.shapes_changed += changed
+        result.shapes_removed += removed
+
+    if not plans:
+        sld_id, partname = generated[0]
+        if package.slide_name(partname) == EMPTY_SLIDE_TAG:
+            result.slides_kept += 1
+        else:
+            sld = parse_xml(package.blobs[partname.membername])
+            _, _, removed = patch_sp_tree(sld.cSld.spTree, "")
+            sld.cSld.set("name", EMPTY_SLIDE_TAG)
+            package.put(partname, serialize_part_xml(sld))
+            result.slides_patched += 1
+            result.shapes_removed += removed
+
+    for sld_id, partname in generated[max(len(plans), 1):]:
+        sld = parse_xml(package.blobs[partname.membername])
+        if _has_user_content(package, partname, sld):
+            # ユーザーの図形・ノートは残し、生成した図形だけを消してユーザーのスライドにする
+            _, _, removed = patch_sp_tree(sld.cSld.spTree, "")
+            del sld.cSld.attrib["name"]
+            package.put(partname, serialize_part_xml(sld))
+            result.slides_patched += 1
+        else:
+            removed = len(_shapes(sld.cSld.spTree))
+            _remove_slide(package, sld_id, partname)
+            result.slides_removed += 1
+        result.shapes_removed += removed
+
+    previous = generated[-1][0]
+    sld_ids = [int(s.get("id")) for s, _ in slides]
+    rids = free_rids({rel.rId for rel in package.prs_rels.relationship_lst})
+    for plan in plans[len(generated):]:
+        fragment, count = slide_fragment(layout, plan, SLIDE_FIRST_SHAPE_ID, chrome)
+        partname = package.next_partname("/ppt/slides/slide%d.xml")
+        rels = CT_Relationships.new()
+        rels.add_rel("rId1", RT.SLIDE_LAYOUT, layout_partname.relative_ref(partname.baseURI))
+        package.put(partname, slide_xml(fragment, slide_tag(slide_key(layout, plan, chrome))), CT.PML_SLIDE)
+        package.put(partname.rels_uri, rels.xml_file_bytes)
+        rid = next(rids)
+        package.prs_rels.add_rel(rid, RT.SLIDE, partname.relative_ref(package.prs_partname.baseURI))
+        sld_ids.append(max(sld_ids + [MIN_SLIDE_ID - 1]) + 1)
+        sld_id = etree.SubElement(previous.getparent(), qn("p:sldId"), {"id": str(sld_ids[-1])})
+        sld_id.set(qn("r:id"), rid)
+        previous.addnext(sld_id)
+        previous = sld_id
+        result.slides_added += 1
+        result.shapes_added += count
+
+    # python-pptx と同じく rId の番号順に並べる
+    ordered = sorted(package.prs_rels.relationship_lst, key=lambda r: (rid_number(r.rId), r.rId))
+    for rel in ordered:
+        package.prs_rels.append(rel)
+    package.write(output_path if output_path is not None else pptx_path)
+    return result
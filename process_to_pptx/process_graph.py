@@ -0,0 +1,290 @@
+"""ノード ID を密な整数に置き換えた接続グラフ。モデルごとに 1 回だけ作り、検証・列計算・描画計画で共有する。
+
+隣接は CSR 形式（offsets[i]:offsets[i+1] が i 番目のノードの辺）で持つ。
+- flow: next の辺（ノード順・next 順）
+- system: request_to / response_from の辺。向きは列の前後関係（request はノード→サービス、response はサービス→ノード）。
+  辺の表（system_sources / system_targets / system_roles）は YAML の記述順、CSR は辺の始点ごとに並べ替えた辺番号。
+- order: flow と system を合わせた列計算用の辺
+接続先 ID が存在しない辺は含めない。ID が重複した場合は後に現れたノードを接続先とする。
+
+レイアウト結果の表（NodePositions・FlowEdges・SystemEdges・EdgeLabels）もこの索引の上に array / list で持ち、
+ノード ID をキーにした dict・list と同じように読めるビューとして公開する。
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .yaml_loader import ProcessNode
+
+# system_roles の値 → layout.system_edges の role 文字列
+SYSTEM_ROLES = ("request", "response")
+ROLE_REQUEST = 0
+ROLE_RESPONSE = 1
+
+
+def _csr(num_nodes: int, sources: Sequence[int]) -> tuple[array, array]:
+    """辺の始点の列から (offsets, 辺番号) を作る（始点ごとに安定な計数ソート）。"""
+    offsets = array("i", [0]) * (num_nodes + 1)
+    for v in sources:
+        offsets[v + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+    fill = offsets[:-1]
+    order = array("i", [0]) * len(sources)
+    for e, v in enumerate(sources):
+        order[fill[v]] = e
+        fill[v] += 1
+    return offsets, order
+
+
+class ProcessGraph:
+    """ノードリストから作る接続の索引。ノードの並び（= 整数インデックス）は作成時の nodes と同じ。"""
+
+    def __init__(self, nodes: Sequence[ProcessNode]) -> None:
+        n = len(nodes)
+        self.ids: list[str | int] = [node.id for node in nodes]
+        self.index: dict[str | int, int] = {node_id: i for i, node_id in enumerate(self.ids)}
+        index = self.index
+
+        # flow: 始点がノード順に並ぶため、辺の表がそのまま CSR になる
+        self.flow_offsets = array("i", [0])
+        self.flow_sources = array("i")
+        self.flow_targets = array("i")
+        self.flow_in_degree = array("i", [0]) * n
+        self.flow_out_degree = array("i", [0]) * n
+        for i, node in enumerate(nodes):
+            for to_id in node.next_ids:
+                j = index.get(to_id)
+                if j is not None:
+                    self.flow_sources.append(i)
+                    self.flow_targets.append(j)
+                    self.flow_in_degree[j] += 1
+            self.flow_out_degree[i] = len(self.flow_targets) - self.flow_offsets[-1]
+            self.flow_offsets.append(len(self.flow_targets))
+
+        # system: 記述順の辺の表（layout.system_edges と同じ順）と、始点ごとの CSR
+        self.system_sources = array("i")
+        self.system_targets = array("i")
+        self.system_roles = array("b")
+        for i, node in enumerate(nodes):
+            for to_id in node.request_to:
+                j = index.get(to_id)
+                if j is not None:
+                    self.system_sources.append(i)
+                    self.system_targets.append(j)
+                    self.system_roles.append(ROLE_REQUEST)
+            for from_id in node.response_from:
+                j = index.get(from_id)
+                if j is not None:
+                    self.system_sources.append(j)
+                    self.system_targets.append(i)
+                    self.system_roles.append(ROLE_RESPONSE)
+        self.system_offsets, self.system_edge_order = _csr(n, self.system_sources)
+
+        # order: 列計算用（ノードごとに flow の辺 → system の辺の順）
+        self.order_offsets = array("i", [0])
+        self.order_targets = array("i")
+        self.order_in_degree = array("i", self.flow_in_degree)
+        for i in range(n):
+            self.order_targets.extend(self.flow_targets[self.flow_offsets[i] : self.flow_offsets[i + 1]])
+            for k in range(self.system_offsets[i], self.system_offsets[i + 1]):
+                j = self.system_targets[self.system_edge_order[k]]
+                self.order_targets.append(j)
+                self.order_in_degree[j] += 1
+            self.order_offsets.append(len(self.order_targets))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def flow_successors(self, i: int) -> array:
+        """i 番目のノードの next の接続先（インデックス）。"""
+        return self.flow_targets[self.flow_offsets[i] : self.flow_offsets[i + 1]]
+
+    def flow_edges(self) -> Iterator[tuple[int, int]]:
+        """next の辺 (from, to) をノード順・next 順に返す（辺番号の順）。"""
+        return zip(self.flow_sources, self.flow_targets)
+
+    def system_edges(self) -> Iterator[tuple[int, int, str]]:
+        """システム接続の辺 (from, to, "request"|"response") を記述順に返す。"""
+        for v, w, role in zip(self.system_sources, self.system_targets, self.system_roles):
+            yield v, w, SYSTEM_ROLES[role]
+
+    def isolated_flow_nodes(self, nodes: Sequence[ProcessNode]) -> list[str | int]:
+        """task / gateway / artifact のうち next の入次数・出次数がともに 0 のノードの ID。"""
+        return [
+            node.id
+            for i, node in enumerate(nodes)
+            if node.type in ("task", "gateway", "artifact")
+            and self.flow_in_degree[i] == 0
+            and self.flow_out_degree[i] == 0
+        ]
+
+
+class NodePositions(MutableMapping):
+    """ノード ID → (left, top, width, height) [EMU]。graph のインデックス順に 1 本の array("q") に持つ。"""
+
+    def __init__(self, graph: ProcessGraph) -> None:
+        self._graph = graph
+        self._rects = array("q", bytes(8 * 4 * len(graph)))
+        self._present = bytearray(len(graph))
+        self._count = 0
+
+    def __getitem__(self, node_id: str | int) -> tuple[int, int, int, int]:
+        i = self._graph.index[node_id]
+        if not self._present[i]:
+            raise KeyError(node_id)
+        k = 4 * i
+        return tuple(self._rects[k : k + 4])  # type: ignore[return-value]
+
+    def __setitem__(self, node_id: str | int, rect: tuple[int, int, int, int]) -> None:
+        i = self._graph.index[node_id]
+        self._rects[4 * i : 4 * i + 4] = array("q", rect)
+        if not self._present[i]:
+            self._present[i] = 1
+            self._count += 1
+
+    def set_rects(self, rects: array) -> None:
+        """ノード順の矩形（ノードごとに 4 要素）をまとめて設定する。ID が重複したノードは後のものを採用。"""
+        index, ids = self._graph.index, self._graph.ids
+        self._rects = array("q", rects)
+        self._present = bytearray(index[node_id] == i for i, node_id in enumerate(ids))
+        self._count = len(index)
+
+    def __delitem__(self, node_id: str | int) -> None:
+        i = self._graph.index[node_id]
+        if not self._present[i]:
+            raise KeyError(node_id)
+        self._present[i] = 0
+        self._count -= 1
+
+    def __contains__(self, node_id: object) -> bool:
+        i = self._graph.index.get(node_id)  # type: ignore[arg-type]
+        return i is not None and bool(self._present[i])
+
+    def __iter__(self) -> Iterator[str | int]:
+        ids = self._graph.ids
+        return (ids[i] for i, present in enumerate(self._present) if present)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class _EdgeView(Sequence):
+    """辺の表を ID の組の読み取り専用リストとして見せる。list と == で比較できる。"""
+
+    def __init__(self, graph: ProcessGraph) -> None:
+        self._graph = graph
+
+    def __getitem__(self, k):  # type: ignore[override]
+        if isinstance(k, slice):
+            return [self._edge(e) for e in range(len(self))[k]]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        return self._edge(k)
+
+    def __contains__(self, key: object) -> bool:
+        return self.find(key) >= 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def _edge(self, k: int) -> tuple:
+        raise NotImplementedError
+
+    def find(self, key: Any) -> int:
+        """key（ID の組）の辺番号。無ければ -1。"""
+        raise NotImplementedError
+
+
+class FlowEdges(_EdgeView):
+    """next の辺 (from_id, to_id) のリスト（layout.edges）。"""
+
+    def __len__(self) -> int:
+        return len(self._graph.flow_targets)
+
+    def _edge(self, k: int) -> tuple[str | int, str | int]:
+        ids = self._graph.ids
+        return ids[self._graph.flow_sources[k]], ids[self._graph.flow_targets[k]]
+
+    def __iter__(self) -> Iterator[tuple[str | int, str | int]]:
+        ids = self._graph.ids
+        return ((ids[v], ids[w]) for v, w in self._graph.flow_edges())
+
+    def find(self, key: Any) -> int:
+        g = self._graph
+        try:
+            from_id, to_id = key
+            v, w = g.index.get(from_id), g.index.get(to_id)
+        except (TypeError, ValueError):
+            return -1
+        if v is None or w is None:
+            return -1
+        for k in range(g.flow_offsets[v], g.flow_offsets[v + 1]):
+            if g.flow_targets[k] == w:
+                return k
+        return -1
+
+
+class SystemEdges(_EdgeView):
+    """システム接続の辺 (from_id, to_id, "request"|"response") のリスト（layout.system_edges）。"""
+
+    def __len__(self) -> int:
+        return len(self._graph.system_targets)
+
+    def _edge(self, k: int) -> tuple[str | int, str | int, str]:
+        g = self._graph
+        return g.ids[g.system_sources[k]], g.ids[g.system_targets[k]], SYSTEM_ROLES[g.system_roles[k]]
+
+    def __iter__(self) -> Iterator[tuple[str | int, str | int, str]]:
+        ids = self._graph.ids
+        return ((ids[v], ids[w], role) for v, w, role in self._graph.system_edges())
+
+    def find(self, key: Any) -> int:
+        g = self._graph
+        try:
+            from_id, to_id, role = key
+            v, w = g.index.get(from_id), g.index.get(to_id)
+        except (TypeError, ValueError):
+            return -1
+        if v is None or w is None or role not in SYSTEM_ROLES:
+            return -1
+        r = SYSTEM_ROLES.index(role)
+        for k in range(g.system_offsets[v], g.system_offsets[v + 1]):
+            e = g.system_edge_order[k]
+            if g.system_targets[e] == w and g.system_roles[e] == r:
+                return e
+        return -1
+
+
+class EdgeLabels(Mapping):
+    """辺（ID の組）→ 矢印ラベル。辺番号順のリストに持ち、ラベルの無い辺はキーに含めない。"""
+
+    def __init__(self, edges: _EdgeView, labels: list[Optional[str]]) -> None:
+        self._edges = edges
+        self._labels = labels
+
+    def __getitem__(self, key: Any) -> str:
+        k = self._edges.find(key)
+        label = self._labels[k] if k >= 0 else None
+        if label is None:
+            raise KeyError(key)
+        return label
+
+    def __iter__(self) -> Iterator[tuple]:
+        return (edge for edge, label in zip(self._edges, self._labels) if label is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for label in self._labels if label is not None)
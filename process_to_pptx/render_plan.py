@@ -0,0 +1,282 @@
+"""ProcessLayout からスライド単位の描画計画（ノード・エッジ・サービス磁気ディスク）を事前計算する。
+
+描画側はスライドごとに全エッジ・全ノードを走査せず、この計画をそのまま描けばよい。
+python-pptx に依存しないため、PPTX 以外の描画（SVG・.drawio 等）からも利用できる。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from .process_graph import ProcessGraph
+from .yaml_loader import EMU_PER_PT, LayoutNode, ProcessLayout, TASK_AREA_LEFT_GAP_EMU
+
+# システム用レーンに集約されたアクター名（yaml_loader._collapse_system_lanes と同じ）
+SYSTEM_LANE_NAME = "システム"
+
+# 四角形の接続点: 0=上, 1=左, 2=下, 3=右（各辺の中央）
+CONNECTION_SITE_TOP = 0
+CONNECTION_SITE_LEFT = 1
+CONNECTION_SITE_BOTTOM = 2
+CONNECTION_SITE_RIGHT = 3
+
+# 矢印ラベルのテキストボックス寸法（EMU）
+EDGE_LABEL_WIDTH_EMU = 360000  # 約 1cm（ラベルが収まる幅）
+EDGE_LABEL_HEIGHT_EMU = 120000  # 約 3mm（8pt テキスト用）
+EDGE_LABEL_OFFSET_EMU = 60000  # 矢印の上側にオフセット
+
+# DoD: アクター名の四角 — 点線から 2pt 離して長方形、等間隔（yaml2pptx と同じ値）
+ACTOR_BOX_GAP_EMU = 2 * EMU_PER_PT
+
+
+def node_shape_rect(node_type: str, left: int, top: int, width: int, height: int) -> tuple[int, int, int, int]:
+    """ノードのセル矩形から実際の図形矩形を返す。スタート・ゴール・サービスはセル内中央の正方形。"""
+    if node_type in ("start", "end", "service"):
+        side = min(width, height)
+        return left + (width - side) // 2, top + (height - side) // 2, side, side
+    return left, top, width, height
+
+
+def site_point(rect: tuple[int, int, int, int], site: int) -> tuple[int, int]:
+    """図形の接続点（0=上, 1=左, 2=下, 3=右）の座標。"""
+    x, y, cx, cy = rect
+    if site == 0:
+        return int(x + cx / 2), y
+    if site == 1:
+        return x, int(y + cy / 2)
+    if site == 2:
+        return int(x + cx / 2), y + cy
+    return x + cx, int(y + cy / 2)
+
+
+def return_route(begin: tuple[int, int], end: tuple[int, int], route_y: int) -> list[tuple[int, int]]:
+    """戻り矢印の U 字の折れ線: 始点（下辺）から route_y まで下り、水平に進んで終点（下辺）へ上る。"""
+    (bx, by), (ex, ey) = begin, end
+    return [(bx, by), (bx, route_y), (ex, route_y), (ex, ey)]
+
+
+def _return_route_y(layout: ProcessLayout, from_node: LayoutNode, to_node: LayoutNode) -> int:
+    """戻り矢印の水平区間の y。両端の図形の下辺の低い方と、下側のレーンの下端との中間（図形の枠に重ならない）。"""
+    bottom = max(
+        rect[1] + rect[3]
+        for rect in (node_shape_rect(n.type, *layout.node_positions[n.id]) for n in (from_node, to_node))
+    )
+    lane = max(from_node.actor_index, to_node.actor_index)
+    lane_bottom = layout.content_top_offset + (lane + 1) * layout.lane_height
+    return (bottom + lane_bottom) // 2
+
+
+def _connection_site_from(from_node, to_node) -> int:
+    """始点（from）側の接続辺。基本は右から出る。同列（同じ column）のときだけ上下。"""
+    # 通常エッジは to.column > from.column なので同列にならない。同列はシステム接続などのみ。
+    if from_node.column == to_node.column:
+        if to_node.actor_index < from_node.actor_index:
+            return CONNECTION_SITE_TOP  # 次が上レーン → 上から出す
+        if to_node.actor_index > from_node.actor_index:
+            return CONNECTION_SITE_BOTTOM  # 次が下レーン → 下から出す
+    return CONNECTION_SITE_RIGHT  # 右から出る
+
+
+def _connection_site_to(from_node, to_node) -> int:
+    """終点（to）側の接続辺。基本は左から入る。同列のときだけ上下で受け。"""
+    if from_node.column == to_node.column:
+        if from_node.actor_index < to_node.actor_index:
+            return CONNECTION_SITE_TOP  # 上から来る → 上で受け
+        if from_node.actor_index > to_node.actor_index:
+            return CONNECTION_SITE_BOTTOM  # 下から来る → 下で受け
+    return CONNECTION_SITE_LEFT  # 左で受ける
+
+
+@dataclass
+class ServiceDiskPlacement:
+    """サービスノードの無いスライドでシステムレーン左端に描く磁気ディスク。"""
+
+    node_id: str | int  # 矢印の接続先として登録するサービスノード ID（同じ label の代表）
+    label: str
+    left: int
+    top: int
+    width: int
+    height: int
+
+
+@dataclass
+class FlowEdgePlan:
+    """スライド内で描くフロー矢印（next）。"""
+
+    from_node: LayoutNode
+    to_node: LayoutNode
+    straight: bool  # True=同一レーン内の直線、False=レーン間の折れ線
+    site_from: int
+    site_to: int
+    label: str | None = None
+    # ラベルのテキストボックス (left, top, width, height)。label があるときのみ
+    label_rect: tuple[int, int, int, int] | None = None
+    back: bool = False  # ループを閉じる戻り矢印（layout.back_edges）
+    # 戻り矢印の水平区間の y（下辺→下辺を図形の下へ回す U 字。return_route 参照）。それ以外は None
+    route_y: int | None = None
+
+
+@dataclass
+class SystemEdgePlan:
+    """スライド内で描くシステム接続の点線（request / response）。"""
+
+    from_node: LayoutNode
+    to_node: LayoutNode
+    role: str  # "request" | "response"
+    site_from: int
+    site_to: int
+    label: str | None = None
+    label_rect: tuple[int, int, int, int] | None = None
+
+
+@dataclass
+class SlidePlan:
+    """1 スライド分の描画対象。リストの並びがそのまま描画順になる。"""
+
+    slide_index: int
+    nodes: list[LayoutNode] = field(default_factory=list)
+    service_disks: list[ServiceDiskPlacement] = field(default_factory=list)
+    edges: list[FlowEdgePlan] = field(default_factory=list)
+    system_edges: list[SystemEdgePlan] = field(default_factory=list)
+
+
+def _label_rect(layout: ProcessLayout, from_id, to_id) -> tuple[int, int, int, int]:
+    """両端ノードの中心の中点を基準に、矢印の上側へラベル枠を置く。"""
+    fl, ft, fw, fh = layout.node_positions[from_id]
+    tl, tt, tw, th = layout.node_positions[to_id]
+    mx = (fl + fw // 2 + tl + tw // 2) // 2
+    my = (ft + fh // 2 + tt + th // 2) // 2
+    return (
+        mx - EDGE_LABEL_WIDTH_EMU // 2,
+        my - EDGE_LABEL_HEIGHT_EMU - EDGE_LABEL_OFFSET_EMU,
+        EDGE_LABEL_WIDTH_EMU,
+        EDGE_LABEL_HEIGHT_EMU,
+    )
+
+
+def _service_disks(layout: ProcessLayout, service_nodes: list[LayoutNode]) -> list[ServiceDiskPlacement]:
+    """システムレーンの一番左（列 0, 1, 2 …）に label ごとの磁気ディスクを並べる。"""
+    unique_system_labels = sorted(set(n.label for n in service_nodes))
+    id_by_label = {n.label: n.id for n in service_nodes}
+    system_lane_idx = len(layout.actors) - 1
+    unit = layout.task_side + layout.gap
+    base_left = layout.left_margin + layout.left_label_width + TASK_AREA_LEFT_GAP_EMU
+    top = layout.content_top_offset + system_lane_idx * layout.lane_height + (
+        layout.lane_height - layout.task_side
+    ) // 2
+    return [
+        ServiceDiskPlacement(
+            node_id=id_by_label[label],
+            label=label,
+            left=base_left + col * unit,
+            top=top,
+            width=layout.task_side,
+            height=layout.task_side,
+        )
+        for col, label in enumerate(unique_system_labels)
+    ]
+
+
+def build_render_plan(layout: ProcessLayout) -> list[SlidePlan]:
+    """
+    layout.nodes / edges / system_edges をスライドごとに振り分けた描画計画を返す。
+    辺の両端は layout.graph のインデックスで引くため、計算量は図の大きさに比例する。
+    """
+    plans = [SlidePlan(slide_index=i) for i in range(layout.num_slides)]
+    graph = layout.graph if layout.graph is not None else ProcessGraph(layout.nodes)
+    nodes = layout.nodes
+
+    # スライドごとに描いた図形の ID（矢印の接続可否の判定用）
+    drawn_ids: list[set[str | int]] = [set() for _ in plans]
+    service_nodes: list[LayoutNode] = []
+    service_slides: set[int] = set()
+    for node in layout.nodes:
+        if node.type == "service":
+            service_nodes.append(node)
+            service_slides.add(node.slide_index)
+        if not 0 <= node.slide_index < len(plans):
+            continue
+        if node.id not in layout.node_positions:
+            continue
+        plans[node.slide_index].nodes.append(node)
+        drawn_ids[node.slide_index].add(node.id)
+
+    # システム用レーンがあるがサービスノードがこのスライドに無い場合、
+    # ページ毎にシステムが表示され矢印が伸ばせるよう磁気ディスクを描く
+    if layout.actors and layout.actors[-1] == SYSTEM_LANE_NAME and service_nodes:
+        disks = _service_disks(layout, service_nodes)
+        for plan in plans:
+            if plan.slide_index in service_slides:
+                continue
+            plan.service_disks = disks
+            drawn_ids[plan.slide_index].update(d.node_id for d in disks)
+
+    system_lanes = {i for i, name in enumerate(layout.actors) if name == SYSTEM_LANE_NAME}
+
+    # フロー矢印: 両端が同じスライドにあるもののみ
+    for v, w in graph.flow_edges():
+        from_node, to_node = nodes[v], nodes[w]
+        from_id, to_id = from_node.id, to_node.id
+        slide_idx = from_node.slide_index
+        if to_node.slide_index != slide_idx or not 0 <= slide_idx < len(plans):
+            continue
+        if from_id not in drawn_ids[slide_idx] or to_id not in drawn_ids[slide_idx]:
+            continue
+        # 接続点: システムレーンへの矢印はタスク下辺・システム上辺。戻り矢印は下辺→下辺で、図形の下を回る U 字。
+        # それ以外は右→左 or 同列で上下
+        back = (from_id, to_id) in layout.back_edges
+        route_y = None
+        if to_node.actor_index in system_lanes:
+            site_from, site_to = CONNECTION_SITE_BOTTOM, CONNECTION_SITE_TOP
+        elif from_node.actor_index in system_lanes:
+            site_from, site_to = CONNECTION_SITE_TOP, CONNECTION_SITE_BOTTOM
+        elif back:
+            site_from, site_to = CONNECTION_SITE_BOTTOM, CONNECTION_SITE_BOTTOM
+            route_y = _return_route_y(layout, from_node, to_node)
+        else:
+            site_from = _connection_site_from(from_node, to_node)
+            site_to = _connection_site_to(from_node, to_node)
+        label = layout.edge_labels.get((from_id, to_id))
+        plans[slide_idx].edges.append(
+            FlowEdgePlan(
+                from_node=from_node,
+                to_node=to_node,
+                straight=from_node.actor_index == to_node.actor_index and not back,
+                site_from=site_from,
+                site_to=site_to,
+                label=label,
+                label_rect=_label_rect(layout, from_id, to_id) if label else None,
+                back=back,
+                route_y=route_y,
+            )
+        )
+
+    # システム接続: from がこのスライドにあれば描画し、to はこのスライドの図形（磁気ディスク含む）に接続
+    for v, w, role in graph.system_edges():
+        from_node, to_node = nodes[v], nodes[w]
+        from_id, to_id = from_node.id, to_node.id
+        slide_idx = from_node.slide_index
+        if not 0 <= slide_idx < len(plans):
+            continue
+        if from_id not in drawn_ids[slide_idx] or to_id not in drawn_ids[slide_idx]:
+            continue
+        if role == "request":
+            # タスクの下辺から出てシステムの上辺に入る
+            site_from, site_to = CONNECTION_SITE_BOTTOM, CONNECTION_SITE_TOP
+        else:
+            # レスポンスはシステム上辺→タスク下辺
+            site_from, site_to = CONNECTION_SITE_TOP, CONNECTION_SITE_BOTTOM
+        label = layout.system_edge_labels.get((from_id, to_id, role))
+        plans[slide_idx].system_edges.append(
+            SystemEdgePlan(
+                from_node=from_node,
+                to_node=to_node,
+                role=role,
+                site_from=site_from,
+                site_to=site_to,
+                label=label,
+                label_rect=_label_rect(layout, from_id, to_id) if label else None,
+            )
+        )
+
+    return plans
@@ -0,0 +1,47 @@
+"""生成した図形・スライドに付ける名前（タグ）。既存の PPTX を差分で更新するときの目印になる（pptx_update）。
+
+図形は cNvPr の name に、何を描いたものか（ノード ID・矢印の両端など）を表す TAG_PREFIX 付きの名前を持つ。
+スライドは cSld の name に、そのスライドの描画入力のハッシュ（slide_cache.slide_key）を持つ。
+ユーザーが後から足した図形・スライドはこの名前を持たないため、更新で書き換えずにそのまま残せる。
+"""
+
+from __future__ import annotations
+
+TAG_PREFIX = "p2p:"
+# 空のモデル（アクターもノードも無い）で描いた白紙のスライドの名前
+EMPTY_SLIDE_TAG = TAG_PREFIX + "empty"
+
+
+def is_tag(name: str | None) -> bool:
+    """name が生成した図形・スライドの名前か。"""
+    return name is not None and name.startswith(TAG_PREFIX)
+
+
+def node_tag(node_id: str | int) -> str:
+    """ノードの図形。"""
+    return f"{TAG_PREFIX}node:{node_id}"
+
+
+def disk_tag(node_id: str | int) -> str:
+    """サービスノードの無いスライドに描く磁気ディスク（node_id は代表のサービスノード ID）。"""
+    return f"{TAG_PREFIX}disk:{node_id}"
+
+
+def edge_tag(kind: str, from_id: str | int, to_id: str | int, label: bool = False) -> str:
+    """矢印（kind は flow / request / response）。label=True ならその矢印のラベル。"""
+    return f"{TAG_PREFIX}{kind}{'-label' if label else ''}:{from_id}>{to_id}"
+
+
+def actor_tag(index: int) -> str:
+    """レーンのアクター名の四角。"""
+    return f"{TAG_PREFIX}actor:{index}"
+
+
+def lane_tag(index: int) -> str:
+    """レーン index の上端の区切り線（index は 1 から）。"""
+    return f"{TAG_PREFIX}lane:{index}"
+
+
+def slide_tag(key: str) -> str:
+    """スライドの名前（key は slide_cache.slide_key）。"""
+    return TAG_PREFIX + key
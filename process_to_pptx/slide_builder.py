@@ -0,0 +1,81 @@
+"""スライドへの図形追加を担う薄い層。図形 ID は python-pptx に問い合わせず自前のカウンタで払い出す。
+
+python-pptx の ``slide.shapes.add_*`` は追加のたびにスライド内の全 @id を走査して次の ID を求めるため、
+図形数 n のスライドでは O(n^2) になる。SlideBuilder は開始時に 1 回だけ最大 ID を調べ、
+以降はカウンタを進めるだけなので、1 スライドの構築コストは図形数に比例する。
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from pptx.shapes.autoshape import AutoShapeType
+from pptx.enum.shapes import MSO_CONNECTOR_TYPE, MSO_SHAPE
+from pptx.oxml.ns import qn
+from pptx.oxml.shapes.autoshape import CT_Shape
+from pptx.oxml.shapes.connector import CT_Connector
+
+
+class SlideBuilder:
+    """1 枚のスライドに図形を追加する。python-pptx の add_shape / add_connector / add_textbox と同じ図形を返す。"""
+
+    def __init__(self, slide) -> None:
+        self.slide = slide
+        self._shapes = slide.shapes
+        self._spTree = self._shapes._spTree
+        # 既存図形（プレースホルダ等）の最大 ID を 1 回だけ調べ、以降はカウンタで払い出す
+        self._last_id = self._spTree.max_shape_id
+        # spTree 末尾に extLst があれば図形はその前に挿入する（スキーマ順序の維持）
+        self._ext_lst = self._spTree.find(qn("p:extLst"))
+
+    def next_shape_id(self) -> int:
+        """次の図形 ID を払い出す。"""
+        self._last_id += 1
+        return self._last_id
+
+    def _append(self, elm) -> None:
+        if self._ext_lst is None:
+            self._spTree.append(elm)
+        else:
+            self._ext_lst.addprevious(elm)
+
+    def _named(self, elm, name: Optional[str]):
+        if name is not None:
+            elm[0][0].set("name", name)  # nvSpPr / nvCxnSpPr の cNvPr
+        self._append(elm)
+        return self._shapes._shape_factory(elm)
+
+    def add_shape(
+        self, autoshape_type_id: MSO_SHAPE, left: int, top: int, width: int, height: int, name: Optional[str] = None
+    ):
+        """オートシェイプを追加する（slide.shapes.add_shape 相当）。name を省くと python-pptx と同じ名前になる。"""
+        autoshape_type = AutoShapeType(autoshape_type_id)
+        id_ = self.next_shape_id()
+        sp = CT_Shape.new_autoshape_sp(
+            id_, "%s %d" % (autoshape_type.basename, id_ - 1), autoshape_type.prst, left, top, width, height
+        )
+        return self._named(sp, name)
+
+    def add_connector(
+        self,
+        connector_type: MSO_CONNECTOR_TYPE,
+        begin_x: int,
+        begin_y: int,
+        end_x: int,
+        end_y: int,
+        name: Optional[str] = None,
+    ):
+        """コネクタを追加する（slide.shapes.add_connector 相当）。"""
+        id_ = self.next_shape_id()
+        flipH, flipV = begin_x > end_x, begin_y > end_y
+        x, y = min(begin_x, end_x), min(begin_y, end_y)
+        cx, cy = abs(end_x - begin_x), abs(end_y - begin_y)
+        prst = MSO_CONNECTOR_TYPE.to_xml(connector_type)
+        cxnSp = CT_Connector.new_cxnSp(id_, "Connector %d" % (id_ - 1), prst, x, y, cx, cy, flipH, flipV)
+        return self._named(cxnSp, name)
+
+    def add_textbox(self, left: int, top: int, width: int, height: int, name: Optional[str] = None):
+        """テキストボックスを追加する（slide.shapes.add_textbox 相当）。"""
+        id_ = self.next_shape_id()
+        sp = CT_Shape.new_textbox_sp(id_, "TextBox %d" % (id_ - 1), left, top, width, height)
+        return self._named(sp, name)
@@ -0,0 +1,196 @@
+"""スライドごとの描画結果（スライドパーツの XML）を、そのスライドの描画入力のハッシュで引くキャッシュ。
+
+キーはスライドに載るノード（ID・種別・テキスト・矩形）・磁気ディスク・矢印（両端・接続点・ラベルと位置）と、
+描画に効くレイアウトの値（フォント、レーンを描く場合はアクター・余白・寸法）のハッシュ。ラベルを 1 つ直しただけなら
+変わるのはそのラベルが載るスライドのキーだけで、残りのスライドは XML を組み立て直さずキャッシュからそのまま書く
+（yaml_to_pptx(..., slide_cache=...)。パッケージは pptx_stream で組み立て直す）。
+
+メモリ上の LRU（合計バイト数の上限付き）と、directory を指定した場合のディスク（parse_cache.DiskStore。
+CLI の --cache-dir と同じディレクトリを共有し、合計サイズの上限を超えたら最後に使われたのが古いものから削除）に置く。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pptx
+
+from .parse_cache import DEFAULT_MAX_BYTES, DiskStore
+from .render_plan import SlidePlan
+from .yaml_loader import ProcessLayout
+
+# キーに含まれる。fast_render のテンプレートやスライド XML の組み立て方（図形・スライドの名前を含む）を変えたら上げる
+SLIDE_CACHE_VERSION = 3
+DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+
+
+def slide_key(layout: ProcessLayout, plan: SlidePlan, chrome: bool) -> str:
+    """plan のスライドの描画入力のハッシュ（fast_render.slide_fragment が読む値だけ）。
+    生成したスライドの名前にもなる（shape_tags.slide_tag。pptx_update が変わったスライドを見分ける）。"""
+    digest = hashlib.sha256(b"slide:v%d:%s:%d\0" % (SLIDE_CACHE_VERSION, pptx.__version__.encode(), marshal.version))
+    fonts = (layout.task_font_pt, layout.label_font_pt)
+    if chrome:
+        fonts += (
+            tuple(layout.actors),
+            layout.actor_font_pt,
+            layout.slide_width,
+            layout.left_margin,
+            layout.right_margin,
+            layout.left_label_width,
+            layout.content_top_offset,
+            layout.lane_height,
+        )
+    digest.update(marshal.dumps((chrome, fonts)))
+    positions = layout.node_positions
+    digest.update(
+        marshal.dumps(
+            [
+                (n.id, n.type, n.gateway_type if n.type == "gateway" else n.label, tuple(positions[n.id]))
+                for n in plan.nodes
+            ]
+        )
+    )
+    digest.update(
+        marshal.dumps([(d.node_id, d.label, d.left, d.top, d.width, d.height) for d in plan.service_disks])
+    )
+    digest.update(
+        marshal.dumps(
+            [
+                (e.from_node.id, e.to_node.id, e.straight, e.site_from, e.site_to, e.label, e.label_rect, e.route_y)
+                for e in plan.edges
+            ]
+        )
+    )
+    digest.update(
+        marshal.dumps(
+            [
+                (e.from_node.id, e.to_node.id, e.role, e.site_from, e.site_to, e.label, e.label_rect)
+                for e in plan.system_edges
+            ]
+        )
+    )
+    return digest.hexdigest()
+
+
+@dataclass
+class SlideCacheStats:
+    """キャッシュの利用状況。evictions はメモリ・ディスクから追い出したエントリの数の合計。"""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    memory_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def format(self) -> str:
+        """1 行の要約（CLI の --cache-stats）。"""
+        return (
+            f"Slide cache: {self.hits} hit(s), {self.misses} miss(es) ({self.hit_rate:.0%}), "
+            f"{self.evictions} evicted, {self.entries} in memory ({self.memory_bytes / 1024:.0f} KiB)"
+        )
+
+
+class SlideCache:
+    """スライドの描画入力のハッシュ → (スライドパーツの XML, 図形数) のキャッシュ（メモリ LRU ＋任意でディスク）。"""
+
+    def __init__(
+        self,
+        directory: Optional[str | Path] = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.store = DiskStore(directory, max_bytes) if directory is not None else None
+        self.max_memory_bytes = max_memory_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory: OrderedDict[str, tuple[bytes, int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+    def key(self, layout: ProcessLayout, plan: SlidePlan, chrome: bool) -> str:
+        """plan のスライドのキー（slide_key）。"""
+        return slide_key(layout, plan, chrome)
+
+    def contains(self, key: str) -> bool:
+        """key があるか（中身は読まず、hits / misses も数えない）。"""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self.store is not None and self.store.entry_path(key).exists()
+
+    def get(self, key: str) -> Optional[tuple[bytes, int]]:
+        """key の (スライド XML, 図形数)（無ければ None）。"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+        stored = self.store.read(key) if self.store is not None else None
+        if stored is not None:
+            try:
+                blob, count = marshal.loads(zlib.decompress(stored))
+                value = (blob, count)
+            except (ValueError, EOFError, TypeError, zlib.error):
+                self.store.discard(key)  # type: ignore[union-attr]
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, blob: bytes, count: int) -> None:
+        """スライド XML と図形数を保存する。ディスクの上限による削除は flush() でまとめて行う。"""
+        with self._lock:
+            self._remember(key, (blob, count))
+            self._unflushed += 1
+        if self.store is not None:
+            self.store.write(key, zlib.compress(marshal.dumps((blob, count)), 1), evict=False)
+
+    def flush(self) -> None:
+        """put したエントリがあれば、ディスクの合計サイズを上限以下にする（1 つの PPTX を書き終えたときに呼ぶ）。"""
+        with self._lock:
+            unflushed, self._unflushed = self._unflushed, 0
+        if unflushed and self.store is not None:
+            removed = self.store.evict()
+            with self._lock:
+                self.evictions += removed
+
+    def stats(self) -> SlideCacheStats:
+        with self._lock:
+            return SlideCacheStats(self.hits, self.misses, self.evictions, len(self._memory), self._memory_bytes)
+
+    def clear(self) -> None:
+        """メモリとディスクの全エントリを削除する（ディスクは同じディレクトリの他のキャッシュも消える）。"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.store is not None:
+            self.store.clear()
+
+    def _remember(self, key: str, value: tuple[bytes, int]) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old[0])
+        self._memory[key] = value
+        self._memory_bytes += len(value[0])
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
@@ -0,0 +1,269 @@
+"""ProcessLayout を SVG と HTML（1 ページに 1 スライド）に描くプレビュー用レンダラ。
+
+PPTX を作って LibreOffice で画像にする代わりに、レーン・ノード図形（菱形・円・データ・磁気ディスク）・
+矢印・ラベルを PPTX と同じ座標（EMU をそのまま viewBox に使う）で描く。python-pptx は import しない。
+レーン（アクター名・区切り線）と矢印の端の形は defs に 1 回だけ書き、各スライドから <use> で参照する。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from .layout_cache import LayoutCache
+from .parse_cache import ParseCache
+from .render_plan import ACTOR_BOX_GAP_EMU, SlidePlan, build_render_plan, node_shape_rect, return_route, site_point
+from .yaml_loader import EMU_PER_INCH, EMU_PER_PT, ProcessLayout, ProcessModel, ProcessSource
+
+PREVIEW_FORMATS = ("svg", "html")
+
+EMU_PER_PX = EMU_PER_INCH // 96
+# SVG で縦に並べるスライドの間隔
+SLIDE_GAP_EMU = EMU_PER_INCH // 4
+# 要素 ID の接頭辞（HTML に埋め込んでも他の ID とぶつからないように）
+ID_PREFIX = "p2p-"
+
+# 色・線幅は PPTX の描画（yaml2pptx）に合わせる
+_NODE_STYLE = 'fill="#E8E8E8" stroke="#373737" stroke-width="9525"'
+_CONNECTOR_STYLE = 'fill="none" stroke="#373737" stroke-width="12700"'
+_DOT_DASH = 'stroke-dasharray="12700 25400"'
+_FONT_FAMILY = "'Yu Gothic', 'Hiragino Sans', Meiryo, sans-serif"
+# 角丸四角形の角の半径（PowerPoint の roundRect の既定値: 短辺の 16.667%）
+_ROUND_RECT_RATIO = 0.16667
+
+_DEFS = (
+    '<marker id="' + ID_PREFIX + 'arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="3" markerHeight="3"'
+    ' orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="#373737"/></marker>'
+    '<marker id="' + ID_PREFIX + 'dot" viewBox="0 0 10 10" refX="5" refY="5" markerWidth="3" markerHeight="3">'
+    '<circle cx="5" cy="5" r="5" fill="#373737"/></marker>'
+)
+
+_HTML_STYLE = (
+    "body{margin:0;background:#808080}"
+    "section.slide{margin:16px auto;background:#fff;box-shadow:0 1px 4px rgba(0,0,0,.4);width:fit-content}"
+    "section.slide svg{display:block}"
+    "@media print{body{background:none}section.slide{margin:0;box-shadow:none;break-after:page}}"
+)
+
+
+def _px(emu: int) -> str:
+    return "%g" % round(emu / EMU_PER_PX, 2)
+
+
+def _text(x: float, y: float, text: str, size_pt: int, bold: bool = False) -> str:
+    """(x, y) を中心に text を描く。改行は行ごとの tspan にする。"""
+    lines = text.replace("\v", "\n").split("\n")
+    size = size_pt * EMU_PER_PT
+    weight = ' font-weight="bold"' if bold else ""
+    head = '<text x="%d" y="%d" font-size="%d"%s text-anchor="middle" dominant-baseline="central">' % (
+        x, y, size, weight
+    )
+    if len(lines) == 1:
+        return head + escape(text) + "</text>"
+    first = -(len(lines) - 1) * 0.6
+    spans = "".join(
+        '<tspan x="%d" dy="%gem">%s</tspan>' % (x, first if i == 0 else 1.2, escape(line))
+        for i, line in enumerate(lines)
+    )
+    return head + spans + "</text>"
+
+
+def _shape(node_type: str, rect: tuple[int, int, int, int]) -> str:
+    """ノード種別ごとの図形（PPTX のプリセット図形と同じ形）。"""
+    x, y, w, h = rect
+    if node_type == "gateway":
+        return '<polygon points="%d,%d %d,%d %d,%d %d,%d" %s/>' % (
+            x + w // 2, y, x + w, y + h // 2, x + w // 2, y + h, x, y + h // 2, _NODE_STYLE
+        )
+    if node_type in ("start", "end"):
+        return '<ellipse cx="%d" cy="%d" rx="%d" ry="%d" %s/>' % (x + w // 2, y + h // 2, w // 2, h // 2, _NODE_STYLE)
+    if node_type == "artifact":
+        dx = w // 5
+        return '<polygon points="%d,%d %d,%d %d,%d %d,%d" %s/>' % (
+            x + dx, y, x + w, y, x + w - dx, y + h, x, y + h, _NODE_STYLE
+        )
+    if node_type == "service":
+        rx, ry = w // 2, h // 6
+        return (
+            '<path d="M%d,%d A%d,%d 0 0 1 %d,%d V%d A%d,%d 0 0 1 %d,%d Z" %s/>'
+            '<path d="M%d,%d A%d,%d 0 0 0 %d,%d" fill="none" stroke="#373737" stroke-width="9525"/>'
+            % (x, y + ry, rx, ry, x + w, y + ry, y + h - ry, rx, ry, x, y + h - ry, _NODE_STYLE,
+               x, y + ry, rx, ry, x + w, y + ry)
+        )
+    r = int(min(w, h) * _ROUND_RECT_RATIO)
+    return '<rect x="%d" y="%d" width="%d" height="%d" rx="%d" %s/>' % (x, y, w, h, r, _NODE_STYLE)
+
+
+def _node(layout: ProcessLayout, node_type: str, text: str, rect: tuple[int, int, int, int]) -> str:
+    x, y, w, h = rect
+    return _shape(node_type, rect) + _text(x + w / 2, y + h / 2, text, layout.task_font_pt)
+
+
+def _connector(
+    begin: tuple[int, int], end: tuple[int, int], straight: bool, system: bool, route_y: Optional[int] = None
+) -> str:
+    """
+    矢印 1 本。折れ線は PPTX の bentConnector3 と同じく 横→縦（中央）→横 の 3 区間。
+    route_y を渡すと戻り矢印の U 字（下→横→上。render_plan.return_route）。
+    """
+    (bx, by), (ex, ey) = begin, end
+    if straight:
+        points = "%d,%d %d,%d" % (bx, by, ex, ey)
+    elif route_y is not None:
+        points = " ".join("%d,%d" % point for point in return_route(begin, end, route_y))
+    else:
+        mx = (bx + ex) // 2
+        points = "%d,%d %d,%d %d,%d %d,%d" % (bx, by, mx, by, mx, ey, ex, ey)
+    style = _CONNECTOR_STYLE + ' marker-end="url(#%sarrow)"' % ID_PREFIX
+    if system:
+        style += ' %s marker-start="url(#%sdot)"' % (_DOT_DASH, ID_PREFIX)
+    return '<polyline points="%s" %s/>' % (points, style)
+
+
+def _label(layout: ProcessLayout, text: str, rect: tuple[int, int, int, int]) -> str:
+    x, y, w, h = rect
+    return _text(x + w / 2, y + h / 2, text, layout.label_font_pt)
+
+
+def chrome_svg(layout: ProcessLayout) -> str:
+    """アクター名の四角とレーン区切りの点線（全スライド共通）。"""
+    parts = []
+    for i, name in enumerate(layout.actors):
+        top = layout.content_top_offset + i * layout.lane_height + ACTOR_BOX_GAP_EMU
+        height = layout.lane_height - 2 * ACTOR_BOX_GAP_EMU
+        parts.append(
+            '<rect x="%d" y="%d" width="%d" height="%d" fill="none" stroke="#000" stroke-width="9525"/>'
+            % (layout.left_margin, top, layout.left_label_width, height)
+        )
+        parts.append(
+            _text(layout.left_margin + layout.left_label_width / 2, top + height / 2, name, layout.actor_font_pt, True)
+        )
+    x1, x2 = layout.left_margin, int(layout.slide_width - layout.right_margin)
+    for i in range(1, len(layout.actors)):
+        y = layout.content_top_offset + i * layout.lane_height
+        parts.append(
+            '<line x1="%d" y1="%d" x2="%d" y2="%d" stroke="#808080" stroke-width="6350" %s/>'
+            % (x1, y, x2, y, _DOT_DASH)
+        )
+    return "".join(parts)
+
+
+def slide_body_svg(layout: ProcessLayout, plan: SlidePlan) -> str:
+    """1 スライド分のノード・磁気ディスク・矢印・ラベル（描画順は PPTX と同じ）。"""
+    parts = []
+    rects: dict[str | int, tuple[int, int, int, int]] = {}
+    for node in plan.nodes:
+        rect = node_shape_rect(node.type, *layout.node_positions[node.id])
+        if node.type == "gateway":
+            text = "＋" if node.gateway_type == "parallel" else "✕"
+        else:
+            text = node.label
+        parts.append(_node(layout, node.type, text, rect))
+        rects[node.id] = rect
+    for disk in plan.service_disks:
+        rect = node_shape_rect("service", disk.left, disk.top, disk.width, disk.height)
+        parts.append(_node(layout, "service", disk.label, rect))
+        rects[disk.node_id] = rect
+    for edge in plan.edges:
+        begin = site_point(rects[edge.from_node.id], edge.site_from)
+        end = site_point(rects[edge.to_node.id], edge.site_to)
+        parts.append(_connector(begin, end, edge.straight, system=False, route_y=edge.route_y))
+        if edge.label:
+            parts.append(_label(layout, edge.label, edge.label_rect))
+    for edge in plan.system_edges:
+        begin = site_point(rects[edge.from_node.id], edge.site_from)
+        end = site_point(rects[edge.to_node.id], edge.site_to)
+        parts.append(_connector(begin, end, straight=False, system=True))
+        if edge.label:
+            parts.append(_label(layout, edge.label, edge.label_rect))
+    return "".join(parts)
+
+
+def _defs(layout: ProcessLayout) -> str:
+    return '<defs>%s<g id="%slanes">%s</g></defs>' % (_DEFS, ID_PREFIX, chrome_svg(layout))
+
+
+def _slide_svg(layout: ProcessLayout, plan: SlidePlan, y: int = 0) -> str:
+    """1 スライド分の <svg>。y は SVG 文書内で縦に並べるときの位置。"""
+    w, h = layout.slide_width, layout.slide_height
+    position = ' y="%d"' % y if y else ""
+    return (
+        '<svg%s width="%d" height="%d" viewBox="0 0 %d %d" font-family=%s>'
+        % (position, w, h, w, h, quoteattr(_FONT_FAMILY))
+        + '<rect width="%d" height="%d" fill="#fff"/><use href="#%slanes"/>' % (w, h, ID_PREFIX)
+        + slide_body_svg(layout, plan)
+        + "</svg>"
+    )
+
+
+def iter_svg(layout: ProcessLayout, plans: Optional[list[SlidePlan]] = None) -> Iterator[str]:
+    """全スライドを縦に並べた 1 つの SVG 文書を断片ごとに返す（大きなプロセスでも 1 本の文字列にしない）。"""
+    plans = build_render_plan(layout) if plans is None else plans
+    count = max(len(plans), 1)
+    width = layout.slide_width
+    height = count * layout.slide_height + (count - 1) * SLIDE_GAP_EMU
+    yield (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="%s" height="%s" viewBox="0 0 %d %d">'
+        % (_px(width), _px(height), width, height)
+    )
+    yield _defs(layout)
+    for i, plan in enumerate(plans):
+        yield _slide_svg(layout, plan, y=i * (layout.slide_height + SLIDE_GAP_EMU))
+    yield "</svg>\n"
+
+
+def iter_html(layout: ProcessLayout, plans: Optional[list[SlidePlan]] = None, title: str = "") -> Iterator[str]:
+    """1 ページに 1 スライドの SVG を並べた HTML を断片ごとに返す（印刷するとスライドごとに改ページ）。"""
+    plans = build_render_plan(layout) if plans is None else plans
+    yield (
+        '<!DOCTYPE html>\n<html lang="ja"><head><meta charset="utf-8"><title>%s</title><style>%s</style></head><body>'
+        % (escape(title), _HTML_STYLE)
+    )
+    yield '<svg width="0" height="0" style="position:absolute">%s</svg>' % _defs(layout)
+    for i, plan in enumerate(plans, 1):
+        yield '<section class="slide" id="%sslide-%d">' % (ID_PREFIX, i)
+        yield (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="%s" height="%s" viewBox="0 0 %d %d" font-family=%s>'
+            % (_px(layout.slide_width), _px(layout.slide_height), layout.slide_width, layout.slide_height,
+               quoteattr(_FONT_FAMILY))
+        )
+        yield '<use href="#%slanes"/>' % ID_PREFIX
+        yield slide_body_svg(layout, plan)
+        yield "</svg></section>"
+    yield "</body></html>\n"
+
+
+def write_preview(
+    layout: ProcessLayout, output: str | Path | IO[str], fmt: str = "svg", title: str = ""
+) -> None:
+    """layout を fmt（svg / html）で output（パスまたはテキストストリーム）に書く。"""
+    if fmt == "svg":
+        parts: Iterable[str] = iter_svg(layout)
+    elif fmt == "html":
+        parts = iter_html(layout, title=title)
+    else:
+        raise ValueError(f"unknown preview format: {fmt!r} (choose from {', '.join(PREVIEW_FORMATS)})")
+    if hasattr(output, "write"):
+        output.writelines(parts)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.writelines(parts)
+
+
+def yaml_to_preview(
+    source: ProcessModel | ProcessSource,
+    output: str | Path | IO[str],
+    fmt: str = "svg",
+    parse_cache: Optional[ParseCache] = None,
+    layout_cache: Optional[LayoutCache] = None,
+) -> ProcessLayout:
+    """
+    YAML を読み、レイアウトを計算して SVG / HTML のプレビューを書く。戻り値は計算した ProcessLayout。
+    source: yaml_to_pptx と同じ（パス・ProcessModel・YAML 文字列・bytes・ストリーム）。
+    """
+    model = ProcessModel.load(source, cache=parse_cache, layout_cache=layout_cache)
+    layout = model.compute_layout()
+    title = Path(output).stem if isinstance(output, (str, Path)) else ""
+    write_preview(layout, output, fmt, title=title)
+    return layout
@@ -0,0 +1,94 @@
+"""スイムレーンの枠（アクター名の四角・レーン区切りの点線）をスライドレイアウトとして出力に焼き込む。
+
+枠はアクター構成と余白で決まり全スライドで同じなので、スライドごとに描かず、白紙レイアウトを複製した
+専用レイアウトに 1 回だけ描いて全スライドから参照する。レイアウト XML はアクター一覧・余白・フォントを
+キーにモジュール内でキャッシュし、同じ構成のプロセスを続けて変換するときは組み立てを省く。
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.parts.slide import SlideLayoutPart
+
+from .base_package import blank_layout
+from .fast_render import chrome_shapes_xml, insert_shapes
+from .yaml_loader import ProcessLayout
+
+SWIMLANE_LAYOUT_NAME = "スイムレーン"
+
+# (キー) → (レイアウト XML, 枠の図形数)。古いものから捨てる
+_CACHE_MAX_ENTRIES = 32
+_layout_xml_cache: OrderedDict[tuple, tuple[bytes, int]] = OrderedDict()
+
+
+def chrome_key(layout: ProcessLayout) -> tuple:
+    """枠の見た目を決める値の組。これが同じプロセス同士は同じレイアウト XML を共有できる。"""
+    return (
+        tuple(layout.actors),
+        layout.slide_width,
+        layout.slide_height,
+        layout.left_margin,
+        layout.right_margin,
+        layout.left_label_width,
+        layout.content_top_offset,
+        layout.lane_height,
+        layout.actor_font_pt,
+    )
+
+
+def _build_layout_xml(base_layout, layout: ProcessLayout) -> tuple[bytes, int]:
+    """白紙レイアウトを複製し、枠の図形を描いたレイアウト XML を返す。"""
+    sld_layout = copy.deepcopy(base_layout._element)
+    sld_layout.attrib.pop("type", None)  # 独自レイアウト（既定の cust）扱いにする
+    sld_layout.cSld.set("name", SWIMLANE_LAYOUT_NAME)
+    holder = base_layout.__class__(sld_layout, None)
+    first_id = holder.shapes._spTree.max_shape_id + 1
+    shapes, _ = chrome_shapes_xml(layout, first_id)
+    insert_shapes(holder, shapes)
+    blob = etree.tostring(sld_layout, encoding="UTF-8", standalone=True)
+    return blob, len(shapes)
+
+
+def clear_cache() -> None:
+    """レイアウト XML のキャッシュを空にする。"""
+    _layout_xml_cache.clear()
+
+
+def add_swimlane_layout(prs, layout: ProcessLayout):
+    """枠を焼き込んだスライドレイアウトを prs に追加する。戻り値は (SlideLayout, 枠の図形数)。"""
+    base = blank_layout(prs)
+    key = chrome_key(layout)
+    cached = _layout_xml_cache.get(key)
+    if cached is None:
+        cached = _build_layout_xml(base, layout)
+        _layout_xml_cache[key] = cached
+        if len(_layout_xml_cache) > _CACHE_MAX_ENTRIES:
+            _layout_xml_cache.popitem(last=False)
+    else:
+        _layout_xml_cache.move_to_end(key)
+    blob, n_shapes = cached
+
+    master = prs.slide_master
+    package = master.part.package
+    part = SlideLayoutPart(
+        partname=package.next_partname("/ppt/slideLayouts/slideLayout%d.xml"),
+        content_type=CT.PML_SLIDE_LAYOUT,
+        package=package,
+        element=parse_xml(blob),
+    )
+    part.relate_to(master.part, RT.SLIDE_MASTER)
+    rId = master.part.relate_to(part, RT.SLIDE_LAYOUT)
+
+    # sldLayoutId の id はマスター・レイアウト ID 全体で一意な 2147483648 以上の値
+    used = [int(m.get("id")) for m in prs.part._element.xpath("./p:sldMasterIdLst/p:sldMasterId")]
+    used += [int(e.get("id")) for e in master._element.xpath("./p:sldLayoutIdLst/p:sldLayoutId")]
+    entry = master._element.get_or_add_sldLayoutIdLst()._add_sldLayoutId()
+    entry.set("id", str(max(used + [2147483647]) + 1))
+    entry.rId = rId
+    return part.slide_layout, n_shapes
@@ -0,0 +1,338 @@
+"""入力ディレクトリを監視し、変わった YAML / .drawio / XML だけを同じプロセスで PPTX に変換し直す（watch）。
+
+CLI を毎回起動するとインタプリタの起動と python-pptx の import を払う。Watcher は 1 プロセスで監視を続け、
+描画モジュールとキャッシュ（レイアウト・スライドはメモリに保持。--cache-dir を渡せば解析結果も含めディスクと共有）
+を温めたまま変換するため、ラベルを直しただけなら組み立て直すのは変わったスライドだけになる。
+変更は Linux では inotify（ctypes 経由。追加の依存なし）で受け取り、使えない環境ではディレクトリを一定間隔で
+走査して更新時刻・サイズの変化を見る。保存途中の書き込みを 1 回にまとめるため、最後の変更から debounce 秒
+たってから変換する。変換した出力はビルドマニフェスト（build_manifest）に記録し、内容の変わっていない保存は省く。
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import io
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Optional, Protocol
+
+from . import base_package
+from .batch import INPUT_SUFFIXES, YAML_SUFFIXES, BatchResult
+from .build_manifest import XML_OPTIONS, BuildManifest, file_digest, yaml_options
+from .layout_cache import LayoutCache
+from .parse_cache import ParseCache
+
+DEFAULT_DEBOUNCE = 0.1  # 最後の変更から変換までの待ち [秒]
+DEFAULT_POLL_INTERVAL = 0.2  # inotify が使えないときの走査間隔 [秒]
+# 変更が無いときに停止の要求を確かめる間隔 [秒]
+_IDLE_TIMEOUT = 0.5
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len（続いて len バイトの名前）
+
+
+class ChangeSource(Protocol):
+    """ディレクトリ直下のファイルの変更を受け取る。"""
+
+    name: str
+
+    def wait(self, timeout: float) -> set[Path]:
+        """最大 timeout 秒待ち、その間に変わったファイル（監視ディレクトリ / 名前）を返す。"""
+        ...
+
+    def close(self) -> None: ...
+
+
+def _scan(directory: Path) -> Iterable[os.DirEntry]:
+    try:
+        with os.scandir(directory) as entries:
+            yield from entries
+    except OSError:
+        return
+
+
+class InotifySource:
+    """inotify（Linux）。書き込み・書き終わり・別名からの置き換え（エディタの保存）を受け取る。"""
+
+    name = "inotify"
+    _MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO
+
+    def __init__(self, directories: Iterable[Path]) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._directories: dict[int, Path] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                self.close()
+                raise OSError(errno, os.strerror(errno), str(directory))
+            self._directories[wd] = directory
+
+    def wait(self, timeout: float) -> set[Path]:
+        changed: set[Path] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                # 取りこぼした可能性があるので、監視しているファイルすべてを変わったものとして扱う
+                for directory in self._directories.values():
+                    changed.update(directory / entry.name for entry in _scan(directory))
+            elif name and wd in self._directories:
+                changed.add(self._directories[wd] / os.fsdecode(name))
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingSource:
+    """ディレクトリを interval 秒ごとに走査し、更新時刻・サイズが変わったファイルを返す（inotify の代わり）。"""
+
+    name = "polling"
+
+    def __init__(self, directories: Iterable[Path], interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.directories = list(directories)
+        self.interval = interval
+        self._snapshot = self._stat_all()
+        self._next_scan = time.monotonic() + interval
+
+    def _stat_all(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for directory in self.directories:
+            for entry in _scan(directory):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                snapshot[directory / entry.name] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> set[Path]:
+        delay = self._next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return set()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = self._stat_all()
+        changed = {path for path, stat in snapshot.items() if self._snapshot.get(path) != stat}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_source(
+    directories: Iterable[Path], interval: float = DEFAULT_POLL_INTERVAL, polling: bool = False
+) -> ChangeSource:
+    """inotify（使えなければ、または polling=True なら走査）で directories を監視する。"""
+    directories = list(directories)
+    if not polling:
+        try:
+            return InotifySource(directories)
+        except (OSError, AttributeError):  # Linux 以外・libc に inotify が無い・監視数の上限など
+            pass
+    return PollingSource(directories, interval)
+
+
+class Watcher:
+    """
+    inputs（ディレクトリ＝直下の YAML / .drawio / XML、またはファイル）を監視し、output_dir/<stem>.pptx に変換する。
+    build_all で最新でない出力を作ってから run で監視を続ける。結果は on_result に渡す（BatchResult の seconds は
+    変更を検知してから出力を書き終えるまでの時間）。使い終わったら close（with 文でもよい）。
+    同じ出力名になる入力（a.yaml と a.drawio など）は batch と同じく inputs の順で最初のものだけが書き、
+    ほかは上書きせずに失敗（error）として報告する。
+    """
+
+    def __init__(
+        self,
+        inputs: Iterable[str | Path],
+        output_dir: str | Path,
+        renderer: Optional[str] = None,
+        bake_chrome: bool = True,
+        cache_dir: Optional[str | Path] = None,
+        debounce: float = DEFAULT_DEBOUNCE,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        polling: bool = False,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+        source: Optional[ChangeSource] = None,
+    ) -> None:
+        # 描画モジュールと土台のパッケージは監視を始める前に用意し、最初の変換で払わない
+        from . import xml2pptx, yaml2pptx
+        from .slide_cache import SlideCache
+
+        if renderer is not None and renderer not in yaml2pptx.RENDERERS:
+            raise ValueError(f"unknown renderer: {renderer!r} (choose from {', '.join(yaml2pptx.RENDERERS)})")
+        base_package.base_blob()
+        self._yaml2pptx, self._xml2pptx = yaml2pptx, xml2pptx
+
+        self.directories: list[Path] = []
+        self.files: set[Path] = set()
+        for item in inputs:
+            path = Path(item)
+            if path.is_dir():
+                self.directories.append(path)
+            elif path.suffix.lower() in INPUT_SUFFIXES:
+                self.files.add(path)
+            else:
+                raise ValueError(f"not a directory or an input file: {item}")
+        watched = list(dict.fromkeys(self.directories + [path.parent for path in sorted(self.files)]))
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.renderer = renderer
+        self.bake_chrome = bake_chrome
+        self.debounce = debounce
+        self.on_result = on_result
+        self.parse_cache = ParseCache(cache_dir) if cache_dir else None
+        self.layout_cache = LayoutCache(cache_dir)
+        # python-pptx の図形 API（default）を明示したときはスライドのキャッシュ（fast のテンプレート）を使わない
+        self.slide_cache = SlideCache(cache_dir) if renderer != "default" else None
+        self.manifest = BuildManifest(self.output_dir)
+        self.owners: dict[Path, Path] = {}  # 出力 → その出力を書く入力
+        self.update_owners()
+        self.source = source if source is not None else open_source(watched, interval, polling)
+
+    def __enter__(self) -> Watcher:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.source.close()
+
+    def is_input(self, path: Path) -> bool:
+        """path が監視対象の入力か（監視ディレクトリ直下の入力の拡張子のファイル、または指定したファイル）。"""
+        if path.suffix.lower() not in INPUT_SUFFIXES:
+            return False
+        return path in self.files or path.parent in self.directories
+
+    def inputs(self) -> list[Path]:
+        """いま存在する監視対象の入力（ディレクトリ順・名前順）。"""
+        found = [
+            directory / entry.name
+            for directory in self.directories
+            for entry in sorted(_scan(directory), key=lambda e: e.name)
+            if entry.is_file()
+        ]
+        found += sorted(path for path in self.files if path.is_file())
+        return [path for path in dict.fromkeys(found) if self.is_input(path)]
+
+    def output(self, path: Path) -> Path:
+        """入力 path の出力先。"""
+        return self.output_dir / (path.stem + ".pptx")
+
+    def update_owners(self) -> None:
+        """いまある入力から、出力ごとにそれを書く入力を決め直す（入力の追加・削除のあとに呼ぶ）。"""
+        self.owners = {}
+        for path in self.inputs():
+            self.owners.setdefault(self.output(path), path)
+
+    def _options(self, path: Path) -> dict:
+        return yaml_options("pptx", self.bake_chrome) if path.suffix.lower() in YAML_SUFFIXES else XML_OPTIONS
+
+    def convert(self, path: Path, detected_at: Optional[float] = None, force: bool = False) -> BatchResult:
+        """
+        path を変換する。detected_at（time.perf_counter）は変更を検知した時刻で、結果の seconds はそこからの時間。
+        内容と設定が前回の変換と同じで出力が残っていれば変換しない（skipped。force なら変換する）。
+        同じ出力を別の入力が書く（owners）なら変換せず、error にする。
+        """
+        start = time.perf_counter() if detected_at is None else detected_at
+        result = BatchResult(input=path, output=self.output(path))
+        options = self._options(path)
+        owner = self.owners.setdefault(result.output, path)
+        if owner != path:
+            result.error = f"output {result.output} is already produced from {owner}"
+        else:
+            try:
+                digest = file_digest(path)
+                if not force and self.manifest.is_up_to_date(result.output, digest, options):
+                    result.skipped = True
+                else:
+                    buf = io.BytesIO()
+                    if path.suffix.lower() in YAML_SUFFIXES:
+                        result.shapes = self._yaml2pptx.yaml_to_pptx(
+                            path,
+                            buf,
+                            renderer=self.renderer,
+                            bake_chrome=self.bake_chrome,
+                            parse_cache=self.parse_cache,
+                            layout_cache=self.layout_cache,
+                            slide_cache=self.slide_cache,
+                        )
+                    else:
+                        result.shapes = self._xml2pptx.xml_to_pptx(path.read_text(encoding="utf-8"), buf)
+                    result.output.write_bytes(buf.getvalue())
+                    self.manifest.record(result.output, digest, options)
+                    self.manifest.save()
+            except Exception as e:  # noqa: BLE001  1 ファイルの失敗で監視を止めない
+                result.error = f"{type(e).__name__}: {e}"
+        result.seconds = time.perf_counter() - start
+        if self.on_result is not None:
+            self.on_result(result)
+        return result
+
+    def build_all(self, force: bool = False) -> list[BatchResult]:
+        """監視対象のすべての入力のうち、出力が最新でないものを変換する（force なら全部）。"""
+        self.update_owners()
+        return [self.convert(path, force=force) for path in self.inputs()]
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """stop がセットされるまで（省略時は割り込まれるまで）監視し、変わった入力を変換する。"""
+        pending: dict[Path, float] = {}  # 入力 → 最初に変更を検知した時刻
+        last_change = 0.0
+        while stop is None or not stop.is_set():
+            changed = self.source.wait(self.debounce if pending else _IDLE_TIMEOUT)
+            now = time.perf_counter()
+            for path in changed:
+                if self.is_input(path):
+                    pending.setdefault(path, now)
+                    last_change = now
+            if pending and now - last_change >= self.debounce:
+                ready, pending = pending, {}
+                self.update_owners()
+                for path, detected_at in sorted(ready.items()):
+                    if path.is_file():
+                        self.convert(path, detected_at)
+
+
+def format_result(result: BatchResult) -> str:
+    """1 ファイル分の要約行（seconds はミリ秒で表示）。"""
+    if result.error is not None:
+        return f"FAIL {result.input}: {result.error}"
+    if result.skipped:
+        return f"SKIP {result.input} -> {result.output} (up to date)"
+    return f"OK   {result.input} -> {result.output} (shapes: {result.shapes}, {result.seconds * 1e3:.0f} ms)"
@@ -3,14 +3,16 @@
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
-from pptx import Presentation
 from pptx.oxml import parse_xml
-from pptx.util import Emu, Pt
+from pptx.util import Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.shapes import MSO_SHAPE, MSO_CONNECTOR_TYPE
 
+from .base_package import blank_layout, new_presentation
+from .slide_builder import SlideBuilder
+
 
 # mxGraph の 1 単位あたりの EMU（1 inch = 914400 EMU）。100 単位 ≈ 約 1 inch になるよう調整。
 EMU_PER_MX_UNIT = 9144
@@ -141,18 +143,16 @@ def _shape_type_from_style(style: str) -> MSO_SHAPE:
 
 def xml_to_pptx(
     xml_content: str,
-    output_path: str | Path,
+    output_path: str | Path | BinaryIO,
     scale: float = EMU_PER_MX_UNIT,
 ) -> int:
     """
-    mxGraphModel XML から、編集可能な図形を含む PPTX を生成する。
+    mxGraphModel XML から、編集可能な図形を含む PPTX を生成する。output_path にはバイナリの書き込みストリームも渡せる。
     戻り値はスライドに追加した図形の数。
     """
-    prs = Presentation()
-    prs.slide_width = Emu(9144000)
-    prs.slide_height = Emu(6858000)
-    blank = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(blank)
+    prs = new_presentation(9144000, 6858000)
+    blank = blank_layout(prs)
+    builder = SlideBuilder(prs.slides.add_slide(blank))
 
     cells = parse_cells(xml_content)
     root_ids = {"0", "1"}
@@ -171,7 +171,7 @@ def xml_to_pptx(
     for cell in drawable:
         g = cell.geometry
         shape_type = _shape_type_from_style(cell.style)
-        shape = slide.shapes.add_shape(
+        shape = builder.add_shape(
             shape_type,
             int(g.x * scale),
             int(g.y * scale),
@@ -213,7 +213,7 @@ def xml_to_pptx(
             y1 = int((g_src.y + g_src.height / 2) * scale)
             x2 = int((g_tgt.x + g_tgt.width) * scale)
             y2 = int((g_tgt.y + g_tgt.height / 2) * scale)
-        connector = slide.shapes.add_connector(
+        connector = builder.add_connector(
             MSO_CONNECTOR_TYPE.STRAIGHT, x1, y1, x2, y2
         )
         connector.line.fill.solid()
@@ -221,7 +221,7 @@ def xml_to_pptx(
         connector.line.width = Pt(1)
         _add_arrow_to_connector(connector)
 
-    prs.save(str(output_path))
+    prs.save(output_path if hasattr(output_path, "write") else str(output_path))
     return len(drawable) + len(edges)
 
 
@@ -0,0 +1,200 @@
+"""YAML 業務プロセス定義から、計算済みのレイアウトをそのまま .drawio（mxGraph）に書き出す。
+
+スライド 1 枚を draw.io の 1 ページ（diagram）にする。レーンは swimlane、ノードは PPTX と同じ形の頂点
+（角丸四角・菱形・円・データ・磁気ディスク）としてレーンの子に置き、矢印は source / target で図形につなぐ。
+XML は断片ごとに書き出し、大きなプロセスでも文書全体を 1 本の文字列にしない。python-pptx は import しない。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, Iterator, Optional
+from xml.sax.saxutils import quoteattr
+
+from .layout_cache import LayoutCache
+from .parse_cache import ParseCache
+from .render_plan import (
+    CONNECTION_SITE_BOTTOM,
+    CONNECTION_SITE_LEFT,
+    CONNECTION_SITE_RIGHT,
+    CONNECTION_SITE_TOP,
+    SlidePlan,
+    build_render_plan,
+    node_shape_rect,
+)
+from .yaml_loader import EMU_PER_INCH, ProcessLayout, ProcessModel, ProcessSource
+
+# draw.io の座標の単位（1/100 インチ。A4 縦が 827×1169）
+EMU_PER_DRAWIO_UNIT = EMU_PER_INCH // 100
+# フォントサイズ（pt）→ draw.io の fontSize（座標と同じ単位）
+DRAWIO_UNITS_PER_PT = 100 / 72
+
+_NODE_COLORS = "fillColor=#E8E8E8;strokeColor=#373737;fontColor=#000000;"
+_NODE_STYLES = {
+    "task": "rounded=1;whiteSpace=nowrap;",
+    "gateway": "rhombus;whiteSpace=nowrap;",
+    "start": "ellipse;aspect=fixed;whiteSpace=nowrap;",
+    "end": "ellipse;aspect=fixed;whiteSpace=nowrap;",
+    "artifact": "shape=parallelogram;perimeter=parallelogramPerimeter;fixedSize=0;size=0.2;whiteSpace=nowrap;",
+    "service": "shape=cylinder3;boundedLbl=1;backgroundOutline=1;whiteSpace=nowrap;",
+}
+_LANE_STYLE = (
+    "swimlane;horizontal=0;html=0;whiteSpace=wrap;fillColor=none;swimlaneFillColor=none;"
+    "strokeColor=#808080;dashed=1;dashPattern=1 2;fontStyle=1;fontColor=#000000;"
+)
+_EDGE_STYLE = "html=0;rounded=0;strokeColor=#373737;strokeWidth=1;endArrow=block;endFill=1;fontColor=#000000;"
+_SYSTEM_EDGE_STYLE = "dashed=1;dashPattern=1 2;startArrow=oval;startFill=1;"
+
+# 接続点 → draw.io の (x, y)（図形内の相対位置）
+_SITE_POINTS = {
+    CONNECTION_SITE_TOP: (0.5, 0),
+    CONNECTION_SITE_LEFT: (0, 0.5),
+    CONNECTION_SITE_BOTTOM: (0.5, 1),
+    CONNECTION_SITE_RIGHT: (1, 0.5),
+}
+
+
+def _unit(emu: float) -> str:
+    return "%g" % round(emu / EMU_PER_DRAWIO_UNIT, 2)
+
+
+def _font(pt: int) -> str:
+    return "fontSize=%g;" % round(pt * DRAWIO_UNITS_PER_PT, 1)
+
+
+def _geometry(x: float, y: float, width: float, height: float) -> str:
+    return '<mxGeometry x="%s" y="%s" width="%s" height="%s" as="geometry"/>' % (
+        _unit(x), _unit(y), _unit(width), _unit(height)
+    )
+
+
+def _vertex(cell_id: str, value: str, style: str, parent: str, geometry: str) -> str:
+    return "<mxCell id=%s value=%s style=%s vertex=\"1\" parent=%s>%s</mxCell>" % (
+        quoteattr(cell_id), quoteattr(value), quoteattr(style), quoteattr(parent), geometry
+    )
+
+
+def _edge(cell_id: str, value: str, style: str, source: str, target: str) -> str:
+    return (
+        "<mxCell id=%s value=%s style=%s edge=\"1\" parent=\"1\" source=%s target=%s>"
+        '<mxGeometry relative="1" as="geometry"/></mxCell>'
+        % (quoteattr(cell_id), quoteattr(value), quoteattr(style), quoteattr(source), quoteattr(target))
+    )
+
+
+def _site_style(site_from: int, site_to: int) -> str:
+    (ex, ey), (nx, ny) = _SITE_POINTS[site_from], _SITE_POINTS[site_to]
+    return "exitX=%g;exitY=%g;exitDx=0;exitDy=0;entryX=%g;entryY=%g;entryDx=0;entryDy=0;" % (ex, ey, nx, ny)
+
+
+def _lane_cells(layout: ProcessLayout, page: int) -> tuple[list[str], list[str]]:
+    """レーンの swimlane セル。戻り値は (セル XML のリスト, レーン番号 → セル ID)。"""
+    cells, ids = [], []
+    x = layout.left_margin
+    width = layout.slide_width - layout.right_margin - layout.left_margin
+    style = _LANE_STYLE + "startSize=%s;" % _unit(layout.left_label_width) + _font(layout.actor_font_pt)
+    for i, name in enumerate(layout.actors):
+        cell_id = "p%d-lane-%d" % (page, i)
+        top = layout.content_top_offset + i * layout.lane_height
+        cells.append(_vertex(cell_id, name, style, "1", _geometry(x, top, width, layout.lane_height)))
+        ids.append(cell_id)
+    return cells, ids
+
+
+def _lane_index(layout: ProcessLayout, top: int) -> int:
+    """図形の上端が入るレーン番号（磁気ディスクはレーン番号を持たないため位置から求める）。"""
+    index = (top - layout.content_top_offset) // layout.lane_height
+    return min(max(index, 0), len(layout.actors) - 1)
+
+
+def iter_page(layout: ProcessLayout, plan: SlidePlan) -> Iterator[str]:
+    """1 スライド分の <diagram> を断片ごとに返す。"""
+    page = plan.slide_index + 1
+    yield (
+        '<diagram id="slide-%d" name="%d"><mxGraphModel grid="1" gridSize="10" guides="1" tooltips="1" connect="1"'
+        ' arrows="1" fold="1" page="1" pageScale="1" pageWidth="%s" pageHeight="%s" math="0" shadow="0"><root>'
+        '<mxCell id="0"/><mxCell id="1" parent="0"/>'
+        % (page, page, _unit(layout.slide_width), _unit(layout.slide_height))
+    )
+    lanes, lane_ids = _lane_cells(layout, page)
+    yield "".join(lanes)
+
+    # ノード ID → セル ID。同じ ID の磁気ディスクがあれば後のものへつなぐ（PPTX の描画と同じ）
+    cell_ids: dict[str | int, str] = {}
+    lane_x = layout.left_margin
+
+    def _node_cell(cell_id: str, node_type: str, value: str, rect: tuple[int, int, int, int], lane: int) -> str:
+        x, y, w, h = node_shape_rect(node_type, *rect)
+        style = _NODE_STYLES.get(node_type, _NODE_STYLES["task"]) + _NODE_COLORS + _font(layout.task_font_pt)
+        if node_type == "service":
+            style += "size=%s;" % _unit(h / 6)
+        if not lane_ids:
+            return _vertex(cell_id, value, style, "1", _geometry(x, y, w, h))
+        lane_top = layout.content_top_offset + lane * layout.lane_height
+        return _vertex(cell_id, value, style, lane_ids[lane], _geometry(x - lane_x, y - lane_top, w, h))
+
+    for node in plan.nodes:
+        cell_id = "p%d-n-%s" % (page, node.id)
+        if node.type == "gateway":
+            value = "＋" if node.gateway_type == "parallel" else "✕"
+        else:
+            value = node.label
+        lane = min(node.actor_index, len(lane_ids) - 1)
+        yield _node_cell(cell_id, node.type, value, layout.node_positions[node.id], lane)
+        cell_ids[node.id] = cell_id
+    for disk in plan.service_disks:
+        cell_id = "p%d-d-%s" % (page, disk.node_id)
+        rect = (disk.left, disk.top, disk.width, disk.height)
+        yield _node_cell(cell_id, "service", disk.label, rect, _lane_index(layout, disk.top))
+        cell_ids[disk.node_id] = cell_id
+
+    label_font = _font(layout.label_font_pt)
+    for i, edge in enumerate(plan.edges):
+        style = _EDGE_STYLE + label_font + _site_style(edge.site_from, edge.site_to)
+        style += "edgeStyle=none;" if edge.straight else "edgeStyle=orthogonalEdgeStyle;"
+        yield _edge(
+            "p%d-e-%d" % (page, i), edge.label or "", style, cell_ids[edge.from_node.id], cell_ids[edge.to_node.id]
+        )
+    for i, edge in enumerate(plan.system_edges):
+        style = (
+            _EDGE_STYLE + _SYSTEM_EDGE_STYLE + label_font + _site_style(edge.site_from, edge.site_to)
+            + "edgeStyle=orthogonalEdgeStyle;"
+        )
+        yield _edge(
+            "p%d-s-%d" % (page, i), edge.label or "", style, cell_ids[edge.from_node.id], cell_ids[edge.to_node.id]
+        )
+    yield "</root></mxGraphModel></diagram>"
+
+
+def iter_drawio(layout: ProcessLayout, plans: Optional[list[SlidePlan]] = None) -> Iterator[str]:
+    """.drawio 文書（<mxfile>、スライドごとに 1 ページ）を断片ごとに返す。"""
+    plans = build_render_plan(layout) if plans is None else plans
+    yield '<mxfile host="process-to-pptx" pages="%d">' % len(plans)
+    for plan in plans:
+        yield from iter_page(layout, plan)
+    yield "</mxfile>\n"
+
+
+def write_drawio(layout: ProcessLayout, output: str | Path | IO[str]) -> None:
+    """layout を .drawio として output（パスまたはテキストストリーム）に書く。"""
+    if hasattr(output, "write"):
+        output.writelines(iter_drawio(layout))
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.writelines(iter_drawio(layout))
+
+
+def yaml_to_drawio(
+    source: ProcessModel | ProcessSource,
+    output: str | Path | IO[str],
+    parse_cache: Optional[ParseCache] = None,
+    layout_cache: Optional[LayoutCache] = None,
+) -> ProcessLayout:
+    """
+    YAML を読み、レイアウトを計算して .drawio を書く。戻り値は計算した ProcessLayout。
+    source: yaml_to_pptx と同じ（パス・ProcessModel・YAML 文字列・bytes・ストリーム）。
+    """
+    model = ProcessModel.load(source, cache=parse_cache, layout_cache=layout_cache)
+    layout = model.compute_layout()
+    write_drawio(layout, output)
+    return layout
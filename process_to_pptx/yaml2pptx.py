@@ -1,22 +1,43 @@
 """YAML 業務プロセス定義から編集可能な PPTX を生成する。"""
 
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
+from typing import BinaryIO, Callable, Optional
 
-from pptx import Presentation
 from pptx.enum.shapes import MSO_CONNECTOR_TYPE, MSO_SHAPE
 from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
 from pptx.util import Emu, Pt
 from pptx.dml.color import RGBColor
 from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
 
 from .yaml_loader import (
     ProcessLayout,
-    load_process_yaml,
-    compute_layout,
+    ProcessModel,
+    ProcessSource,
     EMU_PER_PT,
-    TASK_AREA_LEFT_GAP_EMU,
+    SLIDE_SIZE_4_3,
 )
+from .render_plan import (  # noqa: F401  接続点の定数は従来どおり本モジュールからも参照可能
+    CONNECTION_SITE_BOTTOM,
+    CONNECTION_SITE_LEFT,
+    CONNECTION_SITE_RIGHT,
+    CONNECTION_SITE_TOP,
+    SlidePlan,
+    build_render_plan,
+    return_route,
+)
+from .base_package import blank_layout, new_presentation
+from .shape_tags import EMPTY_SLIDE_TAG, actor_tag, disk_tag, edge_tag, lane_tag, node_tag, slide_tag
+from .slide_builder import SlideBuilder
+from .layout_cache import LayoutCache
+from .parse_cache import ParseCache
+from .pptx_stream import SLIDE_FIRST_SHAPE_ID, StreamingPresentationWriter, slide_xml
+from .slide_cache import SlideCache, slide_key
+from .swimlane_layout import add_swimlane_layout
+from . import fast_render, parallel_render
 
 
 def _add_arrow_to_connector(connector) -> None:
@@ -55,12 +76,24 @@ def _set_connector_ends(connector, tail_oval: bool = False, head_arrow: bool = F
         )
 
 
+def _route_connector(connector, route_y: int) -> None:
+    """接続済みのコネクタを、始点から route_y まで下りて終点へ上る U 字の折れ線（戻り矢印）にする。"""
+    points = return_route((connector.begin_x, connector.begin_y), (connector.end_x, connector.end_y), route_y)
+    x, y, cx, cy, _, _ = fast_render.route_xfrm(points)
+    connector.left, connector.top, connector.width, connector.height = x, y, cx, cy
+    xfrm = connector._element.spPr.xfrm
+    xfrm.flipH = xfrm.flipV = False
+    prst_geom = connector._element.spPr.prstGeom
+    prst_geom.addnext(parse_xml(fast_render.route_geom_xml(points, " " + nsdecls("a"))))
+    connector._element.spPr.remove(prst_geom)
+
+
 # DoD: アクター名の四角 — 点線から 2pt 離して長方形、等間隔
 ACTOR_BOX_GAP_PT = 2
 ACTOR_BOX_GAP_EMU = ACTOR_BOX_GAP_PT * EMU_PER_PT
 
 
-def _draw_actor_labels(slide, layout: ProcessLayout) -> None:
+def _draw_actor_labels(builder: SlideBuilder, layout: ProcessLayout) -> None:
     """スライド左側にアクター名を点線から2pt離した長方形内に描画。DoD: 角のある四角・塗りつぶしなし・枠線黒・フォント黒・影なし。"""
     for i, name in enumerate(layout.actors):
         lane_top = layout.content_top_offset + i * layout.lane_height
@@ -69,9 +102,10 @@ def _draw_actor_labels(slide, layout: ProcessLayout) -> None:
         box_height = layout.lane_height - 2 * ACTOR_BOX_GAP_EMU
         left = layout.left_margin
         width = layout.left_label_width  # アクター列幅に準拠
-        rect = slide.shapes.add_shape(
+        rect = builder.add_shape(
             MSO_SHAPE.RECTANGLE,  # 角のある長方形（角丸ではない）
             Emu(left), Emu(top), Emu(width), Emu(box_height),
+            name=actor_tag(i),
         )
         rect.fill.background()  # 塗りつぶしなし
         rect.line.color.rgb = RGBColor(0, 0, 0)  # 枠線黒
@@ -88,15 +122,15 @@ def _draw_actor_labels(slide, layout: ProcessLayout) -> None:
         p.alignment = PP_ALIGN.CENTER  # 横方向も中央
 
 
-def _draw_lane_separators(slide, layout: ProcessLayout) -> None:
+def _draw_lane_separators(builder: SlideBuilder, layout: ProcessLayout) -> None:
     """レーン間をグレーの点線で区切る。点線はレーンの左端まで届く。影なし（DoD）。"""
     gray = RGBColor(0x80, 0x80, 0x80)
     x1 = layout.left_margin  # スライド左端から 10pt 余白の内側
     x2 = int(layout.slide_width - layout.right_margin)
     for i in range(1, len(layout.actors)):
         y = layout.content_top_offset + i * layout.lane_height
-        line = slide.shapes.add_connector(
-            MSO_CONNECTOR_TYPE.STRAIGHT, x1, y, x2, y
+        line = builder.add_connector(
+            MSO_CONNECTOR_TYPE.STRAIGHT, x1, y, x2, y, name=lane_tag(i)
         )
         line.line.color.rgb = gray
         line.line.width = Pt(0.5)
@@ -109,36 +143,10 @@ def _draw_lane_separators(slide, layout: ProcessLayout) -> None:
         ln.append(dash)
 
 
-# 四角形の接続点: 0=上, 1=左, 2=下, 3=右（各辺の中央）
-CONNECTION_SITE_TOP = 0
-CONNECTION_SITE_LEFT = 1
-CONNECTION_SITE_BOTTOM = 2
-CONNECTION_SITE_RIGHT = 3
-
-
-def _connection_site_from(from_node, to_node) -> int:
-    """始点（from）側の接続辺。基本は右から出る。同列（同じ column）のときだけ上下。"""
-    # 通常エッジは to.column > from.column なので同列にならない。同列はシステム接続などのみ。
-    if from_node.column == to_node.column:
-        if to_node.actor_index < from_node.actor_index:
-            return CONNECTION_SITE_TOP  # 次が上レーン → 上から出す
-        if to_node.actor_index > from_node.actor_index:
-            return CONNECTION_SITE_BOTTOM  # 次が下レーン → 下から出す
-    return CONNECTION_SITE_RIGHT  # 右から出る
-
-
-def _connection_site_to(from_node, to_node) -> int:
-    """終点（to）側の接続辺。基本は左から入る。同列のときだけ上下で受け。"""
-    if from_node.column == to_node.column:
-        if from_node.actor_index < to_node.actor_index:
-            return CONNECTION_SITE_TOP  # 上から来る → 上で受け
-        if from_node.actor_index > to_node.actor_index:
-            return CONNECTION_SITE_BOTTOM  # 下から来る → 下で受け
-    return CONNECTION_SITE_LEFT  # 左で受ける
-
-
-def _draw_node_shape(slide, layout: ProcessLayout, node, left: int, top: int, width: int, height: int):
-    """タスク・分岐・スタート・ゴール・成果物・サービスの図形を 1 つ描画。"""
+def _draw_node_shape(
+    builder: SlideBuilder, layout: ProcessLayout, node, left: int, top: int, width: int, height: int, name: str
+):
+    """タスク・分岐・スタート・ゴール・成果物・サービスの図形を 1 つ描画。name は図形名（shape_tags）。"""
     if node.type == "gateway":
         shape_type = MSO_SHAPE.DIAMOND
     elif node.type in ("start", "end"):
@@ -163,12 +171,13 @@ def _draw_node_shape(slide, layout: ProcessLayout, node, left: int, top: int, wi
         top = top + (height - side) // 2
         width = height = side
 
-    shape = slide.shapes.add_shape(
+    shape = builder.add_shape(
         shape_type,
         Emu(left),
         Emu(top),
         Emu(width),
         Emu(height),
+        name=name,
     )
     tf = shape.text_frame
     tf.clear()
@@ -194,225 +203,293 @@ def _draw_node_shape(slide, layout: ProcessLayout, node, left: int, top: int, wi
     return shape
 
 
-def yaml_to_pptx(
-    yaml_path: str | Path,
-    output_path: str | Path,
-) -> int:
-    """
-    YAML ファイルを読み、PPTX レイアウト仕様に従って編集可能な PPTX を生成する。
-    戻り値はスライドに追加した図形の総数（タスク・分岐・矢印・レーン線・ラベル含む）。
-    """
-    actors, nodes, layout_config = load_process_yaml(yaml_path)
-    margins = layout_config.get("margins") if isinstance(layout_config.get("margins"), dict) else None
-    if not actors or not nodes:
-        prs = Presentation()
-        prs.slide_width = Emu(9144000)
-        prs.slide_height = Emu(6858000)
-        blank = prs.slide_layouts[6]
-        prs.slides.add_slide(blank)
-        prs.save(str(output_path))
-        return 0
+def _draw_edge_label(
+    builder: SlideBuilder, layout: ProcessLayout, text: str, rect: tuple[int, int, int, int], name: str
+):
+    """矢印の近くにラベル（分岐の Yes/No、システム接続のアクション名）を描画する。"""
+    label_left, label_top, label_w, label_h = rect
+    tb = builder.add_textbox(Emu(label_left), Emu(label_top), Emu(label_w), Emu(label_h), name=name)
+    tb.shadow.inherit = False
+    tf = tb.text_frame
+    tf.clear()
+    tf.word_wrap = False
+    p = tf.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(layout.label_font_pt)
+    p.font.color.rgb = RGBColor(0, 0, 0)
+    p.alignment = PP_ALIGN.CENTER
+    return tb
 
-    layout = compute_layout(actors, nodes, margins=margins, layout_config=layout_config)
-    prs = Presentation()
-    prs.slide_width = Emu(layout.slide_width)
-    prs.slide_height = Emu(layout.slide_height)
-    blank = prs.slide_layouts[6]
 
+def render_slide(slide, layout: ProcessLayout, plan: SlidePlan, chrome: bool = True) -> int:
+    """python-pptx の図形 API で 1 スライド分（レーン・ノード・矢印）を描画し、追加した図形数を返す。
+    chrome=False のときレーン（アクター名・区切り線）は描かない（スライドレイアウト側に焼き込む場合）。"""
+    builder = SlideBuilder(slide)
     total_shapes = 0
+    shape_by_id = {}
 
-    for slide_idx in range(layout.num_slides):
-        slide = prs.slides.add_slide(blank)
-        shape_by_id = {}
-
+    if chrome:
         # アクター名（左）
-        _draw_actor_labels(slide, layout)
+        _draw_actor_labels(builder, layout)
         total_shapes += len(layout.actors)
 
         # レーン区切り（グレー点線）
-        _draw_lane_separators(slide, layout)
+        _draw_lane_separators(builder, layout)
         total_shapes += max(0, len(layout.actors) - 1)
 
-        # このスライドに属するノード
-        for node in layout.nodes:
-            if node.slide_index != slide_idx:
-                continue
-            pos = layout.node_positions.get(node.id)
-            if not pos:
-                continue
-            left, top, w, h = pos
-            shp = _draw_node_shape(slide, layout, node, left, top, w, h)
-            shape_by_id[node.id] = shp
+    # このスライドに属するノード
+    for node in plan.nodes:
+        left, top, w, h = layout.node_positions[node.id]
+        shape_by_id[node.id] = _draw_node_shape(builder, layout, node, left, top, w, h, node_tag(node.id))
+        total_shapes += 1
+
+    # サービスノードの無いスライドでもシステムレーンに磁気ディスクを描画する（ページ毎にシステムを表示）
+    for disk in plan.service_disks:
+        fake_node = SimpleNamespace(type="service", label=disk.label)
+        shape_by_id[disk.node_id] = _draw_node_shape(
+            builder, layout, fake_node, disk.left, disk.top, disk.width, disk.height, disk_tag(disk.node_id)
+        )
+        total_shapes += 1
+
+    # このスライド内のエッジのみ矢印で接続（両端が同じスライド）
+    for edge in plan.edges:
+        # 同一レーン内は直線、異なるレーン間は折れ曲がり（直角コネクタ）
+        connector_type = MSO_CONNECTOR_TYPE.STRAIGHT if edge.straight else MSO_CONNECTOR_TYPE.ELBOW
+        tag = edge_tag("flow", edge.from_node.id, edge.to_node.id)
+        conn = builder.add_connector(connector_type, 0, 0, 0, 0, name=tag)
+        conn.begin_connect(shape_by_id[edge.from_node.id], edge.site_from)
+        conn.end_connect(shape_by_id[edge.to_node.id], edge.site_to)
+        if edge.route_y is not None:
+            _route_connector(conn, edge.route_y)
+        conn.line.fill.solid()
+        conn.line.fill.fore_color.rgb = RGBColor(0x37, 0x37, 0x37)
+        conn.line.width = Pt(1)
+        conn.shadow.inherit = False  # 矢印に影を付けない（DoD）
+        _add_arrow_to_connector(conn)
+        total_shapes += 1
+
+        # 分岐矢印のラベル（Yes/No 等）を矢印の近くに表示（DoD）
+        if edge.label:
+            tag = edge_tag("flow", edge.from_node.id, edge.to_node.id, label=True)
+            _draw_edge_label(builder, layout, edge.label, edge.label_rect, tag)
             total_shapes += 1
 
-        # システム用レーンがあるがサービスノードがこのスライドに無い場合、このスライドのシステムレーンに磁気ディスクを描画する（ページ毎にシステムが表示され矢印が伸ばせるようにする）
-        service_nodes = [n for n in layout.nodes if n.type == "service"]
-        if (
-            layout.actors
-            and layout.actors[-1] == "システム"
-            and service_nodes
-            and not any(n.slide_index == slide_idx for n in service_nodes)
-        ):
-            unique_system_labels = sorted(set(n.label for n in service_nodes))
-            id_by_label = {n.label: n.id for n in service_nodes}
-            system_lane_idx = len(layout.actors) - 1
-            unit = layout.task_side + layout.gap
-            base_left = layout.left_margin + layout.left_label_width + TASK_AREA_LEFT_GAP_EMU
-            # システム磁気ディスクはシステムレーンの一番左（列 0, 1, 2）に配置してはみ出しを防ぐ
-            for i, label in enumerate(unique_system_labels):
-                col = i
-                left = base_left + col * unit
-                top = layout.content_top_offset + system_lane_idx * layout.lane_height + (
-                    layout.lane_height - layout.task_side
-                ) // 2
-                w = h = layout.task_side
-                fake_node = SimpleNamespace(type="service", label=label)
-                shp = _draw_node_shape(slide, layout, fake_node, left, top, w, h)
-                shape_by_id[id_by_label[label]] = shp
-                total_shapes += 1
-
-        # このスライド内のエッジのみ矢印で接続（両端が同じスライド）
-        for from_id, to_id in layout.edges:
-            from_node = next((n for n in layout.nodes if n.id == from_id), None)
-            to_node = next((n for n in layout.nodes if n.id == to_id), None)
-            if not from_node or not to_node:
-                continue
-            if from_node.slide_index != slide_idx or to_node.slide_index != slide_idx:
-                continue
-            from_shp = shape_by_id.get(from_id)
-            to_shp = shape_by_id.get(to_id)
-            if not from_shp or not to_shp:
-                continue
-            # 同一レーン内は直線、異なるレーン間は折れ曲がり（直角コネクタ）
-            same_lane = from_node.actor_index == to_node.actor_index
-            connector_type = (
-                MSO_CONNECTOR_TYPE.STRAIGHT
-                if same_lane
-                else MSO_CONNECTOR_TYPE.ELBOW
-            )
-            conn = slide.shapes.add_connector(
-                connector_type, 0, 0, 0, 0
-            )
-            # 接続点: システムレーンへの矢印はタスク下辺・システム上辺。それ以外は従来どおり（右→左 or 同列で上下）
-            system_lane_name = "システム"
-            to_is_system = to_node.actor_index < len(layout.actors) and layout.actors[to_node.actor_index] == system_lane_name
-            from_is_system = from_node.actor_index < len(layout.actors) and layout.actors[from_node.actor_index] == system_lane_name
-            if to_is_system:
-                site_from = CONNECTION_SITE_BOTTOM
-                site_to = CONNECTION_SITE_TOP
-            elif from_is_system:
-                site_from = CONNECTION_SITE_TOP
-                site_to = CONNECTION_SITE_BOTTOM
-            else:
-                site_from = _connection_site_from(from_node, to_node)
-                site_to = _connection_site_to(from_node, to_node)
-            conn.begin_connect(from_shp, site_from)
-            conn.end_connect(to_shp, site_to)
-            conn.line.fill.solid()
-            conn.line.fill.fore_color.rgb = RGBColor(0x37, 0x37, 0x37)
-            conn.line.width = Pt(1)
-            conn.shadow.inherit = False  # 矢印に影を付けない（DoD）
-            _add_arrow_to_connector(conn)
+    # システム接続: 点線で人⇔サービス（タスク⇔システムの矢印は常にエルボー）
+    for edge in plan.system_edges:
+        conn = builder.add_connector(
+            MSO_CONNECTOR_TYPE.ELBOW, 0, 0, 0, 0, name=edge_tag(edge.role, edge.from_node.id, edge.to_node.id)
+        )
+        conn.begin_connect(shape_by_id[edge.from_node.id], edge.site_from)
+        conn.end_connect(shape_by_id[edge.to_node.id], edge.site_to)
+        # DoD: 始点側○・終点側矢印
+        _set_connector_ends(conn, tail_oval=True, head_arrow=True)
+        _set_connector_dotted(conn)
+        conn.line.fill.solid()
+        conn.line.fill.fore_color.rgb = RGBColor(0x37, 0x37, 0x37)
+        conn.line.width = Pt(1)
+        conn.shadow.inherit = False
+        total_shapes += 1
+
+        # システム矢印のアクション名ラベル（request_to / response_from の label）
+        if edge.label:
+            tag = edge_tag(edge.role, edge.from_node.id, edge.to_node.id, label=True)
+            _draw_edge_label(builder, layout, edge.label, edge.label_rect, tag)
             total_shapes += 1
+    return total_shapes
 
-            # 分岐矢印のラベル（Yes/No 等）を矢印の近くに表示（DoD）
-            edge_label = layout.edge_labels.get((from_id, to_id))
-            if edge_label:
-                # 座標は layout の EMU で計算し、矢印の中点付近にテキストボックスを配置
-                from_pos = layout.node_positions.get(from_id)
-                to_pos = layout.node_positions.get(to_id)
-                if from_pos and to_pos:
-                    fl, ft, fw, fh = from_pos
-                    tl, tt, tw, th = to_pos
-                    # 始点・終点の中心
-                    fx_c = fl + fw // 2
-                    fy_c = ft + fh // 2
-                    tx_c = tl + tw // 2
-                    ty_c = tt + th // 2
-                    mx = (fx_c + tx_c) // 2
-                    my = (fy_c + ty_c) // 2
-                else:
-                    mx = (from_shp.left + from_shp.width // 2 + to_shp.left + to_shp.width // 2) // 2
-                    my = (from_shp.top + from_shp.height // 2 + to_shp.top + to_shp.height // 2) // 2
-                label_w = 360000  # 約 1cm（ラベルが収まる幅）
-                label_h = 120000  # 約 3mm（8pt テキスト用）
-                label_left = mx - label_w // 2
-                label_top = my - label_h - 60000  # 矢印の上側にオフセット
-                tb = slide.shapes.add_textbox(Emu(label_left), Emu(label_top), Emu(label_w), Emu(label_h))
-                tb.shadow.inherit = False
-                tf = tb.text_frame
-                tf.clear()
-                tf.word_wrap = False
-                p = tf.paragraphs[0]
-                p.text = edge_label
-                p.font.size = Pt(layout.label_font_pt)
-                p.font.color.rgb = RGBColor(0, 0, 0)
-                p.alignment = PP_ALIGN.CENTER
-                total_shapes += 1
-
-        # システム接続: 点線で人⇔サービス。from（人タスク）がこのスライドにあれば描画し、to（サービス）はこのスライドに描いた磁気ディスクに接続する（ページ毎にシステムを表示）
-        for from_id, to_id, role in layout.system_edges:
-            from_node = next((n for n in layout.nodes if n.id == from_id), None)
-            to_node = next((n for n in layout.nodes if n.id == to_id), None)
-            if not from_node or not to_node:
-                continue
-            if from_node.slide_index != slide_idx:
-                continue
-            from_shp = shape_by_id.get(from_id)
-            to_shp = shape_by_id.get(to_id)
-            if not from_shp or not to_shp:
-                continue
-            # タスク⇔システムの矢印は常にエルボー（折れ線）
-            conn = slide.shapes.add_connector(MSO_CONNECTOR_TYPE.ELBOW, 0, 0, 0, 0)
-            if role == "request":
-                # DoD: タスクの下辺に矢印を結合、システムの上辺に矢印を結合
-                conn.begin_connect(from_shp, CONNECTION_SITE_BOTTOM)
-                conn.end_connect(to_shp, CONNECTION_SITE_TOP)
-                _set_connector_ends(conn, tail_oval=True, head_arrow=True)
-            else:
-                # DoD: レスポンスもシステム上辺→タスク下辺。サービス側○・タスク側矢印
-                conn.begin_connect(from_shp, CONNECTION_SITE_TOP)
-                conn.end_connect(to_shp, CONNECTION_SITE_BOTTOM)
-                _set_connector_ends(conn, tail_oval=True, head_arrow=True)
-            _set_connector_dotted(conn)
-            conn.line.fill.solid()
-            conn.line.fill.fore_color.rgb = RGBColor(0x37, 0x37, 0x37)
-            conn.line.width = Pt(1)
-            conn.shadow.inherit = False
-            total_shapes += 1
 
-            # システム矢印のアクション名ラベル（request_to / response_from の label）
-            sys_label = layout.system_edge_labels.get((from_id, to_id, role))
-            if sys_label:
-                from_pos = layout.node_positions.get(from_id)
-                to_pos = layout.node_positions.get(to_id)
-                if from_pos and to_pos:
-                    fl, ft, fw, fh = from_pos
-                    tl, tt, tw, th = to_pos
-                    fx_c = fl + fw // 2
-                    fy_c = ft + fh // 2
-                    tx_c = tl + tw // 2
-                    ty_c = tt + th // 2
-                    mx = (fx_c + tx_c) // 2
-                    my = (fy_c + ty_c) // 2
-                else:
-                    mx = (from_shp.left + from_shp.width // 2 + to_shp.left + to_shp.width // 2) // 2
-                    my = (from_shp.top + from_shp.height // 2 + to_shp.top + to_shp.height // 2) // 2
-                label_w = 360000
-                label_h = 120000
-                label_left = mx - label_w // 2
-                label_top = my - label_h - 60000
-                tb = slide.shapes.add_textbox(Emu(label_left), Emu(label_top), Emu(label_w), Emu(label_h))
-                tb.shadow.inherit = False
-                tf = tb.text_frame
-                tf.clear()
-                tf.word_wrap = False
-                p = tf.paragraphs[0]
-                p.text = sys_label
-                p.font.size = Pt(layout.label_font_pt)
-                p.font.color.rgb = RGBColor(0, 0, 0)
-                p.alignment = PP_ALIGN.CENTER
-                total_shapes += 1
-
-    prs.save(str(output_path))
+def _save(prs, output_path: str | Path | BinaryIO) -> None:
+    """パスまたはバイナリストリームへ保存する。"""
+    prs.save(output_path if hasattr(output_path, "write") else str(output_path))
+
+
+# 描画方式: default=python-pptx の図形 API、fast=XML テンプレートから spTree を直接構築
+RENDERERS = {
+    "default": render_slide,
+    "fast": fast_render.render_slide,
+}
+
+
+def yaml_to_pptx(
+    yaml_path: ProcessModel | ProcessSource,
+    output_path: str | Path | BinaryIO,
+    renderer: Optional[str] = None,
+    bake_chrome: bool = True,
+    parse_cache: Optional[ParseCache] = None,
+    layout_cache: Optional[LayoutCache] = None,
+    workers: Optional[int] = None,
+    stream: bool = False,
+    slide_cache: Optional[SlideCache] = None,
+) -> int:
+    """
+    YAML ファイルを読み、PPTX レイアウト仕様に従って編集可能な PPTX を生成する。
+    yaml_path: YAML のパスのほか、読み込み済みの ProcessModel・YAML 文字列・bytes・ストリームも渡せる。
+    renderer: "default"（python-pptx の図形 API）または "fast"（XML テンプレートから直接構築）。出力は同じ。
+    省略時は default（並列・stream・slide_cache では fast）。default を明示してこれらと組み合わせると ValueError。
+    bake_chrome: True ならレーン（アクター名・区切り線）を専用スライドレイアウトに 1 回だけ描き、全スライドで共有する。
+    False なら従来どおりスライドごとに描く。
+    parse_cache: 指定すると YAML の解析結果をディスクにキャッシュし、内容が同じなら再解析しない。
+    layout_cache: 指定するとグラフの構造（ラベル以外）と layout 設定が同じならレイアウト計算を省く（layout_cache 参照）。
+    workers: 2 以上ならスライドの図形 XML をその数のプロセスで並列に組み立てる（0 は CPU 数。parallel_render 参照）。
+    並列時は fast と同じ XML テンプレートを使う（出力は同じ）。
+    stream: True ならスライドを描いたそばから zip に書いて捨てる（pptx_stream 参照。スライド数によらずメモリが一定）。
+    workers と同じく fast のテンプレートで組み立て、各パーツの中身は同じ。
+    slide_cache: 指定するとスライドごとの XML を描画入力のハッシュでキャッシュし、入力が変わっていないスライドは
+    組み立て直さずにそのまま書く（slide_cache 参照）。常に stream と同じ書き方になる（出力は同じ）。
+    output_path にはバイナリの書き込みストリーム（シークできない標準出力なども可）も渡せる。
+    戻り値は追加した図形の総数（タスク・分岐・矢印・レーン線・ラベル含む。焼き込んだレーンは 1 回分）。
+    """
+    render = _renderer(renderer, workers, stream, slide_cache)
+    model = ProcessModel.load(yaml_path, cache=parse_cache, layout_cache=layout_cache)
+    return _write_model(
+        model, output_path, render, bake_chrome, workers=workers, stream=stream, slide_cache=slide_cache
+    )
+
+
+@dataclass(frozen=True)
+class LayoutVariant:
+    """render_variants で出力する 1 通りのレイアウト（スライドの寸法 [EMU]・1 スライドの列数）。"""
+
+    slide_size: tuple[int, int] = SLIDE_SIZE_4_3
+    max_cols_per_slide: Optional[int] = None
+
+
+def render_variants(
+    source: ProcessModel | ProcessSource,
+    outputs: Mapping[LayoutVariant, str | Path | BinaryIO],
+    renderer: Optional[str] = None,
+    bake_chrome: bool = True,
+    parse_cache: Optional[ParseCache] = None,
+    layout_cache: Optional[LayoutCache] = None,
+    workers: Optional[int] = None,
+    stream: bool = False,
+    slide_cache: Optional[SlideCache] = None,
+) -> dict[LayoutVariant, int]:
+    """
+    1 つのプロセスを複数のレイアウト（16:9 と 4:3、列数違いなど）で PPTX に出力する。
+    読み込み・接続の索引・列の割り当ては 1 回だけ行い、全バリアントで共有する。
+    outputs: バリアント → 出力先（パスまたはバイナリストリーム）。その他の引数は yaml_to_pptx と同じ。
+    YAML に layout.max_cols_per_slide があればバリアントの列数よりそちらが優先（compute_layout と同じ）。
+    戻り値はバリアントごとの図形数。
+    """
+    render = _renderer(renderer, workers, stream, slide_cache)
+    model = ProcessModel.load(source, cache=parse_cache, layout_cache=layout_cache)
+    return {
+        variant: _write_model(model, output_path, render, bake_chrome, variant, workers, stream, slide_cache)
+        for variant, output_path in outputs.items()
+    }
+
+
+def _stream_slides(
+    writer: StreamingPresentationWriter,
+    layout: ProcessLayout,
+    plans: list[SlidePlan],
+    chrome: bool,
+    workers: int,
+    slide_cache: Optional[SlideCache],
+) -> int:
+    """
+    plans のスライドを順に writer へ書き、図形数を返す。slide_cache があれば、キャッシュに無いスライドだけを
+    （workers で並列に）組み立て、あるスライドはキャッシュの XML をそのまま書く。
+    """
+    keys = [slide_key(layout, plan, chrome) for plan in plans]
+    if slide_cache is None:
+        total = 0
+        fragments = parallel_render.iter_fragments(layout, plans, chrome, workers, SLIDE_FIRST_SHAPE_ID)
+        for key, (fragment, count) in zip(keys, fragments):
+            writer.add_slide(fragment, slide_tag(key))
+            total += count
+        return total
+
+    present = [slide_cache.contains(key) for key in keys]
+    fragments = parallel_render.iter_fragments(
+        layout, [plan for plan, hit in zip(plans, present) if not hit], chrome, workers, SLIDE_FIRST_SHAPE_ID
+    )
+    total = 0
+    for plan, key, hit in zip(plans, keys, present):
+        # 無かったスライドの断片は、その間に別のプロセスがキャッシュに書いていても順番を保つため必ず受け取る
+        rendered = None if hit else next(fragments)
+        cached = slide_cache.get(key)
+        if cached is None:
+            fragment, count = rendered or fast_render.slide_fragment(layout, plan, SLIDE_FIRST_SHAPE_ID, chrome)
+            blob = slide_xml(fragment, slide_tag(key))
+            slide_cache.put(key, blob, count)
+        else:
+            blob, count = cached
+        writer.add_slide_xml(blob)
+        total += count
+    slide_cache.flush()
+    return total
+
+
+def _renderer(
+    name: Optional[str],
+    workers: Optional[int] = None,
+    stream: bool = False,
+    slide_cache: Optional[SlideCache] = None,
+) -> Callable[..., int]:
+    """
+    名前から描画関数を返す（None は default）。並列（workers が 2 以上）・stream・slide_cache では描画関数を使わず
+    fast の XML テンプレートで組み立てるため、python-pptx の図形 API（default）を明示して組み合わせたときは
+    黙って置き換えずにエラーにする。
+    """
+    if name is None:
+        return RENDERERS["default"]
+    if name not in RENDERERS:
+        raise ValueError(f"unknown renderer: {name!r} (choose from {', '.join(RENDERERS)})")
+    if name == "default":
+        if parallel_render.resolve_workers(workers) > 1:
+            raise ValueError("renderer 'default' cannot render slides in parallel (workers > 1); use renderer='fast'")
+        if stream or slide_cache is not None:
+            raise ValueError("renderer 'default' cannot be combined with stream or slide_cache; use renderer='fast'")
+    return RENDERERS[name]
+
+
+def _write_model(
+    model: ProcessModel,
+    output_path: str | Path | BinaryIO,
+    render: Callable[..., int],
+    bake_chrome: bool,
+    variant: Optional[LayoutVariant] = None,
+    workers: Optional[int] = None,
+    stream: bool = False,
+    slide_cache: Optional[SlideCache] = None,
+) -> int:
+    """モデルを 1 つのレイアウトで描いて保存し、図形数を返す。"""
+    variant = variant or LayoutVariant()
+    if model.is_empty:
+        prs = new_presentation(*variant.slide_size)
+        blank = blank_layout(prs)
+        if stream:
+            with StreamingPresentationWriter(prs, blank, output_path) as writer:
+                writer.add_slide(name=EMPTY_SLIDE_TAG)
+            return 0
+        prs.slides.add_slide(blank)._element.cSld.set("name", EMPTY_SLIDE_TAG)
+        _save(prs, output_path)
+        return 0
+
+    layout = model.compute_layout(max_cols_per_slide=variant.max_cols_per_slide, slide_size=variant.slide_size)
+    prs = new_presentation(layout.slide_width, layout.slide_height)
+    total_shapes = 0
+    if bake_chrome:
+        slide_layout, total_shapes = add_swimlane_layout(prs, layout)
+    else:
+        slide_layout = blank_layout(prs)
+
+    # ノード・エッジのスライド振り分けと ID 解決は事前に 1 回だけ行う
+    plans = build_render_plan(layout)
+    workers = parallel_render.resolve_workers(workers)
+    if stream or slide_cache is not None:
+        with StreamingPresentationWriter(prs, slide_layout, output_path) as writer:
+            total_shapes += _stream_slides(writer, layout, plans, not bake_chrome, workers, slide_cache)
+        return total_shapes
+    if workers > 1:
+        total_shapes += parallel_render.render_slides(prs, slide_layout, layout, plans, not bake_chrome, workers)
+    else:
+        for plan in plans:
+            total_shapes += render(prs.slides.add_slide(slide_layout), layout, plan, chrome=not bake_chrome)
+    for slide, plan in zip(prs.slides, plans):
+        slide._element.cSld.set("name", slide_tag(slide_key(layout, plan, not bake_chrome)))
+
+    _save(prs, output_path)
     return total_shapes
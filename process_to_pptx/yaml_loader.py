@@ -2,18 +2,43 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
+import io
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping, Sequence
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, Union
 
 import yaml
 
+from .placement import Grid, Placement, place_nodes
+from .process_graph import EdgeLabels, FlowEdges, NodePositions, ProcessGraph, SystemEdges
+
+if TYPE_CHECKING:
+    from .layout_cache import LayoutCache
+    from .parse_cache import ParseCache
+
+# load_process_yaml の正規化結果の形式を変えたら上げる（解析キャッシュのキーに含まれる）
+LOADER_VERSION = 1
+
+# libyaml があれば C 実装のローダーを使う（結果は純 Python 版と同じ）
+HAS_LIBYAML = hasattr(yaml, "CSafeLoader")
+SafeLoader = yaml.CSafeLoader if HAS_LIBYAML else yaml.SafeLoader
+# これ以上のサイズの YAML は既定でストリーミング読み込みにする
+STREAMING_THRESHOLD_BYTES = 1024 * 1024
+
 # 1 inch = 914400 EMU（python-pptx の標準）
 EMU_PER_INCH = 914400
 # 1 pt = 1/72 inch
 EMU_PER_PT = EMU_PER_INCH // 72
 
+# スライドの (幅, 高さ) [EMU]。既定は 4:3
+SLIDE_SIZE_4_3 = (10 * EMU_PER_INCH, int(7.5 * EMU_PER_INCH))
+SLIDE_SIZE_16_9 = (12192000, int(7.5 * EMU_PER_INCH))
+
 # 最小フォント 10pt を維持するための最小タスク一辺（約 0.25 inch）
 MIN_TASK_SIDE_EMU = int(0.25 * EMU_PER_INCH)
 # スライド左右余白の最小（DoD: 10pt 以上）
@@ -63,9 +88,16 @@ def _collapse_system_lanes(actors: list[str]) -> tuple[list[str], dict[int, int]
     return new_actors, old_to_new
 
 
-@dataclass
+# 読み込んだノードの空の接続・ラベルは全ノードで共有する（読み取り専用）。空の list / dict でもノード数ぶん確保されるため
+NO_IDS: tuple[str | int, ...] = ()
+NO_LABELS: Mapping[str | int, str] = MappingProxyType({})
+
+NODE_TYPES = ("task", "gateway", "start", "end", "artifact", "service")
+
+
+@dataclass(slots=True)
 class ProcessNode:
-    """1 ノード（タスク・分岐・スタート・終了・成果物・サービス）。"""
+    """1 ノード（タスク・分岐・スタート・終了・成果物・サービス）。__slots__ でインスタンス辞書を持たない。"""
 
     id: str | int
     type: str  # "task" | "gateway" | "start" | "end" | "artifact" | "service"
@@ -73,23 +105,55 @@ class ProcessNode:
     label: str
     next_ids: list[str | int]
     # 分岐矢印のラベル: to_id -> 表示テキスト（next が { id, label } 形式のとき）
-    next_labels: dict[str | int, str] = field(default_factory=dict)
+    next_labels: Mapping[str | int, str] = field(default_factory=dict)
     # gateway のときのみ: "exclusive"（条件分岐・菱形に✕）| "parallel"（並行・菱形に＋）
     gateway_type: str = "exclusive"
     # システム接続: 人タスクからサービスへのリクエスト先ノード ID のリスト
-    request_to: list[str | int] = field(default_factory=list)
+    request_to: Sequence[str | int] = field(default_factory=list)
     # システム接続: リクエスト先ごとのラベル（request_to が [{ id, label? }] のとき）
-    request_to_labels: dict[str | int, str] = field(default_factory=dict)
+    request_to_labels: Mapping[str | int, str] = field(default_factory=dict)
     # システム接続: 人タスクがレスポンスを受け取るサービスノード ID のリスト
-    response_from: list[str | int] = field(default_factory=list)
+    response_from: Sequence[str | int] = field(default_factory=list)
     # システム接続: レスポンス元ごとのラベル（response_from が [{ id, label? }] のとき）
-    response_from_labels: dict[str | int, str] = field(default_factory=dict)
+    response_from_labels: Mapping[str | int, str] = field(default_factory=dict)
     # レイアウト後に設定
     column: int = 0
     slide_index: int = 0
     col_in_slide: int = 0
 
 
+class LayoutNode:
+    """
+    レイアウト結果のノード。読み込んだノード（node）の属性に、このレイアウトでのレーン・列・スライドを重ねる。
+    レイアウトごとに作るため、同じモデルから複数のレイアウトを計算しても互いに影響しない。
+    """
+
+    __slots__ = ("node", "id", "type", "label", "gateway_type", "actor_index", "column", "slide_index", "col_in_slide")
+
+    def __init__(self, node: ProcessNode, actor_index: int, column: int, slide_index: int, col_in_slide: int) -> None:
+        self.node = node
+        self.id = node.id
+        self.type = node.type
+        self.label = node.label
+        self.gateway_type = node.gateway_type
+        self.actor_index = actor_index
+        self.column = column
+        self.slide_index = slide_index
+        self.col_in_slide = col_in_slide
+
+    def __getattr__(self, name: str) -> Any:
+        # next_ids・request_to などその他の読み込み結果は元のノードから
+        if name == "node":
+            raise AttributeError(name)
+        return getattr(self.node, name)
+
+    def __repr__(self) -> str:
+        return (
+            f"LayoutNode(id={self.id!r}, type={self.type!r}, actor_index={self.actor_index}, "
+            f"column={self.column}, slide_index={self.slide_index}, col_in_slide={self.col_in_slide})"
+        )
+
+
 @dataclass
 class ProcessLayout:
     """レイアウト定数と計算結果。"""
@@ -111,18 +175,28 @@ class ProcessLayout:
     bottom_margin: int = 0  # compute_layout で設定
 
     actors: list[str] = field(default_factory=list)
-    nodes: list[ProcessNode] = field(default_factory=list)
+    nodes: list[LayoutNode] = field(default_factory=list)
+    # ノード順（graph のインデックス順）の配置: レーン・通し列・スライド・スライド内の列。nodes はこれを重ねたもの
+    lanes: array = field(default_factory=lambda: array("i"))
+    columns: array = field(default_factory=lambda: array("i"))
+    slide_indices: array = field(default_factory=lambda: array("i"))
+    cols_in_slide: array = field(default_factory=lambda: array("i"))
     # ノード id → 配置 (x, y) 中心または左上（図形用）
-    node_positions: dict[str | int, tuple[int, int, int, int]] = field(
+    # compute_layout では graph 上の array に持つ NodePositions・FlowEdges・SystemEdges・EdgeLabels（dict / list と同様に読める）
+    node_positions: MutableMapping[str | int, tuple[int, int, int, int]] = field(
         default_factory=dict
     )  # id -> (left_emu, top_emu, width_emu, height_emu)
-    edges: list[tuple[str | int, str | int]] = field(default_factory=list)  # (from_id, to_id)
+    edges: Sequence[tuple[str | int, str | int]] = field(default_factory=list)  # (from_id, to_id)
+    # edges のうちループを閉じる戻り辺（手戻り先へ戻る矢印として描く）
+    back_edges: set[tuple[str | int, str | int]] = field(default_factory=set)
+    # nodes の接続の索引（compute_layout が設定。nodes と同じ並び）
+    graph: ProcessGraph | None = field(default=None, repr=False, compare=False)
     # 分岐矢印のラベル: (from_id, to_id) -> 表示テキスト
-    edge_labels: dict[tuple[str | int, str | int], str] = field(default_factory=dict)
+    edge_labels: Mapping[tuple[str | int, str | int], str] = field(default_factory=dict)
     # システム接続: (from_id, to_id, "request"|"response")。request=人→サービス、response=サービス→人
-    system_edges: list[tuple[str | int, str | int, str]] = field(default_factory=list)
+    system_edges: Sequence[tuple[str | int, str | int, str]] = field(default_factory=list)
     # システム接続矢印のラベル: (from_id, to_id, "request"|"response") -> 表示テキスト
-    system_edge_labels: dict[tuple[str | int, str | int, str], str] = field(default_factory=dict)
+    system_edge_labels: Mapping[tuple[str | int, str | int, str], str] = field(default_factory=dict)
     num_slides: int = 1
     # フォントサイズ（pt）。layout で未指定時は既定値
     task_font_pt: int = 10
@@ -181,210 +255,409 @@ def _resolve_actor_index(actor: Any, actors: list[str]) -> int:
 
 
 def _normalize_id(raw: Any) -> str | int:
-    """YAML の id をそのまま返す（キーとして一貫して使う）。"""
-    if isinstance(raw, (str, int)):
+    """YAML の id をそのまま返す（キーとして一貫して使う）。文字列は intern して参照元と共有する。"""
+    if isinstance(raw, str):
+        return sys.intern(raw)
+    if isinstance(raw, int):
         return raw
     if isinstance(raw, float) and raw == int(raw):
         return int(raw)
-    return str(raw)
+    return sys.intern(str(raw))
+
 
+def _label(raw: Any) -> str | None:
+    """矢印ラベル。空なら None。同じ文言は intern して共有する。"""
+    if raw is None:
+        return None
+    text = str(raw).strip()
+    return sys.intern(text) if text else None
 
-def load_process_yaml(path: str | Path) -> tuple[list[str], list[ProcessNode], dict[str, Any]]:
+
+# load_process_yaml / ProcessModel.load に渡せる入力: パス、YAML 文字列（改行を含む str）、bytes、ストリーム
+ProcessSource = Union[str, Path, bytes, IO]
+
+
+def load_process_yaml(
+    path: ProcessSource, cache: ParseCache | None = None, streaming: bool | None = None
+) -> tuple[list[str], list[ProcessNode], dict[str, Any]]:
     """
-    YAML ファイルを読み、actors とノードリストと layout 設定を返す。
+    YAML を読み、actors とノードリストと layout 設定を返す。
     ノードの actor はインデックスに正規化し、next は ID のリストに正規化する。
     戻り値: (actors, nodes, layout_config)。layout_config はルートの "layout" の値（なければ {}）。
+    path: ファイルパスのほか、YAML 文字列（改行を含む str）・bytes・読み込みストリームも渡せる。
+    cache を渡すと、内容が同じ YAML は解析せずキャッシュから返す（parse_cache 参照）。
+    streaming: True なら nodes をイベント単位で読み 1 件ずつ ProcessNode にする（文書全体の木を作らない）。
+    None（既定）なら内容が STREAMING_THRESHOLD_BYTES 以上のときだけストリーミングで読む。
     """
-    text = Path(path).read_text(encoding="utf-8")
-    data = yaml.safe_load(text)
+    if hasattr(path, "read"):
+        if cache is None and streaming:
+            return _load_streaming(path)
+        content = path.read()
+    elif isinstance(path, bytes):
+        content = path
+    elif isinstance(path, str) and "\n" in path:
+        content = path
+    else:
+        path = Path(path)
+        if streaming is None:
+            streaming = path.stat().st_size >= STREAMING_THRESHOLD_BYTES
+        if cache is None and streaming:
+            with path.open("rb") as f:
+                return _load_streaming(f)
+        content = path.read_bytes()
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    if cache is not None:
+        cached = cache.get(content)
+        if cached is not None:
+            return cached
+    if streaming is None:
+        streaming = len(content) >= STREAMING_THRESHOLD_BYTES
+    if streaming:
+        result = _load_streaming(io.BytesIO(content))
+    else:
+        result = _parse_process_data(yaml.load(content.decode("utf-8"), Loader=SafeLoader))
+    if cache is not None:
+        cache.put(content, result)
+    return result
+
+
+def _parse_actors(data: dict[str, Any]) -> list[str]:
+    raw_actors = data.get("actors") or []
+    return [sys.intern(str(a)) for a in raw_actors] if isinstance(raw_actors, list) else []
+
+
+def _parse_node(item: Any, actors: list[str]) -> ProcessNode | None:
+    """nodes の 1 要素を ProcessNode に正規化する。id の無い要素・辞書でない要素は None。"""
+    if not isinstance(item, dict):
+        return None
+    nid = item.get("id")
+    if nid is None:
+        return None
+    nid = _normalize_id(nid)
+    typ = (item.get("type") or "task").lower()
+    typ = NODE_TYPES[NODE_TYPES.index(typ)] if typ in NODE_TYPES else "task"
+    actor = item.get("actor", 0)
+    actor_index = _resolve_actor_index(actor, actors)
+    label = sys.intern(str(item.get("label") or ""))
+    next_raw = item.get("next")
+    next_ids: list[str | int] = []
+    next_labels: dict[str | int, str] = {}
+    if isinstance(next_raw, list):
+        for x in next_raw:
+            if isinstance(x, dict):
+                to_id_raw = x.get("id")
+                if to_id_raw is not None:
+                    to_id = _normalize_id(to_id_raw)
+                    next_ids.append(to_id)
+                    lb = _label(x.get("label"))
+                    if lb:
+                        next_labels[to_id] = lb
+            else:
+                next_ids.append(_normalize_id(x))
+    elif next_raw is not None:
+        next_ids = [_normalize_id(next_raw)]
+
+    gateway_type = "exclusive"
+    if typ == "gateway":
+        gt = (item.get("gateway_type") or "exclusive").lower()
+        gateway_type = "parallel" if gt == "parallel" else "exclusive"
+
+    request_to: list[str | int] = []
+    request_to_labels: dict[str | int, str] = {}
+    for x in item.get("request_to") or []:
+        if isinstance(x, dict):
+            rid = x.get("id")
+            if rid is not None:
+                to_id = _normalize_id(rid)
+                request_to.append(to_id)
+                lb = _label(x.get("label"))
+                if lb:
+                    request_to_labels[to_id] = lb
+        else:
+            request_to.append(_normalize_id(x))
+    response_from: list[str | int] = []
+    response_from_labels: dict[str | int, str] = {}
+    for x in item.get("response_from") or []:
+        if isinstance(x, dict):
+            rid = x.get("id")
+            if rid is not None:
+                from_id = _normalize_id(rid)
+                response_from.append(from_id)
+                lb = _label(x.get("label"))
+                if lb:
+                    response_from_labels[from_id] = lb
+        else:
+            response_from.append(_normalize_id(x))
+
+    return ProcessNode(
+        id=nid,
+        type=typ,
+        actor_index=actor_index,
+        label=label,
+        next_ids=next_ids,
+        next_labels=next_labels or NO_LABELS,
+        gateway_type=gateway_type,
+        request_to=request_to or NO_IDS,
+        request_to_labels=request_to_labels or NO_LABELS,
+        response_from=response_from or NO_IDS,
+        response_from_labels=response_from_labels or NO_LABELS,
+    )
+
+
+def _parse_process_data(data: Any) -> tuple[list[str], list[ProcessNode], dict[str, Any]]:
+    """YAML の読み込み結果を (actors, nodes, layout_config) に正規化する。"""
     if not data or not isinstance(data, dict):
         return [], [], {}
 
     layout_config = data.get("layout") if isinstance(data.get("layout"), dict) else {}
-
-    raw_actors = data.get("actors") or []
-    actors = [str(a) for a in raw_actors] if isinstance(raw_actors, list) else []
+    actors = _parse_actors(data)
 
     raw_nodes = data.get("nodes") or []
     if not isinstance(raw_nodes, list):
         return actors, [], layout_config
 
-    nodes: list[ProcessNode] = []
-    for item in raw_nodes:
-        if not isinstance(item, dict):
-            continue
-        nid = item.get("id")
-        if nid is None:
-            continue
-        nid = _normalize_id(nid)
-        typ = (item.get("type") or "task").lower()
-        if typ not in ("task", "gateway", "start", "end", "artifact", "service"):
-            typ = "task"
-        actor = item.get("actor", 0)
-        actor_index = _resolve_actor_index(actor, actors)
-        label = str(item.get("label") or "")
-        next_raw = item.get("next")
-        next_ids: list[str | int] = []
-        next_labels: dict[str | int, str] = {}
-        if isinstance(next_raw, list):
-            for x in next_raw:
-                if isinstance(x, dict):
-                    to_id_raw = x.get("id")
-                    if to_id_raw is not None:
-                        to_id = _normalize_id(to_id_raw)
-                        next_ids.append(to_id)
-                        lb = x.get("label")
-                        if lb is not None and str(lb).strip():
-                            next_labels[to_id] = str(lb).strip()
-                else:
-                    next_ids.append(_normalize_id(x))
-        elif next_raw is not None:
-            next_ids = [_normalize_id(next_raw)]
-
-        gateway_type = "exclusive"
-        if typ == "gateway":
-            gt = (item.get("gateway_type") or "exclusive").lower()
-            gateway_type = "parallel" if gt == "parallel" else "exclusive"
-
-        request_to: list[str | int] = []
-        request_to_labels: dict[str | int, str] = {}
-        for x in item.get("request_to") or []:
-            if isinstance(x, dict):
-                rid = x.get("id")
-                if rid is not None:
-                    to_id = _normalize_id(rid)
-                    request_to.append(to_id)
-                    lb = x.get("label")
-                    if lb is not None and str(lb).strip():
-                        request_to_labels[to_id] = str(lb).strip()
+    nodes = [node for node in (_parse_node(item, actors) for item in raw_nodes) if node is not None]
+    return actors, nodes, layout_config
+
+
+# ストリーミング読み込み: 合成・構築は PyYAML の Composer / Constructor と同じ規則で、イベントから直接値を作る
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+_MERGE = object()
+
+
+def _event_value(loader: Any, anchors: dict[str, Any]) -> Any:
+    """次の値 1 つ分（スカラー・シーケンス・マッピング）のイベントを読み、Python の値にする。"""
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(
+                None, None, "found undefined alias %r" % event.anchor, event.start_mark
+            )
+        return anchors[event.anchor]
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        if tag == _MERGE_TAG:
+            return _MERGE
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        # construct_object は構築済みノードを文書末まで保持するため、構築関数を直接呼ぶ
+        constructor = loader.yaml_constructors.get(tag, loader.yaml_constructors[None])
+        value = constructor(loader, node)
+    elif isinstance(event, yaml.SequenceStartEvent):
+        value = []
+        if event.anchor is not None:
+            anchors[event.anchor] = value
+        while not loader.check_event(yaml.SequenceEndEvent):
+            value.append(_event_value(loader, anchors))
+        loader.get_event()
+        return value
+    elif isinstance(event, yaml.MappingStartEvent):
+        value = {}
+        if event.anchor is not None:
+            anchors[event.anchor] = value
+        merged: list[dict] = []
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _event_value(loader, anchors)
+            item = _event_value(loader, anchors)
+            if key is _MERGE:
+                merged.extend(item if isinstance(item, list) else [item])
             else:
-                request_to.append(_normalize_id(x))
-        response_from: list[str | int] = []
-        response_from_labels: dict[str | int, str] = {}
-        for x in item.get("response_from") or []:
-            if isinstance(x, dict):
-                rid = x.get("id")
-                if rid is not None:
-                    from_id = _normalize_id(rid)
-                    response_from.append(from_id)
-                    lb = x.get("label")
-                    if lb is not None and str(lb).strip():
-                        response_from_labels[from_id] = str(lb).strip()
+                value[key] = item
+        loader.get_event()
+        if merged:
+            # マージキー: 明示したキーが優先、複数あれば先に書いたものが優先
+            explicit = dict(value)
+            value.clear()
+            for m in reversed(merged):
+                value.update(m)
+            value.update(explicit)
+        return value
+    else:
+        raise yaml.composer.ComposerError(None, None, "unexpected event %r" % event, event.start_mark)
+    if event.anchor is not None:
+        anchors[event.anchor] = value
+    return value
+
+
+def _load_streaming(stream: BinaryIO) -> tuple[list[str], list[ProcessNode], dict[str, Any]]:
+    """ルートのマッピングをイベント単位で読み、nodes の要素を 1 件ずつ ProcessNode にする。"""
+    loader = SafeLoader(stream)
+    anchors: dict[str, Any] = {}
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            return [], [], {}
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(yaml.MappingStartEvent):
+            return _parse_process_data(_event_value(loader, anchors))
+        loader.get_event()
+
+        data: dict[Any, Any] = {}
+        nodes: list[ProcessNode] | None = None
+        # actors より前に nodes が来た場合だけ、要素を辞書のまま保留する
+        pending: list[Any] = []
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _event_value(loader, anchors)
+            if key == "nodes" and loader.check_event(yaml.SequenceStartEvent):
+                start = loader.get_event()
+                actors = _parse_actors(data) if "actors" in data else None
+                nodes, pending = [], []
+                streamed: list[Any] = []
+                if start.anchor is not None:
+                    anchors[start.anchor] = streamed  # nodes 全体を参照するエイリアスは空扱い
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    item = _event_value(loader, anchors)
+                    if actors is None:
+                        pending.append(item)
+                        continue
+                    node = _parse_node(item, actors)
+                    if node is not None:
+                        nodes.append(node)
+                loader.get_event()
+                data["nodes"] = streamed
             else:
-                response_from.append(_normalize_id(x))
-
-        nodes.append(
-            ProcessNode(
-                id=nid,
-                type=typ,
-                actor_index=actor_index,
-                label=label,
-                next_ids=next_ids,
-                next_labels=next_labels,
-                gateway_type=gateway_type,
-                request_to=request_to,
-                request_to_labels=request_to_labels,
-                response_from=response_from,
-                response_from_labels=response_from_labels,
-            )
-        )
-
+                if key == "nodes":
+                    nodes, pending = None, []
+                data[key] = _event_value(loader, anchors)
+    finally:
+        loader.dispose()
+
+    if nodes is None:
+        return _parse_process_data(data)
+    actors = _parse_actors(data)
+    nodes.extend(node for node in (_parse_node(item, actors) for item in pending) if node is not None)
+    layout_config = data.get("layout") if isinstance(data.get("layout"), dict) else {}
     return actors, nodes, layout_config
 
 
-def find_isolated_flow_nodes(nodes: list[ProcessNode]) -> list[str | int]:
+def find_isolated_flow_nodes(nodes: list[ProcessNode], graph: ProcessGraph | None = None) -> list[str | int]:
     """
     人に属するフローノード（task / gateway）のうち、
     入次数・出次数がともに 0 の孤立ノードの ID を返す。
     DoD: 人のタスクの接続（孤立した人のタスクが存在しないことの確認用）。
+    graph: nodes から作った ProcessGraph（省略時はここで作る）。
     """
     if not nodes:
         return []
-    id_to_node = {n.id: n for n in nodes}
-    in_degree: dict[str | int, int] = {n.id: 0 for n in nodes}
-    for n in nodes:
-        for to_id in n.next_ids:
-            if to_id in id_to_node:
-                in_degree[to_id] = in_degree.get(to_id, 0) + 1
-    isolated: list[str | int] = []
-    for n in nodes:
-        if n.type not in ("task", "gateway", "artifact"):
-            continue
-        out_degree = sum(1 for to_id in n.next_ids if to_id in id_to_node)
-        if in_degree[n.id] == 0 and out_degree == 0:
-            isolated.append(n.id)
-    return isolated
+    return (graph or ProcessGraph(nodes)).isolated_flow_nodes(nodes)
 
 
-def _assign_columns(
-    nodes: list[ProcessNode],
-    id_to_node: dict,
-    extra_edges: list[tuple[str | int, str | int]] | None = None,
-) -> None:
+def _assign_columns(nodes: list[ProcessNode], graph: ProcessGraph) -> tuple[list[int], set[tuple[int, int]]]:
     """
-    フロー順で列番号を付与。分岐発生時は「分岐前の列＋分岐先用の1列」とし、
-    分岐先のノードは同一列に配置し得るようにする（横に間延びしない）。
-    入次数0から BFS で列を伝播し、複数 predecessor の場合は最大列+1 を採用。
-    extra_edges はシステム接続など next 以外の辺（列計算用）。
+    フロー順の列番号（ノード順）と、閉路を作る戻り辺 (from, to)（graph のインデックス）の集合を返す。O(ノード数+辺数)。
+    深さ優先探索で「探索中の経路上のノードへ戻る辺」を戻り辺とする（閉路＝強連結成分はすべてこの辺で切れる）。
+    戻り辺を除いたグラフは DAG になり、その上で最長路レイヤリング（列 = 全 predecessor の最大列+1）を行う。
+    分岐先は同じ列に並び、合流点は最大列+1 になる。ループ内のノードも手戻り先の続きの列に並ぶ。
+    探索は開始ノード → 入次数0 → 残り（ノード順）の順に始めるため、戻り辺はループの入口へ戻る辺になる。
+    辺は graph の order（next とシステム接続）を使う。
     """
-    # 入次数を計算（next の逆方向 + extra_edges）
-    in_degree: dict[str | int, int] = {n.id: 0 for n in nodes}
-    for node in nodes:
-        for to_id in node.next_ids:
-            if to_id in id_to_node:
-                in_degree[to_id] = in_degree.get(to_id, 0) + 1
-    for from_id, to_id in extra_edges or []:
-        if to_id in id_to_node:
-            in_degree[to_id] = in_degree.get(to_id, 0) + 1
-
-    # 列は未割り当てを -1 で表す
-    for node in nodes:
-        node.column = -1
-
-    # 入次数0のノードを列0にし、BFS のキューに入れる
-    queue: deque[ProcessNode] = deque()
-    for node in nodes:
-        if in_degree[node.id] == 0:
-            node.column = 0
-            queue.append(node)
-
-    # extra_edges の from -> to も列伝播に使う（to の列 = from + 1）
-    out_extra: dict[str | int, list[str | int]] = defaultdict(list)
-    for from_id, to_id in extra_edges or []:
-        out_extra[from_id].append(to_id)
-
-    while queue:
-        n = queue.popleft()
-        c = n.column
-        for to_id in n.next_ids:
-            next_node = id_to_node.get(to_id)
-            if not next_node:
-                continue
-            # 分岐先も単一 next も同じ: 次の列は c+1。合流点は複数回更新で max になる
-            next_node.column = max(next_node.column, c + 1)
-            in_degree[next_node.id] -= 1
-            if in_degree[next_node.id] == 0:
-                queue.append(next_node)
-        for to_id in out_extra.get(n.id, []):
-            next_node = id_to_node.get(to_id)
-            if not next_node:
-                continue
-            next_node.column = max(next_node.column, c + 1)
-            in_degree[next_node.id] -= 1
-            if in_degree[next_node.id] == 0:
-                queue.append(next_node)
-
-    # 未到達ノード（閉路や孤立）は既存の最大列の続きで割り当て
-    max_col = max((n.column for n in nodes if n.column >= 0), default=-1)
-    for node in nodes:
-        if node.column < 0:
-            max_col += 1
-            node.column = max_col
-
+    columns, back = _layer_columns(nodes, graph)
     # ループ対応: スタートノードは常に列0に配置し、戻り矢印が左向きに描画されるようにする
-    for node in nodes:
+    for i, node in enumerate(nodes):
         if node.type == "start":
-            node.column = 0
+            columns[i] = 0
+    return columns, back
+
+
+def _layer_columns(nodes: list[ProcessNode], graph: ProcessGraph) -> tuple[list[int], set[tuple[int, int]]]:
+    """_assign_columns の本体。開始ノードを列 0 に寄せる前の最長路の列（後続の列はこの値から決まる）と戻り辺。"""
+    n = len(nodes)
+    offsets, targets = graph.order_offsets, graph.order_targets
+
+    # 反復 DFS: 戻り辺の検出と後順（post-order）の記録
+    roots = [i for i, node in enumerate(nodes) if node.type == "start"]
+    roots += [i for i in range(n) if graph.order_in_degree[i] == 0]
+    roots += range(n)
+    visited = [False] * n
+    on_path = [False] * n
+    back: set[tuple[int, int]] = set()
+    post_order: list[int] = []
+    for root in roots:
+        if visited[root]:
+            continue
+        visited[root] = on_path[root] = True
+        stack = [(root, offsets[root])]
+        while stack:
+            v, k = stack[-1]
+            if k < offsets[v + 1]:
+                stack[-1] = (v, k + 1)
+                w = targets[k]
+                if on_path[w]:
+                    back.add((v, w))
+                elif not visited[w]:
+                    visited[w] = on_path[w] = True
+                    stack.append((w, offsets[w]))
+            else:
+                stack.pop()
+                on_path[v] = False
+                post_order.append(v)
+
+    # 後順の逆は戻り辺を除いた DAG のトポロジカル順（強連結成分を縮約した順序とも一致）
+    columns = [0] * n
+    for v in reversed(post_order):
+        c = columns[v] + 1
+        for k in range(offsets[v], offsets[v + 1]):
+            w = targets[k]
+            if columns[w] < c and (v, w) not in back:
+                columns[w] = c
+    return columns, back
+
+
+@dataclass(frozen=True)
+class LayoutStructure:
+    """
+    スライド寸法・列数に依らないレイアウトの骨格（ノード順）。同じノードから作る複数のレイアウトで共有する。
+    """
+
+    actors: list[str]  # システム用レーンを集約したアクター
+    lanes: array  # 各ノードのレーン（集約後のアクター index）
+    columns: array  # 各ノードの通し列（サービスはフローの後ろに label 順）
+    back_edges: frozenset[tuple[int, int]]  # next のうちループを閉じる辺 (from, to)（graph のインデックス）
+    key: str | None = field(default=None, compare=False)  # LayoutCache の構造のキー（キャッシュを使った場合）
+
+
+def compute_structure(
+    actors: list[str],
+    nodes: list[ProcessNode],
+    graph: ProcessGraph | None = None,
+    cache: LayoutCache | None = None,
+) -> LayoutStructure:
+    """レーンの集約と列の割り当て。nodes は変更しない。cache に同じ構造の結果があればそれを返す。"""
+    key = None
+    if cache is not None:
+        key = cache.structure_key(actors, nodes)
+        cached = cache.get_structure(key)
+        if cached is not None:
+            return cached
+    if graph is None:
+        graph = ProcessGraph(nodes)
+    # DR-002: システム用マークのアクターを1本のレーンに集約
+    collapsed_actors, old_to_new = _collapse_system_lanes(actors)
+    lanes = array("i", (old_to_new.get(n.actor_index, n.actor_index) for n in nodes))
+    # システム接続も列計算に含める（サービスノードに列を付与）
+    columns, back = _assign_columns(nodes, graph)
+
+    # システム用レーン内: type: service のノードはユニークな label 順に列を並べる（DoD）
+    max_col = max(columns, default=-1)
+    unique_system_labels = sorted(set(n.label for n in nodes if n.type == "service"))
+    service_column = {label: max_col + 1 + idx for idx, label in enumerate(unique_system_labels)}
+    for i, node in enumerate(nodes):
+        if node.type == "service":
+            columns[i] = service_column[node.label]
+
+    structure = LayoutStructure(
+        actors=collapsed_actors,
+        lanes=lanes,
+        columns=array("i", columns),
+        back_edges=frozenset((v, w) for v, w in graph.flow_edges() if (v, w) in back),
+        key=key,
+    )
+    if cache is not None:
+        cache.put_structure(key, structure)
+    return structure
 
 
 def _parse_margins_emu(margins: dict[str, Any] | None) -> dict[str, int]:
@@ -440,27 +713,30 @@ def _parse_layout_options(layout_config: dict[str, Any] | None) -> dict[str, Any
     return out
 
 
-def compute_layout(
-    actors: list[str],
-    nodes: list[ProcessNode],
-    max_cols_per_slide: int | None = None,
-    margins: dict[str, Any] | None = None,
-    layout_config: dict[str, Any] | None = None,
-) -> ProcessLayout:
-    """
-    アクター名・ノードリストからレイアウトを計算する。
-    アクター数に応じてレーン高さ・タスクサイズを調整し、
-    図がスライドの描画領域からはみ出さないようスケールする。
-    ノードは列に割り当て、max_cols を超えたら次スライド。
-    margins: YAML の layout.margins（left_pt, right_pt, top_pt, bottom_pt 等）。未指定時は現行どおり。
-    layout_config: YAML の layout ルート。max_cols_per_slide, task_size_ratio, task_font_pt 等を読む。
-    """
-    # DR-002: システム用マークのアクターを1本のレーンに集約
-    collapsed_actors, old_to_new = _collapse_system_lanes(actors)
-    for node in nodes:
-        node.actor_index = old_to_new.get(node.actor_index, node.actor_index)
-
-    layout = ProcessLayout(actors=collapsed_actors, nodes=nodes)
+# 配置の計算で決まる ProcessLayout の寸法（LayoutCache に配置と一緒に保存する）
+LAYOUT_GEOMETRY_FIELDS = (
+    "slide_width",
+    "slide_height",
+    "left_margin",
+    "right_margin",
+    "content_top_offset",
+    "bottom_margin",
+    "lane_height",
+    "task_side",
+    "gap",
+)
+
+
+def _layout_grid(
+    layout: ProcessLayout,
+    max_cols_per_slide: int | None,
+    margins: dict[str, Any] | None,
+    layout_opts: dict[str, Any],
+    slide_size: tuple[int, int] | None,
+) -> Grid:
+    """layout の寸法（LAYOUT_GEOMETRY_FIELDS）を決め、配置の格子を返す。layout.actors（レーン数）だけに依り、ノードには依らない。"""
+    if slide_size is not None:
+        layout.slide_width, layout.slide_height = slide_size
     layout.content_top_offset = int(layout.slide_height * 0.25)
     layout.bottom_margin = int(0.05 * layout.slide_height)
 
@@ -476,12 +752,11 @@ def compute_layout(
         layout.bottom_margin = margins_emu["bottom_margin"]
 
     # layout オプション（列数・タスク比率・フォント）
-    layout_opts = _parse_layout_options(layout_config)
     task_size_ratio = layout_opts.get("task_size_ratio", TASK_SIDE_RATIO)
     if layout_opts.get("max_cols_per_slide") is not None:
         max_cols_per_slide = layout_opts["max_cols_per_slide"]
 
-    num_actors = len(collapsed_actors) or 1
+    num_actors = len(layout.actors) or 1
     available_height = layout.slide_height - layout.content_top_offset - layout.bottom_margin
     # マージン内の高さをレーン数で分割してレーン高さを決定（margin の有無にかかわらず適用）
     layout.lane_height = max(available_height // num_actors, 1)
@@ -495,35 +770,12 @@ def compute_layout(
     layout.task_side = max(int(layout.lane_height * task_size_ratio), MIN_TASK_SIDE_EMU)
     layout.gap = layout.task_side
 
-    id_to_node = {n.id: n for n in nodes}
-    # システム接続を列計算に含める（サービスノードに列を付与）
-    extra_edges: list[tuple[str | int, str | int]] = []
-    for n in nodes:
-        for to_id in n.request_to:
-            if to_id in id_to_node:
-                extra_edges.append((n.id, to_id))
-        for from_id in n.response_from:
-            if from_id in id_to_node:
-                extra_edges.append((from_id, n.id))
-    _assign_columns(nodes, id_to_node, extra_edges)
-
-    # システム用レーン内: type: service のノードはユニークな label 順に列を並べる（DoD）
-    max_col = max((n.column for n in nodes if n.column >= 0), default=-1)
-    unique_system_labels = sorted(set(n.label for n in nodes if n.type == "service"))
-    for node in nodes:
-        if node.type == "service" and unique_system_labels:
-            idx = unique_system_labels.index(node.label)
-            node.column = max_col + 1 + idx
-
-    # 仮の max_cols_per_slide でスライド・列を割り当て
+    # 仮の max_cols_per_slide（スケールの算出用）
     unit = layout.task_side + layout.gap
     if max_cols_per_slide is not None:
         tentative_max_cols = max(1, max_cols_per_slide)
     else:
         tentative_max_cols = max(1, layout.content_width // unit)
-    for node in nodes:
-        node.slide_index = node.column // tentative_max_cols
-        node.col_in_slide = node.column % tentative_max_cols
 
     # スライドに必ず収まるようスケールを算出
     required_height = num_actors * layout.lane_height
@@ -538,83 +790,119 @@ def compute_layout(
     layout.gap = layout.task_side
     # layout.lane_height はマージン内分割のまま維持（縦方向は縮めない）
 
-    # スケール後の列幅で最大列数を再計算し、スライド・列を再割り当て（YAML で列数指定時はその値を使用）
+    # スケール後の列幅で最大列数を再計算し、スライド・列を再割り当て（列数指定時はその値を使用。YAML が優先）
     unit = layout.task_side + layout.gap
-    if layout_opts.get("max_cols_per_slide") is not None:
-        final_max_cols = layout_opts["max_cols_per_slide"]
+    if max_cols_per_slide is not None:
+        final_max_cols = max(1, max_cols_per_slide)
     else:
         final_max_cols = max(1, layout.content_width // unit)
-    for node in nodes:
-        node.slide_index = node.column // final_max_cols
-        node.col_in_slide = node.column % final_max_cols
+    # スライド・スライド内の列・各ノードの (left, top, width, height) を EMU で計算（スライド内の座標）
+    # アクター枠と最初のタスクの間に 10pt 余白（DoD）。同一アクター・同一列の複数ノードは縦分割（DoD）
+    return Grid(
+        origin_left=layout.left_margin + layout.left_label_width + TASK_AREA_LEFT_GAP_EMU,
+        unit=unit,
+        content_top=layout.content_top_offset,
+        lane_height=layout.lane_height,
+        task_side=layout.task_side,
+        max_cols=final_max_cols,
+    )
 
-    # システムノードだけのスライドは作らない（各ページにシステムは左端で描画するため）
-    layout.num_slides = max((n.slide_index for n in nodes if n.type != "service"), default=0) + 1
-
-    # エッジ収集（next から）と分岐矢印ラベル
-    for node in nodes:
-        for to_id in node.next_ids:
-            if to_id in id_to_node:
-                layout.edges.append((node.id, to_id))
-                lbl = node.next_labels.get(to_id)
-                if lbl:
-                    layout.edge_labels[(node.id, to_id)] = lbl
-    # システム接続エッジ（request / response）と矢印ラベル
-    for n in nodes:
-        for to_id in n.request_to:
-            if to_id in id_to_node:
-                layout.system_edges.append((n.id, to_id, "request"))
-                lbl = n.request_to_labels.get(to_id)
-                if lbl:
-                    layout.system_edge_labels[(n.id, to_id, "request")] = lbl
-        for from_id in n.response_from:
-            if from_id in id_to_node:
-                layout.system_edges.append((from_id, n.id, "response"))
-                lbl = n.response_from_labels.get(from_id)
-                if lbl:
-                    layout.system_edge_labels[(from_id, n.id, "response")] = lbl
-
-    # 各ノードの (left, top, width, height) を EMU で計算（スライド内の座標）
-    # アクター枠と最初のタスクの間に 10pt 余白（DoD）
-    for node in nodes:
-        lane = node.actor_index
-        col = node.col_in_slide
-
-        left = layout.left_margin + layout.left_label_width + TASK_AREA_LEFT_GAP_EMU + col * (layout.task_side + layout.gap)
-        top = layout.content_top_offset + lane * layout.lane_height + (
-            layout.lane_height - layout.task_side
-        ) // 2
-        layout.node_positions[node.id] = (
-            left,
-            top,
-            layout.task_side,
-            layout.task_side,
-        )
 
-    # 同一アクター・同一列に複数ノードがある場合、レーン高さの90%を縦分割して配置（DoD）
-    key_to_nodes: dict[tuple[int, int, int], list[ProcessNode]] = defaultdict(list)
-    for node in nodes:
-        key_to_nodes[(node.slide_index, node.actor_index, node.col_in_slide)].append(node)
+def compute_layout(
+    actors: list[str],
+    nodes: list[ProcessNode],
+    max_cols_per_slide: int | None = None,
+    margins: dict[str, Any] | None = None,
+    layout_config: dict[str, Any] | None = None,
+    graph: ProcessGraph | None = None,
+    vectorized: bool | None = None,
+    slide_size: tuple[int, int] | None = None,
+    structure: LayoutStructure | None = None,
+    cache: LayoutCache | None = None,
+) -> ProcessLayout:
+    """
+    アクター名・ノードリストからレイアウトを計算する。
+    アクター数に応じてレーン高さ・タスクサイズを調整し、
+    図がスライドの描画領域からはみ出さないようスケールする。
+    ノードは列に割り当て、max_cols を超えたら次スライド。
+    margins: YAML の layout.margins（left_pt, right_pt, top_pt, bottom_pt 等）。未指定時は現行どおり。
+    layout_config: YAML の layout ルート。max_cols_per_slide, task_size_ratio, task_font_pt 等を読む。
+    graph: nodes と同じ並びで作った ProcessGraph（省略時はここで作る）。layout.graph に入る。
+    vectorized: 配置を NumPy で計算するか（placement.place_nodes 参照。None ならノード数と NumPy の有無で決める）。
+    slide_size: スライドの (幅, 高さ) [EMU]。省略時は 4:3（SLIDE_SIZE_4_3）。
+    structure: actors・nodes から作った compute_structure の結果（省略時はここで作る）。
+    cache: LayoutCache。構造（ラベル以外）と設定が同じレイアウトは列の割り当て・ページ分け・位置計算を省く。
+    actors・nodes は変更しない。配置は layout.lanes / columns / slide_indices / cols_in_slide と layout.nodes に入る。
+    """
+    if graph is None:
+        graph = ProcessGraph(nodes)
+    if structure is None:
+        structure = compute_structure(actors, nodes, graph, cache)
+    collapsed_actors = structure.actors
+    layout = ProcessLayout(actors=collapsed_actors, graph=graph)
+    layout_opts = _parse_layout_options(layout_config)
 
-    for key, group in key_to_nodes.items():
-        if len(group) <= 1:
-            continue
-        _slide_idx, lane, col = key
-        lane_top = layout.content_top_offset + lane * layout.lane_height
-        zone_height = int(layout.lane_height * 0.9)
-        zone_top = lane_top + (layout.lane_height - zone_height) // 2
-        n = len(group)
-        row_height = zone_height // n
-        remainder = zone_height % n
-        left = layout.left_margin + layout.left_label_width + TASK_AREA_LEFT_GAP_EMU + col * (layout.task_side + layout.gap)
-        # 列幅は1タスク時と同じ（task_side）。高さのみ分割。
-        width = layout.task_side
-        offset = 0
-        for i, node in enumerate(group):
-            h = row_height + (1 if i < remainder else 0)
-            top = zone_top + offset
-            offset += h
-            layout.node_positions[node.id] = (left, top, width, h)
+    # 構造と設定が同じなら、ページ分け・位置計算をせずキャッシュの寸法と配置を使う
+    placement_key = None
+    cached = None
+    if cache is not None:
+        structure_key = structure.key or cache.structure_key(actors, nodes)
+        placement_key = cache.placement_key(structure_key, layout_config, margins, max_cols_per_slide, slide_size)
+        cached = cache.get_placement(placement_key)
+    if cached is not None:
+        geometry, placement = cached
+        for name, value in zip(LAYOUT_GEOMETRY_FIELDS, geometry):
+            setattr(layout, name, value)
+    else:
+        grid = _layout_grid(layout, max_cols_per_slide, margins, layout_opts, slide_size)
+        placement = place_nodes(structure.columns, structure.lanes, grid, vectorized)
+        if cache is not None:
+            geometry = tuple(getattr(layout, name) for name in LAYOUT_GEOMETRY_FIELDS)
+            cache.put_placement(placement_key, (geometry, placement))
+    return _assemble_layout(layout, nodes, graph, structure, placement, layout_opts)
+
+
+def _assemble_layout(
+    layout: ProcessLayout,
+    nodes: list[ProcessNode],
+    graph: ProcessGraph,
+    structure: LayoutStructure,
+    placement: Placement,
+    layout_opts: dict[str, Any],
+) -> ProcessLayout:
+    """寸法を決めた layout に、ノード順の配置・辺・ラベルの表とフォントを設定する。"""
+    layout.lanes = structure.lanes
+    layout.columns = structure.columns
+    layout.slide_indices = array("i", placement.slide_index)
+    layout.cols_in_slide = array("i", placement.col_in_slide)
+    layout.nodes = [
+        LayoutNode(node, lane, column, slide_index, col_in_slide)
+        for node, lane, column, slide_index, col_in_slide in zip(
+            nodes, structure.lanes, structure.columns, placement.slide_index, placement.col_in_slide
+        )
+    ]
+
+    # システムノードだけのスライドは作らない（各ページにシステムは左端で描画するため）
+    layout.num_slides = max((n.slide_index for n in layout.nodes if n.type != "service"), default=0) + 1
+
+    # エッジ（next）と分岐矢印ラベル: graph の辺番号順の表
+    ids = graph.ids
+    layout.edges = FlowEdges(graph)
+    layout.edge_labels = EdgeLabels(
+        layout.edges, [nodes[v].next_labels.get(ids[w]) for v, w in graph.flow_edges()]
+    )
+    layout.back_edges = {(ids[v], ids[w]) for v, w in structure.back_edges}
+    # システム接続エッジ（request / response）と矢印ラベル。ラベルは記述したノード側に持つ
+    layout.system_edges = SystemEdges(graph)
+    layout.system_edge_labels = EdgeLabels(
+        layout.system_edges,
+        [
+            nodes[v].request_to_labels.get(ids[w]) if role == "request" else nodes[w].response_from_labels.get(ids[v])
+            for v, w, role in graph.system_edges()
+        ],
+    )
+    layout.node_positions = NodePositions(graph)
+    layout.node_positions.set_rects(placement.rects)
 
     # フォントサイズ（layout で指定されていれば上書き）
     if "task_font_pt" in layout_opts:
@@ -625,3 +913,81 @@ def compute_layout(
         layout.label_font_pt = layout_opts["label_font_pt"]
 
     return layout
+
+
+@dataclass
+class ProcessModel:
+    """読み込み済みの業務プロセス。1 回だけ読み込み、孤立ノードの検査・レイアウト計算・描画で共有する。"""
+
+    actors: list[str]
+    nodes: list[ProcessNode]
+    layout_config: dict[str, Any] = field(default_factory=dict)
+    # 列の割り当て・配置を再利用するキャッシュ（layout_cache 参照）
+    layout_cache: LayoutCache | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def load(
+        cls,
+        source: ProcessModel | ProcessSource,
+        cache: ParseCache | None = None,
+        streaming: bool | None = None,
+        layout_cache: LayoutCache | None = None,
+    ) -> ProcessModel:
+        """
+        パス・YAML 文字列・bytes・ストリームから読み込む（load_process_yaml と同じ規則）。
+        モデルはそのまま返す（layout_cache を指定し、モデルがキャッシュを持っていなければ設定する）。
+        """
+        if isinstance(source, cls):
+            if layout_cache is not None and source.layout_cache is None:
+                source.layout_cache = layout_cache
+            return source
+        actors, nodes, layout_config = load_process_yaml(source, cache=cache, streaming=streaming)
+        return cls(actors=actors, nodes=nodes, layout_config=layout_config, layout_cache=layout_cache)
+
+    @property
+    def is_empty(self) -> bool:
+        """アクターまたはノードが無く、描画するものが無い。"""
+        return not self.actors or not self.nodes
+
+    @property
+    def margins(self) -> dict[str, Any] | None:
+        """layout.margins（辞書で指定されていなければ None）。"""
+        margins = self.layout_config.get("margins")
+        return margins if isinstance(margins, dict) else None
+
+    @cached_property
+    def graph(self) -> ProcessGraph:
+        """ノードの接続の索引（最初に使ったときに 1 回だけ作る）。"""
+        return ProcessGraph(self.nodes)
+
+    @cached_property
+    def structure(self) -> LayoutStructure:
+        """レーンの集約と列の割り当て（スライド寸法・列数に依らないため全レイアウトで共有）。"""
+        return compute_structure(self.actors, self.nodes, self.graph, self.layout_cache)
+
+    def find_isolated_flow_nodes(self) -> list[str | int]:
+        """入出辺のないフローノードの ID（find_isolated_flow_nodes と同じ）。"""
+        return find_isolated_flow_nodes(self.nodes, self.graph)
+
+    def compute_layout(
+        self,
+        max_cols_per_slide: int | None = None,
+        vectorized: bool | None = None,
+        slide_size: tuple[int, int] | None = None,
+    ) -> ProcessLayout:
+        """
+        レイアウトを計算する。モデルは変更しないため、同じモデルから何度でも（複数スレッドからでも）計算できる。
+        接続の索引と列の割り当ては最初の 1 回だけ行い、以降のレイアウトで共有する。
+        """
+        return compute_layout(
+            self.actors,
+            self.nodes,
+            max_cols_per_slide=max_cols_per_slide,
+            margins=self.margins,
+            layout_config=self.layout_config,
+            graph=self.graph,
+            vectorized=vectorized,
+            slide_size=slide_size,
+            structure=self.structure,
+            cache=self.layout_cache,
+        )
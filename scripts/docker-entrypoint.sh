@@ -3,21 +3,12 @@
 # Usage: docker compose run convert
 # Input: files in mounted input/ (e.g. *.yaml, *.yml)
 # Output: output/<stem>.pptx per input file
+# All files are converted in one process (see `process-to-pptx batch`); BATCH_WORKERS sets the pool size.
+# Inputs unchanged since the last run are skipped (manifest in OUTPUT_DIR); set FORCE=1 to convert everything.
 
 set -e
 mkdir -p "${OUTPUT_DIR:?}"
 
-converted=0
-for f in "${INPUT_DIR}"/*.yaml "${INPUT_DIR}"/*.yml; do
-  [ -f "$f" ] || continue
-  base=$(basename "$f" .yaml)
-  base="${base%.yml}"
-  uv run process-to-pptx from-yaml "$f" -o "${OUTPUT_DIR}/${base}.pptx"
-  converted=$((converted + 1))
-done
-
-if [ "$converted" -eq 0 ]; then
-  echo "No .yaml/.yml files found in ${INPUT_DIR}. Put input files there and run again." 1>&2
-  exit 1
-fi
-echo "Converted ${converted} file(s) to ${OUTPUT_DIR}"
+# globs are quoted so that `batch` expands them itself (no match is not an error there)
+exec uv run process-to-pptx batch "${INPUT_DIR}/*.yaml" "${INPUT_DIR}/*.yml" \
+  -o "${OUTPUT_DIR}" ${BATCH_WORKERS:+--workers "${BATCH_WORKERS}"} ${FORCE:+--force}
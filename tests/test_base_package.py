@@ -0,0 +1,59 @@
+"""base_package（既定テンプレートから不要なパーツを削った土台）のテスト。"""
+
+import io
+import zipfile
+from pathlib import Path
+
+from pptx import Presentation
+
+from process_to_pptx import xml2pptx, yaml2pptx
+from process_to_pptx.base_package import blank_layout, new_presentation
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _names(data: bytes) -> list[str]:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return z.namelist()
+
+
+def test_base_keeps_only_blank_layout() -> None:
+    prs = new_presentation(12192000, 6858000)
+    assert [layout.name for layout in prs.slide_layouts] == ["Blank"]
+    assert blank_layout(prs) is prs.slide_layouts[0]
+    assert blank_layout(Presentation()).name == "Blank"
+    assert (prs.slide_width, prs.slide_height) == (12192000, 6858000)
+    buf = io.BytesIO()
+    prs.save(buf)
+    names = _names(buf.getvalue())
+    assert [n for n in names if n.startswith("ppt/slideLayouts/") and n.endswith(".xml")] == [
+        "ppt/slideLayouts/slideLayout1.xml"
+    ]
+    assert not [n for n in names if "printerSettings" in n or "thumbnail" in n]
+
+
+def test_new_presentations_are_independent() -> None:
+    first = new_presentation()
+    first.slides.add_slide(blank_layout(first))
+    first.slide_width = 914400
+    second = new_presentation()
+    assert len(second.slides) == 0
+    assert second.slide_width != 914400
+
+
+def test_outputs_are_smaller_and_open_in_python_pptx() -> None:
+    default = io.BytesIO()
+    Presentation().save(default)
+    for bake_chrome in (True, False):
+        out = io.BytesIO()
+        yaml2pptx.yaml_to_pptx(ROOT / "input" / "bank-sales.yaml", out, bake_chrome=bake_chrome)
+        names = _names(out.getvalue())
+        assert len([n for n in names if n.startswith("ppt/slideLayouts/") and n.endswith(".xml")]) == (
+            2 if bake_chrome else 1
+        )
+        prs = Presentation(io.BytesIO(out.getvalue()))
+        assert len(prs.slides) >= 1
+    xml_out = io.BytesIO()
+    xml2pptx.xml_to_pptx('<mxGraphModel><root><mxCell id="0"/><mxCell id="1" parent="0"/></root></mxGraphModel>', xml_out)
+    assert len(xml_out.getvalue()) < len(default.getvalue())
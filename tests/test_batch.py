@@ -0,0 +1,80 @@
+"""batch（まとめて変換）のテスト。"""
+
+import threading
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+
+from process_to_pptx import batch
+
+
+SAMPLE_YAML = """
+actors: [A, B]
+nodes:
+  - { id: 1, type: task, actor: 0, label: T1, next: [2] }
+  - { id: 2, type: task, actor: 1, label: T2, next: [] }
+"""
+
+SAMPLE_XML = """<mxGraphModel><root>
+  <mxCell id="0"/>
+  <mxCell id="1" parent="0"/>
+  <mxCell id="2" parent="0" value="X" vertex="1"><mxGeometry x="0" y="0" width="80" height="30" as="geometry"/></mxCell>
+</root></mxGraphModel>"""
+
+
+def _inputs(tmp_path: Path) -> Path:
+    src = tmp_path / "in"
+    src.mkdir()
+    for i in range(3):
+        (src / f"p{i}.yaml").write_text(SAMPLE_YAML, encoding="utf-8")
+    (src / "d.drawio").write_text(SAMPLE_XML, encoding="utf-8")
+    (src / "notes.txt").write_text("ignored", encoding="utf-8")
+    return src
+
+
+def _run_batch(*args, **kwargs) -> list[batch.BatchResult]:
+    """run_batch を別スレッドで動かし、止まったら（枠の取り合いで待ち続けたら）失敗にする。"""
+    box: list[list[batch.BatchResult]] = []
+    thread = threading.Thread(target=lambda: box.append(batch.run_batch(*args, **kwargs)), daemon=True)
+    thread.start()
+    thread.join(timeout=60)
+    assert box, "run_batch did not finish"
+    return box[0]
+
+
+def test_collect_inputs_dir_glob_and_dedup(tmp_path: Path) -> None:
+    src = _inputs(tmp_path)
+    found = batch.collect_inputs([str(src), str(src / "*.yaml"), str(src / "notes.txt")])
+    assert [p.name for p in found] == ["d.drawio", "p0.yaml", "p1.yaml", "p2.yaml"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_converts_all(workers: int, tmp_path: Path) -> None:
+    src = _inputs(tmp_path)
+    seen = []
+    results = batch.run_batch(
+        batch.collect_inputs([str(src)]), tmp_path / "out", workers=workers, queue_size=1, on_result=seen.append
+    )
+    assert [r.error for r in results] == [None] * 4
+    assert sorted(r.input.name for r in seen) == ["d.drawio", "p0.yaml", "p1.yaml", "p2.yaml"]
+    for r in results:
+        assert r.output.parent == tmp_path / "out"
+        assert r.shapes > 0
+        assert len(Presentation(str(r.output)).slides) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_reports_failures_and_continues(workers: int, tmp_path: Path) -> None:
+    src = _inputs(tmp_path)
+    (src / "broken.yaml").write_text("actors: [A\n", encoding="utf-8")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "p0.yml").write_text(SAMPLE_YAML, encoding="utf-8")
+    inputs = batch.collect_inputs([str(src), str(tmp_path / "other")])
+    # queue_size=1: 出力の重複で失敗する最後のファイルは、直前の変換が枠を埋めている間に来る
+    results = {r.input.name: r for r in _run_batch(inputs, tmp_path / "out", workers=workers, queue_size=1)}
+    assert results["broken.yaml"].error is not None
+    assert "already produced" in results["p0.yml"].error
+    assert results["p1.yaml"].error is None
+    assert batch.format_result(results["broken.yaml"]).startswith("FAIL")
+    assert batch.format_result(results["p1.yaml"]).startswith("OK")
@@ -0,0 +1,126 @@
+"""build_manifest（変わっていない入力の変換を省くマニフェスト）のテスト。"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import batch, build_manifest
+from process_to_pptx.build_manifest import MANIFEST_NAME, BuildManifest, file_digest, yaml_options
+
+
+SAMPLE_YAML = """
+actors: [A, B]
+nodes:
+  - { id: 1, type: task, actor: 0, label: T1, next: [2] }
+  - { id: 2, type: task, actor: 1, label: T2, next: [] }
+"""
+
+
+def test_manifest_checks_input_options_and_output(tmp_path: Path) -> None:
+    inp = tmp_path / "in.yaml"
+    inp.write_text(SAMPLE_YAML, encoding="utf-8")
+    out = tmp_path / "out" / "p.pptx"
+    out.parent.mkdir()
+    out.write_bytes(b"pptx")
+    digest = file_digest(inp)
+    options = yaml_options("pptx", True)
+
+    manifest = BuildManifest.for_output(out)
+    assert not manifest.is_up_to_date(out, digest, options)
+    manifest.record(out, digest, options)
+    manifest.save()
+
+    reloaded = BuildManifest(out.parent)
+    assert reloaded.is_up_to_date(out, digest, options)
+    assert not reloaded.is_up_to_date(out, digest, yaml_options("pptx", False))
+    assert not reloaded.is_up_to_date(out, "0" * 64, options)
+    os.utime(out, ns=(0, 0))
+    assert not reloaded.is_up_to_date(out, digest, options)
+    out.unlink()
+    assert not reloaded.is_up_to_date(out, digest, options)
+
+
+def test_manifest_save_keeps_entries_from_other_writers(tmp_path: Path) -> None:
+    for name in ("a.pptx", "b.pptx"):
+        (tmp_path / name).write_bytes(name.encode())
+    first, second = BuildManifest(tmp_path), BuildManifest(tmp_path)
+    first.record(tmp_path / "a.pptx", "a", {})
+    second.record(tmp_path / "b.pptx", "b", {})
+    first.save()
+    second.save()
+    data = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert sorted(data["outputs"]) == ["a.pptx", "b.pptx"]
+
+    (tmp_path / MANIFEST_NAME).write_text("{broken", encoding="utf-8")
+    assert not BuildManifest(tmp_path).is_up_to_date(tmp_path / "a.pptx", "a", {})
+
+
+def test_run_batch_incremental(tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    for i in range(3):
+        (src / f"p{i}.yaml").write_text(SAMPLE_YAML, encoding="utf-8")
+    inputs = batch.collect_inputs([str(src)])
+    out = tmp_path / "out"
+
+    first = batch.run_batch(inputs, out, workers=1, incremental=True)
+    assert [r.skipped for r in first] == [False] * 3
+    (src / "p1.yaml").write_text(SAMPLE_YAML + "# edited\n", encoding="utf-8")
+    second = batch.run_batch(inputs, out, workers=1, incremental=True)
+    assert [r.skipped for r in second] == [True, False, True]
+    assert batch.format_result(second[0]).startswith("SKIP")
+    assert [r.skipped for r in batch.run_batch(inputs, out, workers=1, incremental=True, bake_chrome=False)] == [False] * 3
+    assert [r.skipped for r in batch.run_batch(inputs, out, workers=1)] == [False] * 3
+
+
+def test_run_batch_incremental_skip_after_full_queue(tmp_path: Path) -> None:
+    """変換が枠を埋めている（2×workers より多く変わった）ところへ最新のファイルが来ても止まらない。"""
+    src = tmp_path / "in"
+    src.mkdir()
+    for name in ["p0", "p1", "p2", "p3", "p4", "z"]:
+        (src / f"{name}.yaml").write_text(SAMPLE_YAML, encoding="utf-8")
+    inputs = batch.collect_inputs([str(src)])
+    out = tmp_path / "out"
+    batch.run_batch(inputs, out, workers=1, incremental=True)
+    for i in range(5):
+        (src / f"p{i}.yaml").write_text(SAMPLE_YAML + "# edited\n", encoding="utf-8")
+
+    # queue_size=1: 最後の変換が回収されずに枠を埋めたまま、最新の z.yaml の番になる
+    box: list = []
+    thread = threading.Thread(
+        target=lambda: box.append(batch.run_batch(inputs, out, workers=2, queue_size=1, incremental=True)),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=60)
+    assert box, "run_batch did not finish"
+    assert [(r.skipped, r.error) for r in box[0]] == [(False, None)] * 5 + [(True, None)]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX のパーミッション")
+def test_manifest_is_readable_by_others(tmp_path: Path) -> None:
+    """マニフェストは一時ファイルの 0600 のままにせず、umask どおりのパーミッションで置く（出力ディレクトリを共有できる）。"""
+    old = os.umask(0o022)
+    try:
+        (tmp_path / "p.pptx").write_bytes(b"pptx")
+        manifest = BuildManifest(tmp_path)
+        manifest.record(tmp_path / "p.pptx", "0" * 64, yaml_options("pptx", True))
+        manifest.save()
+    finally:
+        os.umask(old)
+    assert (tmp_path / MANIFEST_NAME).stat().st_mode & 0o777 == (tmp_path / "p.pptx").stat().st_mode & 0o777 == 0o644
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="/proc の Umask")
+def test_new_file_mode_does_not_toggle_umask(monkeypatch: pytest.MonkeyPatch) -> None:
+    """保存のたびに umask を付け替えない（付け替えの間に他のスレッドが作るファイルが umask 0 になる）。"""
+    expected = 0o666 & ~build_manifest._proc_umask()
+
+    def _umask(mask: int) -> int:
+        raise AssertionError("os.umask called")
+
+    monkeypatch.setattr(os, "umask", _umask)
+    assert build_manifest.new_file_mode() == expected
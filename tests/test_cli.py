@@ -1,7 +1,10 @@
 """CLI のテスト。"""
 
+import io
+import json
 import subprocess
 import sys
+import zipfile
 from pathlib import Path
 
 
@@ -87,3 +90,173 @@ def test_cli_from_yaml(tmp_path: Path) -> None:
     assert out.exists()
     assert out.stat().st_size > 0
     assert "Shapes:" in r.stderr
+
+
+def test_cli_from_yaml_fast_renderer(tmp_path: Path) -> None:
+    inp = tmp_path / "in.yaml"
+    inp.write_text(SAMPLE_YAML, encoding="utf-8")
+    out = tmp_path / "out.pptx"
+    r = _run("from-yaml", str(inp), "-o", str(out), "--renderer", "fast")
+    assert r.returncode == 0
+    assert out.exists()
+    assert "Shapes:" in r.stderr
+
+
+def test_cli_batch(tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    (src / "a.xml").write_text(SAMPLE_XML, encoding="utf-8")
+    (src / "b.drawio").write_text(SAMPLE_XML, encoding="utf-8")
+    out = tmp_path / "out"
+    r = _run("batch", str(src), "-o", str(out), "-j", "2")
+    assert r.returncode == 0, r.stderr
+    assert (out / "a.pptx").exists() and (out / "b.pptx").exists()
+    assert "Converted 2/2" in r.stdout
+
+
+def test_cli_batch_no_inputs(tmp_path: Path) -> None:
+    r = _run("batch", str(tmp_path / "*.yaml"), "-o", str(tmp_path / "out"))
+    assert r.returncode == 1
+    assert "No input files" in r.stderr
+
+
+def test_cli_from_yaml_stdin(tmp_path: Path) -> None:
+    out = tmp_path / "out.pptx"
+    r = _run("from-yaml", "-", "-o", str(out), input_text=SAMPLE_YAML)
+    assert r.returncode == 0, r.stderr
+    assert out.exists()
+    assert "Shapes:" in r.stderr
+
+
+def test_cli_layout_json_without_pptx(tmp_path: Path) -> None:
+    """layout サブコマンドは JSON を書き、python-pptx（と lxml）を import しない。"""
+    out = tmp_path / "layout.json"
+    code = (
+        "import sys; from process_to_pptx import cli; "
+        f"sys.argv = ['process-to-pptx', 'layout', 'input/bank-sales.yaml', '-o', {str(out)!r}]; cli.main(); "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('pptx', 'lxml')))"
+    )
+    r = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent
+    )
+    assert r.returncode == 0, r.stderr
+    assert r.stdout.strip().endswith("[]")
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert data["schema"] == "process-to-pptx/layout" and data["nodes"]
+
+    r = _run("layout", "-", input_text="actors: [A]\nnodes:\n  - {id: 1, actor: A, label: X}\n")
+    assert r.returncode == 0
+    assert [n["id"] for n in json.loads(r.stdout)["nodes"]] == [1]
+
+
+def test_cli_renderer_names_match_renderers() -> None:
+    from process_to_pptx import cli, yaml2pptx
+
+    assert sorted(cli.RENDERER_NAMES) == sorted(yaml2pptx.RENDERERS)
+
+
+def test_cli_from_yaml_other_formats_without_pptx(tmp_path: Path) -> None:
+    """from-yaml --format svg / html / drawio はプレビュー・.drawio を書き、python-pptx を import しない。"""
+    for fmt, marker in (("svg", "<svg"), ("html", "<svg"), ("drawio", "<mxfile")):
+        out = tmp_path / f"preview.{fmt}"
+        code = (
+            "import sys; from process_to_pptx import cli; "
+            f"sys.argv = ['process-to-pptx', 'from-yaml', 'input/process.yaml', '-o', {str(out)!r}, '--format', {fmt!r}]; "
+            "cli.main(); print('pptx' in sys.modules)"
+        )
+        r = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent
+        )
+        assert r.returncode == 0, r.stderr
+        assert r.stdout.strip().endswith("False")
+        assert "Slides: " in r.stderr or "Pages: " in r.stderr
+        assert marker in out.read_text(encoding="utf-8")
+
+    from process_to_pptx import cli, svg_render
+
+    assert cli.PREVIEW_FORMATS == svg_render.PREVIEW_FORMATS
+
+
+def test_cli_from_yaml_pptx_to_stdout() -> None:
+    """-o - は PPTX を標準出力へストリーミングで書き、標準出力には PPTX 以外を書かない。"""
+    r = subprocess.run(
+        [sys.executable, "-m", "process_to_pptx", "from-yaml", "input/process.yaml", "-o", "-"],
+        capture_output=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert r.returncode == 0, r.stderr
+    assert b"Shapes: " in r.stderr
+    with zipfile.ZipFile(io.BytesIO(r.stdout)) as z:
+        assert "ppt/slides/slide1.xml" in z.namelist()
+
+
+def test_cli_skips_up_to_date_outputs(tmp_path: Path) -> None:
+    """from-yaml / to-pptx は入力と設定が前回と同じで出力が残っていれば変換せず、--force で作り直す。"""
+    inp = tmp_path / "in.yaml"
+    inp.write_text(Path("input/process.yaml").read_text(encoding="utf-8"), encoding="utf-8")
+    out = tmp_path / "out.pptx"
+    assert "Saved:" in _run("from-yaml", str(inp), "-o", str(out)).stdout
+    assert "Up to date:" in _run("from-yaml", str(inp), "-o", str(out)).stdout
+    assert "Saved:" in _run("from-yaml", str(inp), "-o", str(out), "--chrome", "slide").stdout
+    assert "Saved:" in _run("from-yaml", str(inp), "-o", str(out), "--chrome", "slide", "--force").stdout
+    with inp.open("a", encoding="utf-8") as f:
+        f.write("# edited\n")
+    assert "Saved:" in _run("from-yaml", str(inp), "-o", str(out), "--chrome", "slide").stdout
+
+    xml = tmp_path / "in.xml"
+    xml.write_text(SAMPLE_XML, encoding="utf-8")
+    out_xml = tmp_path / "xml.pptx"
+    assert "Saved:" in _run("to-pptx", str(xml), "-o", str(out_xml)).stdout
+    assert "Up to date:" in _run("to-pptx", str(xml), "-o", str(out_xml)).stdout
+    out_xml.unlink()
+    assert "Saved:" in _run("to-pptx", str(xml), "-o", str(out_xml)).stdout
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.xml").write_text(SAMPLE_XML, encoding="utf-8")
+    assert "Converted 1/1" in _run("batch", str(src), "-o", str(tmp_path), "-j", "1").stdout
+    assert "(1 up to date)" in _run("batch", str(src), "-o", str(tmp_path), "-j", "1").stdout
+    assert "Converted 1/1" in _run("batch", str(src), "-o", str(tmp_path), "-j", "1", "--force").stdout
+
+
+def test_cli_update(tmp_path: Path) -> None:
+    """update は from-yaml の出力を YAML の変更分だけ更新し、生成した PPTX でなければエラーにする。"""
+    inp = tmp_path / "in.yaml"
+    inp.write_text(SAMPLE_YAML, encoding="utf-8")
+    out = tmp_path / "out.pptx"
+    assert _run("from-yaml", str(inp), "-o", str(out)).returncode == 0
+    inp.write_text(SAMPLE_YAML.replace("label: T2", "label: T2b"), encoding="utf-8")
+    r = _run("update", str(inp), str(out))
+    assert r.returncode == 0
+    assert "Updated:" in r.stdout
+    assert "1 updated" in r.stderr
+
+    pptx_out = tmp_path / "xml.pptx"
+    xml = tmp_path / "in.xml"
+    xml.write_text(SAMPLE_XML, encoding="utf-8")
+    assert _run("to-pptx", str(xml), "-o", str(pptx_out)).returncode == 0
+    r = _run("update", str(inp), str(pptx_out))
+    assert r.returncode == 1
+    assert "Error:" in r.stderr
+
+
+def test_cli_watch_rejects_unknown_inputs(tmp_path: Path) -> None:
+    """watch は入力ディレクトリでも入力ファイルでもないものを渡すとエラーにする（監視は始めない）。"""
+    notes = tmp_path / "notes.txt"
+    notes.write_text("x", encoding="utf-8")
+    r = _run("watch", str(notes), "-o", str(tmp_path / "out"))
+    assert r.returncode == 1
+    assert "Error:" in r.stderr
+
+
+def test_cli_rejects_default_renderer_with_workers(tmp_path: Path) -> None:
+    """--renderer default を -j 2 以上・--stream と組み合わせると、fast に置き換えずにエラーにする（省略時は並列で描く）。"""
+    inp = tmp_path / "in.yaml"
+    inp.write_text(SAMPLE_YAML, encoding="utf-8")
+    r = _run("from-yaml", str(inp), "-o", str(tmp_path / "a.pptx"), "--renderer", "default", "-j", "2")
+    assert r.returncode == 2
+    assert "--renderer default" in r.stderr
+    assert _run("from-yaml", str(inp), "-o", str(tmp_path / "b.pptx"), "-j", "2").returncode == 0
+    r = _run("from-yaml", str(inp), "-o", str(tmp_path / "c.pptx"), "--renderer", "default", "--stream")
+    assert r.returncode == 2
+    assert "--stream" in r.stderr
@@ -0,0 +1,99 @@
+"""fast_render のテスト（既定レンダラと同じ XML になること）。"""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import yaml2pptx
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SAMPLE_YAML_MIXED = """
+actors:
+  - 営業
+  - 上司
+  - "[システム]CRM"
+nodes:
+  - id: 0
+    type: start
+    actor: 0
+    label: 開始
+    next: [1]
+  - id: 1
+    type: task
+    actor: 0
+    label: "見積 & 提案\\n<初回>"
+    next: [2]
+    request_to: [{ id: crm, label: 登録 }]
+  - id: 2
+    type: gateway
+    actor: 1
+    label: 承認?
+    next: [{ id: 3, label: "Yes" }, { id: 1, label: "No" }]
+  - id: 3
+    type: artifact
+    actor: 0
+    label: 見積書
+    next: [4]
+    response_from: [{ id: crm, label: 取得 }]
+  - id: 4
+    type: gateway
+    actor: 0
+    label: 並行
+    gateway_type: parallel
+    next: [5]
+  - id: 5
+    type: end
+    actor: 0
+    label: 終了
+  - id: crm
+    type: service
+    actor: 2
+    label: CRM
+layout:
+  max_cols_per_slide: 3
+"""
+
+
+def _slide_parts(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as z:
+        return {n: z.read(n) for n in z.namelist() if n.startswith(("ppt/slides/", "ppt/slideLayouts/"))}
+
+
+def _render_both(yaml_path: Path, tmp_path: Path, bake_chrome: bool = True) -> tuple[int, int, dict, dict]:
+    out_default = tmp_path / "default.pptx"
+    out_fast = tmp_path / "fast.pptx"
+    n_default = yaml2pptx.yaml_to_pptx(yaml_path, out_default, bake_chrome=bake_chrome)
+    n_fast = yaml2pptx.yaml_to_pptx(yaml_path, out_fast, renderer="fast", bake_chrome=bake_chrome)
+    return n_default, n_fast, _slide_parts(out_default), _slide_parts(out_fast)
+
+
+@pytest.mark.parametrize(
+    "yaml_name",
+    ["input/bank-sales.yaml", "input/it-sales.yaml", "input/process.yaml", "docs/examples/process.yaml"],
+)
+def test_fast_renderer_matches_default(yaml_name: str, tmp_path: Path) -> None:
+    """fast レンダラはサンプル YAML で既定レンダラと同じスライド XML を出力する。"""
+    n_default, n_fast, default, fast = _render_both(ROOT / yaml_name, tmp_path)
+    assert n_fast == n_default
+    assert fast == default
+
+
+@pytest.mark.parametrize("bake_chrome", [True, False])
+def test_fast_renderer_matches_default_mixed(bake_chrome: bool, tmp_path: Path) -> None:
+    """改行・XML 特殊文字・複数スライド・システム接続・ループを含む場合も同じ XML になる。"""
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML_MIXED, encoding="utf-8")
+    n_default, n_fast, default, fast = _render_both(yaml_path, tmp_path, bake_chrome=bake_chrome)
+    assert len([n for n in default if n.startswith("ppt/slides/")]) >= 4  # 2 スライド分の slide XML と rels
+    assert n_fast == n_default
+    assert fast == default
+
+
+def test_unknown_renderer_rejected(tmp_path: Path) -> None:
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML_MIXED, encoding="utf-8")
+    with pytest.raises(ValueError):
+        yaml2pptx.yaml_to_pptx(yaml_path, tmp_path / "out.pptx", renderer="turbo")
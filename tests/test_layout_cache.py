@@ -0,0 +1,128 @@
+"""layout_cache（構造・設定をキーにしたレイアウト結果のキャッシュ）のテスト。"""
+
+import re
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import placement, yaml2pptx, yaml_loader
+from process_to_pptx.layout_cache import LayoutCache
+from process_to_pptx.yaml_loader import ProcessModel
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _snapshot(layout):
+    return (
+        [(n.id, n.actor_index, n.column, n.slide_index, n.col_in_slide) for n in layout.nodes],
+        dict(layout.node_positions),
+        sorted(layout.back_edges),
+        dict(layout.edge_labels),
+        [getattr(layout, name) for name in yaml_loader.LAYOUT_GEOMETRY_FIELDS],
+        layout.num_slides,
+    )
+
+
+@pytest.fixture
+def counters(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    """列の割り当てと配置計算の呼び出し回数。"""
+    counts = {"columns": 0, "placement": 0}
+    assign, place = yaml_loader._assign_columns, yaml_loader.place_nodes
+
+    def _assign(*args):
+        counts["columns"] += 1
+        return assign(*args)
+
+    def _place(*args):
+        counts["placement"] += 1
+        return place(*args)
+
+    monkeypatch.setattr(yaml_loader, "_assign_columns", _assign)
+    monkeypatch.setattr(yaml_loader, "place_nodes", _place)
+    return counts
+
+
+def test_label_only_edit_skips_layout(counters: dict[str, int]) -> None:
+    """ラベルだけ変えた YAML は列の割り当ても配置も再計算せず、結果は計算し直したものと同じ。"""
+    src = (ROOT / "input" / "bank-sales.yaml").read_text(encoding="utf-8")
+    # サービスの label は列の並びに効くため変えない
+    edited = re.sub(r"label: (?!SFA|M365|ファイルサーバー)", "label: 改訂 ", src)
+    assert edited != src
+    cache = LayoutCache()
+    first = ProcessModel.load(src, layout_cache=cache).compute_layout()
+    second = ProcessModel.load(edited, layout_cache=cache).compute_layout()
+    assert counters == {"columns": 1, "placement": 1}
+    assert second.nodes[0].label != first.nodes[0].label
+    assert _snapshot(second) == _snapshot(ProcessModel.load(edited).compute_layout())
+
+
+def test_structure_and_config_changes_miss(counters: dict[str, int]) -> None:
+    """接続を変えると両方の段、layout 設定・スライド寸法だけ変えると配置の段だけ計算し直す。"""
+    src = (ROOT / "input" / "process.yaml").read_text(encoding="utf-8")
+    cache = LayoutCache()
+    model = ProcessModel.load(src, layout_cache=cache)
+    model.compute_layout()
+    model.compute_layout(slide_size=yaml_loader.SLIDE_SIZE_16_9)
+    assert counters == {"columns": 1, "placement": 2}
+
+    resized = ProcessModel.load(src + "layout:\n  task_size_ratio: 0.5\n", layout_cache=cache)
+    resized.compute_layout()
+    assert counters == {"columns": 1, "placement": 3}
+
+    rewired = ProcessModel.load(src, layout_cache=cache)
+    rewired.nodes[0].next_ids = list(reversed(rewired.nodes[0].next_ids)) + [rewired.nodes[-1].id]
+    rewired.compute_layout()
+    assert counters == {"columns": 2, "placement": 4}
+
+
+def test_disk_cache_shared_across_processes(tmp_path: Path, counters: dict[str, int]) -> None:
+    """ディレクトリを指定すると新しい LayoutCache（別プロセスの CLI 相当）でもヒットし、同じ PPTX になる。"""
+    src = ROOT / "input" / "bank-sales.yaml"
+    cache_dir = tmp_path / "cache"
+    first = yaml_loader.compute_layout(*_load(src), cache=LayoutCache(cache_dir))
+    reloaded = LayoutCache(cache_dir)
+    second = yaml_loader.compute_layout(*_load(src), cache=reloaded)
+    assert counters == {"columns": 1, "placement": 1}
+    assert (reloaded.hits, reloaded.misses) == (2, 0)
+    assert _snapshot(second) == _snapshot(first)
+
+    out_cached, out_plain = tmp_path / "cached.pptx", tmp_path / "plain.pptx"
+    yaml2pptx.yaml_to_pptx(src, out_cached, layout_cache=LayoutCache(cache_dir))
+    yaml2pptx.yaml_to_pptx(src, out_plain)
+    assert counters["columns"] == 2  # キャッシュ無しの 1 回分だけ増える
+    assert _pptx_xml(out_cached) == _pptx_xml(out_plain)
+
+
+def test_corrupt_disk_entry_is_recomputed(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    args = _load(ROOT / "input" / "process.yaml")
+    expected = _snapshot(yaml_loader.compute_layout(*args, cache=LayoutCache(cache_dir)))
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b"broken")
+    cache = LayoutCache(cache_dir)
+    assert _snapshot(yaml_loader.compute_layout(*args, cache=cache)) == expected
+    assert cache.hits == 0
+
+
+def test_vectorized_placement_hits_scalar_entry(counters: dict[str, int]) -> None:
+    """ループと NumPy の配置は同じ結果のため、キーに計算方法は含めない。"""
+    if placement.load_numpy() is None:
+        pytest.skip("NumPy is not installed")
+    cache = LayoutCache()
+    args = _load(ROOT / "input" / "bank-sales.yaml")
+    scalar = yaml_loader.compute_layout(*args, vectorized=False, cache=cache)
+    vector = yaml_loader.compute_layout(*args, vectorized=True, cache=cache)
+    assert counters["placement"] == 1
+    assert _snapshot(vector) == _snapshot(scalar)
+
+
+def _load(path: Path):
+    actors, nodes, layout_config = yaml_loader.load_process_yaml(path)
+    return actors, nodes, None, layout_config.get("margins"), layout_config
+
+
+def _pptx_xml(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as z:
+        return {name: z.read(name) for name in z.namelist() if name.endswith(".xml")}
@@ -0,0 +1,40 @@
+"""layout_json（レイアウトの JSON 出力）のテスト。"""
+
+import io
+import json
+from pathlib import Path
+
+from process_to_pptx.layout_json import LAYOUT_JSON_SCHEMA, layout_to_dict, yaml_to_layout_json
+from process_to_pptx.yaml_loader import ProcessModel
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_layout_json_matches_computed_layout(tmp_path: Path) -> None:
+    """ノードの位置・スライド・レーン、辺とラベルが compute_layout の結果と一致する。"""
+    model = ProcessModel.load(ROOT / "input" / "bank-sales.yaml")
+    layout = model.compute_layout()
+    out = tmp_path / "layout.json"
+    yaml_to_layout_json(ROOT / "input" / "bank-sales.yaml", out)
+    data = json.loads(out.read_text(encoding="utf-8"))
+
+    assert data == json.loads(json.dumps(layout_to_dict(layout)))
+    assert (data["schema"], data["unit"]) == (LAYOUT_JSON_SCHEMA, "emu")
+    assert data["slide"] == {"width": layout.slide_width, "height": layout.slide_height, "count": layout.num_slides}
+    assert [lane["name"] for lane in data["lanes"]] == layout.actors
+    for item, node in zip(data["nodes"], layout.nodes):
+        assert item["id"] == node.id and item["slide"] == node.slide_index and item["lane"] == node.actor_index
+        assert (item["x"], item["y"], item["width"], item["height"]) == layout.node_positions[node.id]
+        assert ("gateway_type" in item) == (node.type == "gateway")
+    assert [(e["from"], e["to"]) for e in data["edges"]] == list(layout.edges)
+    assert {(e["from"], e["to"]): e["label"] for e in data["edges"] if e["label"]} == dict(layout.edge_labels)
+    assert {(e["from"], e["to"]) for e in data["edges"] if e["back"]} == layout.back_edges
+    assert [(e["from"], e["to"], e["role"]) for e in data["system_edges"]] == list(layout.system_edges)
+
+
+def test_layout_json_to_stream_and_empty_process() -> None:
+    buf = io.StringIO()
+    layout = yaml_to_layout_json("actors: []\nnodes: []\n", buf, indent=2)
+    data = json.loads(buf.getvalue())
+    assert data["nodes"] == [] and data["edges"] == [] and data["slide"]["count"] == layout.num_slides == 1
@@ -0,0 +1,175 @@
+"""layout_session（エディタ向けの増分レイアウト）のテスト。"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import layout_session, yaml_loader
+from process_to_pptx.layout_session import LayoutSession
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode, compute_layout
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _snapshot(layout):
+    return (
+        [(n.id, n.actor_index, n.column, n.slide_index, n.col_in_slide) for n in layout.nodes],
+        dict(layout.node_positions),
+        sorted(map(str, layout.back_edges)),
+        dict(layout.edge_labels),
+        list(layout.system_edges),
+        dict(layout.system_edge_labels),
+        layout.num_slides,
+    )
+
+
+def _full(session: LayoutSession):
+    model = session.model()
+    return compute_layout(model.actors, model.nodes, margins=model.margins, layout_config=model.layout_config)
+
+
+def _positions(session: LayoutSession) -> dict:
+    return {node_id: session.position(node_id) for node_id in session}
+
+
+def test_initial_layout_matches_compute_layout() -> None:
+    model = ProcessModel.load(ROOT / "input" / "bank-sales.yaml")
+    session = LayoutSession(model)
+    assert _snapshot(session.layout()) == _snapshot(model.compute_layout())
+    assert session.num_slides == model.compute_layout().num_slides
+
+
+def test_random_edits_match_full_relayout() -> None:
+    """ループを作らない編集を続けても、毎回全体を計算し直した結果と同じ。moved は位置が変わったノードと一致する。"""
+    rnd = random.Random(7)
+    actors = ["A", "B", "[システム]S", "C"]
+    for _trial in range(30):
+        rank: dict[int, float] = {}
+
+        def _node(i: int) -> ProcessNode:
+            typ = rnd.choice(["task"] * 6 + ["gateway", "start", "end", "service"])
+            rank.setdefault(i, rnd.random())  # 辺は rank の小さい方から大きい方へだけ張る（閉路を作らない）
+            return ProcessNode(
+                id=i,
+                type=typ,
+                actor_index=2 if typ == "service" else rnd.choice([0, 1, 3]),
+                label=rnd.choice(["x", "y"]) if typ == "service" else f"L{i}",
+                next_ids=[],
+            )
+
+        nodes = [_node(i) for i in range(rnd.randint(0, 12))]
+        for node in nodes:
+            if node.type != "service":
+                node.next_ids = [o.id for o in nodes if o.type != "service" and rank[o.id] > rank[node.id] and rnd.random() < 0.2]
+                node.request_to = [o.id for o in nodes if o.type == "service" and rank[o.id] > rank[node.id] and rnd.random() < 0.3]
+        session = LayoutSession(ProcessModel(actors=actors, nodes=nodes, layout_config={"max_cols_per_slide": 3}))
+        removed: list[int] = []
+        next_id = 100
+        for _step in range(25):
+            ids = list(session)
+            before = _positions(session)
+            op = rnd.random()
+            if op < 0.3 or not ids:
+                node_id = removed.pop() if removed and rnd.random() < 0.5 else next_id
+                next_id += 1
+                node = _node(node_id)
+                if node.type != "service":
+                    node.next_ids = [o for o in ids if rank[o] > rank[node_id] and session.node(o).type != "service" and rnd.random() < 0.3]
+                changes = session.insert_node(node, rnd.choice([None, rnd.randint(0, len(ids))]))
+            elif op < 0.45:
+                node_id = rnd.choice(ids)
+                removed.append(node_id)
+                changes = session.delete_node(node_id)
+            elif op < 0.7:
+                a, b = sorted(rnd.sample(ids, 2), key=rank.__getitem__) if len(ids) > 1 else (ids[0], ids[0])
+                kinds = (session.node(a).type == "service", session.node(b).type == "service")
+                if a == b or kinds == (True, True):
+                    continue
+                role = {(False, False): "next", (False, True): "request", (True, False): "response"}[kinds]
+                changes = session.add_edge(a, b, label=rnd.choice([None, "yes"]), role=role)
+            elif op < 0.85:
+                node = session.node(rnd.choice(ids))
+                edges = [(node.id, t, "next") for t in node.next_ids] + [(f, node.id, "response") for f in node.response_from]
+                if not edges:
+                    continue
+                changes = session.remove_edge(*rnd.choice(edges))
+            else:
+                node = session.node(rnd.choice(ids))
+                changes = session.set_label(node.id, rnd.choice(["x", "y", "z"]) if node.type == "service" else "renamed")
+            full = _full(session)
+            assert _snapshot(session.layout()) == _snapshot(full)
+            after = _positions(session)
+            assert set(changes.moved) == {i for i in after if before.get(i) != after[i]}
+            assert changes.num_slides == full.num_slides
+
+
+def test_label_edit_moves_nothing_but_service_label_reorders_services() -> None:
+    model = ProcessModel.load(ROOT / "input" / "bank-sales.yaml")
+    session = LayoutSession(model)
+    task = next(n for n in model.nodes if n.type == "task")
+    changes = session.set_label(task.id, "名前を変更")
+    assert changes.relabeled == [task.id] and not changes.moved
+    assert changes.slides == {session.position(task.id)[0]}
+    assert task.label != "名前を変更"  # モデルのノードは変更しない
+
+    services = sorted((n for n in model.nodes if n.type == "service"), key=lambda n: n.label)
+    changes = session.set_label(services[0].id, "ZZZ")  # 先頭のサービスが後ろの列へ
+    assert services[0].id in changes.moved and set(changes.moved) < {n.id for n in services}
+    assert _snapshot(session.layout()) == _snapshot(_full(session))
+
+
+def test_rework_loop_becomes_back_edge() -> None:
+    """前の工程へ戻る辺は戻り辺になり、列は変わらない（全体を計算し直しても同じ）。"""
+    model = ProcessModel.load(ROOT / "input" / "process.yaml")
+    session = LayoutSession(model)
+    flow = [n for n in model.nodes if n.type in ("task", "gateway")]
+    last, first = flow[-1], flow[0]
+    changes = session.add_edge(last.id, first.id, label="差し戻し")
+    assert not changes.moved
+    layout = session.layout()
+    assert (last.id, first.id) in layout.back_edges
+    assert _snapshot(layout) == _snapshot(_full(session))
+    session.remove_edge(last.id, first.id)
+    assert _snapshot(session.layout()) == _snapshot(model.compute_layout())
+
+
+def test_deleted_node_reconnects_when_reinserted() -> None:
+    nodes = [
+        ProcessNode(id="s", type="start", actor_index=0, label="", next_ids=["a"]),
+        ProcessNode(id="a", type="task", actor_index=0, label="A", next_ids=["b"]),
+        ProcessNode(id="b", type="task", actor_index=1, label="B", next_ids=[]),
+    ]
+    session = LayoutSession(ProcessModel(actors=["X", "Y"], nodes=nodes))
+    changes = session.delete_node("a")
+    assert changes.removed == ["a"] and changes.moved == {"b": session.position("b")}
+    assert session.column("b") == 0
+    session.insert_node(nodes[1], 1)
+    assert [session.column(i) for i in "sab"] == [0, 1, 2]
+    assert list(session) == ["s", "a", "b"]
+    with pytest.raises(ValueError):
+        session.insert_node(nodes[1])
+    with pytest.raises(ValueError):
+        session.remove_edge("s", "b")
+    with pytest.raises(ValueError):
+        session.add_edge("s", "b", role="other")
+
+
+def test_edit_cost_does_not_depend_on_process_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """2 万ノードのプロセスでも、分岐の追加はその周りのノードだけを動かし、全体の計算をしない。"""
+    n = 20000
+    nodes = [ProcessNode(id=i, type="task", actor_index=i % 3, label=f"T{i}", next_ids=[i + 1]) for i in range(n)]
+    session = LayoutSession(ProcessModel(actors=["A", "B", "C"], nodes=nodes))
+
+    def _fail(*args):
+        raise AssertionError("full layout should not run")
+
+    monkeypatch.setattr(layout_session, "_layer_columns", _fail)
+    monkeypatch.setattr(yaml_loader, "place_nodes", _fail)
+    changes = session.insert_node(ProcessNode(id="x", type="task", actor_index=1, label="X", next_ids=[502]), 501)
+    changes2 = session.add_edge(500, "x")
+    assert set(changes.moved) | set(changes2.moved) == {"x"}
+    assert session.column("x") == session.column(501)
+    changes = session.add_edge(n - 1, 0)  # 全体を戻るループ
+    assert not changes.moved
@@ -0,0 +1,59 @@
+"""parallel_render（スライドの図形 XML をプロセスプールで組み立てる）のテスト。"""
+
+import io
+import zipfile
+
+import pytest
+
+from process_to_pptx import parallel_render, yaml2pptx
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _wide_model(n: int = 120) -> ProcessModel:
+    """スライドが 10 枚以上になる横長のプロセス（レーン間の矢印・分岐ラベル・ループ付き）。"""
+    nodes = [ProcessNode(id="s", type="start", actor_index=0, label="開始", next_ids=[0])]
+    for i in range(n):
+        node = ProcessNode(id=i, type="task", actor_index=i % 3, label=f"作業 {i}", next_ids=[i + 1] if i + 1 < n else [])
+        if i % 10 == 9:
+            node.type, node.next_ids, node.next_labels = "gateway", [i + 1, i - 5], {i + 1: "Yes", i - 5: "No"}
+        nodes.append(node)
+    return ProcessModel(actors=["営業", "上司", "事務"], nodes=nodes)
+
+
+def _xml(data: bytes) -> dict[str, bytes]:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+@pytest.mark.parametrize("bake_chrome", [True, False])
+def test_parallel_output_matches_sequential(bake_chrome: bool) -> None:
+    model = _wide_model()
+    assert model.compute_layout().num_slides >= parallel_render.MIN_PARALLEL_SLIDES
+    outputs = {}
+    for renderer, workers in (("default", None), ("fast", 2), (None, 3)):
+        buf = io.BytesIO()
+        n = yaml2pptx.yaml_to_pptx(model, buf, renderer=renderer, bake_chrome=bake_chrome, workers=workers)
+        outputs[renderer, workers] = (n, _xml(buf.getvalue()))
+    assert outputs["fast", 2] == outputs["default", None]
+    assert outputs[None, 3] == outputs["default", None]
+
+
+def test_explicit_default_renderer_rejected_in_parallel() -> None:
+    """python-pptx の図形 API（default）を明示して並列にすると、fast に置き換えずにエラーにする。"""
+    with pytest.raises(ValueError):
+        yaml2pptx.yaml_to_pptx(_wide_model(), io.BytesIO(), renderer="default", workers=2)
+    assert yaml2pptx.yaml_to_pptx(_wide_model(), io.BytesIO(), renderer="default", workers=1) > 0
+
+
+def test_small_decks_and_single_worker_do_not_start_a_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(*args, **kwargs):
+        raise AssertionError("process pool should not start")
+
+    monkeypatch.setattr(parallel_render, "ProcessPoolExecutor", _fail)
+    small = ProcessModel(
+        actors=["A"], nodes=[ProcessNode(id=1, type="task", actor_index=0, label="X", next_ids=[])]
+    )
+    assert yaml2pptx.yaml_to_pptx(small, io.BytesIO(), workers=4) > 0
+    assert yaml2pptx.yaml_to_pptx(_wide_model(), io.BytesIO(), workers=1) > 0
+    assert parallel_render.resolve_workers(None) == parallel_render.resolve_workers(-2) == 1
+    assert parallel_render.resolve_workers(0) >= 1
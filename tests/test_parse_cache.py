@@ -0,0 +1,71 @@
+"""parse_cache（YAML 解析結果のディスクキャッシュ）のテスト。"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import parse_cache, yaml_loader
+from process_to_pptx.parse_cache import ParseCache
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_cached_result_equals_parsed(tmp_path: Path) -> None:
+    """2 回目はキャッシュから返り、内容は YAML を解析した結果と同じ。"""
+    cache = ParseCache(tmp_path / "cache")
+    src = ROOT / "input" / "bank-sales.yaml"
+    first = yaml_loader.load_process_yaml(src, cache=cache)
+    second = yaml_loader.load_process_yaml(src, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second == first == yaml_loader.load_process_yaml(src)
+    assert second[1][0] is not first[1][0]  # compute_layout が書き換えても互いに影響しない
+
+
+def test_hit_skips_yaml_parsing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ParseCache(tmp_path / "cache")
+    src = ROOT / "input" / "process.yaml"
+    expected = yaml_loader.load_process_yaml(src, cache=cache)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed on a cache hit")
+
+    monkeypatch.setattr(yaml_loader.yaml, "safe_load", _fail)
+    assert yaml_loader.load_process_yaml(src, cache=cache) == expected
+
+
+def test_key_includes_loader_version(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ParseCache(tmp_path / "cache")
+    src = ROOT / "input" / "process.yaml"
+    yaml_loader.load_process_yaml(src, cache=cache)
+    monkeypatch.setattr(parse_cache, "LOADER_VERSION", yaml_loader.LOADER_VERSION + 1)
+    yaml_loader.load_process_yaml(src, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_lru_eviction_by_size(tmp_path: Path) -> None:
+    """合計サイズが上限を超えると、最後に使われたのが古いエントリから消える。"""
+    cache = ParseCache(tmp_path / "cache")
+    contents = [f"actors: [A]\nnodes:\n  - {{ id: {i}, label: T{i} }}\n".encode() for i in range(3)]
+    for i, content in enumerate(contents):
+        cache.put(content, yaml_loader._parse_process_data({"actors": ["A"], "nodes": [{"id": i}]}))
+        os.utime(cache._entry_path(content), ns=(i * 10**9, i * 10**9))
+    sizes = [cache._entry_path(c).stat().st_size for c in contents]
+    assert cache.get(contents[0]) is not None  # 0 を使ったので 1 が最も古くなる
+    cache.max_bytes = sum(sizes) - 1
+    cache.evict()
+    assert [cache._entry_path(c).exists() for c in contents] == [True, False, True]
+
+
+def test_corrupt_entry_and_unmarshalable_layout(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path / "cache")
+    src = tmp_path / "in.yaml"
+    src.write_text("actors: [A]\nnodes: [{ id: 1 }]\nlayout: { updated: 2024-01-01 }\n", encoding="utf-8")
+    yaml_loader.load_process_yaml(src, cache=cache)
+    assert list(cache.directory.glob("*.bin")) == []  # 日付は marshal できないのでキャッシュしない
+
+    content = b"actors: [A]\nnodes: [{ id: 1 }]\n"
+    cache._entry_path(content).write_bytes(b"broken")
+    assert cache.get(content) is None
+    assert not cache._entry_path(content).exists()
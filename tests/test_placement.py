@@ -0,0 +1,59 @@
+"""placement のテスト。"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import placement
+from process_to_pptx.placement import Grid, place_nodes
+from process_to_pptx.yaml_loader import ProcessModel
+
+ROOT = Path(__file__).resolve().parent.parent
+GRID = Grid(origin_left=1000, unit=500, content_top=3000, lane_height=7002, task_side=300, max_cols=4)
+
+
+def test_scalar_stacks_nodes_in_same_cell() -> None:
+    """同じスライド・レーン・列のノードはレーン高さの 90% をノード順に縦分割する。"""
+    result = place_nodes([0, 1, 1, 5, 1], [0, 1, 1, 1, 1], GRID, vectorized=False)
+    assert result.slide_index == [0, 0, 0, 1, 0]
+    assert result.col_in_slide == [0, 1, 1, 1, 1]
+    rects = [tuple(result.rects[4 * i : 4 * i + 4]) for i in range(5)]
+    assert rects[0] == (1000, 3000 + (7002 - 300) // 2, 300, 300)
+    zone = int(7002 * 0.9)
+    heights = [rects[i][3] for i in (1, 2, 4)]
+    assert sum(heights) == zone and heights == [zone // 3 + 1, zone // 3, zone // 3]
+    assert rects[2][1] == rects[1][1] + heights[0]
+    assert rects[3][:2] == (1500, 3000 + 7002 + (7002 - 300) // 2)  # 別スライドの同じ列は積まない
+
+
+def test_vectorized_matches_scalar() -> None:
+    """NumPy の経路はループと同じ結果になる。"""
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    for n in (0, 1, 50, 3000):
+        columns = [rng.randrange(n // 4 + 1) for _ in range(n)]
+        lanes = [rng.randrange(3) for _ in range(n)]
+        assert place_nodes(columns, lanes, GRID, vectorized=True) == place_nodes(columns, lanes, GRID, vectorized=False)
+
+
+def test_compute_layout_vectorized_matches_scalar() -> None:
+    """サンプルのレイアウトは NumPy の有無で変わらない。"""
+    pytest.importorskip("numpy")
+    model = ProcessModel.load(ROOT / "input" / "bank-sales.yaml")
+    scalar = model.compute_layout(vectorized=False)
+    vector = model.compute_layout(vectorized=True)
+    assert dict(vector.node_positions) == dict(scalar.node_positions)
+    assert [(n.slide_index, n.col_in_slide) for n in vector.nodes] == [
+        (n.slide_index, n.col_in_slide) for n in scalar.nodes
+    ]
+    assert vector.num_slides == scalar.num_slides
+
+
+def test_falls_back_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """NumPy が無ければ既定ではループで計算し、明示的に求めたときだけ ImportError。"""
+    monkeypatch.setattr(placement, "_numpy", False)
+    monkeypatch.setattr(placement, "VECTORIZE_MIN_NODES", 0)
+    assert place_nodes([0, 1], [0, 0], GRID).col_in_slide == [0, 1]
+    with pytest.raises(ImportError):
+        place_nodes([0, 1], [0, 0], GRID, vectorized=True)
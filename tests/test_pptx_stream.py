@@ -0,0 +1,89 @@
+"""pptx_stream（スライドを 1 枚ずつ zip に書き出すライター）のテスト。"""
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+
+from process_to_pptx import yaml2pptx
+from process_to_pptx.pptx_stream import StreamingPresentationWriter
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class _UnseekableSink(io.RawIOBase):
+    """標準出力のようにシークできない書き込み先。"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.data += b
+        return len(b)
+
+
+def _parts(data: bytes) -> dict[str, bytes]:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+@pytest.mark.parametrize("bake_chrome", [True, False])
+def test_stream_parts_match_presentation_save(bake_chrome: bool) -> None:
+    """パーツ（スライド・presentation.xml・rels・[Content_Types].xml）の中身は prs.save と同じ。"""
+    for source in (ROOT / "input" / "bank-sales.yaml", "actors: []\nnodes: []\n"):
+        saved, streamed = io.BytesIO(), io.BytesIO()
+        n = yaml2pptx.yaml_to_pptx(source, saved, bake_chrome=bake_chrome)
+        assert yaml2pptx.yaml_to_pptx(source, streamed, bake_chrome=bake_chrome, stream=True) == n
+        assert _parts(streamed.getvalue()) == _parts(saved.getvalue())
+
+
+def test_stream_to_unseekable_output_with_workers() -> None:
+    nodes = [
+        ProcessNode(id=i, type="task", actor_index=i % 2, label=f"T{i}", next_ids=[i + 1] if i < 59 else [])
+        for i in range(60)
+    ]
+    model = ProcessModel(actors=["A", "B"], nodes=nodes)
+    sink = _UnseekableSink()
+    yaml2pptx.yaml_to_pptx(model, sink, stream=True, workers=2)
+    prs = Presentation(io.BytesIO(bytes(sink.data)))
+    assert len(prs.slides) == model.compute_layout().num_slides > 4
+    expected = io.BytesIO()
+    yaml2pptx.yaml_to_pptx(model, expected)
+    assert _parts(bytes(sink.data)) == _parts(expected.getvalue())
+
+
+def test_writer_requires_empty_base_and_leaves_it_unchanged(tmp_path: Path) -> None:
+    prs = Presentation()
+    before = prs.part.blob
+    with StreamingPresentationWriter(prs, prs.slide_layouts[6], tmp_path / "out.pptx") as writer:
+        writer.add_slide()
+        writer.add_slide('<p:sp><p:nvSpPr><p:cNvPr id="2" name="X"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr/></p:sp>')
+    assert writer.slide_count == 2
+    assert prs.part.blob == before
+    out = Presentation(str(tmp_path / "out.pptx"))
+    assert [len(s.shapes) for s in out.slides] == [0, 1]
+
+    prs.slides.add_slide(prs.slide_layouts[6])
+    with pytest.raises(ValueError):
+        StreamingPresentationWriter(prs, prs.slide_layouts[6], io.BytesIO())
+
+
+def test_explicit_default_renderer_rejected_when_streaming() -> None:
+    """stream・slide_cache は fast のテンプレートで書くため、default を明示したら置き換えずにエラーにする。"""
+    from process_to_pptx.slide_cache import SlideCache
+
+    source = ROOT / "input" / "bank-sales.yaml"
+    with pytest.raises(ValueError):
+        yaml2pptx.yaml_to_pptx(source, io.BytesIO(), renderer="default", stream=True)
+    with pytest.raises(ValueError):
+        yaml2pptx.yaml_to_pptx(source, io.BytesIO(), renderer="default", slide_cache=SlideCache())
+    assert yaml2pptx.yaml_to_pptx(source, io.BytesIO(), renderer="fast", stream=True) > 0
+    # 省略時は並列・ストリームでも描ける（fast のテンプレート）
+    assert yaml2pptx.yaml_to_pptx(source, io.BytesIO(), stream=True) > 0
@@ -0,0 +1,182 @@
+"""pptx_update（生成済み PPTX の差分更新）のテスト。"""
+
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+from pptx.util import Emu
+
+from process_to_pptx import yaml2pptx
+from process_to_pptx.pptx_update import update_pptx
+from process_to_pptx.shape_tags import is_tag
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _model(n: int = 40, label: str = "作業 10", actors: tuple[str, ...] = ("A", "B", "C")) -> ProcessModel:
+    nodes = [
+        ProcessNode(
+            id=i,
+            type="task",
+            actor_index=i % 3,
+            label=label if i == 10 else f"作業 {i}",
+            next_ids=[i + 1] if i < n - 1 else [],
+            next_labels={i + 1: "Yes"} if i % 7 == 0 else {},
+        )
+        for i in range(n)
+    ]
+    return ProcessModel(actors=list(actors), nodes=nodes)
+
+
+def _generate(model: ProcessModel, path: Path, bake_chrome: bool = True) -> Path:
+    """生成して、1 枚目にユーザーのタイトルとノートを足す。"""
+    yaml2pptx.yaml_to_pptx(model, path, bake_chrome=bake_chrome)
+    prs = Presentation(str(path))
+    slide = prs.slides[0]
+    slide.shapes.add_textbox(Emu(0), Emu(0), Emu(914400), Emu(300000)).text = "ユーザーのタイトル"
+    slide.notes_slide.notes_text_frame.text = "ノート"
+    prs.save(str(path))
+    return path
+
+
+def _generated_shapes(prs) -> list[list[tuple]]:
+    """スライドごとの生成した図形（名前・位置・大きさ・テキスト）。ID は比べない。"""
+    return [
+        [
+            (s.name, s.left, s.top, s.width, s.height, s.text_frame.text if s.has_text_frame else None)
+            for s in slide.shapes
+            if is_tag(s.name)
+        ]
+        for slide in prs.slides
+    ]
+
+
+def _assert_matches_fresh(updated, model: ProcessModel, bake_chrome: bool = True) -> None:
+    """更新した PPTX の生成図形が、model から作り直したものと同じで、ユーザーのタイトル・ノートが残っている。"""
+    fresh = io.BytesIO()
+    yaml2pptx.yaml_to_pptx(model, fresh, bake_chrome=bake_chrome)
+    assert _generated_shapes(updated) == _generated_shapes(Presentation(fresh))
+    assert updated.slides[0].shapes[-1].text_frame.text == "ユーザーのタイトル"
+    assert updated.slides[0].notes_slide.notes_text_frame.text == "ノート"
+
+
+def _members(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+@pytest.mark.parametrize("bake_chrome", [True, False])
+def test_label_change_rewrites_only_that_shape(bake_chrome: bool, tmp_path: Path) -> None:
+    path = _generate(_model(), tmp_path / "deck.pptx", bake_chrome)
+    slides = len(Presentation(str(path)).slides)
+    before = _members(path)
+
+    result = update_pptx(_model(), path)
+    assert (result.slides_kept, result.slides_patched) == (slides, 0)
+
+    edited = _model(label="ラベルを変更")
+    result = update_pptx(edited, path)
+    assert (result.slides_kept, result.slides_patched, result.slides_added, result.slides_removed) == (
+        slides - 1,
+        1,
+        0,
+        0,
+    )
+    assert (result.shapes_added, result.shapes_changed, result.shapes_removed) == (0, 1, 0)
+    after = _members(path)
+    # 書き換わるのはラベルが載るスライドのパーツだけ（他のパーツはバイト列のまま）
+    slide_index = next(n.slide_index for n in edited.compute_layout().nodes if n.id == 10)
+    assert [name for name in before if before[name] != after.get(name)] == [f"ppt/slides/slide{slide_index + 1}.xml"]
+    _assert_matches_fresh(Presentation(str(path)), edited, bake_chrome)
+
+
+def test_slides_are_added_and_removed(tmp_path: Path) -> None:
+    path = _generate(_model(), tmp_path / "deck.pptx")
+    slides = len(Presentation(str(path)).slides)
+
+    result = update_pptx(_model(80), path)
+    assert result.slides_added > 0
+    _assert_matches_fresh(Presentation(str(path)), _model(80))
+
+    out = io.BytesIO()
+    result = update_pptx(_model(20), path, out)
+    prs = Presentation(out)
+    assert result.slides_removed > 0
+    assert len(prs.slides) < slides
+    _assert_matches_fresh(prs, _model(20))
+
+
+def test_removed_slide_with_user_content_is_kept(tmp_path: Path) -> None:
+    path = _generate(_model(), tmp_path / "deck.pptx")
+    # 1 枚にまとまるモデルへ縮めても、ユーザーのタイトルがある 1 枚目は残る（生成した図形だけ消える）
+    tiny = ProcessModel(actors=["A"], nodes=[ProcessNode(id=0, type="task", actor_index=0, label="x", next_ids=[])])
+    prs = Presentation(str(path))
+    prs.slides[1].shapes.add_textbox(Emu(0), Emu(0), Emu(914400), Emu(300000)).text = "メモ"
+    prs.save(str(path))
+    slides = len(prs.slides)
+    result = update_pptx(tiny, path)
+    prs = Presentation(str(path))
+    assert len(prs.slides) == 2
+    assert result.slides_removed == slides - 2
+    assert [s.text_frame.text for s in prs.slides[1].shapes] == ["メモ"]
+
+
+def test_empty_model_keeps_one_blank_slide(tmp_path: Path) -> None:
+    path = tmp_path / "deck.pptx"
+    yaml2pptx.yaml_to_pptx(_model(), path)
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("actors: []\nnodes: []\n", encoding="utf-8")
+    # 空のモデルでは yaml_to_pptx の出力と同じく白紙のスライドが 1 枚残り、もう一度更新できる
+    result = update_pptx(empty, path)
+    prs = Presentation(str(path))
+    assert len(prs.slides) == 1 and len(prs.slides[0].shapes) == 0
+    assert result.slides_patched == 1
+    assert update_pptx(empty, path).slides_kept == 1
+    update_pptx(_model(20), path)
+    fresh = io.BytesIO()
+    yaml2pptx.yaml_to_pptx(_model(20), fresh)
+    assert len(Presentation(str(path)).slides) == len(Presentation(fresh).slides)
+
+    yaml2pptx.yaml_to_pptx(empty, tmp_path / "fresh-empty.pptx")
+    assert update_pptx(empty, tmp_path / "fresh-empty.pptx").slides_kept == 1
+
+
+def test_actor_change_updates_baked_layout(tmp_path: Path) -> None:
+    path = _generate(_model(), tmp_path / "deck.pptx")
+    renamed = _model(actors=("営業", "B", "C"))
+    result = update_pptx(renamed, path)
+    assert result.layout_patched
+    prs = Presentation(str(path))
+    layout = prs.slides[0].slide_layout
+    assert "営業" in [s.text_frame.text for s in layout.shapes if s.has_text_frame]
+    _assert_matches_fresh(prs, renamed)
+
+
+def test_rejects_decks_without_generated_slides(tmp_path: Path) -> None:
+    path = tmp_path / "plain.pptx"
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[6])
+    prs.save(str(path))
+    with pytest.raises(ValueError):
+        update_pptx(_model(), path)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX のパーミッション")
+def test_update_keeps_file_mode(tmp_path: Path) -> None:
+    """その場で更新しても元のファイルのパーミッションを保ち、新しい出力は umask どおりに作る。"""
+    old = os.umask(0o022)
+    try:
+        path = tmp_path / "deck.pptx"
+        yaml2pptx.yaml_to_pptx(_model(), path)
+        assert path.stat().st_mode & 0o777 == 0o644
+        update_pptx(_model(label="ラベルを変更"), path)
+        assert path.stat().st_mode & 0o777 == 0o644
+        os.chmod(path, 0o664)
+        update_pptx(_model(), path)
+        assert path.stat().st_mode & 0o777 == 0o664
+        update_pptx(_model(label="別のラベル"), path, tmp_path / "new.pptx")
+        assert (tmp_path / "new.pptx").stat().st_mode & 0o777 == 0o644
+    finally:
+        os.umask(old)
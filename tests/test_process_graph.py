@@ -0,0 +1,70 @@
+"""ProcessGraph のテスト。"""
+
+from process_to_pptx.process_graph import ProcessGraph
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _nodes() -> list[ProcessNode]:
+    return [
+        ProcessNode(id="s", type="start", actor_index=0, label="開始", next_ids=[1]),
+        ProcessNode(id=1, type="task", actor_index=0, label="T1", next_ids=[2, "missing"], request_to=["svc"]),
+        ProcessNode(id=2, type="task", actor_index=0, label="T2", next_ids=["e"], response_from=["svc"]),
+        ProcessNode(id="e", type="end", actor_index=0, label="終了", next_ids=[]),
+        ProcessNode(id="svc", type="service", actor_index=1, label="API", next_ids=[]),
+        ProcessNode(id=9, type="task", actor_index=0, label="孤立", next_ids=[]),
+    ]
+
+
+def test_flow_csr_and_degrees() -> None:
+    """next は CSR で持ち、存在しない接続先は含めない。"""
+    graph = ProcessGraph(_nodes())
+    assert len(graph) == 6
+    assert graph.index["svc"] == 4
+    assert list(graph.flow_offsets) == [0, 1, 2, 3, 3, 3, 3]
+    assert list(graph.flow_successors(1)) == [2]
+    assert list(graph.flow_edges()) == [(0, 1), (1, 2), (2, 3)]
+    assert list(graph.flow_in_degree) == [0, 1, 1, 1, 0, 0]
+    assert list(graph.flow_out_degree) == [1, 1, 1, 0, 0, 0]
+    assert graph.isolated_flow_nodes(_nodes()) == [9]
+
+
+def test_system_edges_follow_column_order() -> None:
+    """request はノード→サービス、response はサービス→ノードの向き。order は next とシステム接続を合わせる。"""
+    graph = ProcessGraph(_nodes())
+    assert list(graph.system_edges()) == [(1, 4, "request"), (4, 2, "response")]
+    svc = graph.index["svc"]
+    start, end = graph.system_offsets[svc], graph.system_offsets[svc + 1]
+    assert [graph.system_targets[e] for e in graph.system_edge_order[start:end]] == [2]
+    assert list(graph.order_targets[graph.order_offsets[1] : graph.order_offsets[2]]) == [2, 4]
+    assert list(graph.order_in_degree) == [0, 1, 2, 1, 1, 0]
+
+
+def test_model_graph_shared_by_layouts() -> None:
+    """ProcessModel の索引は 1 回だけ作られ、レイアウト計算と孤立ノード検査で共有される。"""
+    model = ProcessModel(actors=["A", "[システム]API"], nodes=_nodes())
+    assert model.find_isolated_flow_nodes() == [9]
+    first = model.compute_layout()
+    second = model.compute_layout(max_cols_per_slide=2)
+    assert first.graph is second.graph is model.graph
+    assert first.edges == [("s", 1), (1, 2), (2, "e")]
+    assert first.system_edges == [(1, "svc", "request"), ("svc", 2, "response")]
+
+
+def test_layout_tables_read_like_dicts_and_lists() -> None:
+    """レイアウトの位置・辺・ラベルの表は dict / list と同じように読める。"""
+    nodes = _nodes()
+    nodes[1].next_labels = {2: "Yes"}
+    nodes[1].request_to_labels = {"svc": "登録"}
+    layout = ProcessModel(actors=["A", "[システム]API"], nodes=nodes).compute_layout()
+    assert len(layout.node_positions) == 6
+    assert set(layout.node_positions) == {"s", 1, 2, "e", "svc", 9}
+    assert "missing" not in layout.node_positions
+    left, top, width, height = layout.node_positions[1]
+    assert width > 0 and height > 0
+    assert dict(layout.node_positions) == {nid: layout.node_positions[nid] for nid in layout.node_positions}
+    assert layout.edges[-1] == (2, "e") and layout.edges[:1] == [("s", 1)]
+    assert (1, 2) in layout.edges and (2, 1) not in layout.edges
+    assert ("svc", 2, "response") in layout.system_edges and ("svc", 2, "request") not in layout.system_edges
+    assert dict(layout.edge_labels) == {(1, 2): "Yes"}
+    assert layout.edge_labels.get(("s", 1)) is None
+    assert dict(layout.system_edge_labels) == {(1, "svc", "request"): "登録"}
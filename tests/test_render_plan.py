@@ -0,0 +1,104 @@
+"""render_plan のテスト。"""
+
+from process_to_pptx.render_plan import (
+    CONNECTION_SITE_BOTTOM,
+    CONNECTION_SITE_LEFT,
+    CONNECTION_SITE_RIGHT,
+    CONNECTION_SITE_TOP,
+    build_render_plan,
+    node_shape_rect,
+    return_route,
+    site_point,
+)
+from process_to_pptx.yaml_loader import ProcessNode, compute_layout
+
+
+def _chain(n: int, actors: int = 2) -> list[ProcessNode]:
+    return [
+        ProcessNode(id=i, type="task", actor_index=i % actors, label=f"T{i}", next_ids=[i + 1] if i + 1 < n else [])
+        for i in range(n)
+    ]
+
+
+def test_nodes_and_edges_bucketed_by_slide() -> None:
+    """ノードは slide_index ごとに振り分けられ、スライドをまたぐ矢印は描かない。"""
+    nodes = _chain(12)
+    layout = compute_layout(["A", "B"], nodes, layout_config={"max_cols_per_slide": 4})
+    plans = build_render_plan(layout)
+    assert len(plans) == layout.num_slides == 3
+    for plan in plans:
+        assert all(n.slide_index == plan.slide_index for n in plan.nodes)
+        for edge in plan.edges:
+            assert edge.from_node.slide_index == edge.to_node.slide_index == plan.slide_index
+    assert sum(len(p.nodes) for p in plans) == 12
+    # 12 ノードの鎖のうちスライド境界をまたぐ 2 本は描かない
+    assert sum(len(p.edges) for p in plans) == 11 - 2
+
+
+def test_edge_sites_and_labels() -> None:
+    """レーン間は折れ線・右から左、分岐ラベルには枠が付く。"""
+    nodes = [
+        ProcessNode(id=1, type="gateway", actor_index=0, label="?", next_ids=[2], next_labels={2: "Yes"}),
+        ProcessNode(id=2, type="task", actor_index=1, label="T2", next_ids=[]),
+    ]
+    layout = compute_layout(["A", "B"], nodes)
+    (plan,) = build_render_plan(layout)
+    (edge,) = plan.edges
+    assert edge.straight is False
+    assert (edge.site_from, edge.site_to) == (CONNECTION_SITE_RIGHT, CONNECTION_SITE_LEFT)
+    assert edge.label == "Yes"
+    assert edge.label_rect is not None
+
+
+def test_service_disks_on_slides_without_service() -> None:
+    """サービスノードの無いスライドにはシステムレーンの磁気ディスクが計画される。"""
+    nodes = _chain(10, actors=1)
+    nodes[0].request_to = ["svc"]
+    nodes[9].response_from = ["svc"]
+    nodes.append(ProcessNode(id="svc", type="service", actor_index=1, label="API", next_ids=[]))
+    layout = compute_layout(["営業", "[システム]API"], nodes, layout_config={"max_cols_per_slide": 4})
+    plans = build_render_plan(layout)
+    svc = next(n for n in layout.nodes if n.type == "service")
+    for plan in plans:
+        if plan.slide_index == svc.slide_index:
+            assert plan.service_disks == []
+        else:
+            assert [d.node_id for d in plan.service_disks] == ["svc"]
+    first = plans[0]
+    (request,) = first.system_edges
+    assert request.role == "request"
+    assert (request.site_from, request.site_to) == (CONNECTION_SITE_BOTTOM, CONNECTION_SITE_TOP)
+
+
+def test_back_edge_drawn_as_return_arrow() -> None:
+    """ループを閉じる戻り辺は下辺から出て下辺に入る折れ線になる。"""
+    nodes = _chain(4, actors=1)
+    nodes[3].next_ids = [1]
+    layout = compute_layout(["A"], nodes)
+    (plan,) = build_render_plan(layout)
+    back = [e for e in plan.edges if e.back]
+    assert [(e.from_node.id, e.to_node.id) for e in back] == [(3, 1)]
+    assert back[0].straight is False
+    assert (back[0].site_from, back[0].site_to) == (CONNECTION_SITE_BOTTOM, CONNECTION_SITE_BOTTOM)
+    assert all(e.straight for e in plan.edges if not e.back)
+
+
+def test_same_lane_back_edge_routed_below_tasks() -> None:
+    """同じレーンの戻り矢印（s→a→b→g→a の g→a）は、タスクの下辺より下・レーンの下端より上を通る U 字になる。"""
+    nodes = [ProcessNode(id="s", type="start", actor_index=0, label="s", next_ids=["a"])]
+    nodes += [
+        ProcessNode(id=x, type="task", actor_index=0, label=x, next_ids=[y])
+        for x, y in (("a", "b"), ("b", "g"), ("g", "a"))
+    ]
+    layout = compute_layout(["A"], nodes)
+    (plan,) = build_render_plan(layout)
+    (back,) = [e for e in plan.edges if e.back]
+    assert all(e.route_y is None for e in plan.edges if not e.back)
+    rects = {n.id: node_shape_rect(n.type, *layout.node_positions[n.id]) for n in plan.nodes}
+    begin = site_point(rects["g"], back.site_from)
+    end = site_point(rects["a"], back.site_to)
+    assert begin[1] == end[1]  # 両端は同じ高さ（タスクの下辺）
+    route = return_route(begin, end, back.route_y)
+    assert route[0] == begin and route[-1] == end
+    assert max(y + h for _, y, _, h in rects.values()) < back.route_y
+    assert back.route_y < layout.content_top_offset + layout.lane_height
@@ -0,0 +1,55 @@
+"""slide_builder のテスト。"""
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_CONNECTOR_TYPE, MSO_SHAPE
+
+from process_to_pptx.slide_builder import SlideBuilder
+
+
+def _blank_slide():
+    prs = Presentation()
+    return prs, prs.slides.add_slide(prs.slide_layouts[6])
+
+
+def test_builder_allocates_unique_sequential_ids() -> None:
+    """図形 ID は既存の最大 ID の続きから重複なく払い出される。"""
+    _, slide = _blank_slide()
+    builder = SlideBuilder(slide)
+    shapes = [
+        builder.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, 100, 100),
+        builder.add_connector(MSO_CONNECTOR_TYPE.STRAIGHT, 200, 0, 0, 50),
+        builder.add_textbox(0, 0, 100, 100),
+    ]
+    ids = [s.shape_id for s in shapes]
+    assert ids == [2, 3, 4]
+    assert len(slide.shapes) == 3
+
+
+def test_builder_matches_python_pptx_shapes() -> None:
+    """SlideBuilder で追加した図形は slide.shapes.add_* と同じ XML になる。"""
+    _, slide_a = _blank_slide()
+    _, slide_b = _blank_slide()
+    builder = SlideBuilder(slide_a)
+    builder.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, 10, 20, 30, 40)
+    builder.add_connector(MSO_CONNECTOR_TYPE.ELBOW, 50, 60, 10, 20)
+    builder.add_textbox(1, 2, 3, 4)
+    slide_b.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, 10, 20, 30, 40)
+    slide_b.shapes.add_connector(MSO_CONNECTOR_TYPE.ELBOW, 50, 60, 10, 20)
+    slide_b.shapes.add_textbox(1, 2, 3, 4)
+    xml_a = [s._element.xml for s in slide_a.shapes]
+    xml_b = [s._element.xml for s in slide_b.shapes]
+    assert xml_a == xml_b
+
+
+def test_builder_connects_shapes() -> None:
+    """払い出した ID でコネクタの接続先が参照される。"""
+    _, slide = _blank_slide()
+    builder = SlideBuilder(slide)
+    a = builder.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, 100, 100)
+    b = builder.add_shape(MSO_SHAPE.RECTANGLE, 300, 0, 100, 100)
+    conn = builder.add_connector(MSO_CONNECTOR_TYPE.STRAIGHT, 0, 0, 0, 0)
+    conn.begin_connect(a, 3)
+    conn.end_connect(b, 1)
+    xml = conn._element.xml
+    assert f'<a:stCxn id="{a.shape_id}" idx="3"/>' in xml
+    assert f'<a:endCxn id="{b.shape_id}" idx="1"/>' in xml
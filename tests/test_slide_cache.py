@@ -0,0 +1,86 @@
+"""slide_cache（スライドの描画入力のハッシュで引くスライド XML のキャッシュ）のテスト。"""
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from process_to_pptx import yaml2pptx
+from process_to_pptx.render_plan import build_render_plan
+from process_to_pptx.slide_cache import SlideCache
+from process_to_pptx.yaml_loader import ProcessModel, ProcessNode
+
+
+def _model(changed_label: str = "作業 30") -> ProcessModel:
+    nodes = [
+        ProcessNode(
+            id=i,
+            type="task",
+            actor_index=i % 3,
+            label=changed_label if i == 30 else f"作業 {i}",
+            next_ids=[i + 1] if i < 79 else [],
+            next_labels={i + 1: "Yes"} if i % 7 == 0 else {},
+        )
+        for i in range(80)
+    ]
+    return ProcessModel(actors=["A", "B", "C"], nodes=nodes)
+
+
+def _parts(data: bytes) -> dict[str, bytes]:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+def _pptx(model: ProcessModel, **kwargs) -> bytes:
+    out = io.BytesIO()
+    yaml2pptx.yaml_to_pptx(model, out, **kwargs)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("bake_chrome", [True, False])
+def test_only_changed_slide_is_rebuilt(bake_chrome: bool, tmp_path: Path) -> None:
+    cache = SlideCache(tmp_path / "cache")
+    model = _model()
+    slides = model.compute_layout().num_slides
+    assert slides > 3
+    assert _parts(_pptx(model, bake_chrome=bake_chrome, slide_cache=cache)) == _parts(_pptx(model, bake_chrome=bake_chrome))
+    assert (cache.hits, cache.misses) == (0, slides)
+
+    edited = _model("ラベルを変更")
+    data = _pptx(edited, bake_chrome=bake_chrome, slide_cache=cache, workers=2)
+    assert (cache.hits, cache.misses) == (slides - 1, slides + 1)
+    assert _parts(data) == _parts(_pptx(edited, bake_chrome=bake_chrome))
+
+    # ディスクに残るため、新しいキャッシュ（別プロセス相当）でもすべてヒットする
+    reloaded = SlideCache(tmp_path / "cache")
+    assert _parts(_pptx(edited, bake_chrome=bake_chrome, slide_cache=reloaded)) == _parts(data)
+    assert reloaded.stats().hit_rate == 1.0
+
+
+def test_key_depends_on_render_inputs() -> None:
+    layout = _model().compute_layout()
+    plans = build_render_plan(layout)
+    cache = SlideCache()
+    keys = [cache.key(layout, plan, True) for plan in plans]
+    assert len(set(keys)) == len(keys)
+    assert keys == [cache.key(_model().compute_layout(), plan, True) for plan in build_render_plan(_model().compute_layout())]
+    assert cache.key(layout, plans[0], False) != keys[0]
+
+
+def test_eviction_and_stats(tmp_path: Path) -> None:
+    cache = SlideCache(max_memory_bytes=250)
+    for i in range(5):
+        cache.put(f"k{i}", b"x" * 100, 1)
+    stats = cache.stats()
+    assert (stats.entries, stats.memory_bytes, stats.evictions) == (2, 200, 3)
+    assert cache.get("k0") is None and cache.get("k4") == (b"x" * 100, 1)
+    assert "1 hit(s), 1 miss(es) (50%), 3 evicted" in cache.stats().format()
+
+    disk = SlideCache(tmp_path, max_bytes=200)
+    for i in range(10):
+        disk.put(f"k{i}", bytes(range(256)) * 4, 1)
+    assert len(list(tmp_path.glob("*.bin"))) == 10  # 削除は flush でまとめて行う
+    disk.flush()
+    assert len(list(tmp_path.glob("*.bin"))) < 10
+    assert disk.stats().evictions > 0
@@ -0,0 +1,80 @@
+"""svg_render（SVG / HTML プレビュー）のテスト。"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from process_to_pptx import svg_render
+from process_to_pptx.render_plan import build_render_plan
+from process_to_pptx.yaml_loader import ProcessModel
+
+
+ROOT = Path(__file__).resolve().parent.parent
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def test_svg_draws_every_planned_shape(tmp_path: Path) -> None:
+    """スライドごとにノード・磁気ディスク・矢印・ラベルを描画計画どおりの数だけ描き、レーンは defs に 1 回だけ置く。"""
+    model = ProcessModel.load(ROOT / "input" / "bank-sales.yaml")
+    layout = model.compute_layout()
+    plans = build_render_plan(layout)
+    out = tmp_path / "preview.svg"
+    svg_render.yaml_to_preview(model, out, fmt="svg")
+    root = ET.parse(out).getroot()
+
+    slides = root.findall(SVG + "svg")
+    assert len(slides) == layout.num_slides == len(plans)
+    assert len(root.find(SVG + "defs").findall(f"{SVG}g/{SVG}rect")) == len(layout.actors)
+    for slide, plan in zip(slides, plans):
+        assert slide.find(SVG + "use") is not None
+        connectors = slide.findall(SVG + "polyline")
+        assert len(connectors) == len(plan.edges) + len(plan.system_edges)
+        dotted = [c for c in connectors if "marker-start" in c.attrib]
+        assert len(dotted) == len(plan.system_edges)
+        texts = [t for t in slide.findall(SVG + "text")]
+        labels = sum(1 for e in plan.edges + plan.system_edges if e.label)
+        assert len(texts) == len(plan.nodes) + len(plan.service_disks) + labels
+        assert len(slide.findall(SVG + "ellipse")) == sum(n.type in ("start", "end") for n in plan.nodes)
+
+    # タスクの図形はレイアウトの位置どおり
+    task = next(n for n in layout.nodes if n.type == "task" and n.slide_index == 0)
+    x, y, w, h = layout.node_positions[task.id]
+    assert slides[0].find(f"{SVG}rect[@x='{x}'][@y='{y}'][@width='{w}'][@height='{h}']") is not None
+
+
+def test_html_has_one_page_per_slide_and_escapes_text() -> None:
+    src = (
+        "actors: [\"A & B\"]\n"
+        "nodes:\n"
+        "  - {id: 1, type: task, actor: 0, label: \"見積 <初回>\\n確認\", next: [2]}\n"
+        "  - {id: 2, type: gateway, actor: 0, label: ok?, next: [{id: 3, label: \"Yes\"}]}\n"
+        "  - {id: 3, type: end, actor: 0, label: 終了}\n"
+    )
+    buf = io.StringIO()
+    layout = svg_render.yaml_to_preview(src, buf, fmt="html")
+    html = buf.getvalue()
+    assert html.startswith("<!DOCTYPE html>")
+    assert len(re.findall(r'<section class="slide"', html)) == layout.num_slides
+    assert "A &amp; B" in html and "見積 &lt;初回&gt;</tspan>" in html and ">Yes</text>" in html
+    body = html[html.index("<body>") + len("<body>"):html.index("</body>")]
+    ET.fromstring("<root>" + body + "</root>")  # 埋め込んだ SVG は整形式
+
+
+def test_back_edge_drawn_as_u_shape() -> None:
+    """戻り矢印は図形の下を回る U 字（下→横→上）の折れ線で描く。"""
+    model = ProcessModel.load(
+        io.StringIO(
+            "actors: [A]\nnodes:\n"
+            "  - { id: a, type: task, actor: 0, label: a, next: [b] }\n"
+            "  - { id: b, type: task, actor: 0, label: b, next: [a] }\n"
+        )
+    )
+    layout = model.compute_layout()
+    (plan,) = build_render_plan(layout)
+    (back,) = [e for e in plan.edges if e.back]
+    svg = svg_render.slide_body_svg(layout, plan)
+    (points,) = [p for p in re.findall(r'<polyline points="([^"]*)"', svg) if len(p.split()) == 4]
+    (bx, by), (x1, y1), (x2, y2), (ex, ey) = [tuple(map(int, p.split(","))) for p in points.split()]
+    assert (x1, y1) == (bx, back.route_y) and (x2, y2) == (ex, back.route_y)
+    assert by == ey < back.route_y
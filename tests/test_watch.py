@@ -0,0 +1,154 @@
+"""watch（監視して変わった入力だけを変換し直す）のテスト。"""
+
+import queue
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+
+from process_to_pptx import watch
+
+SAMPLE_YAML = """
+actors: [A, B]
+nodes:
+  - {{ id: 1, type: task, actor: 0, label: {label}, next: [2] }}
+  - {{ id: 2, type: task, actor: 1, label: T2, next: [] }}
+"""
+
+SAMPLE_XML = """<mxGraphModel><root>
+  <mxCell id="0"/>
+  <mxCell id="1" parent="0"/>
+  <mxCell id="2" parent="0" value="DRAWIO" vertex="1"><mxGeometry x="0" y="0" width="80" height="30" as="geometry"/></mxCell>
+</root></mxGraphModel>"""
+
+
+def _write(path: Path, label: str) -> None:
+    path.write_text(SAMPLE_YAML.format(label=label), encoding="utf-8")
+
+
+def _texts(path: Path) -> list[str]:
+    return [s.text_frame.text for slide in Presentation(str(path)).slides for s in slide.shapes if s.has_text_frame]
+
+
+class _FakeSource:
+    """wait のたびに決めておいた変更を 1 組ずつ返し、尽きたら timeout 秒待つ（待ちすぎたら stop をセットする）。"""
+
+    name = "fake"
+
+    def __init__(self, batches: list[set[Path]], stop: threading.Event) -> None:
+        self.batches = list(batches)
+        self.stop = stop
+        self.idle = 0
+
+    def wait(self, timeout: float) -> set[Path]:
+        if self.batches:
+            return self.batches.pop(0)
+        self.idle += 1
+        if self.idle > 20:
+            self.stop.set()
+        time.sleep(timeout)
+        return set()
+
+    def close(self) -> None:
+        pass
+
+
+def test_polling_source_reports_changed_files(tmp_path: Path) -> None:
+    (tmp_path / "a.yaml").write_text("x", encoding="utf-8")
+    source = watch.PollingSource([tmp_path], interval=0.0)
+    assert source.wait(0.1) == set()
+    (tmp_path / "a.yaml").write_text("changed", encoding="utf-8")
+    (tmp_path / "b.yaml").write_text("new", encoding="utf-8")
+    assert source.wait(0.1) == {tmp_path / "a.yaml", tmp_path / "b.yaml"}
+
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_edit_is_rendered_while_watching(polling: bool, tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    _write(src / "p.yaml", "T1")
+    results: queue.Queue = queue.Queue()
+    with watch.Watcher([src], tmp_path / "out", debounce=0.05, interval=0.05, polling=polling, on_result=results.put) as w:
+        if not polling and w.source.name != "inotify":
+            pytest.skip("inotify is not available")
+        assert [r.error for r in w.build_all()] == [None]
+        results.get_nowait()
+        stop = threading.Event()
+        thread = threading.Thread(target=w.run, args=(stop,))
+        thread.start()
+        try:
+            _write(src / "p.yaml", "EDITED")
+            result = results.get(timeout=10)
+        finally:
+            stop.set()
+            thread.join()
+    assert result.error is None and not result.skipped
+    assert result.input == src / "p.yaml"
+    assert "EDITED" in _texts(tmp_path / "out" / "p.pptx")
+
+
+def test_build_all_skips_up_to_date_outputs(tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    _write(src / "p.yaml", "T1")
+    (src / "notes.txt").write_text("ignored", encoding="utf-8")
+    stop = threading.Event()
+    with watch.Watcher([src], tmp_path / "out", source=_FakeSource([], stop)) as w:
+        assert [r.skipped for r in w.build_all()] == [False]
+    with watch.Watcher([src], tmp_path / "out", source=_FakeSource([], stop)) as w:
+        assert [r.skipped for r in w.build_all()] == [True]
+        assert [r.skipped for r in w.build_all(force=True)] == [False]
+
+
+def test_changes_are_debounced_and_filtered(tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    target = src / "p.yaml"
+    _write(target, "T1")
+    (src / "notes.txt").write_text("ignored", encoding="utf-8")
+    stop = threading.Event()
+    # 保存中の 3 回の書き込みと対象外のファイル → 最後の書き込みから debounce 秒たって 1 回だけ変換する
+    source = _FakeSource([{target}, {target, src / "notes.txt"}, {target}], stop)
+    converted = []
+
+    def on_result(result) -> None:
+        converted.append(result)
+        stop.set()
+
+    with watch.Watcher([src], tmp_path / "out", debounce=0.05, source=source, on_result=on_result) as w:
+        w.run(stop)
+    assert source.batches == []
+    assert [(r.input, r.error) for r in converted] == [(target, None)]
+    assert "T1" in _texts(tmp_path / "out" / "p.pptx")
+
+
+def test_inputs_with_the_same_output_are_reported_as_failures(tmp_path: Path) -> None:
+    src = tmp_path / "in"
+    src.mkdir()
+    _write(src / "p.yaml", "T1")
+    (src / "p.drawio").write_text(SAMPLE_XML, encoding="utf-8")
+    stop = threading.Event()
+    # 名前順で先の p.drawio が p.pptx を書き、p.yaml を保存しても上書きしない
+    source = _FakeSource([{src / "p.yaml"}], stop)
+    converted = []
+
+    def on_result(result) -> None:
+        converted.append(result)
+        if len(converted) == 3:
+            stop.set()
+
+    with watch.Watcher([src], tmp_path / "out", debounce=0.05, source=source, on_result=on_result) as w:
+        assert [(r.input.name, r.error) for r in w.build_all()][0] == ("p.drawio", None)
+        w.run(stop)
+    assert [r.input.name for r in converted] == ["p.drawio", "p.yaml", "p.yaml"]
+    for r in converted[1:]:
+        assert "already produced from" in r.error
+        assert watch.format_result(r).startswith("FAIL")
+    assert "DRAWIO" in _texts(tmp_path / "out" / "p.pptx")
+
+
+def test_rejects_unknown_inputs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        watch.Watcher([tmp_path / "notes.txt"], tmp_path / "out", polling=True)
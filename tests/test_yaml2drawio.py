@@ -0,0 +1,71 @@
+"""yaml2drawio（計算済みレイアウト → .drawio）のテスト。"""
+
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from process_to_pptx.render_plan import build_render_plan, node_shape_rect
+from process_to_pptx.yaml2drawio import EMU_PER_DRAWIO_UNIT, yaml_to_drawio
+from process_to_pptx.yaml_loader import ProcessModel
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _absolute(cells: dict[str, ET.Element], cell: ET.Element) -> tuple[float, float]:
+    """親（レーン）の位置を足した絶対座標。"""
+    geo = cell.find("mxGeometry")
+    x, y = float(geo.get("x")), float(geo.get("y"))
+    parent = cells.get(cell.get("parent"))
+    if parent is not None and parent.get("vertex") == "1":
+        px, py = _absolute(cells, parent)
+        x, y = x + px, y + py
+    return x, y
+
+
+def test_pages_vertices_and_edges_follow_layout(tmp_path: Path) -> None:
+    """スライドごとに 1 ページ。頂点はレイアウトの位置・形で、矢印は同じページの図形をつなぐ。"""
+    model = ProcessModel.load(ROOT / "input" / "bank-sales.yaml")
+    layout = model.compute_layout()
+    plans = build_render_plan(layout)
+    out = tmp_path / "process.drawio"
+    yaml_to_drawio(model, out)
+    diagrams = ET.parse(out).getroot().findall("diagram")
+    assert len(diagrams) == layout.num_slides
+
+    for diagram, plan in zip(diagrams, plans):
+        cells = {c.get("id"): c for c in diagram.iter("mxCell")}
+        lanes = [c for c in cells.values() if (c.get("style") or "").startswith("swimlane")]
+        assert [c.get("value") for c in lanes] == layout.actors
+        for node in plan.nodes:
+            cell = cells[f"p{plan.slide_index + 1}-n-{node.id}"]
+            assert cell.get("parent") == lanes[node.actor_index].get("id")
+            x, y, w, h = node_shape_rect(node.type, *layout.node_positions[node.id])
+            ax, ay = _absolute(cells, cell)
+            assert abs(ax - x / EMU_PER_DRAWIO_UNIT) < 0.02 and abs(ay - y / EMU_PER_DRAWIO_UNIT) < 0.02
+            assert float(cell.find("mxGeometry").get("width")) == round(w / EMU_PER_DRAWIO_UNIT, 2)
+        edges = [c for c in cells.values() if c.get("edge") == "1"]
+        assert len(edges) == len(plan.edges) + len(plan.system_edges)
+        assert all(cells[e.get("source")].get("vertex") == "1" and e.get("target") in cells for e in edges)
+        labels = sorted(e.label for e in plan.edges + plan.system_edges if e.label)
+        assert sorted(e.get("value") for e in edges if e.get("value")) == labels
+
+
+def test_shapes_and_escaping_to_stream() -> None:
+    src = (
+        "actors: [\"A & B\"]\n"
+        "nodes:\n"
+        "  - {id: s, type: start, actor: 0, label: 開始, next: [1]}\n"
+        "  - {id: 1, type: task, actor: 0, label: \"見積 <初回>\\n確認\", next: [2]}\n"
+        "  - {id: 2, type: gateway, actor: 0, label: ok?, gateway_type: parallel, next: [3]}\n"
+        "  - {id: 3, type: artifact, actor: 0, label: 見積書}\n"
+    )
+    buf = io.StringIO()
+    yaml_to_drawio(src, buf)
+    cells = {c.get("id"): c for c in ET.fromstring(buf.getvalue()).iter("mxCell")}
+    assert cells["p1-lane-0"].get("value") == "A & B"
+    assert cells["p1-n-1"].get("value") == "見積 <初回>\n確認"
+    assert cells["p1-n-2"].get("value") == "＋"
+    styles = {node_id: cells[f"p1-n-{node_id}"].get("style") for node_id in ("s", "1", "2", "3")}
+    assert styles["s"].startswith("ellipse;") and styles["1"].startswith("rounded=1;")
+    assert styles["2"].startswith("rhombus;") and styles["3"].startswith("shape=parallelogram;")
@@ -5,6 +5,7 @@ from pathlib import Path
 from pptx.enum.shapes import MSO_SHAPE
 from pptx.enum.text import MSO_ANCHOR
 from pptx import Presentation
+from pptx.oxml.ns import qn
 
 from process_to_pptx import yaml2pptx
 
@@ -63,8 +64,8 @@ def test_actor_label_vertical_center(tmp_path: Path) -> None:
     yaml2pptx.yaml_to_pptx(yaml_path, out)
     prs = Presentation(str(out))
     slide = prs.slides[0]
-    # アクターラベルはテキスト付き図形で、vertical_anchor が MIDDLE であること
-    textboxes = [s for s in slide.shapes if s.has_text_frame and s.text.strip()]
+    # アクターラベルはスライドレイアウトに焼き込まれたテキスト付き図形で、vertical_anchor が MIDDLE であること
+    textboxes = [s for s in slide.slide_layout.shapes if not s.is_placeholder and s.has_text_frame and s.text.strip()]
     assert len(textboxes) >= 2, "少なくとも2つのアクターラベルがある"
     for tb in textboxes[:2]:  # 最初の2つはアクター名
         assert tb.text_frame.vertical_anchor == MSO_ANCHOR.MIDDLE
@@ -86,6 +87,38 @@ def test_actor_label_in_rectangle(tmp_path: Path) -> None:
     assert len(rects) >= 2, "アクター名は長方形（角丸四角）で描画される"
 
 
+def test_swimlane_chrome_baked_into_layout(tmp_path: Path) -> None:
+    """レーンは専用レイアウトに 1 回だけ描かれ、全スライドがそのレイアウトを使う。"""
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML + "layout:\n  max_cols_per_slide: 1\n", encoding="utf-8")
+    out = tmp_path / "out.pptx"
+    n = yaml2pptx.yaml_to_pptx(yaml_path, out)
+    prs = Presentation(str(out))
+    assert len(prs.slides) == 2
+    layouts = {slide.slide_layout.name for slide in prs.slides}
+    assert layouts == {"スイムレーン"}
+    chrome = [s for s in prs.slides[0].slide_layout.shapes if not s.is_placeholder]
+    assert [s.text for s in chrome if s.has_text_frame] == ["A", "B"]
+    assert len(chrome) == 3  # アクター名 2 + 区切り線 1
+    for slide in prs.slides:
+        assert [s.text for s in slide.shapes if s.has_text_frame] in (["Task 1"], ["Task 2"])
+    # アクター名 2 + 区切り線 1（レイアウトに 1 回）+ タスク 2
+    assert n == 5
+
+
+def test_swimlane_chrome_per_slide(tmp_path: Path) -> None:
+    """bake_chrome=False なら従来どおりスライドごとにレーンを描く。"""
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML, encoding="utf-8")
+    out = tmp_path / "out.pptx"
+    n = yaml2pptx.yaml_to_pptx(yaml_path, out, bake_chrome=False)
+    prs = Presentation(str(out))
+    slide = prs.slides[0]
+    assert slide.slide_layout.name == "Blank"
+    assert [s.text for s in slide.shapes if s.has_text_frame][:2] == ["A", "B"]
+    assert n == 6
+
+
 SAMPLE_YAML_START_END = """
 actors:
   - A
@@ -259,3 +292,91 @@ def test_branch_arrow_labels_drawn(tmp_path: Path) -> None:
     )
     assert "Yes" in all_text, "分岐矢印ラベル Yes がスライドに含まれる"
     assert "No" in all_text, "分岐矢印ラベル No がスライドに含まれる"
+
+
+def test_swimlane_layout_cached_by_actors_and_margins(tmp_path: Path) -> None:
+    """同じアクター・余白のプロセスはレイアウト XML を使い回し、アクターが変われば作り直す。"""
+    from process_to_pptx import swimlane_layout
+
+    swimlane_layout.clear_cache()
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML, encoding="utf-8")
+    yaml2pptx.yaml_to_pptx(yaml_path, tmp_path / "a.pptx")
+    yaml2pptx.yaml_to_pptx(yaml_path, tmp_path / "b.pptx", renderer="fast")
+    assert len(swimlane_layout._layout_xml_cache) == 1
+    yaml_path.write_text(SAMPLE_YAML.replace("  - B\n", "  - C\n"), encoding="utf-8")
+    yaml2pptx.yaml_to_pptx(yaml_path, tmp_path / "c.pptx")
+    assert len(swimlane_layout._layout_xml_cache) == 2
+    assert [s.text for s in Presentation(str(tmp_path / "c.pptx")).slides[0].slide_layout.shapes if s.has_text_frame and not s.is_placeholder] == ["A", "C"]
+
+
+def test_yaml_to_pptx_accepts_model_string_and_stream(tmp_path: Path) -> None:
+    """パスの代わりに ProcessModel・YAML 文字列・ストリームを渡しても同じ PPTX になる。"""
+    import io
+
+    from process_to_pptx.yaml_loader import ProcessModel
+
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML, encoding="utf-8")
+    n_path = yaml2pptx.yaml_to_pptx(yaml_path, tmp_path / "path.pptx")
+    model = ProcessModel.load(yaml_path)
+    sources = {
+        "model": model,
+        "model_again": model,  # 同じモデルを何度描画しても結果は変わらない
+        "text": SAMPLE_YAML,
+        "stream": io.BytesIO(SAMPLE_YAML.encode("utf-8")),
+    }
+    for name, source in sources.items():
+        out = io.BytesIO()
+        assert yaml2pptx.yaml_to_pptx(source, out) == n_path, name
+        prs = Presentation(out)
+        assert [s.text for s in prs.slides[0].shapes if s.has_text_frame] == ["Task 1", "Task 2"], name
+    assert [n.column for n in model.nodes] == [0, 0]  # レイアウト結果はモデルに書き込まれない
+
+
+def test_render_variants_share_model(tmp_path: Path, monkeypatch) -> None:
+    """render_variants は 1 回の読み込み・列の割り当てで、寸法・列数の違う PPTX をそれぞれ出力する。"""
+    from process_to_pptx import yaml_loader
+    from process_to_pptx.yaml2pptx import LayoutVariant
+    from process_to_pptx.yaml_loader import SLIDE_SIZE_16_9, SLIDE_SIZE_4_3
+
+    calls = []
+    original = yaml_loader._assign_columns
+    monkeypatch.setattr(yaml_loader, "_assign_columns", lambda *args: calls.append(1) or original(*args))
+    yaml_path = tmp_path / "in.yaml"
+    yaml_path.write_text(SAMPLE_YAML, encoding="utf-8")
+    wide = LayoutVariant(slide_size=SLIDE_SIZE_16_9)
+    narrow = LayoutVariant(slide_size=SLIDE_SIZE_4_3, max_cols_per_slide=1)  # 2 列 → 2 スライド
+    counts = yaml2pptx.render_variants(yaml_path, {wide: tmp_path / "wide.pptx", narrow: tmp_path / "narrow.pptx"})
+    assert len(calls) == 1
+    prs_wide = Presentation(str(tmp_path / "wide.pptx"))
+    prs_narrow = Presentation(str(tmp_path / "narrow.pptx"))
+    assert (prs_wide.slide_width, prs_wide.slide_height) == SLIDE_SIZE_16_9
+    assert (prs_narrow.slide_width, prs_narrow.slide_height) == SLIDE_SIZE_4_3
+    assert len(prs_wide.slides) == 1 and len(prs_narrow.slides) == 2
+    assert counts[wide] == yaml2pptx.yaml_to_pptx(yaml_path, tmp_path / "single.pptx")
+
+
+def test_back_edge_drawn_below_tasks(tmp_path: Path) -> None:
+    """同じレーンの戻り矢印は、タスクの下辺に重なる平らな線ではなく、タスクの下を回る U 字の折れ線になる。"""
+    yaml_path = tmp_path / "loop.yaml"
+    yaml_path.write_text(
+        """
+actors: [A]
+nodes:
+  - { id: s, type: start, actor: 0, label: s, next: [a] }
+  - { id: a, type: task, actor: 0, label: a, next: [b] }
+  - { id: b, type: task, actor: 0, label: b, next: [g] }
+  - { id: g, type: task, actor: 0, label: g, next: [a] }
+""",
+        encoding="utf-8",
+    )
+    for renderer in ("default", "fast"):
+        out = tmp_path / f"{renderer}.pptx"
+        yaml2pptx.yaml_to_pptx(yaml_path, out, renderer=renderer)
+        shapes = {s.name: s for s in Presentation(str(out)).slides[0].shapes}
+        back = shapes["p2p:flow:g>a"]
+        task_bottom = max(shapes[f"p2p:node:{x}"].top + shapes[f"p2p:node:{x}"].height for x in "abg")
+        assert back.top == task_bottom
+        assert back.height > 0
+        assert back._element.spPr.find(qn("a:custGeom")) is not None
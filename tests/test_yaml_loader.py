@@ -2,6 +2,10 @@
 
 from pathlib import Path
 
+import pytest
+import yaml
+
+from process_to_pptx import yaml_loader
 from process_to_pptx.yaml_loader import (
     ProcessNode,
     load_process_yaml,
@@ -330,7 +334,7 @@ nodes:
     actors, nodes, _ = load_process_yaml(p)
     layout = compute_layout(actors, nodes)
     assert layout.actors == ["営業", "システム"], "システム用マークの2アクターが1本の「システム」に集約"
-    svc = next(n for n in nodes if n.type == "service")
+    svc = next(n for n in layout.nodes if n.type == "service")
     assert svc.actor_index == 1, "サービスノードは集約後のシステムレーン（index 1）に属する"
     assert (1, "svc", "request") in layout.system_edges
     assert ("svc", 2, "response") in layout.system_edges
@@ -429,11 +433,51 @@ nodes:
     p.write_text(yaml_with_loop.strip(), encoding="utf-8")
     actors, nodes, _ = load_process_yaml(p)
     layout = compute_layout(actors, nodes)
-    start_node = next(n for n in nodes if n.type == "start" and n.id == 0)
+    start_node = next(n for n in layout.nodes if n.type == "start" and n.id == 0)
     assert start_node.column == 0, "開始ノードはループ時も列0に配置される"
     assert (2, 0) in layout.edges, "タスク2→開始のループ用エッジが含まれる"
 
 
+def test_rework_loop_keeps_flow_order() -> None:
+    """差し戻しループ内のノードもフロー順の列に並び、ループを閉じる辺だけが戻り辺になる。"""
+    nodes = [
+        ProcessNode(id="s", type="start", actor_index=0, label="開始", next_ids=["a"]),
+        ProcessNode(id="a", type="task", actor_index=0, label="申請", next_ids=["g"]),
+        ProcessNode(id="g", type="gateway", actor_index=1, label="承認?", next_ids=["r", "e"]),
+        ProcessNode(id="r", type="task", actor_index=0, label="修正", next_ids=["a"]),
+        ProcessNode(id="e", type="end", actor_index=1, label="終了", next_ids=[]),
+    ]
+    layout = compute_layout(["申請者", "承認者"], nodes)
+    assert {n.id: n.column for n in layout.nodes} == {"s": 0, "a": 1, "g": 2, "r": 3, "e": 3}
+    assert layout.back_edges == {("r", "a")}
+    assert ("r", "a") in layout.edges
+
+
+def test_cycle_without_entry_and_self_loop() -> None:
+    """入口の無い閉路は先頭ノードから並べ、自己ループも戻り辺として扱う。"""
+    nodes = [ProcessNode(id=i, type="task", actor_index=0, label=f"T{i}", next_ids=[(i + 1) % 3]) for i in range(3)]
+    nodes[1].next_ids.append(1)
+    layout = compute_layout(["A"], nodes)
+    assert [n.column for n in layout.nodes] == [0, 1, 2]
+    assert layout.back_edges == {(2, 0), (1, 1)}
+
+
+@pytest.mark.parametrize("n", [1_000, 10_000, 100_000])
+def test_column_assignment_scales_with_loops(n: int) -> None:
+    """10 ノードごとに差し戻しループがあっても列はフロー順のまま。再帰しないため 10 万ノードでも動く。"""
+    nodes = [
+        ProcessNode(id=i, type="task", actor_index=i % 3, label=f"T{i}", next_ids=[i + 1] if i + 1 < n else [])
+        for i in range(n)
+    ]
+    for i in range(9, n, 10):
+        nodes[i].next_ids.append(i - 5)
+    nodes[-1].next_ids.append(0)  # 全体を 1 つの大きな閉路にする
+    layout = compute_layout(["A", "B", "C"], nodes, layout_config={"max_cols_per_slide": 50})
+    assert list(layout.columns) == list(range(n))
+    assert len(layout.back_edges) == n // 10 + 1
+    assert layout.num_slides == -(-n // 50)
+
+
 def test_slide_margin_10pt(tmp_path: Path) -> None:
     """スライド左右に 10pt 以上余白がとられる（DoD）。"""
     p = tmp_path / "process.yaml"
@@ -509,3 +553,131 @@ def test_layout_fits_in_slide(tmp_path: Path) -> None:
         assert left >= 0 and top >= 0, f"ノード {nid} が左上にはみ出す"
         assert left + w <= layout.slide_width, f"ノード {nid} が右にはみ出す"
         assert top + h <= layout.slide_height, f"ノード {nid} が下にはみ出す"
+
+
+STREAMING_EDGE_CASES = {
+    "anchors_and_merge": """
+defaults: &d { type: task, actor: 1 }
+nodes:
+  - { <<: *d, id: 1, label: "a", next: [2.0] }
+  - { <<: [*d, { label: base }], id: 2, actor: 0, next: [{ id: 3, label: ok }] }
+  - &n3 { id: 3, type: end, actor: 営業 }
+  - *n3
+  - not-a-node
+  - { label: no id }
+actors: [営業, "[システム]CRM", 上司]
+layout: { max_cols_per_slide: 3, margins: { left: 12 } }
+""",
+    "explicit_tags": """
+actors: [!!str 1, A]
+nodes:
+  - { id: !!str 10, label: !!str 2024, next: [0x1F] }
+  - { id: 31, type: TASK, label: ~ }
+""",
+    "nodes_not_a_list": "actors: [A]\nnodes: { id: 1 }\n",
+    "root_is_list": "- 1\n- 2\n",
+    "empty": "",
+    "duplicate_nodes_key": "actors: [A]\nnodes: [{ id: 1 }]\nnodes: { id: 2 }\n",
+}
+
+
+def test_streaming_loader_matches_full_parse(tmp_path: Path) -> None:
+    """ストリーミング読み込み（C / 純 Python どちらのパーサでも）は全体を読む場合と同じ結果になる。"""
+    loaders = [yaml.SafeLoader] + ([yaml.CSafeLoader] if yaml_loader.HAS_LIBYAML else [])
+    for name, text in STREAMING_EDGE_CASES.items():
+        path = tmp_path / f"{name}.yaml"
+        path.write_text(text, encoding="utf-8")
+        expected = yaml_loader._parse_process_data(yaml.load(text, Loader=yaml.SafeLoader))
+        for loader in loaders:
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr(yaml_loader, "SafeLoader", loader)
+                assert load_process_yaml(path, streaming=False) == expected, (name, loader)
+                assert load_process_yaml(path, streaming=True) == expected, (name, loader)
+
+
+def test_streaming_chosen_by_file_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "in.yaml"
+    path.write_text(SAMPLE_YAML, encoding="utf-8")
+    calls = []
+    original = yaml_loader._load_streaming
+    monkeypatch.setattr(yaml_loader, "_load_streaming", lambda f: calls.append(1) or original(f))
+    load_process_yaml(path)
+    assert calls == []
+    monkeypatch.setattr(yaml_loader, "STREAMING_THRESHOLD_BYTES", 1)
+    load_process_yaml(path)
+    assert calls == [1]
+
+
+def test_process_model_sources_and_repeatable_layout(tmp_path: Path) -> None:
+    """ProcessModel はパス・文字列・bytes・ストリームから同じ内容で読め、レイアウトを何度計算しても同じ。"""
+    import io
+
+    from process_to_pptx.yaml_loader import ProcessModel
+
+    text = SAMPLE_YAML.replace("  - お客様\n  - IT営業\n", '  - 営業\n  - "[システム]CRM"\n  - "[システム]ERP"\n')
+    path = tmp_path / "in.yaml"
+    path.write_text(text, encoding="utf-8")
+    model = ProcessModel.load(path)
+    assert ProcessModel.load(model) is model
+    for source in (str(path), text, text.encode("utf-8"), io.StringIO(text), io.BytesIO(text.encode("utf-8"))):
+        assert ProcessModel.load(source) == model
+    assert ProcessModel.load(io.BytesIO(text.encode("utf-8")), streaming=True) == model
+
+    first = model.compute_layout()
+    second = model.compute_layout()
+    assert first.actors == second.actors == ["営業", "システム"]
+    assert first.node_positions == second.node_positions
+    assert [n.actor_index for n in model.nodes] == [n.actor_index for n in ProcessModel.load(path).nodes]
+
+
+def test_parsed_nodes_are_compact() -> None:
+    """ノードは __slots__ で持ち、空の接続・ラベルは共有、同じ文言のラベルは同じ文字列オブジェクトになる。"""
+    actors, nodes, _ = load_process_yaml(
+        """
+actors: [A]
+nodes:
+  - { id: a, actor: A, label: 作業, next: [{ id: b, label: "次へ" }] }
+  - { id: b, actor: A, label: 作業, next: [{ id: a, label: "次へ" }] }
+"""
+    )
+    a, b = nodes
+    assert not hasattr(a, "__dict__")
+    assert a.request_to is b.request_to is yaml_loader.NO_IDS
+    assert a.response_from_labels is b.response_from_labels is yaml_loader.NO_LABELS
+    assert a.label is b.label
+    assert a.next_labels["b"] is b.next_labels["a"]
+    assert b.next_ids[0] is a.id
+
+
+def test_compute_layout_is_pure_and_reentrant() -> None:
+    """compute_layout は入力のノードを変更せず、同じモデルを複数スレッドから同時にレイアウトできる。"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from process_to_pptx.yaml_loader import SLIDE_SIZE_16_9, ProcessModel
+
+    actors = ["A", "[システム]X", "B"]
+    nodes = [
+        ProcessNode(id=i, type="task", actor_index=2 * (i % 2), label=f"T{i}", next_ids=[i + 1] if i < 39 else [])
+        for i in range(40)
+    ]
+    nodes[3].request_to = ["svc"]
+    nodes.append(ProcessNode(id="svc", type="service", actor_index=1, label="X", next_ids=[]))
+    before = [(n.actor_index, n.column, n.slide_index, n.col_in_slide) for n in nodes]
+    layout = compute_layout(actors, nodes)
+    assert [(n.actor_index, n.column, n.slide_index, n.col_in_slide) for n in nodes] == before
+    assert layout.nodes[1].actor_index == 1 and layout.nodes[-1].actor_index == 2  # 集約後のレーン
+    assert layout.nodes[3].request_to == ["svc"]  # 読み込み結果は元のノードから
+
+    model = ProcessModel(actors=actors, nodes=nodes)
+    variants = [(None, None), (5, None), (None, SLIDE_SIZE_16_9), (7, SLIDE_SIZE_16_9)] * 4
+
+    def _snapshot(variant):
+        cols, size = variant
+        result = model.compute_layout(max_cols_per_slide=cols, slide_size=size)
+        return result.slide_width, result.num_slides, dict(result.node_positions), list(result.slide_indices)
+
+    sequential = [_snapshot(v) for v in variants]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(_snapshot, variants)) == sequential
+    default, wide = sequential[0], sequential[2]
+    assert wide[0] > default[0] and wide[1] < default[1]  # 16:9 は 1 スライドに多くの列が入る